@@ -16,7 +16,7 @@ import platform
 import sys
 import threading
 from time import monotonic
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypedDict
 
 # Import cryptography early since import openssl is not thread-safe
 # _frozen_importlib._DeadlockError: deadlock detected by _ModuleLock('cryptography.hazmat.backends.openssl.backend')
@@ -87,7 +87,7 @@ from .helpers import (
     translation,
 )
 from .helpers.dispatcher import async_dispatcher_send_internal
-from .helpers.storage import get_internal_store_manager
+from .helpers.storage import Store, get_internal_store_manager
 from .helpers.system_info import async_get_system_info, is_official_image
 from .helpers.typing import ConfigType
 from .setup import (
@@ -132,6 +132,9 @@ STAGE_2_TIMEOUT = 300
 WRAP_UP_TIMEOUT = 300
 COOLDOWN_TIME = 60
 
+IMPORT_GRAPH_STORAGE_KEY = "core.import_graph"
+IMPORT_GRAPH_STORAGE_VERSION = 1
+
 
 DEBUGGER_INTEGRATIONS = {"debugpy"}
 
@@ -433,6 +436,7 @@ async def async_load_base_functionality(hass: core.HomeAssistant) -> None:
         create_eager_task(issue_registry.async_load(hass)),
         create_eager_task(label_registry.async_load(hass)),
         hass.async_add_executor_job(_init_blocking_io_modules_in_executor),
+        create_eager_task(template.async_load_bytecode_cache(hass)),
         create_eager_task(template.async_load_custom_templates(hass)),
         create_eager_task(restore_state.async_load(hass)),
         create_eager_task(hass.config_entries.async_initialize()),
@@ -802,6 +806,121 @@ async def async_setup_multi_components(
             )
 
 
+class ImportGraphEntry(TypedDict):
+    """Import cost and dependencies of an integration from the last start."""
+
+    import_time: float
+    dependencies: list[str]
+
+
+def _critical_path_import_order(
+    import_graph: dict[str, ImportGraphEntry], domains: set[str]
+) -> list[str]:
+    """Return the domains with a known import cost in critical path order.
+
+    The critical path of a domain is its own import time plus the longest
+    critical path of the domains that depend on it, since none of them can
+    be set up until it has been imported and set up.
+    """
+    dependents: defaultdict[str, set[str]] = defaultdict(set)
+    for domain in domains:
+        if (entry := import_graph.get(domain)) is not None:
+            for dependency in entry["dependencies"]:
+                dependents[dependency].add(domain)
+
+    critical_path: dict[str, float] = {}
+
+    def _critical_path(domain: str) -> float:
+        if (cost := critical_path.get(domain)) is not None:
+            return cost
+        # Guard against cycles in a stale graph
+        critical_path[domain] = 0
+        entry = import_graph.get(domain)
+        cost = (entry["import_time"] if entry else 0) + max(
+            (_critical_path(dependent) for dependent in dependents[domain]),
+            default=0,
+        )
+        critical_path[domain] = cost
+        return cost
+
+    return sorted(
+        (
+            domain
+            for domain in domains
+            if (entry := import_graph.get(domain)) and entry["import_time"]
+        ),
+        key=_critical_path,
+        reverse=True,
+    )
+
+
+async def _async_preimport_integrations(
+    hass: core.HomeAssistant,
+    integration_cache: dict[str, loader.Integration],
+    import_order: list[str],
+) -> None:
+    """Import integrations ahead of setup in the given order.
+
+    Only one import is queued at a time so imports requested by
+    setup do not have to wait for the whole list to be imported.
+    Integrations are skipped unless their requirements are already
+    installed, as setup may still have to install or update them.
+    """
+    integrations = [
+        integration
+        for domain in import_order
+        if (integration := integration_cache.get(domain)) is not None
+        and integration.import_executor
+    ]
+    await requirements.async_load_installed_versions(
+        hass,
+        {req for integration in integrations for req in integration.requirements},
+    )
+    for integration in integrations:
+        domain = integration.domain
+        if not requirements.async_requirements_installed(
+            hass, integration.requirements
+        ):
+            continue
+        try:
+            await integration.async_get_component()
+        except Exception:  # noqa: BLE001
+            # The error will be raised again and logged when
+            # the integration is set up
+            _LOGGER.debug("Failed to pre-import %s", domain, exc_info=True)
+
+
+@core.callback
+def _async_save_import_graph(
+    hass: core.HomeAssistant,
+    store: Store[dict[str, ImportGraphEntry]],
+    import_graph: dict[str, ImportGraphEntry],
+    domains_to_setup: set[str],
+    integration_cache: dict[str, loader.Integration],
+) -> None:
+    """Save the import cost and dependencies of the integrations set up."""
+    import_times = hass.data[loader.DATA_IMPORT_TIMES]
+    new_import_graph: dict[str, ImportGraphEntry] = {}
+    for domain in domains_to_setup:
+        if (integration := integration_cache.get(domain)) is None:
+            continue
+        if (import_time := import_times.get(domain)) is None:
+            # Not imported in the executor this time because
+            # it was already imported, keep the last known cost
+            previous = import_graph.get(domain)
+            import_time = previous["import_time"] if previous else 0
+        new_import_graph[domain] = {
+            "import_time": round(import_time, 4),
+            "dependencies": sorted(
+                {*integration.dependencies, *integration.after_dependencies}
+                & domains_to_setup
+            ),
+        }
+    hass.async_create_background_task(
+        store.async_save(new_import_graph), "save import graph", eager_start=True
+    )
+
+
 async def _async_resolve_domains_to_setup(
     hass: core.HomeAssistant, config: dict[str, Any]
 ) -> tuple[set[str], dict[str, loader.Integration]]:
@@ -973,10 +1092,28 @@ async def _async_set_up_integrations(
     watcher = _WatchPendingSetups(hass, _setup_started(hass))
     watcher.async_start()
 
+    import_graph_store: Store[dict[str, ImportGraphEntry]] = Store(
+        hass, IMPORT_GRAPH_STORAGE_VERSION, IMPORT_GRAPH_STORAGE_KEY, private=True
+    )
+    import_graph_task = create_eager_task(
+        import_graph_store.async_load(), name="load import graph", loop=hass.loop
+    )
+
     domains_to_setup, integration_cache = await _async_resolve_domains_to_setup(
         hass, config
     )
 
+    # Import the integrations that took the longest to import on the last
+    # start first so setup is not left waiting on a long chain of imports
+    import_graph = await import_graph_task or {}
+    if import_order := _critical_path_import_order(import_graph, domains_to_setup):
+        hass.async_create_background_task(
+            _async_preimport_integrations(hass, integration_cache, import_order),
+            "preimport integrations",
+            eager_start=True,
+        )
+    good_start = True
+
     # Initialize recorder
     if "recorder" in domains_to_setup:
         recorder.async_initialize_recorder(hass)
@@ -1035,6 +1172,7 @@ async def _async_set_up_integrations(
             ):
                 await async_setup_multi_components(hass, stage_1_domains, config)
         except TimeoutError:
+            good_start = False
             _LOGGER.warning(
                 "Setup timed out for stage 1 waiting on %s - moving forward",
                 hass._active_tasks,  # noqa: SLF001
@@ -1051,6 +1189,7 @@ async def _async_set_up_integrations(
             ):
                 await async_setup_multi_components(hass, stage_2_domains, config)
         except TimeoutError:
+            good_start = False
             _LOGGER.warning(
                 "Setup timed out for stage 2 waiting on %s - moving forward",
                 hass._active_tasks,  # noqa: SLF001
@@ -1062,6 +1201,7 @@ async def _async_set_up_integrations(
         async with hass.timeout.async_timeout(WRAP_UP_TIMEOUT, cool_down=COOLDOWN_TIME):
             await hass.async_block_till_done()
     except TimeoutError:
+        good_start = False
         _LOGGER.warning(
             "Setup timed out for bootstrap waiting on %s - moving forward",
             hass._active_tasks,  # noqa: SLF001
@@ -1069,6 +1209,11 @@ async def _async_set_up_integrations(
 
     watcher.async_stop()
 
+    if good_start:
+        _async_save_import_graph(
+            hass, import_graph_store, import_graph, domains_to_setup, integration_cache
+        )
+
     if _LOGGER.isEnabledFor(logging.DEBUG):
         setup_time = async_get_setup_timings(hass)
         _LOGGER.debug(
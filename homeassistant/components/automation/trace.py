@@ -6,11 +6,7 @@ from collections.abc import Generator
 from contextlib import contextmanager
 from typing import Any
 
-from homeassistant.components.trace import (
-    CONF_STORED_TRACES,
-    ActionTrace,
-    async_store_trace,
-)
+from homeassistant.components.trace import ActionTrace, trace_policy
 from homeassistant.core import Context, HomeAssistant
 from homeassistant.helpers.typing import ConfigType
 
@@ -58,14 +54,13 @@ def trace_automation(
 ) -> Generator[AutomationTrace]:
     """Trace action execution of automation with automation_id."""
     trace = AutomationTrace(automation_id, config, blueprint_inputs, context)
-    async_store_trace(hass, trace, trace_config[CONF_STORED_TRACES])
-
-    try:
-        yield trace
-    except Exception as ex:
-        if automation_id:
-            trace.set_error(ex)
-        raise
-    finally:
-        if automation_id:
-            trace.finished()
+    with trace_policy(hass, trace, trace_config):
+        try:
+            yield trace
+        except Exception as ex:
+            if automation_id:
+                trace.set_error(ex)
+            raise
+        finally:
+            if automation_id:
+                trace.finished()
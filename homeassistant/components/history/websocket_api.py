@@ -4,15 +4,16 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Callable, Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime as dt, timedelta
 import logging
-from typing import Any, cast
+from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.models import ColumnarStates
 from homeassistant.components.websocket_api import messages
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.const import (
@@ -35,22 +36,54 @@ from homeassistant.helpers.event import (
     async_track_point_in_utc_time,
     async_track_state_change_event,
 )
-from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.json import json_bytes, json_fragment
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
+from homeassistant.util.hass_dict import HassKey
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import DOMAIN, EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
 
 _LOGGER = logging.getLogger(__name__)
 
 
+type _HubKey = tuple[frozenset[str], bool, bool]
+type _BackfillKey = tuple[dt, bool, bool, bool]
+type _HistoricalQueryKey = tuple[
+    dt, dt, tuple[str, ...] | None, bool, bool, bool, bool, bool
+]
+type _HistoricalResponse = tuple[float, dt | None, bytes | None]
+
+HISTORY_STREAM_HUBS: HassKey[dict[_HubKey, HistoryStreamHub]] = HassKey(
+    f"{DOMAIN}_stream_hubs"
+)
+HISTORY_QUERIES: HassKey[
+    dict[_HistoricalQueryKey, asyncio.Future[_HistoricalResponse]]
+] = HassKey(f"{DOMAIN}_queries")
+
+
+@dataclass(slots=True)
+class _StreamBackfill:
+    """Historical states of the live streams that started together.
+
+    The live events are kept until every stream has sent its
+    historical states so they can be sent after them in order.
+    """
+
+    key: _BackfillKey
+    end_time: dt
+    events: list[Event] = field(default_factory=list)
+    streams: int = 0
+
+
 @dataclass(slots=True)
 class HistoryLiveStream:
     """Track a history live stream."""
 
-    stream_queue: asyncio.Queue[Event]
-    subscriptions: list[CALLBACK_TYPE]
+    connection: ActiveConnection
+    message_id_as_bytes: bytes
+    subscriptions_setup_complete_timestamp: float
+    backfill: _StreamBackfill | None
     end_time_unsub: CALLBACK_TYPE | None = None
     task: asyncio.Task | None = None
     wait_sync_task: asyncio.Task | None = None
@@ -59,6 +92,8 @@ class HistoryLiveStream:
 @callback
 def async_setup(hass: HomeAssistant) -> None:
     """Set up the history websocket API."""
+    hass.data[HISTORY_STREAM_HUBS] = {}
+    hass.data[HISTORY_QUERIES] = {}
     websocket_api.async_register_command(hass, ws_get_history_during_period)
     websocket_api.async_register_command(hass, ws_stream)
 
@@ -78,22 +113,33 @@ def _ws_get_significant_states(
     return json_bytes(
         messages.result_message(
             msg_id,
-            history.get_significant_states(
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-                True,
+            _columnar_states_to_json_fragments(
+                history.get_significant_states_columnar(
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    None,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                    no_attributes,
+                )
             ),
         )
     )
 
 
+def _columnar_states_to_json_fragments(
+    states: dict[str, ColumnarStates],
+) -> dict[str, json_fragment]:
+    """Serialize columnar states without creating a dict per state."""
+    return {
+        entity_id: json_fragment(columnar.as_compressed_state_json())
+        for entity_id, columnar in states.items()
+    }
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/history_during_period",
@@ -173,7 +219,7 @@ async def ws_get_history_during_period(
 
 
 def _generate_stream_message(
-    states: dict[str, list[dict[str, Any]]],
+    states: dict[str, list[dict[str, Any]]] | dict[str, json_fragment],
     start_day: dt,
     end_day: dt,
 ) -> dict[str, Any]:
@@ -201,7 +247,7 @@ def _generate_websocket_response(
     msg_id: int,
     start_time: dt,
     end_time: dt,
-    states: dict[str, list[dict[str, Any]]],
+    states: dict[str, list[dict[str, Any]]] | dict[str, json_fragment],
 ) -> bytes:
     """Generate a websocket response."""
     return json_bytes(
@@ -211,9 +257,22 @@ def _generate_websocket_response(
     )
 
 
+def _event_message_prefix(event: dict[str, Any]) -> bytes:
+    """Serialize an event message without the id.
+
+    The result is missing the closing brace so it can be
+    completed with _event_message_with_id.
+    """
+    return json_bytes({"type": "event", "event": event})[:-1]
+
+
+def _event_message_with_id(prefix: bytes, message_id_as_bytes: bytes) -> bytes:
+    """Complete an event message prefix with the message id."""
+    return b"".join((prefix, b',"id":', message_id_as_bytes, b"}"))
+
+
 def _generate_historical_response(
     hass: HomeAssistant,
-    msg_id: int,
     start_time: dt,
     end_time: dt,
     entity_ids: list[str] | None,
@@ -222,31 +281,26 @@ def _generate_historical_response(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
-) -> tuple[float, dt | None, bytes | None]:
-    """Generate a historical response."""
-    states = cast(
-        dict[str, list[dict[str, Any]]],
-        history.get_significant_states(
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            None,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
+) -> _HistoricalResponse:
+    """Generate a historical response without the message id."""
+    states = history.get_significant_states_columnar(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
     )
     last_time_ts = 0.0
-    for state_list in states.values():
+    for columnar in states.values():
         if (
-            state_list
-            and (state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED])
-            > last_time_ts
+            columnar
+            and (state_last_time := columnar.last_updated_ts[-1]) > last_time_ts
         ):
-            last_time_ts = cast(float, state_last_time)
+            last_time_ts = state_last_time
 
     if last_time_ts == 0:
         # If we did not send any states ever, we need to send an empty response
@@ -261,7 +315,11 @@ def _generate_historical_response(
     return (
         last_time_ts,
         last_time_dt,
-        _generate_websocket_response(msg_id, start_time, last_time_dt, states),
+        _event_message_prefix(
+            _generate_stream_message(
+                _columnar_states_to_json_fragments(states), start_time, last_time_dt
+            )
+        ),
     )
 
 
@@ -278,23 +336,41 @@ async def _async_send_historical_states(
     no_attributes: bool,
     send_empty: bool,
 ) -> dt | None:
-    """Fetch history significant_states and send them to the client."""
-    instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
-        _generate_historical_response,
-        hass,
-        msg_id,
+    """Fetch history significant_states and send them to the client.
+
+    Streams that ask for the same history at the same time, like
+    dashboards that are opened on several devices, share the query.
+    """
+    queries = hass.data[HISTORY_QUERIES]
+    key: _HistoricalQueryKey = (
         start_time,
         end_time,
-        entity_ids,
+        tuple(entity_ids) if entity_ids is not None else None,
         include_start_time_state,
         significant_changes_only,
         minimal_response,
         no_attributes,
         send_empty,
     )
-    if payload:
-        connection.send_message(payload)
+    if (future := queries.get(key)) is None:
+        future = queries[key] = get_instance(hass).async_add_executor_job(
+            _generate_historical_response,
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            send_empty,
+        )
+        future.add_done_callback(lambda _: queries.pop(key, None))
+    # Shield the query so another stream waiting for it is not
+    # cancelled when this one is unsubscribed
+    last_time_ts, last_time_dt, prefix = await asyncio.shield(future)
+    if prefix:
+        connection.send_message(_event_message_with_id(prefix, str(msg_id).encode()))
     return last_time_dt if last_time_ts != 0 else None
 
 
@@ -323,51 +399,13 @@ def _events_to_compressed_states(
     return states_by_entity_ids
 
 
-async def _async_events_consumer(
-    subscriptions_setup_complete_time: dt,
-    connection: ActiveConnection,
-    msg_id: int,
-    stream_queue: asyncio.Queue[Event],
-    no_attributes: bool,
-) -> None:
-    """Stream events from the queue."""
-    subscriptions_setup_complete_timestamp = (
-        subscriptions_setup_complete_time.timestamp()
-    )
-    while True:
-        events: list[Event] = [await stream_queue.get()]
-        # If the event is older than the last db
-        # event we already sent it so we skip it.
-        if events[0].time_fired_timestamp <= subscriptions_setup_complete_timestamp:
-            continue
-        # We sleep for the EVENT_COALESCE_TIME so
-        # we can group events together to minimize
-        # the number of websocket messages when the
-        # system is overloaded with an event storm
-        await asyncio.sleep(EVENT_COALESCE_TIME)
-        while not stream_queue.empty():
-            events.append(stream_queue.get_nowait())
-
-        if history_states := _events_to_compressed_states(events, no_attributes):
-            connection.send_message(
-                json_bytes(
-                    messages.event_message(
-                        msg_id,
-                        {"states": history_states},
-                    )
-                )
-            )
-
-
 @callback
 def _async_subscribe_events(
     hass: HomeAssistant,
-    subscriptions: list[CALLBACK_TYPE],
     target: Callable[[Event[Any]], None],
     entity_ids: list[str],
     significant_changes_only: bool,
-    minimal_response: bool,
-) -> None:
+) -> CALLBACK_TYPE:
     """Subscribe to events for the entities and devices or all.
 
     These are the events we need to listen for to do
@@ -383,18 +421,238 @@ def _async_subscribe_events(
         ) is None:
             return
         if (
-            (significant_changes_only or minimal_response)
+            significant_changes_only
             and new_state.state == old_state.state
             and new_state.domain not in history.SIGNIFICANT_DOMAINS
         ):
             return
         target(event)
 
-    subscriptions.append(
-        async_track_state_change_event(hass, entity_ids, _forward_state_events_filtered)
+    return async_track_state_change_event(
+        hass, entity_ids, _forward_state_events_filtered
     )
 
 
+class HistoryStreamHub:
+    """Share the live history of the same entities between streams.
+
+    The state changed events are coalesced, converted and serialized
+    once for every stream that follows the same entities with the same
+    options, only the message id is added for each stream.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: _HubKey,
+        entity_ids: list[str],
+        significant_changes_only: bool,
+        no_attributes: bool,
+    ) -> None:
+        """Initialize the hub and subscribe to the state changed events."""
+        self._hass = hass
+        self._key = key
+        self._no_attributes = no_attributes
+        self._closed = False
+        self._streams: list[HistoryLiveStream] = []
+        self._backfills: dict[_BackfillKey, _StreamBackfill] = {}
+        self._queue: asyncio.Queue[Event] = asyncio.Queue(MAX_PENDING_HISTORY_STATES)
+        self._unsub_events = _async_subscribe_events(
+            hass, self._async_queue_or_close, entity_ids, significant_changes_only
+        )
+        self._task = create_eager_task(self._async_events_consumer())
+
+    @callback
+    def async_add_stream(
+        self, connection: ActiveConnection, msg_id: int, backfill_key: _BackfillKey
+    ) -> HistoryLiveStream:
+        """Add a stream that waits for its historical states.
+
+        A stream that asks for the same history as a stream that is
+        still sending its historical states shares its end time so
+        the query can be shared as well.
+        """
+        if (backfill := self._backfills.get(backfill_key)) is None:
+            backfill = self._backfills[backfill_key] = _StreamBackfill(
+                backfill_key, dt_util.utcnow()
+            )
+        backfill.streams += 1
+        stream = HistoryLiveStream(
+            connection,
+            str(msg_id).encode(),
+            backfill.end_time.timestamp(),
+            backfill,
+        )
+        self._streams.append(stream)
+        return stream
+
+    @callback
+    def async_start_live(self, stream: HistoryLiveStream) -> bool:
+        """Start sending live events once the historical states are sent.
+
+        Returns False if the stream was removed, because it reached its
+        end time or fell too far behind, while the historical states
+        were sent.
+        """
+        if stream.backfill is None or stream not in self._streams:
+            return False
+        cutoff = stream.subscriptions_setup_complete_timestamp
+        if not any(
+            event.time_fired_timestamp > cutoff for event in stream.backfill.events
+        ):
+            self._async_release_backfill(stream)
+            return True
+        # We sleep for the EVENT_COALESCE_TIME so we can group the events
+        # that happened while sending the historical states together
+        stream.task = create_eager_task(self._async_send_backfill_events(stream))
+        return True
+
+    @callback
+    def async_remove_stream(self, stream: HistoryLiveStream) -> None:
+        """Remove a stream and unsubscribe when it is the last one."""
+        if stream not in self._streams:
+            return
+        self._streams.remove(stream)
+        if stream.backfill:
+            self._async_release_backfill(stream)
+        if stream.task:
+            stream.task.cancel()
+        if stream.wait_sync_task:
+            stream.wait_sync_task.cancel()
+        if stream.end_time_unsub:
+            stream.end_time_unsub()
+            stream.end_time_unsub = None
+        if not self._streams:
+            self._async_close()
+
+    @callback
+    def _async_close(self) -> None:
+        """Unsubscribe from the events and remove all streams."""
+        if self._closed:
+            return
+        self._closed = True
+        hubs = self._hass.data[HISTORY_STREAM_HUBS]
+        if hubs.get(self._key) is self:
+            del hubs[self._key]
+        self._unsub_events()
+        self._task.cancel()
+        for stream in list(self._streams):
+            self.async_remove_stream(stream)
+
+    @callback
+    def _async_release_backfill(self, stream: HistoryLiveStream) -> None:
+        """Switch a stream over to the live events."""
+        backfill = stream.backfill
+        assert backfill is not None
+        stream.backfill = None
+        backfill.streams -= 1
+        if not backfill.streams and self._backfills.get(backfill.key) is backfill:
+            del self._backfills[backfill.key]
+
+    @callback
+    def _async_queue_or_close(self, event: Event) -> None:
+        """Queue an event to be processed or close the hub."""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            _LOGGER.debug(
+                "Client exceeded max pending messages of %s",
+                MAX_PENDING_HISTORY_STATES,
+            )
+            self._async_close()
+
+    async def _async_events_consumer(self) -> None:
+        """Stream events from the queue."""
+        queue = self._queue
+        while True:
+            events: list[Event] = [await queue.get()]
+            # We sleep for the EVENT_COALESCE_TIME so
+            # we can group events together to minimize
+            # the number of websocket messages when the
+            # system is overloaded with an event storm
+            await asyncio.sleep(EVENT_COALESCE_TIME)
+            while not queue.empty():
+                events.append(queue.get_nowait())
+            self._async_dispatch(events)
+
+    async def _async_send_backfill_events(self, stream: HistoryLiveStream) -> None:
+        """Send the events that happened while sending the historical states."""
+        await asyncio.sleep(EVENT_COALESCE_TIME)
+        assert stream.backfill is not None
+        events = stream.backfill.events
+        self._async_release_backfill(stream)
+        self._async_send_after_cutoff(stream, events)
+
+    @callback
+    def _async_send_after_cutoff(
+        self, stream: HistoryLiveStream, events: list[Event]
+    ) -> None:
+        """Send the events the stream did not get from the database."""
+        # If the event is older than the last db
+        # event we already sent it so we skip it.
+        cutoff = stream.subscriptions_setup_complete_timestamp
+        if history_states := _events_to_compressed_states(
+            (event for event in events if event.time_fired_timestamp > cutoff),
+            self._no_attributes,
+        ):
+            stream.connection.send_message(
+                _event_message_with_id(
+                    _event_message_prefix({"states": history_states}),
+                    stream.message_id_as_bytes,
+                )
+            )
+
+    @callback
+    def _async_dispatch(self, events: list[Event]) -> None:
+        """Send a batch of events to all streams."""
+        for backfill in list(self._backfills.values()):
+            backfill.events.extend(events)
+            if len(backfill.events) > MAX_PENDING_HISTORY_STATES:
+                _LOGGER.debug(
+                    "Client exceeded max pending messages of %s",
+                    MAX_PENDING_HISTORY_STATES,
+                )
+                for stream in list(self._streams):
+                    if stream.backfill is backfill:
+                        self.async_remove_stream(stream)
+        oldest_timestamp = min(event.time_fired_timestamp for event in events)
+        prefix: bytes | None = None
+        for stream in list(self._streams):
+            if stream.backfill:
+                continue
+            if oldest_timestamp <= stream.subscriptions_setup_complete_timestamp:
+                self._async_send_after_cutoff(stream, events)
+                continue
+            if prefix is None:
+                prefix = _event_message_prefix(
+                    {
+                        "states": _events_to_compressed_states(
+                            events, self._no_attributes
+                        )
+                    }
+                )
+            stream.connection.send_message(
+                _event_message_with_id(prefix, stream.message_id_as_bytes)
+            )
+
+
+@callback
+def _async_get_stream_hub(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> HistoryStreamHub:
+    """Get the hub for the entities and options or create it."""
+    hubs = hass.data[HISTORY_STREAM_HUBS]
+    key: _HubKey = (frozenset(entity_ids), significant_changes_only, no_attributes)
+    if (hub := hubs.get(key)) is None:
+        hub = hubs[key] = HistoryStreamHub(
+            hass, key, entity_ids, significant_changes_only, no_attributes
+        )
+    return hub
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/stream",
@@ -473,52 +731,35 @@ async def ws_stream(
         )
         return
 
-    subscriptions: list[CALLBACK_TYPE] = []
-    stream_queue: asyncio.Queue[Event] = asyncio.Queue(MAX_PENDING_HISTORY_STATES)
-    live_stream = HistoryLiveStream(
-        subscriptions=subscriptions, stream_queue=stream_queue
+    hub = _async_get_stream_hub(
+        hass,
+        entity_ids,
+        significant_changes_only or minimal_response,
+        no_attributes,
     )
+    live_stream = hub.async_add_stream(
+        connection,
+        msg_id,
+        (
+            start_time,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+        ),
+    )
+    assert live_stream.backfill is not None
+    subscriptions_setup_complete_time = live_stream.backfill.end_time
 
     @callback
     def _unsub(*_utc_time: Any) -> None:
         """Unsubscribe from all events."""
-        for subscription in subscriptions:
-            subscription()
-        subscriptions.clear()
-        if live_stream.task:
-            live_stream.task.cancel()
-        if live_stream.wait_sync_task:
-            live_stream.wait_sync_task.cancel()
-        if live_stream.end_time_unsub:
-            live_stream.end_time_unsub()
-            live_stream.end_time_unsub = None
+        hub.async_remove_stream(live_stream)
 
     if end_time:
         live_stream.end_time_unsub = async_track_point_in_utc_time(
             hass, _unsub, end_time
         )
 
-    @callback
-    def _queue_or_cancel(event: Event) -> None:
-        """Queue an event to be processed or cancel."""
-        try:
-            stream_queue.put_nowait(event)
-        except asyncio.QueueFull:
-            _LOGGER.debug(
-                "Client exceeded max pending messages of %s",
-                MAX_PENDING_HISTORY_STATES,
-            )
-            _unsub()
-
-    _async_subscribe_events(
-        hass,
-        subscriptions,
-        _queue_or_cancel,
-        entity_ids,
-        significant_changes_only=significant_changes_only,
-        minimal_response=minimal_response,
-    )
-    subscriptions_setup_complete_time = dt_util.utcnow()
     connection.subscriptions[msg_id] = _unsub
     connection.send_result(msg_id)
     # Fetch everything from history
@@ -536,20 +777,11 @@ async def ws_stream(
         True,
     )
 
-    if msg_id not in connection.subscriptions:
-        # Unsubscribe happened while sending historical states
+    if msg_id not in connection.subscriptions or not hub.async_start_live(live_stream):
+        # Unsubscribe happened or the stream ended while
+        # sending historical states
         return
 
-    live_stream.task = create_eager_task(
-        _async_events_consumer(
-            subscriptions_setup_complete_time,
-            connection,
-            msg_id,
-            stream_queue,
-            no_attributes,
-        )
-    )
-
     live_stream.wait_sync_task = create_eager_task(
         get_instance(hass).async_block_till_done()
     )
@@ -7,6 +7,7 @@ from contextlib import suppress
 from dataclasses import dataclass
 import logging
 import math
+from pathlib import Path
 import queue
 import threading
 import time
@@ -38,9 +39,14 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
+    Platform,
 )
 from homeassistant.core import Event, HomeAssistant, State, callback
-from homeassistant.helpers import event as event_helper, state as state_helper
+from homeassistant.helpers import (
+    discovery,
+    event as event_helper,
+    state as state_helper,
+)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_values import EntityValues
 from homeassistant.helpers.entityfilter import (
@@ -48,6 +54,7 @@ from homeassistant.helpers.entityfilter import (
     convert_include_exclude_filter,
 )
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.ssl import client_context
 
 from .const import (
     API_VERSION_2,
@@ -71,6 +78,9 @@ from .const import (
     CONF_OVERRIDE_MEASUREMENT,
     CONF_PRECISION,
     CONF_RETRY_COUNT,
+    CONF_SPOOL,
+    CONF_SPOOL_CONCURRENCY,
+    CONF_SPOOL_MAX_SIZE,
     CONF_SSL_CA_CERT,
     CONF_TAGS,
     CONF_TAGS_ATTRIBUTES,
@@ -78,6 +88,8 @@ from .const import (
     DEFAULT_API_VERSION,
     DEFAULT_HOST_V2,
     DEFAULT_MEASUREMENT_ATTR,
+    DEFAULT_SPOOL_CONCURRENCY,
+    DEFAULT_SPOOL_MAX_SIZE,
     DEFAULT_SSL_V2,
     DOMAIN,
     EVENT_NEW_STATE,
@@ -96,12 +108,16 @@ from .const import (
     RETRY_DELAY,
     RETRY_INTERVAL,
     RETRY_MESSAGE,
+    SPOOL_DIRECTORY,
+    SPOOL_SEGMENT_MAX_AGE,
+    SPOOL_SEGMENT_SIZE,
     TEST_QUERY_V1,
     TEST_QUERY_V2,
     TIMEOUT,
     WRITE_ERROR,
     WROTE_MESSAGE,
 )
+from .spool import InfluxSpool, InfluxSpoolDrainer, get_spool_write_request
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -162,9 +178,21 @@ _CUSTOMIZE_ENTITY_SCHEMA = vol.Schema(
     }
 )
 
+_SPOOL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_SPOOL_MAX_SIZE, default=DEFAULT_SPOOL_MAX_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(
+            CONF_SPOOL_CONCURRENCY, default=DEFAULT_SPOOL_CONCURRENCY
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+    }
+)
+
 _INFLUX_BASE_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
     {
         vol.Optional(CONF_RETRY_COUNT, default=0): cv.positive_int,
+        vol.Optional(CONF_SPOOL): _SPOOL_SCHEMA,
         vol.Optional(CONF_DEFAULT_MEASUREMENT): cv.string,
         vol.Optional(CONF_MEASUREMENT_ATTR, default=DEFAULT_MEASUREMENT_ATTR): vol.In(
             ["unit_of_measurement", "domain__device_class", "entity_id"]
@@ -482,6 +510,9 @@ def _retry_setup(hass: HomeAssistant, config: ConfigType) -> None:
 def setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the InfluxDB component."""
     conf = config[DOMAIN]
+    if CONF_SPOOL in conf:
+        return _setup_spool(hass, config)
+
     try:
         influx = get_influx_connection(conf, test_write=True)
     except ConnectionError as exc:
@@ -507,10 +538,60 @@ def setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return True
 
 
+def _setup_spool(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up writing events through the spool.
+
+    Events are kept in the spool while InfluxDB is not reachable so
+    setting up does not need to connect to InfluxDB.
+    """
+    conf = config[DOMAIN]
+    spool_conf = conf[CONF_SPOOL]
+    spool = InfluxSpool(
+        Path(hass.config.path(SPOOL_DIRECTORY)),
+        spool_conf[CONF_SPOOL_MAX_SIZE] * 1024 * 1024,
+        SPOOL_SEGMENT_SIZE,
+        SPOOL_SEGMENT_MAX_AGE,
+        conf.get(CONF_PRECISION),
+    )
+    spool.load()
+
+    ssl_context = None
+    if CONF_SSL_CA_CERT in conf and conf[CONF_VERIFY_SSL]:
+        ssl_context = client_context()
+        ssl_context.load_verify_locations(conf[CONF_SSL_CA_CERT])
+    drainer = InfluxSpoolDrainer(
+        hass,
+        spool,
+        get_spool_write_request(conf),
+        spool_conf[CONF_SPOOL_CONCURRENCY],
+        conf[CONF_VERIFY_SSL],
+        ssl_context,
+    )
+
+    event_to_json = _generate_event_to_json(conf)
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass, None, event_to_json, 0, spool=spool
+    )
+    instance.start()
+    hass.add_job(drainer.async_start)
+
+    def shutdown(event):
+        """Shut down the thread and keep the remaining events in the spool."""
+        instance.queue.put(None)
+        instance.join()
+        spool.close()
+
+    hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
+
+    discovery.load_platform(hass, Platform.SENSOR, DOMAIN, {}, config)
+
+    return True
+
+
 class InfluxThread(threading.Thread):
     """A threaded event handler class."""
 
-    def __init__(self, hass, influx, event_to_json, max_tries):
+    def __init__(self, hass, influx, event_to_json, max_tries, spool=None):
         """Initialize the listener."""
         threading.Thread.__init__(self, name=DOMAIN)
         self.queue: queue.SimpleQueue[threading.Event | tuple[float, Event] | None] = (
@@ -519,6 +600,7 @@ class InfluxThread(threading.Thread):
         self.influx = influx
         self.event_to_json = event_to_json
         self.max_tries = max_tries
+        self.spool: InfluxSpool | None = spool
         self.write_errors = 0
         self.shutdown = False
         hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
@@ -535,8 +617,16 @@ class InfluxThread(threading.Thread):
         return BATCH_TIMEOUT
 
     def get_events_json(self):
-        """Return a batch of events formatted for writing."""
-        queue_seconds = QUEUE_BACKLOG_SECONDS + self.max_tries * RETRY_DELAY
+        """Return a batch of events formatted for writing.
+
+        Events which waited too long in the queue are dropped unless
+        they are kept in the spool.
+        """
+        queue_seconds = (
+            None
+            if self.spool is not None
+            else QUEUE_BACKLOG_SECONDS + self.max_tries * RETRY_DELAY
+        )
 
         count = 0
         json = []
@@ -555,7 +645,7 @@ class InfluxThread(threading.Thread):
                     timestamp, event = item
                     age = time.monotonic() - timestamp
 
-                    if age < queue_seconds:
+                    if queue_seconds is None or age < queue_seconds:
                         if event_json := self.event_to_json(event):
                             json.append(event_json)
                     else:
@@ -595,7 +685,11 @@ class InfluxThread(threading.Thread):
         """Process incoming events."""
         while not self.shutdown:
             _, json = self.get_events_json()
-            if json:
+            if not json:
+                continue
+            if self.spool is not None:
+                self.spool.append_points(json)
+            else:
                 self.write_to_influxdb(json)
 
     def block_till_done(self):
@@ -33,6 +33,9 @@ CONF_RETRY_COUNT = "max_retries"
 CONF_IGNORE_ATTRIBUTES = "ignore_attributes"
 CONF_PRECISION = "precision"
 CONF_SSL_CA_CERT = "ssl_ca_cert"
+CONF_SPOOL = "spool"
+CONF_SPOOL_MAX_SIZE = "max_size"
+CONF_SPOOL_CONCURRENCY = "concurrency"
 
 CONF_QUERIES = "queries"
 CONF_QUERIES_FLUX = "queries_flux"
@@ -59,6 +62,8 @@ DEFAULT_RANGE_START = "-15m"
 DEFAULT_RANGE_STOP = "now()"
 DEFAULT_FUNCTION_FLUX = "|> limit(n: 1)"
 DEFAULT_MEASUREMENT_ATTR = "unit_of_measurement"
+DEFAULT_SPOOL_MAX_SIZE = 64  # MiB
+DEFAULT_SPOOL_CONCURRENCY = 4
 
 INFLUX_CONF_MEASUREMENT = "measurement"
 INFLUX_CONF_TAGS = "tags"
@@ -84,6 +89,12 @@ TEST_QUERY_V1 = "SHOW DATABASES;"
 TEST_QUERY_V2 = "buckets()"
 CODE_INVALID_INPUTS = 400
 
+SPOOL_DIRECTORY = ".influxdb_spool"
+SPOOL_SEGMENT_SIZE = 512 * 1024  # bytes
+SPOOL_SEGMENT_MAX_AGE = 10  # seconds
+SPOOL_DRAIN_INTERVAL = timedelta(seconds=1)
+SPOOL_COMPRESS_LEVEL = 6
+
 MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=10)
 
 RE_DIGIT_TAIL = re.compile(r"^[^\.]*\d+\.?\d+[^\.]*$")
@@ -120,6 +131,11 @@ RETRY_MESSAGE = f"%s Retrying in {RETRY_INTERVAL} seconds."
 CATCHING_UP_MESSAGE = "Catching up, dropped %d old events."
 RESUMED_MESSAGE = "Resumed, lost %d events."
 WROTE_MESSAGE = "Wrote %d events."
+SPOOL_FULL_MESSAGE = "Spool is full, dropped %d old events."
+SPOOL_RETRY_MESSAGE = (
+    f"%s Keeping events in the spool, retrying in {RETRY_DELAY} seconds."
+)
+SPOOL_RESUMED_MESSAGE = "Resumed, writing the events kept in the spool."
 RUNNING_QUERY_MESSAGE = "Running query: %s."
 QUERY_NO_RESULTS_MESSAGE = "Query returned no results, sensor state set to UNKNOWN: %s."
 QUERY_MULTIPLE_RESULTS_MESSAGE = (
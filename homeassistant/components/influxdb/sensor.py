@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import datetime
 import logging
+import time
 from typing import Final
 
 import voluptuous as vol
@@ -11,6 +12,7 @@ import voluptuous as vol
 from homeassistant.components.sensor import (
     PLATFORM_SCHEMA as SENSOR_PLATFORM_SCHEMA,
     SensorEntity,
+    SensorStateClass,
 )
 from homeassistant.const import (
     CONF_API_VERSION,
@@ -50,6 +52,7 @@ from .const import (
     DEFAULT_GROUP_FUNCTION,
     DEFAULT_RANGE_START,
     DEFAULT_RANGE_STOP,
+    DOMAIN,
     INFLUX_CONF_VALUE,
     INFLUX_CONF_VALUE_V2,
     LANGUAGE_FLUX,
@@ -65,6 +68,7 @@ from .const import (
     RENDERING_WHERE_MESSAGE,
     RUNNING_QUERY_MESSAGE,
 )
+from .spool import InfluxSpool
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -162,6 +166,14 @@ def setup_platform(
     discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the InfluxDB component."""
+    if discovery_info is not None:
+        spool = hass.data[DOMAIN].spool
+        add_entities(
+            [InfluxSpoolBacklogSensor(spool), InfluxSpoolThroughputSensor(spool)],
+            update_before_add=True,
+        )
+        return
+
     try:
         influx = get_influx_connection(config, test_read=True)
     except ConnectionError as exc:
@@ -257,6 +269,52 @@ class InfluxSensor(SensorEntity):
         self._state = value
 
 
+class InfluxSpoolBacklogSensor(SensorEntity):
+    """Number of events kept in the spool to be written to InfluxDB."""
+
+    _attr_name = "InfluxDB spool backlog"
+    _attr_unique_id = "influxdb_spool_backlog"
+    _attr_native_unit_of_measurement = "events"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, spool: InfluxSpool) -> None:
+        """Initialize the sensor."""
+        self._spool = spool
+
+    async def async_update(self) -> None:
+        """Update the backlog of the spool."""
+        spool = self._spool
+        self._attr_native_value = spool.points
+        self._attr_extra_state_attributes = {
+            "size": spool.size,
+            "dropped": spool.dropped,
+        }
+
+
+class InfluxSpoolThroughputSensor(SensorEntity):
+    """Rate of the events written from the spool to InfluxDB."""
+
+    _attr_name = "InfluxDB spool throughput"
+    _attr_unique_id = "influxdb_spool_throughput"
+    _attr_native_unit_of_measurement = "events/s"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, spool: InfluxSpool) -> None:
+        """Initialize the sensor."""
+        self._spool = spool
+        self._written = spool.written
+        self._updated = time.monotonic()
+
+    async def async_update(self) -> None:
+        """Update the rate of the events written since the last update."""
+        now = time.monotonic()
+        written = self._spool.written
+        if elapsed := now - self._updated:
+            self._attr_native_value = round((written - self._written) / elapsed, 2)
+        self._written = written
+        self._updated = now
+
+
 class InfluxFluxSensorData:
     """Class for handling the data retrieval from Influx with Flux query."""
 
@@ -0,0 +1,433 @@
+"""Durable spool for writing events to InfluxDB."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+import gzip
+import logging
+from operator import attrgetter
+from pathlib import Path
+import ssl
+import threading
+import time
+from typing import Any, BinaryIO
+
+import aiohttp
+from influxdb.line_protocol import make_lines
+
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_PATH,
+    CONF_PORT,
+    CONF_SSL,
+    CONF_TOKEN,
+    CONF_URL,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util.async_ import create_eager_task
+
+from .const import (
+    API_VERSION_2,
+    CLIENT_ERROR_V1,
+    CLIENT_ERROR_V2,
+    CODE_INVALID_INPUTS,
+    CONF_API_VERSION,
+    CONF_BUCKET,
+    CONF_DB_NAME,
+    CONF_ORG,
+    CONF_PRECISION,
+    CONNECTION_ERROR,
+    RETRY_DELAY,
+    SPOOL_COMPRESS_LEVEL,
+    SPOOL_DRAIN_INTERVAL,
+    SPOOL_FULL_MESSAGE,
+    SPOOL_RESUMED_MESSAGE,
+    SPOOL_RETRY_MESSAGE,
+    TIMEOUT,
+    WRITE_ERROR,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".lp"
+
+# The line protocol precision names of the configured precisions
+_LINE_PROTOCOL_PRECISION = {"ns": "n", "us": "u", "ms": "ms", "s": "s"}
+
+
+@dataclass(slots=True)
+class SpoolSegment:
+    """A segment file of the spool."""
+
+    sequence: int
+    path: Path
+    size: int = 0
+    points: int = 0
+    draining: bool = False
+    started: float = 0.0
+
+
+class InfluxSpool:
+    """Keep line protocol batches in size capped segment files.
+
+    Batches are appended to the newest segment until it reaches the
+    segment size. It is only drained once it is full or older than the
+    maximum segment age, so each write to InfluxDB carries as many
+    points as possible. When the spool grows past its maximum size the
+    oldest segments which are not being drained are dropped.
+
+    The spool is shared by the InfluxThread appending batches and the
+    executor jobs draining it so all methods are thread-safe. They do
+    blocking I/O and must not be called from the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_size: int,
+        segment_size: int,
+        segment_max_age: float,
+        precision: str | None = None,
+    ) -> None:
+        """Initialize the spool."""
+        self.directory = directory
+        self.max_size = max_size
+        self.segment_size = segment_size
+        self.segment_max_age = segment_max_age
+        self.precision = precision
+        self.size = 0
+        self.points = 0
+        self.dropped = 0
+        self.written = 0
+        self._lock = threading.Lock()
+        self._segments: deque[SpoolSegment] = deque()
+        self._active: SpoolSegment | None = None
+        self._file: BinaryIO | None = None
+        self._next_sequence = 0
+
+    def load(self) -> None:
+        """Load the segments left by a previous run."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments: list[SpoolSegment] = []
+        for path in self.directory.glob(f"*{SEGMENT_SUFFIX}"):
+            if not path.stem.isdigit():
+                continue
+            data = path.read_bytes()
+            segments.append(
+                SpoolSegment(int(path.stem), path, len(data), data.count(b"\n"))
+            )
+        segments.sort(key=attrgetter("sequence"))
+        with self._lock:
+            self._segments.extend(segments)
+            for segment in segments:
+                self.size += segment.size
+                self.points += segment.points
+            if segments:
+                self._next_sequence = segments[-1].sequence + 1
+
+    def append_points(self, points: list[dict[str, Any]]) -> None:
+        """Append a batch of points in the json format of the client."""
+        precision = _LINE_PROTOCOL_PRECISION.get(self.precision or "ns")
+        data = make_lines({"points": points}, precision).encode()
+        with self._lock:
+            if (active := self._active) is None or active.size >= self.segment_size:
+                active = self._start_segment()
+            assert self._file is not None
+            self._file.write(data)
+            self._file.flush()
+            active.size += len(data)
+            active.points += len(points)
+            self.size += len(data)
+            self.points += len(points)
+            dropped = self._drop_oldest()
+        if dropped:
+            _LOGGER.warning(SPOOL_FULL_MESSAGE, dropped)
+
+    def take(self, limit: int) -> list[SpoolSegment]:
+        """Take the oldest segments for draining.
+
+        The newest segment is sealed once it is full or reached the
+        maximum segment age so it can be drained as well and the next
+        batch starts a new segment. Until then it is not taken.
+        """
+        with self._lock:
+            if (active := self._active) is not None and (
+                active.size >= self.segment_size
+                or time.monotonic() - active.started >= self.segment_max_age
+            ):
+                self._seal()
+            segments: list[SpoolSegment] = []
+            for segment in self._segments:
+                if len(segments) == limit:
+                    break
+                if not segment.draining and segment is not self._active:
+                    segment.draining = True
+                    segments.append(segment)
+            return segments
+
+    @staticmethod
+    def read_compressed(segment: SpoolSegment) -> bytes:
+        """Return the gzip compressed lines of a segment taken for draining."""
+        return gzip.compress(
+            segment.path.read_bytes(), compresslevel=SPOOL_COMPRESS_LEVEL
+        )
+
+    def complete(self, segment: SpoolSegment, written: bool) -> None:
+        """Remove a drained segment."""
+        with self._lock:
+            if segment in self._segments:
+                self._remove(segment)
+                if written:
+                    self.written += segment.points
+
+    def release(self, segment: SpoolSegment) -> None:
+        """Release a segment which failed to drain so it is drained later."""
+        with self._lock:
+            segment.draining = False
+
+    def close(self) -> None:
+        """Close the newest segment."""
+        with self._lock:
+            self._seal()
+
+    def _start_segment(self) -> SpoolSegment:
+        """Seal the newest segment and start a new one."""
+        self._seal()
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        active = self._active = SpoolSegment(
+            sequence,
+            self.directory / f"{sequence:012d}{SEGMENT_SUFFIX}",
+            started=time.monotonic(),
+        )
+        self._segments.append(active)
+        self._file = active.path.open("ab")
+        return active
+
+    def _seal(self) -> None:
+        """Close the file of the newest segment."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._active = None
+
+    def _drop_oldest(self) -> int:
+        """Drop the oldest segments until the spool fits its maximum size."""
+        dropped = 0
+        while self.size > self.max_size:
+            for segment in self._segments:
+                if not segment.draining and segment is not self._active:
+                    break
+            else:
+                break
+            self._remove(segment)
+            self.dropped += segment.points
+            dropped += segment.points
+        return dropped
+
+    def _remove(self, segment: SpoolSegment) -> None:
+        """Remove a segment and its file."""
+        self._segments.remove(segment)
+        self.size -= segment.size
+        self.points -= segment.points
+        segment.path.unlink(missing_ok=True)
+
+
+@dataclass(slots=True)
+class SpoolWriteRequest:
+    """The HTTP request writing line protocol to InfluxDB."""
+
+    url: str
+    params: dict[str, str]
+    headers: dict[str, str]
+    client_error: str
+
+
+def get_spool_write_request(conf: dict[str, Any]) -> SpoolWriteRequest:
+    """Return the write request of the HTTP API for the API version."""
+    headers: dict[str, str] = {
+        aiohttp.hdrs.CONTENT_ENCODING: "gzip",
+        aiohttp.hdrs.CONTENT_TYPE: "text/plain; charset=utf-8",
+    }
+    precision = conf.get(CONF_PRECISION)
+
+    if conf[CONF_API_VERSION] == API_VERSION_2:
+        params = {"org": conf[CONF_ORG], "bucket": conf[CONF_BUCKET]}
+        if precision is not None:
+            params["precision"] = precision
+        headers[aiohttp.hdrs.AUTHORIZATION] = f"Token {conf[CONF_TOKEN]}"
+        return SpoolWriteRequest(
+            f"{conf[CONF_URL]}/api/v2/write", params, headers, CLIENT_ERROR_V2
+        )
+
+    scheme = "https" if conf.get(CONF_SSL) else "http"
+    path = conf.get(CONF_PATH, "")
+    if path and not path.startswith("/"):
+        path = f"/{path}"
+    url = (
+        f"{scheme}://{conf.get(CONF_HOST, 'localhost')}:{conf.get(CONF_PORT, 8086)}"
+        f"{path}/write"
+    )
+    params = {"db": conf[CONF_DB_NAME]}
+    if precision is not None:
+        params["precision"] = _LINE_PROTOCOL_PRECISION[precision]
+    if CONF_USERNAME in conf:
+        params["u"] = conf[CONF_USERNAME]
+        params["p"] = conf[CONF_PASSWORD]
+    return SpoolWriteRequest(url, params, headers, CLIENT_ERROR_V1)
+
+
+class InfluxSpoolDrainer:
+    """Drain the spool to InfluxDB with compressed bulk writes.
+
+    Each segment is written with a single gzip compressed request and
+    up to concurrency requests are in flight at a time. Segments are
+    only removed once InfluxDB accepted them so a segment which is
+    written again after a failure is not lost, InfluxDB overwrites
+    points with the same series and timestamp.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        spool: InfluxSpool,
+        request: SpoolWriteRequest,
+        concurrency: int,
+        verify_ssl: bool = True,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        """Initialize the drainer."""
+        self.hass = hass
+        self.spool = spool
+        self.request = request
+        self.concurrency = concurrency
+        self.verify_ssl = verify_ssl
+        self._session: aiohttp.ClientSession | None = None
+        self._ssl_context = ssl_context
+        self._draining = False
+        self._failing = False
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start draining the spool periodically."""
+        self._session = async_get_clientsession(self.hass, self.verify_ssl)
+        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self.async_stop)
+        self._async_track_drain()
+
+    @callback
+    def async_stop(self, event: Event | None = None) -> None:
+        """Stop draining the spool."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_track_drain(self) -> None:
+        """Drain the spool at the drain interval."""
+        self._unsub = async_track_time_interval(
+            self.hass,
+            self._async_drain_interval,
+            SPOOL_DRAIN_INTERVAL,
+            name="influxdb spool drain",
+        )
+
+    @callback
+    def _async_drain_interval(self, now: datetime) -> None:
+        """Drain the spool unless a drain is running."""
+        if self._draining:
+            return
+        self.hass.async_create_background_task(
+            self.async_drain(), "influxdb spool drain", eager_start=True
+        )
+
+    @callback
+    def _async_retry(self, now: datetime) -> None:
+        """Resume draining the spool after a failed write."""
+        self._async_track_drain()
+        self._async_drain_interval(now)
+
+    async def async_drain(self) -> bool:
+        """Write the spool to InfluxDB until it is empty.
+
+        When InfluxDB could not be reached the spool is drained again
+        after the retry delay and False is returned.
+        """
+        if self._draining:
+            return True
+        self._draining = True
+        try:
+            while segments := await self.hass.async_add_executor_job(
+                self.spool.take, self.concurrency
+            ):
+                results = await asyncio.gather(
+                    *(
+                        create_eager_task(self._async_write_segment(segment))
+                        for segment in segments
+                    )
+                )
+                if not all(results):
+                    if self._unsub is not None:
+                        self._unsub()
+                        self._unsub = async_call_later(
+                            self.hass, RETRY_DELAY, self._async_retry
+                        )
+                    return False
+        finally:
+            self._draining = False
+        if self._failing:
+            self._failing = False
+            _LOGGER.warning(SPOOL_RESUMED_MESSAGE)
+        return True
+
+    async def _async_write_segment(self, segment: SpoolSegment) -> bool:
+        """Write a segment to InfluxDB and remove it once it is written."""
+        hass = self.hass
+        request = self.request
+        assert self._session is not None
+        data = await hass.async_add_executor_job(self.spool.read_compressed, segment)
+        kwargs: dict[str, Any] = {}
+        if self._ssl_context is not None:
+            kwargs["ssl"] = self._ssl_context
+        try:
+            async with self._session.post(
+                request.url,
+                params=request.params,
+                headers=request.headers,
+                data=data,
+                timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+                **kwargs,
+            ) as response:
+                if response.status == CODE_INVALID_INPUTS:
+                    # Resending the segment can not fix invalid lines
+                    _LOGGER.error(WRITE_ERROR, segment.path.name, await response.text())
+                    await hass.async_add_executor_job(
+                        self.spool.complete, segment, False
+                    )
+                    return True
+                if response.status >= 500:
+                    error = CONNECTION_ERROR % await response.text()
+                    return await self._async_write_failed(segment, error)
+                if response.status >= 300:
+                    error = request.client_error % await response.text()
+                    return await self._async_write_failed(segment, error)
+        except (aiohttp.ClientError, TimeoutError) as err:
+            return await self._async_write_failed(segment, CONNECTION_ERROR % err)
+        await hass.async_add_executor_job(self.spool.complete, segment, True)
+        return True
+
+    async def _async_write_failed(self, segment: SpoolSegment, error: str) -> bool:
+        """Keep a segment which failed to write in the spool."""
+        if not self._failing:
+            self._failing = True
+            _LOGGER.error(SPOOL_RETRY_MESSAGE, error)
+        await self.hass.async_add_executor_job(self.spool.release, segment)
+        return False
@@ -64,7 +64,7 @@ from .const import (
 )
 from .helpers import is_sensor_continuous
 from .models import EventAsRow, LazyEventPartialState, LogbookConfig, async_event_to_row
-from .queries import statement_for_request
+from .queries import statement_for_logbook_index_start, statement_for_request
 from .queries.common import PSEUDO_EVENT_STATE_CHANGED
 
 _LOGGER = logging.getLogger(__name__)
@@ -158,6 +158,15 @@ class EventProcessor:
                     instance.event_type_manager.get_many(self.event_types, session)
                 )
             )
+            use_logbook_index = instance.logbook_index and (
+                (
+                    logbook_index_start := session.execute(
+                        statement_for_logbook_index_start()
+                    ).scalar()
+                )
+                is not None
+                and logbook_index_start <= start_day.timestamp()
+            )
             stmt = statement_for_request(
                 start_day,
                 end_day,
@@ -167,6 +176,7 @@ class EventProcessor:
                 self.device_ids,
                 self.filters,
                 self.context_id,
+                use_logbook_index=use_logbook_index,
             )
             return self.humanify(
                 execute_stmt_lambda_element(session, stmt, orm_rows=False)
@@ -5,8 +5,10 @@ from __future__ import annotations
 from collections.abc import Collection
 from datetime import datetime as dt
 
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
+from homeassistant.components.recorder.db_schema import LogbookIndex
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import ulid_to_bytes_or_none
 from homeassistant.helpers.json import json_dumps
@@ -17,6 +19,15 @@ from .entities import entities_stmt
 from .entities_and_devices import entities_devices_stmt
 
 
+def statement_for_logbook_index_start() -> StatementLambdaElement:
+    """Generate the statement for the oldest state change in the logbook index.
+
+    The index is complete from its oldest row as the recorder clears
+    it when it runs without maintaining it.
+    """
+    return lambda_stmt(lambda: select(func.min(LogbookIndex.time_ts)))
+
+
 def statement_for_request(
     start_day_dt: dt,
     end_day_dt: dt,
@@ -26,8 +37,13 @@ def statement_for_request(
     device_ids: list[str] | None = None,
     filters: Filters | None = None,
     context_id: str | None = None,
+    use_logbook_index: bool = False,
 ) -> StatementLambdaElement:
-    """Generate the logbook statement for a logbook request."""
+    """Generate the logbook statement for a logbook request.
+
+    With use_logbook_index the state changes are read from the
+    logbook index the recorder maintains instead of the states.
+    """
     start_day = start_day_dt.timestamp()
     end_day = end_day_dt.timestamp()
     # No entities: logbook sends everything for the timeframe
@@ -40,6 +56,7 @@ def statement_for_request(
             event_type_ids,
             filters,
             context_id_bin,
+            use_logbook_index,
         )
 
     # sqlalchemy caches object quoting, the
@@ -56,6 +73,7 @@ def statement_for_request(
             states_metadata_ids or [],
             [json_dumps(entity_id) for entity_id in entity_ids],
             [json_dumps(device_id) for device_id in device_ids],
+            use_logbook_index,
         )
 
     # entities: logbook sends everything for the timeframe for the entities
@@ -66,6 +84,7 @@ def statement_for_request(
             event_type_ids,
             states_metadata_ids or [],
             [json_dumps(entity_id) for entity_id in entity_ids],
+            use_logbook_index,
         )
 
     # devices: logbook sends everything for the timeframe for the devices
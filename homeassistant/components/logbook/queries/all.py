@@ -9,11 +9,17 @@ from sqlalchemy.sql.selectable import Select
 from homeassistant.components.recorder.db_schema import (
     LAST_UPDATED_INDEX_TS,
     Events,
+    LogbookIndex,
     States,
 )
 from homeassistant.components.recorder.filters import Filters
 
-from .common import apply_states_filters, select_events_without_states, select_states
+from .common import (
+    apply_states_filters,
+    select_events_without_states,
+    select_logbook_index_states,
+    select_states,
+)
 
 
 def all_stmt(
@@ -22,12 +28,37 @@ def all_stmt(
     event_type_ids: tuple[int, ...],
     filters: Filters | None,
     context_id_bin: bytes | None = None,
+    use_logbook_index: bool = False,
 ) -> StatementLambdaElement:
     """Generate a logbook query for all entities."""
     stmt = lambda_stmt(
         lambda: select_events_without_states(start_day, end_day, event_type_ids)
     )
-    if context_id_bin is not None:
+    if use_logbook_index:
+        # Each branch has its own lambda so the cached
+        # statements of the index and the states differ
+        if context_id_bin is not None:
+            stmt += lambda s: s.where(
+                Events.context_id_bin == context_id_bin
+            ).union_all(
+                select_logbook_index_states(start_day, end_day).where(
+                    LogbookIndex.context_id_bin == context_id_bin
+                )
+            )
+        elif filters and filters.has_config:
+            stmt = stmt.add_criteria(
+                lambda q: q.filter(filters.events_entity_filter()).union_all(
+                    select_logbook_index_states(start_day, end_day).where(
+                        filters.states_metadata_entity_filter()
+                    )
+                ),
+                track_on=[filters],
+            )
+        else:
+            stmt += lambda s: s.union_all(
+                select_logbook_index_states(start_day, end_day)
+            )
+    elif context_id_bin is not None:
         stmt += lambda s: s.where(Events.context_id_bin == context_id_bin).union_all(
             _states_query_for_context_id(start_day, end_day, context_id_bin),
         )
@@ -20,6 +20,7 @@ from homeassistant.components.recorder.db_schema import (
     EventData,
     Events,
     EventTypes,
+    LogbookIndex,
     StateAttributes,
     States,
     StatesMeta,
@@ -89,6 +90,24 @@ EVENT_COLUMNS_FOR_STATE_SELECT = (
     States.context_parent_id_bin.label("context_parent_id_bin"),
 )
 
+EVENT_COLUMNS_FOR_LOGBOOK_INDEX_SELECT = (
+    LogbookIndex.state_id.label("row_id"),
+    literal(value=PSEUDO_EVENT_STATE_CHANGED, type_=sqlalchemy.String).label(
+        "event_type"
+    ),
+    literal(value=None, type_=sqlalchemy.Text).label("event_data"),
+    LogbookIndex.time_ts.label("time_fired_ts"),
+    LogbookIndex.context_id_bin.label("context_id_bin"),
+    LogbookIndex.context_user_id_bin.label("context_user_id_bin"),
+    LogbookIndex.context_parent_id_bin.label("context_parent_id_bin"),
+)
+
+LOGBOOK_INDEX_STATE_COLUMNS = (
+    LogbookIndex.state.label("state"),
+    StatesMeta.entity_id.label("entity_id"),
+    LogbookIndex.icon.label("icon"),
+)
+
 EMPTY_STATE_COLUMNS = (
     literal(value=None, type_=sqlalchemy.String).label("state"),
     literal(value=None, type_=sqlalchemy.String).label("entity_id"),
@@ -189,6 +208,24 @@ def apply_states_filters(sel: Select, start_day: float, end_day: float) -> Selec
     )
 
 
+def select_logbook_index_states(start_day: float, end_day: float) -> Select:
+    """Generate a select that formats the logbook index as event rows.
+
+    The recorder only writes the state changes the logbook shows to
+    the index so they do not have to be filtered by joining the old
+    states and the attributes.
+    """
+    return (
+        select(
+            *EVENT_COLUMNS_FOR_LOGBOOK_INDEX_SELECT,
+            *LOGBOOK_INDEX_STATE_COLUMNS,
+            NOT_CONTEXT_ONLY,
+        )
+        .filter((LogbookIndex.time_ts > start_day) & (LogbookIndex.time_ts < end_day))
+        .outerjoin(StatesMeta, (LogbookIndex.metadata_id == StatesMeta.metadata_id))
+    )
+
+
 def _missing_state_matcher() -> ColumnElement[bool]:
     # The below removes state change events that do not have
     # and old_state or the old_state is missing (newly added entities)
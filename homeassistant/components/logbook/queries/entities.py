@@ -17,6 +17,7 @@ from homeassistant.components.recorder.db_schema import (
     EventData,
     Events,
     EventTypes,
+    LogbookIndex,
     States,
     StatesMeta,
 )
@@ -28,6 +29,7 @@ from .common import (
     select_events_context_id_subquery,
     select_events_context_only,
     select_events_without_states,
+    select_logbook_index_states,
     select_states,
     select_states_context_only,
 )
@@ -56,6 +58,7 @@ def _select_entities_context_ids_sub_query(
 
 def _apply_entities_context_union(
     sel: Select,
+    states_sel: Select,
     start_day: float,
     end_day: float,
     event_type_ids: tuple[int, ...],
@@ -76,7 +79,7 @@ def _apply_entities_context_union(
     # in the python code anyways since they will have context_only
     # set on them the impact is minimal.
     return sel.union_all(
-        states_select_for_entity_ids(start_day, end_day, states_metadata_ids),
+        states_sel,
         apply_events_context_hints(
             select_events_context_only()
             .select_from(entities_cte)
@@ -99,13 +102,31 @@ def entities_stmt(
     event_type_ids: tuple[int, ...],
     states_metadata_ids: Collection[int],
     json_quoted_entity_ids: list[str],
+    use_logbook_index: bool = False,
 ) -> StatementLambdaElement:
     """Generate a logbook query for multiple entities."""
+    if use_logbook_index:
+        return lambda_stmt(
+            lambda: _apply_entities_context_union(
+                select_events_without_states(start_day, end_day, event_type_ids).where(
+                    apply_event_entity_id_matchers(json_quoted_entity_ids)
+                ),
+                logbook_index_select_for_entity_ids(
+                    start_day, end_day, states_metadata_ids
+                ),
+                start_day,
+                end_day,
+                event_type_ids,
+                states_metadata_ids,
+                json_quoted_entity_ids,
+            ).order_by(Events.time_fired_ts)
+        )
     return lambda_stmt(
         lambda: _apply_entities_context_union(
             select_events_without_states(start_day, end_day, event_type_ids).where(
                 apply_event_entity_id_matchers(json_quoted_entity_ids)
             ),
+            states_select_for_entity_ids(start_day, end_day, states_metadata_ids),
             start_day,
             end_day,
             event_type_ids,
@@ -124,6 +145,15 @@ def states_select_for_entity_ids(
     ).where(States.metadata_id.in_(states_metadata_ids))
 
 
+def logbook_index_select_for_entity_ids(
+    start_day: float, end_day: float, states_metadata_ids: Collection[int]
+) -> Select:
+    """Generate a select for states from the LogbookIndex table for specific entities."""
+    return select_logbook_index_states(start_day, end_day).where(
+        LogbookIndex.metadata_id.in_(states_metadata_ids)
+    )
+
+
 def apply_event_entity_id_matchers(
     json_quoted_entity_ids: Iterable[str],
 ) -> ColumnElement[bool]:
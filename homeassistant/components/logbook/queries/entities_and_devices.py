@@ -29,6 +29,7 @@ from .devices import apply_event_device_id_matchers
 from .entities import (
     apply_entities_hints,
     apply_event_entity_id_matchers,
+    logbook_index_select_for_entity_ids,
     states_select_for_entity_ids,
 )
 
@@ -59,6 +60,7 @@ def _select_entities_device_id_context_ids_sub_query(
 
 def _apply_entities_devices_context_union(
     sel: Select,
+    states_sel: Select,
     start_day: float,
     end_day: float,
     event_type_ids: tuple[int, ...],
@@ -80,7 +82,7 @@ def _apply_entities_devices_context_union(
     # in the python code anyways since they will have context_only
     # set on them the impact is minimal.
     return sel.union_all(
-        states_select_for_entity_ids(start_day, end_day, states_metadata_ids),
+        states_sel,
         apply_events_context_hints(
             select_events_context_only()
             .select_from(devices_entities_cte)
@@ -108,8 +110,28 @@ def entities_devices_stmt(
     states_metadata_ids: Collection[int],
     json_quoted_entity_ids: list[str],
     json_quoted_device_ids: list[str],
+    use_logbook_index: bool = False,
 ) -> StatementLambdaElement:
     """Generate a logbook query for multiple entities."""
+    if use_logbook_index:
+        return lambda_stmt(
+            lambda: _apply_entities_devices_context_union(
+                select_events_without_states(start_day, end_day, event_type_ids).where(
+                    _apply_event_entity_id_device_id_matchers(
+                        json_quoted_entity_ids, json_quoted_device_ids
+                    )
+                ),
+                logbook_index_select_for_entity_ids(
+                    start_day, end_day, states_metadata_ids
+                ),
+                start_day,
+                end_day,
+                event_type_ids,
+                states_metadata_ids,
+                json_quoted_entity_ids,
+                json_quoted_device_ids,
+            ).order_by(Events.time_fired_ts)
+        )
     return lambda_stmt(
         lambda: _apply_entities_devices_context_union(
             select_events_without_states(start_day, end_day, event_type_ids).where(
@@ -117,6 +139,7 @@ def entities_devices_stmt(
                     json_quoted_entity_ids, json_quoted_device_ids
                 )
             ),
+            states_select_for_entity_ids(start_day, end_day, states_metadata_ids),
             start_day,
             end_day,
             event_type_ids,
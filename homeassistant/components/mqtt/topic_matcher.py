@@ -0,0 +1,208 @@
+"""Match MQTT topics against subscription topic filters."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterator
+
+from lru import LRU
+
+# The number of topics to remember the matching items for
+#
+# Based on:
+# - The number of distinct topics large installs receive messages on
+# - How much memory our low end hardware has
+MATCH_CACHE_SIZE = 8192
+
+MULTI_LEVEL_WILDCARD = "#"
+SINGLE_LEVEL_WILDCARD = "+"
+_WILDCARDS = {MULTI_LEVEL_WILDCARD, SINGLE_LEVEL_WILDCARD}
+
+
+class _TopicNode[_T]:
+    """A topic level of the wildcard topic filter trie."""
+
+    __slots__ = ("children", "items")
+
+    def __init__(self) -> None:
+        """Initialize the topic level."""
+        self.children: dict[str, _TopicNode[_T]] = {}
+        self.items: set[_T] = set()
+
+
+class TopicMatcher[_T]:
+    """Match topics against topic filters.
+
+    Topic filters without wildcards are kept in a dict. Topic filters
+    with + and # wildcards are kept in a trie with one node per topic
+    level so a topic is matched against all of them in a single walk.
+
+    Match results are kept in a bounded LRU cache. When a topic filter
+    changes only the cached topics it can match are invalidated.
+    """
+
+    def __init__(self, cache_size: int = MATCH_CACHE_SIZE) -> None:
+        """Initialize the topic matcher."""
+        self._simple: dict[str, set[_T]] = {}
+        self._root: _TopicNode[_T] = _TopicNode()
+        self._cache: LRU[str, list[_T]] = LRU(cache_size, callback=self._evicted)
+        # The cached topics by their first topic level
+        self._cached_topics: defaultdict[str, set[str]] = defaultdict(set)
+
+    def __contains__(self, topic_filter: str) -> bool:
+        """Return if any item is added with the topic filter."""
+        if topic_filter in self._simple:
+            return True
+        if (node := self._find_node(topic_filter)) is None:
+            return False
+        return bool(node.items)
+
+    def __iter__(self) -> Iterator[_T]:
+        """Iterate over all added items."""
+        for items in self._simple.values():
+            yield from items
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            yield from node.items
+            nodes.extend(node.children.values())
+
+    def add(self, topic_filter: str, item: _T) -> None:
+        """Add an item for a topic filter."""
+        if not is_wildcard_topic_filter(topic_filter):
+            self._simple.setdefault(topic_filter, set()).add(item)
+            self._invalidate_topic(topic_filter)
+            return
+        node = self._root
+        for level in topic_filter.split("/"):
+            if (child := node.children.get(level)) is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        node.items.add(item)
+        self._invalidate_topic_filter(topic_filter)
+
+    def remove(self, topic_filter: str, item: _T) -> None:
+        """Remove an item for a topic filter.
+
+        Raises KeyError if the item was not added for the topic filter.
+        """
+        if not is_wildcard_topic_filter(topic_filter):
+            simple = self._simple
+            items = simple[topic_filter]
+            items.remove(item)
+            if not items:
+                del simple[topic_filter]
+            self._invalidate_topic(topic_filter)
+            return
+        path: list[tuple[_TopicNode[_T], str]] = []
+        node = self._root
+        for level in topic_filter.split("/"):
+            path.append((node, level))
+            node = node.children[level]
+        node.items.remove(item)
+        # Prune the levels that no longer lead to any topic filter
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.items or child.children:
+                break
+            del parent.children[level]
+        self._invalidate_topic_filter(topic_filter)
+
+    def match(self, topic: str) -> list[_T]:
+        """Return the items with a topic filter that matches the topic.
+
+        The returned list is cached and must not be modified.
+        """
+        if (matches := self._cache.get(topic)) is not None:
+            return matches
+        matches = list(self._simple.get(topic, ()))
+        if self._root.children:
+            self._match_wildcards(topic, matches)
+        self._cache[topic] = matches
+        self._cached_topics[topic.partition("/")[0]].add(topic)
+        return matches
+
+    def _match_wildcards(self, topic: str, matches: list[_T]) -> None:
+        """Add the items with a wildcard topic filter that matches the topic."""
+        levels = topic.split("/")
+        last = len(levels)
+        # Wildcards in the first level do not match topics
+        # that start with $ such as $SYS/broker/uptime
+        first_level_wildcards = not topic.startswith("$")
+        nodes: list[tuple[_TopicNode[_T], int]] = [(self._root, 0)]
+        while nodes:
+            node, idx = nodes.pop()
+            children = node.children
+            wildcards = idx > 0 or first_level_wildcards
+            # # also matches the parent level so sport/# matches sport
+            if wildcards and (multi := children.get(MULTI_LEVEL_WILDCARD)):
+                matches.extend(multi.items)
+            if idx == last:
+                matches.extend(node.items)
+                continue
+            level = levels[idx]
+            if wildcards and (single := children.get(SINGLE_LEVEL_WILDCARD)):
+                nodes.append((single, idx + 1))
+            # A wildcard in the topic itself is only matched by the
+            # wildcard branches above so items are not matched twice
+            if level not in _WILDCARDS and (child := children.get(level)):
+                nodes.append((child, idx + 1))
+
+    def _find_node(self, topic_filter: str) -> _TopicNode[_T] | None:
+        """Return the trie node of a topic filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            if (child := node.children.get(level)) is None:
+                return None
+            node = child
+        return node
+
+    def _evicted(self, topic: str, matches: list[_T]) -> None:
+        """Forget a topic that was evicted from the match cache."""
+        self._forget_cached_topic(topic)
+
+    def _forget_cached_topic(self, topic: str) -> None:
+        """Remove a topic from the cached topics index."""
+        first_level = topic.partition("/")[0]
+        cached_topics = self._cached_topics[first_level]
+        cached_topics.discard(topic)
+        if not cached_topics:
+            del self._cached_topics[first_level]
+
+    def _invalidate_topic(self, topic: str) -> None:
+        """Invalidate the cached match of a single topic."""
+        if self._cache.pop(topic, None) is not None:
+            self._forget_cached_topic(topic)
+
+    def _invalidate_topic_filter(self, topic_filter: str) -> None:
+        """Invalidate the cached matches of the subtree a topic filter covers."""
+        levels = topic_filter.split("/")
+        first_level = levels[0]
+        if first_level in _WILDCARDS:
+            self._cache.clear()
+            self._cached_topics.clear()
+            return
+        if not (cached_topics := self._cached_topics.get(first_level)):
+            return
+        prefix_levels: list[str] = []
+        for level in levels:
+            if level in _WILDCARDS:
+                break
+            prefix_levels.append(level)
+        prefix = "/".join(prefix_levels)
+        sub_prefix = f"{prefix}/"
+        cache = self._cache
+        for topic in [
+            topic
+            for topic in cached_topics
+            if topic == prefix or topic.startswith(sub_prefix)
+        ]:
+            cached_topics.remove(topic)
+            del cache[topic]
+        if not cached_topics:
+            del self._cached_topics[first_level]
+
+
+def is_wildcard_topic_filter(topic_filter: str) -> bool:
+    """Return if a topic filter contains a wildcard."""
+    return SINGLE_LEVEL_WILDCARD in topic_filter or MULTI_LEVEL_WILDCARD in topic_filter
@@ -19,14 +19,17 @@ import voluptuous as vol
 
 from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE, Platform
 from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util.loop_accounting import LoopAccounting
 
-from .const import DOMAIN
+from . import websocket_api
+from .const import DOMAIN, LOOP_ACCOUNTING_COORDINATOR
+from .coordinator import LoopAccountingCoordinator
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -40,6 +43,8 @@ SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
 SERVICE_SET_ASYNCIO_DEBUG = "set_asyncio_debug"
 SERVICE_LOG_CURRENT_TASKS = "log_current_tasks"
+SERVICE_START_LOOP_ACCOUNTING = "start_loop_accounting"
+SERVICE_STOP_LOOP_ACCOUNTING = "stop_loop_accounting"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -63,8 +68,12 @@ SERVICES = (
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_LOG_CURRENT_TASKS,
+    SERVICE_START_LOOP_ACCOUNTING,
+    SERVICE_STOP_LOOP_ACCOUNTING,
 )
 
+PLATFORMS = [Platform.SENSOR]
+
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 DEFAULT_MAX_OBJECTS = 5
@@ -85,6 +94,9 @@ async def async_setup_entry(  # noqa: C901
     """Set up Profiler from a config entry."""
     lock = asyncio.Lock()
     domain_data = hass.data[DOMAIN] = {}
+    coordinator = domain_data[LOOP_ACCOUNTING_COORDINATOR] = LoopAccountingCoordinator(
+        hass
+    )
 
     async def _async_run_profile(call: ServiceCall) -> None:
         async with lock:
@@ -273,6 +285,20 @@ async def async_setup_entry(  # noqa: C901
             base_logger.setLevel(logging.INFO)
         hass.loop.set_debug(enabled)
 
+    async def _async_start_loop_accounting(call: ServiceCall) -> None:
+        """Start accounting the time spent in the event loop."""
+        if hass.loop_accounting is not None:
+            raise HomeAssistantError("Loop accounting already started")
+        hass.loop_accounting = LoopAccounting()
+        await coordinator.async_refresh()
+
+    async def _async_stop_loop_accounting(call: ServiceCall) -> None:
+        """Stop accounting the time spent in the event loop."""
+        if hass.loop_accounting is None:
+            raise HomeAssistantError("Loop accounting not running")
+        hass.loop_accounting = None
+        await coordinator.async_refresh()
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -382,13 +408,34 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_current_tasks,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_LOOP_ACCOUNTING,
+        _async_start_loop_accounting,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_LOOP_ACCOUNTING,
+        _async_stop_loop_accounting,
+    )
+
+    websocket_api.async_setup(hass)
+    await coordinator.async_config_entry_first_refresh()
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
     for service in SERVICES:
         hass.services.async_remove(domain=DOMAIN, service=service)
+    hass.loop_accounting = None
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
     hass.data.pop(DOMAIN)
@@ -2,3 +2,5 @@
 
 DOMAIN = "profiler"
 DEFAULT_NAME = "Profiler"
+
+LOOP_ACCOUNTING_COORDINATOR = "loop_accounting_coordinator"
@@ -0,0 +1,85 @@
+"""Coordinator for the event loop accounting of the profiler."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util.loop_accounting import LoopAccounting, LoopStats
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATE_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(slots=True)
+class LoopAccountingData:
+    """Event loop time accounted since the previous update."""
+
+    busy: float
+    domains: dict[str, float]
+    event_types: dict[str, float]
+
+
+def _sorted_deltas(
+    stats: dict[str, LoopStats], previous_totals: dict[str, float]
+) -> tuple[dict[str, float], dict[str, float]]:
+    """Return the totals and the time since the previous totals, slowest first."""
+    totals = {key: key_stats.total for key, key_stats in stats.items()}
+    deltas = {
+        key: delta
+        for key, total in totals.items()
+        if (delta := total - previous_totals.get(key, 0.0)) > 0
+    }
+    return totals, dict(sorted(deltas.items(), key=lambda item: -item[1]))
+
+
+class LoopAccountingCoordinator(DataUpdateCoordinator[LoopAccountingData | None]):
+    """Summarize the event loop accounting over each update interval."""
+
+    config_entry: ConfigEntry
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="Profiler loop accounting",
+            update_interval=UPDATE_INTERVAL,
+        )
+        self._accounting: LoopAccounting | None = None
+        self._updated = 0.0
+        self._domain_totals: dict[str, float] = {}
+        self._event_type_totals: dict[str, float] = {}
+
+    async def _async_update_data(self) -> LoopAccountingData | None:
+        """Return the loop time accounted since the previous update."""
+        if (accounting := self.hass.loop_accounting) is None:
+            self._accounting = None
+            return None
+        if accounting is not self._accounting:
+            self._accounting = accounting
+            self._updated = accounting.started
+            self._domain_totals = {}
+            self._event_type_totals = {}
+        now = time.monotonic()
+        self._domain_totals, domains = _sorted_deltas(
+            accounting.domains, self._domain_totals
+        )
+        self._event_type_totals, event_types = _sorted_deltas(
+            accounting.event_types, self._event_type_totals
+        )
+        interval = now - self._updated
+        self._updated = now
+        return LoopAccountingData(
+            busy=min(100.0, sum(domains.values()) / interval * 100)
+            if interval > 0
+            else 0.0,
+            domains=domains,
+            event_types=event_types,
+        )
@@ -0,0 +1,121 @@
+"""Sensors for the event loop accounting of the profiler."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, LOOP_ACCOUNTING_COORDINATOR
+from .coordinator import LoopAccountingCoordinator, LoopAccountingData
+
+MAX_LISTED = 10
+
+
+def _slowest(times: dict[str, float]) -> str | None:
+    """Return the key that used the most loop time."""
+    return next(iter(times), None)
+
+
+def _listed_times(times: dict[str, float]) -> dict[str, Any]:
+    """Return the loop time in milliseconds of the keys that used the most."""
+    return {
+        key: round(seconds * 1000, 3)
+        for key, seconds in islice(times.items(), MAX_LISTED)
+    }
+
+
+@dataclass(frozen=True, kw_only=True)
+class LoopAccountingSensorEntityDescription(SensorEntityDescription):
+    """Describes a loop accounting sensor."""
+
+    value_fn: Callable[[LoopAccountingData], float | str | None]
+    attributes_fn: Callable[[LoopAccountingData], dict[str, Any]] | None = None
+
+
+SENSORS: tuple[LoopAccountingSensorEntityDescription, ...] = (
+    LoopAccountingSensorEntityDescription(
+        key="loop_busy",
+        translation_key="loop_busy",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda data: data.busy,
+    ),
+    LoopAccountingSensorEntityDescription(
+        key="busiest_integration",
+        translation_key="busiest_integration",
+        value_fn=lambda data: _slowest(data.domains),
+        attributes_fn=lambda data: {"loop_time_ms": _listed_times(data.domains)},
+    ),
+    LoopAccountingSensorEntityDescription(
+        key="busiest_event_type",
+        translation_key="busiest_event_type",
+        value_fn=lambda data: _slowest(data.event_types),
+        attributes_fn=lambda data: {"loop_time_ms": _listed_times(data.event_types)},
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the loop accounting sensors."""
+    coordinator: LoopAccountingCoordinator = hass.data[DOMAIN][
+        LOOP_ACCOUNTING_COORDINATOR
+    ]
+    async_add_entities(
+        LoopAccountingSensor(coordinator, entry, description) for description in SENSORS
+    )
+
+
+class LoopAccountingSensor(CoordinatorEntity[LoopAccountingCoordinator], SensorEntity):
+    """A sensor summarizing the event loop accounting."""
+
+    entity_description: LoopAccountingSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: LoopAccountingCoordinator,
+        entry: ConfigEntry,
+        description: LoopAccountingSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Return if the loop accounting is running."""
+        return super().available and self.coordinator.data is not None
+
+    @property
+    def native_value(self) -> float | str | None:
+        """Return the state of the sensor."""
+        if (data := self.coordinator.data) is None:
+            return None
+        return self.entity_description.value_fn(data)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the loop time of the integrations or event types."""
+        if (data := self.coordinator.data) is None or (
+            attributes_fn := self.entity_description.attributes_fn
+        ) is None:
+            return None
+        return attributes_fn(data)
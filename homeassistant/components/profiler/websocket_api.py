@@ -0,0 +1,29 @@
+"""The profiler websocket API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Set up the profiler websocket API."""
+    websocket_api.async_register_command(hass, ws_loop_accounting)
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command({"type": "profiler/loop_accounting"})
+@callback
+def ws_loop_accounting(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the event loop time accounted per integration and event type."""
+    if (accounting := hass.loop_accounting) is None:
+        connection.send_error(
+            msg["id"], "not_running", "Loop accounting is not running"
+        )
+        return
+    connection.send_result(msg["id"], accounting.as_dict())
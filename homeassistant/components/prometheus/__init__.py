@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
 from contextlib import suppress
+from dataclasses import dataclass, field
 import logging
 import string
 from typing import Any, cast
@@ -60,7 +62,13 @@ from homeassistant.const import (
     STATE_UNKNOWN,
     UnitOfTemperature,
 )
-from homeassistant.core import Event, EventStateChangedData, HomeAssistant, State
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.helpers import entityfilter, state as state_helper
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_registry import (
@@ -85,12 +93,16 @@ CONF_COMPONENT_CONFIG_GLOB = "component_config_glob"
 CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_DEFAULT_METRIC = "default_metric"
 CONF_OVERRIDE_METRIC = "override_metric"
+CONF_UPDATE_ON_SCRAPE = "update_on_scrape"
 COMPONENT_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {vol.Optional(CONF_OVERRIDE_METRIC): cv.string}
 )
 
 DEFAULT_NAMESPACE = "homeassistant"
 
+# Domains whose handler increases a counter on every state change
+COUNTER_DOMAINS = {"automation"}
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.All(
@@ -100,6 +112,7 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(CONF_REQUIRES_AUTH, default=True): cv.boolean,
                 vol.Optional(CONF_DEFAULT_METRIC): cv.string,
                 vol.Optional(CONF_OVERRIDE_METRIC): cv.string,
+                vol.Optional(CONF_UPDATE_ON_SCRAPE, default=False): cv.boolean,
                 vol.Optional(CONF_COMPONENT_CONFIG, default={}): vol.Schema(
                     {cv.entity_id: COMPONENT_CONFIG_SCHEMA_ENTRY}
                 ),
@@ -118,8 +131,6 @@ CONFIG_SCHEMA = vol.Schema(
 
 def setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Activate Prometheus component."""
-    hass.http.register_view(PrometheusView(config[DOMAIN][CONF_REQUIRES_AUTH]))
-
     conf: dict[str, Any] = config[DOMAIN]
     entity_filter: entityfilter.EntityFilter = conf[CONF_FILTER]
     namespace: str = conf[CONF_PROM_NAMESPACE]
@@ -140,12 +151,22 @@ def setup(hass: HomeAssistant, config: ConfigType) -> bool:
         override_metric,
         default_metric,
     )
-
-    hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_state_changed_event)
-    hass.bus.listen(
-        EVENT_ENTITY_REGISTRY_UPDATED,
-        metrics.handle_entity_registry_updated,
-    )
+    hass.http.register_view(PrometheusView(conf[CONF_REQUIRES_AUTH], metrics))
+
+    if conf[CONF_UPDATE_ON_SCRAPE]:
+        # Only record which entities changed and update their
+        # metrics in the executor when the metrics are scraped
+        hass.bus.listen(EVENT_STATE_CHANGED, metrics.async_handle_state_changed_event)
+        hass.bus.listen(
+            EVENT_ENTITY_REGISTRY_UPDATED,
+            metrics.async_handle_entity_registry_updated,
+        )
+    else:
+        hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_state_changed_event)
+        hass.bus.listen(
+            EVENT_ENTITY_REGISTRY_UPDATED,
+            metrics.handle_entity_registry_updated,
+        )
 
     for state in hass.states.all():
         if entity_filter(state.entity_id):
@@ -154,6 +175,15 @@ def setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return True
 
 
+@dataclass(slots=True)
+class _PendingState:
+    """The last state of an entity which changed since the last scrape."""
+
+    state: State
+    changes: int = 0
+    removed_friendly_names: list[str | None] = field(default_factory=list)
+
+
 class PrometheusMetrics:
     """Model all of the metrics which should be exposed to Prometheus."""
 
@@ -188,6 +218,9 @@ class PrometheusMetrics:
             self.metrics_prefix = ""
         self._metrics: dict[str, MetricWrapperBase] = {}
         self._climate_units = climate_units
+        self._pending_states: dict[str, _PendingState] = {}
+        self._pending_removals: list[str] = []
+        self._scrape_lock = asyncio.Lock()
 
     def handle_state_changed_event(self, event: Event[EventStateChangedData]) -> None:
         """Handle new messages from the bus."""
@@ -205,8 +238,37 @@ class PrometheusMetrics:
 
         self.handle_state(state)
 
-    def handle_state(self, state: State) -> None:
-        """Add/update a state in Prometheus."""
+    @callback
+    def async_handle_state_changed_event(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Record a state change to update its metrics on the next scrape."""
+        if (state := event.data["new_state"]) is None:
+            return
+
+        entity_id = state.entity_id
+        if not self._filter(entity_id):
+            return
+
+        if (pending := self._pending_states.get(entity_id)) is None:
+            pending = self._pending_states[entity_id] = _PendingState(state)
+        else:
+            pending.state = state
+        if (old_state := event.data["old_state"]) is not None and (
+            old_friendly_name := old_state.attributes.get(ATTR_FRIENDLY_NAME)
+        ) != state.attributes.get(ATTR_FRIENDLY_NAME):
+            # The labelsets of the old name are removed, so the counters
+            # of the new name only count the changes since the rename
+            pending.removed_friendly_names.append(old_friendly_name)
+            pending.changes = 0
+        pending.changes += 1
+
+    def handle_state(self, state: State, changes: int = 1) -> None:
+        """Add/update a state in Prometheus.
+
+        The counters are increased by the number of state changes the
+        state is the last of.
+        """
         entity_id = state.entity_id
         _LOGGER.debug("Handling state update for %s", entity_id)
         domain, _ = hacore.split_entity_id(entity_id)
@@ -216,13 +278,15 @@ class PrometheusMetrics:
         handler = f"_handle_{domain}"
 
         if hasattr(self, handler) and state.state not in ignored_states:
-            getattr(self, handler)(state)
+            # Handlers of counters count each change
+            for _ in range(changes if domain in COUNTER_DOMAINS else 1):
+                getattr(self, handler)(state)
 
         labels = self._labels(state)
         state_change = self._metric(
             "state_change", prometheus_client.Counter, "The number of state changes"
         )
-        state_change.labels(**labels).inc()
+        state_change.labels(**labels).inc(changes)
 
         entity_available = self._metric(
             "entity_available",
@@ -242,8 +306,46 @@ class PrometheusMetrics:
         self, event: Event[EventEntityRegistryUpdatedData]
     ) -> None:
         """Listen for deleted, disabled or renamed entities and remove them from the Prometheus Registry."""
+        if metrics_entity_id := self._removed_entity_id(event):
+            self._remove_labelsets(metrics_entity_id)
+
+    @callback
+    def async_handle_entity_registry_updated(
+        self, event: Event[EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Record deleted, disabled or renamed entities to remove them on the next scrape."""
+        if metrics_entity_id := self._removed_entity_id(event):
+            self._pending_states.pop(metrics_entity_id, None)
+            self._pending_removals.append(metrics_entity_id)
+
+    async def async_generate_latest(self, hass: HomeAssistant) -> bytes:
+        """Update the metrics of the recorded changes and render all metrics."""
+        async with self._scrape_lock:
+            pending_removals, self._pending_removals = self._pending_removals, []
+            pending_states, self._pending_states = self._pending_states, {}
+            return await hass.async_add_executor_job(
+                self._update_and_generate_latest, pending_removals, pending_states
+            )
+
+    def _update_and_generate_latest(
+        self, pending_removals: list[str], pending_states: dict[str, _PendingState]
+    ) -> bytes:
+        """Update the metrics of the recorded changes and render all metrics."""
+        for entity_id in pending_removals:
+            self._remove_labelsets(entity_id)
+        for entity_id, pending in pending_states.items():
+            for friendly_name in pending.removed_friendly_names:
+                self._remove_labelsets(entity_id, friendly_name)
+            self.handle_state(pending.state, pending.changes)
+        return prometheus_client.generate_latest(prometheus_client.REGISTRY)
+
+    @staticmethod
+    def _removed_entity_id(
+        event: Event[EventEntityRegistryUpdatedData],
+    ) -> str | None:
+        """Return the entity id whose labelsets a registry update removes."""
         if event.data["action"] in (None, "create"):
-            return
+            return None
 
         entity_id = event.data.get("entity_id")
         _LOGGER.debug("Handling entity update for %s", entity_id)
@@ -260,8 +362,7 @@ class PrometheusMetrics:
             elif "disabled_by" in changes:
                 metrics_entity_id = entity_id
 
-        if metrics_entity_id:
-            self._remove_labelsets(metrics_entity_id)
+        return metrics_entity_id
 
     def _remove_labelsets(
         self, entity_id: str, friendly_name: str | None = None
@@ -814,18 +915,17 @@ class PrometheusView(HomeAssistantView):
     url = API_ENDPOINT
     name = "api:prometheus"
 
-    def __init__(self, requires_auth: bool) -> None:
+    def __init__(self, requires_auth: bool, metrics: PrometheusMetrics) -> None:
         """Initialize Prometheus view."""
         self.requires_auth = requires_auth
+        self._metrics = metrics
 
     async def get(self, request: web.Request) -> web.Response:
         """Handle request for Prometheus metrics."""
         _LOGGER.debug("Received Prometheus metrics request")
 
         hass = request.app[KEY_HASS]
-        body = await hass.async_add_executor_job(
-            prometheus_client.generate_latest, prometheus_client.REGISTRY
-        )
+        body = await self._metrics.async_generate_latest(hass)
         return web.Response(
             body=body,
             content_type=CONTENT_TYPE_TEXT_PLAIN,
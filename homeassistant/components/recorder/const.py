@@ -46,8 +46,29 @@ DEFAULT_MAX_BIND_VARS = 4000
 
 DB_WORKER_PREFIX = "DbWorker"
 
+# The time a single purge slice may spend purging states and events
+PURGE_SLICE_TIME_BUDGET = 2.0
+# Purging is paused while the recorder queue is deeper than this
+PURGE_PAUSE_BACKLOG = 1000
+# The number of seconds to wait before resuming a paused purge
+PURGE_PAUSE_SECONDS = 10
+
+PURGE_PROGRESS_STORAGE_KEY = f"{DOMAIN}.purge_progress"
+PURGE_PROGRESS_STORAGE_VERSION = 1
+
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
 
+#
+# Domains that are always continuous and not shown in the logbook
+#
+# These are hard coded here to avoid importing
+# the entire counter, proximity and sensor integrations
+# to get the name of the domain.
+ALWAYS_CONTINUOUS_DOMAINS = {"counter", "proximity"}
+
+# Domains that are continuous if there is a UOM set on the entity
+CONDITIONALLY_CONTINUOUS_DOMAINS = {"sensor"}
+
 ATTR_KEEP_DAYS = "keep_days"
 ATTR_REPACK = "repack"
 ATTR_APPLY_FILTER = "apply_filter"
@@ -65,11 +86,13 @@ LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 INTEGRATION_PLATFORM_COMPILE_STATISTICS = "compile_statistics"
 INTEGRATION_PLATFORM_VALIDATE_STATISTICS = "validate_statistics"
 INTEGRATION_PLATFORM_LIST_STATISTIC_IDS = "list_statistic_ids"
+INTEGRATION_PLATFORM_RECORD_STATE = "record_state"
 
 INTEGRATION_PLATFORMS_RUN_IN_RECORDER_THREAD = {
     INTEGRATION_PLATFORM_COMPILE_STATISTICS,
     INTEGRATION_PLATFORM_VALIDATE_STATISTICS,
     INTEGRATION_PLATFORM_LIST_STATISTIC_IDS,
+    INTEGRATION_PLATFORM_RECORD_STATE,
 }
 
 
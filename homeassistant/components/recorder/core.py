@@ -35,15 +35,20 @@ from homeassistant.core import (
     CALLBACK_TYPE,
     Event,
     EventStateChangedData,
+    HassJob,
+    HassJobType,
     HomeAssistant,
+    State,
     callback,
 )
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
 )
 from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
@@ -61,6 +66,8 @@ from .const import (
     MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    PURGE_PROGRESS_STORAGE_KEY,
+    PURGE_PROGRESS_STORAGE_VERSION,
     SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
     STATISTICS_ROWS_SCHEMA_VERSION,
@@ -88,9 +95,12 @@ from .migration import (
 )
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .purge import PurgeProgress, PurgeStatistics
 from .queries import get_migration_changes
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
+from .table_managers.events import EventsManager
+from .table_managers.logbook_index import LogbookIndexManager
 from .table_managers.recorder_runs import RecorderRunsManager
 from .table_managers.state_attributes import StateAttributesManager
 from .table_managers.states import StatesManager
@@ -104,6 +114,7 @@ from .tasks import (
     CommitTask,
     CompileMissingStatisticsTask,
     DatabaseLockTask,
+    EventBatchTask,
     ImportStatisticsTask,
     KeepAliveTask,
     PerodicCleanupTask,
@@ -174,6 +185,7 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        logbook_index: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -209,6 +221,9 @@ class Recorder(threading.Thread):
         # by is_entity_recorder and the sensor recorder.
         self.entity_filter = entity_filter
         self.exclude_event_types = exclude_event_types
+        # The logbook reads the state changes it shows from the
+        # logbook_index table when it is maintained
+        self.logbook_index = logbook_index
 
         self.schema_version = 0
         self._commits_without_expire = 0
@@ -216,12 +231,27 @@ class Recorder(threading.Thread):
 
         self.recorder_runs_manager = RecorderRunsManager()
         self.states_manager = StatesManager()
+        self.events_manager = EventsManager()
+        self.logbook_index_manager = LogbookIndexManager()
+        # Recorder platforms that are passed the states of their domain
+        # as the states are recorded, only accessed in the recorder thread
+        self.record_state_platforms: dict[
+            str, Callable[[HomeAssistant, State], None]
+        ] = {}
         self.event_data_manager = EventDataManager(self)
         self.event_type_manager = EventTypeManager(self)
         self.states_meta_manager = StatesMetaManager(self)
         self.state_attributes_manager = StateAttributesManager(self)
         self.statistics_meta_manager = StatisticsMetaManager(self)
 
+        self.purge_statistics = PurgeStatistics()
+        self._purge_progress_store: Store[dict[str, Any]] = Store(
+            hass,
+            PURGE_PROGRESS_STORAGE_VERSION,
+            PURGE_PROGRESS_STORAGE_KEY,
+            private=True,
+        )
+
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
@@ -234,6 +264,12 @@ class Recorder(threading.Thread):
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
+        # A batch of events is a single item in the queue so the events
+        # of batches beyond the first are counted separately for the
+        # backlog. The event loop only writes the queued count and the
+        # recorder thread only writes the processed count.
+        self._queued_batch_events = 0
+        self._processed_batch_events = 0
         self._keep_alive_listener: CALLBACK_TYPE | None = None
         self._commit_listener: CALLBACK_TYPE | None = None
         self._periodic_listener: CALLBACK_TYPE | None = None
@@ -251,7 +287,11 @@ class Recorder(threading.Thread):
     @property
     def backlog(self) -> int:
         """Return the number of items in the recorder backlog."""
-        return self._queue.qsize()
+        return (
+            self._queue.qsize()
+            + self._queued_batch_events
+            - self._processed_batch_events
+        )
 
     @cached_property
     def dialect_name(self) -> SupportedDialect | None:
@@ -280,6 +320,52 @@ class Recorder(threading.Thread):
         """Add a task to the recorder queue."""
         self._queue.put(task)
 
+    def queue_task_later(self, delay: float, task: RecorderTask) -> None:
+        """Add a task to the recorder queue after a delay."""
+        self.hass.loop.call_soon_threadsafe(self._async_queue_task_later, delay, task)
+
+    @callback
+    def _async_queue_task_later(self, delay: float, task: RecorderTask) -> None:
+        """Add a task to the recorder queue after a delay."""
+        async_call_later(
+            self.hass,
+            delay,
+            HassJob(
+                lambda _: self.queue_task(task),
+                "recorder queue task later",
+                cancel_on_shutdown=True,
+                job_type=HassJobType.Callback,
+            ),
+        )
+
+    def save_purge_progress(self, progress: PurgeProgress | None) -> None:
+        """Save the progress of an unfinished purge or remove it when done."""
+        self.hass.add_job(
+            self._async_save_purge_progress,
+            progress.as_dict() if progress else None,
+        )
+
+    async def _async_save_purge_progress(self, data: dict[str, Any] | None) -> None:
+        """Save the progress of an unfinished purge or remove it when done."""
+        if data is None:
+            await self._purge_progress_store.async_remove()
+        else:
+            await self._purge_progress_store.async_save(data)
+
+    async def _async_resume_purge(self) -> None:
+        """Resume a purge that did not finish before the last shutdown."""
+        if not (data := await self._purge_progress_store.async_load()):
+            return
+        progress = PurgeProgress.from_dict(data)
+        _LOGGER.debug(
+            "Resuming purge before %s", progress.purge_before.isoformat(sep=" ")
+        )
+        self.queue_task(
+            PurgeTask(
+                progress.purge_before, progress.repack, progress.apply_filter, progress
+            )
+        )
+
     def set_enable(self, enable: bool) -> None:
         """Enable or disable recording events and states."""
         self.enabled = enable
@@ -333,9 +419,23 @@ class Recorder(threading.Thread):
             # Unknown what it is.
             queue_put(event)
 
+        @callback
+        def _state_changed_batch_listener(events: list[Event[Any]]) -> None:
+            """Put a batch of state changed events in the process queue."""
+            if events[0].event_type in exclude_event_types:
+                return
+            if entity_filter is not None:
+                events = [
+                    event for event in events if entity_filter(event.data["entity_id"])
+                ]
+            if events:
+                self._queued_batch_events += len(events) - 1
+                queue_put(EventBatchTask(events))
+
         self._event_listener = self.hass.bus.async_listen(
             MATCH_ALL,
             _event_listener,
+            batch_listener=_state_changed_batch_listener,
         )
         self._queue_watcher = async_track_time_interval(
             self.hass,
@@ -449,9 +549,11 @@ class Recorder(threading.Thread):
         # is a request to shutdown.
         while True:
             try:
-                self._queue.get_nowait()
+                task = self._queue.get_nowait()
             except queue.Empty:
                 break
+            if type(task) is EventBatchTask:
+                self._queued_batch_events -= len(task.events) - 1
         self.queue_task(StopTask())
         await self.hass.async_add_executor_job(self.join)
 
@@ -663,6 +765,12 @@ class Recorder(threading.Thread):
             self.hass, self.async_nightly_tasks, hour=4, minute=12, second=0
         )
 
+        # Resume a purge that was paused by a restart
+        if self.auto_purge:
+            self.hass.async_create_background_task(
+                self._async_resume_purge(), "recorder resume purge"
+            )
+
         # Compile short term statistics every 5 minutes
         self._periodic_listener = async_track_utc_time_change(
             self.hass, self._async_five_minute_tasks, minute=range(0, 60, 5), second=10
@@ -705,6 +813,16 @@ class Recorder(threading.Thread):
         self._event_session_has_pending_writes = True
         session.add(obj)
 
+    def _add_event_row(self, dbevent: Events) -> None:
+        """Add an Events row to the next bulk insert."""
+        self._event_session_has_pending_writes = True
+        self.events_manager.add_pending_row(dbevent)
+
+    def _add_state_row(self, dbstate: States) -> None:
+        """Add a States row to the next bulk insert."""
+        self._event_session_has_pending_writes = True
+        self.states_manager.add_pending_row(dbstate)
+
     def _notify_migration_failed(self) -> None:
         """Notify the user schema migration failed."""
         persistent_notification.create(
@@ -870,6 +988,8 @@ class Recorder(threading.Thread):
                     state_change_events.append(event_)
                 else:
                     non_state_change_events.append(event_)
+            elif type(task_or_event) is EventBatchTask:
+                state_change_events.extend(task_or_event.events)
 
         assert self.event_session is not None
         session = self.event_session
@@ -1041,6 +1161,12 @@ class Recorder(threading.Thread):
             return
         if event.event_type == EVENT_STATE_CHANGED:
             self._process_state_changed_event_into_session(event)
+            if (
+                self.record_state_platforms
+                and (new_state := event.data["new_state"])
+                and (record_state := self.record_state_platforms.get(new_state.domain))
+            ):
+                record_state(self.hass, new_state)
         else:
             self._process_non_state_changed_event_into_session(event)
         # Commit if the commit interval is zero
@@ -1066,7 +1192,7 @@ class Recorder(threading.Thread):
             dbevent.event_type_rel = event_types
 
         if not event.data:
-            self._add_to_session(session, dbevent)
+            self._add_event_row(dbevent)
             return
 
         event_data_manager = self.event_data_manager
@@ -1091,7 +1217,7 @@ class Recorder(threading.Thread):
             self._add_to_session(session, dbevent_data)
             dbevent.event_data_rel = dbevent_data
 
-        self._add_to_session(session, dbevent)
+        self._add_event_row(dbevent)
 
     def _process_state_changed_event_into_session(
         self, event: Event[EventStateChangedData]
@@ -1128,9 +1254,10 @@ class Recorder(threading.Thread):
             dbstate.entity_id = None
 
         if entity_id is None or not (
-            shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
+            shared_attrs_data := state_attributes_manager.shared_attrs_from_event(event)
         ):
             return
+        shared_attrs_bytes, hash_ = shared_attrs_data
 
         # Map the entity_id to the StatesMeta table
         if pending_states_meta := states_meta_manager.get_pending(entity_id):
@@ -1159,12 +1286,7 @@ class Recorder(threading.Thread):
         elif (
             attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
         ) or (
-            (hash_ := StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes))
-            and (
-                attributes_id := state_attributes_manager.get(
-                    shared_attrs, hash_, session
-                )
-            )
+            attributes_id := state_attributes_manager.get(shared_attrs, hash_, session)
         ):
             dbstate.attributes_id = attributes_id
         else:
@@ -1174,7 +1296,9 @@ class Recorder(threading.Thread):
             self._add_to_session(session, dbstate_attributes)
             dbstate.state_attributes = dbstate_attributes
 
-        self._add_to_session(session, dbstate)
+        self._add_state_row(dbstate)
+        if self.logbook_index and states_meta_manager.active:
+            self.logbook_index_manager.add_pending(dbstate, event)
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1222,6 +1346,14 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        # Flush the new StatesMeta, StateAttributes, EventTypes and
+        # EventData rows first so the ids are known when the States
+        # and Events rows are written with executemany inserts.
+        session.flush()
+        self.states_manager.bulk_insert_pending(session)
+        self.events_manager.bulk_insert_pending(session)
+        self.logbook_index_manager.bulk_insert_pending(session)
+
         if (
             pending_last_reported
             := self.states_manager.get_pending_last_reported_timestamp()
@@ -1245,6 +1377,8 @@ class Recorder(threading.Thread):
         # many selects for matching attributes by loading them
         # into the LRU or committed now.
         self.states_manager.post_commit_pending()
+        self.events_manager.post_commit_pending()
+        self.logbook_index_manager.post_commit_pending()
         self.state_attributes_manager.post_commit_pending()
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
@@ -1272,6 +1406,8 @@ class Recorder(threading.Thread):
     def _close_event_session(self) -> None:
         """Close the event session."""
         self.states_manager.reset()
+        self.events_manager.reset()
+        self.logbook_index_manager.reset()
         self.state_attributes_manager.reset()
         self.event_data_manager.reset()
         self.event_type_manager.reset()
@@ -1462,6 +1598,8 @@ class Recorder(threading.Thread):
         with session_scope(session=self.get_session()) as session:
             end_incomplete_runs(session, self.recorder_runs_manager.recording_start)
             self.recorder_runs_manager.start(session)
+            if not self.logbook_index:
+                self.logbook_index_manager.clear(session)
 
         self._open_event_session()
 
@@ -94,6 +94,7 @@ TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 TABLE_MIGRATION_CHANGES = "migration_changes"
+TABLE_LOGBOOK_INDEX = "logbook_index"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
 
@@ -116,6 +117,7 @@ ALL_TABLES = [
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_LOGBOOK_INDEX,
 ]
 
 TABLES_TO_CHECK = [
@@ -129,9 +131,12 @@ LAST_UPDATED_INDEX_TS = "ix_states_last_updated_ts"
 METADATA_ID_LAST_UPDATED_INDEX_TS = "ix_states_metadata_id_last_updated_ts"
 EVENTS_CONTEXT_ID_BIN_INDEX = "ix_events_context_id_bin"
 STATES_CONTEXT_ID_BIN_INDEX = "ix_states_context_id_bin"
+LOGBOOK_INDEX_METADATA_ID_TIME_TS_INDEX = "ix_logbook_index_metadata_id_time_ts"
+LOGBOOK_INDEX_TIME_TS_INDEX = "ix_logbook_index_time_ts"
 LEGACY_STATES_EVENT_ID_INDEX = "ix_states_event_id"
 LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated_ts"
 CONTEXT_ID_BIN_MAX_LENGTH = 16
+MAX_LENGTH_LOGBOOK_ICON = 255
 
 MYSQL_COLLATE = "utf8mb4_unicode_ci"
 MYSQL_DEFAULT_CHARSET = "utf8mb4"
@@ -669,6 +674,40 @@ class StatesMeta(Base):
         )
 
 
+class LogbookIndex(Base):
+    """State changes that are shown in the logbook.
+
+    The rows are only written when the logbook index is enabled and
+    hold everything the logbook shows for a state change so it does
+    not have to join the states with their old state and attributes.
+    """
+
+    __table_args__ = (
+        Index(LOGBOOK_INDEX_METADATA_ID_TIME_TS_INDEX, "metadata_id", "time_ts"),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_LOGBOOK_INDEX
+    state_id: Mapped[int] = mapped_column(
+        ID_TYPE, primary_key=True, autoincrement=False
+    )
+    metadata_id: Mapped[int | None] = mapped_column(ID_TYPE)
+    time_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
+    state: Mapped[str | None] = mapped_column(String(MAX_LENGTH_STATE_STATE))
+    icon: Mapped[str | None] = mapped_column(String(MAX_LENGTH_LOGBOOK_ICON))
+    context_id_bin: Mapped[bytes | None] = mapped_column(CONTEXT_BINARY_TYPE)
+    context_user_id_bin: Mapped[bytes | None] = mapped_column(CONTEXT_BINARY_TYPE)
+    context_parent_id_bin: Mapped[bytes | None] = mapped_column(CONTEXT_BINARY_TYPE)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.LogbookIndex("
+            f"state_id={self.state_id}, metadata_id={self.metadata_id}, "
+            f"state='{self.state}', time_ts={self.time_ts}"
+            ")>"
+        )
+
+
 class StatisticsBase:
     """Statistics base class."""
 
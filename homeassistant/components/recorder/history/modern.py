@@ -31,6 +31,7 @@ from ..const import LAST_REPORTED_SCHEMA_VERSION
 from ..db_schema import SHARED_ATTR_OR_LEGACY_ATTRIBUTES, StateAttributes, States
 from ..filters import Filters
 from ..models import (
+    ColumnarStates,
     LazyState,
     datetime_to_timestamp_or_none,
     extract_metadata_ids,
@@ -225,6 +226,117 @@ def get_significant_states_with_session(
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
     """
+    if not (
+        result := _execute_significant_states_stmt(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ):
+        return {}
+    rows, start_time_ts, entity_ids, entity_id_to_metadata_id = result
+    return _sorted_states_to_dict(
+        rows,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes=no_attributes,
+    )
+
+
+def get_significant_states_columnar(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> dict[str, ColumnarStates]:
+    """Wrap get_significant_states_columnar_with_session with an sql session."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return get_significant_states_columnar_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
+
+
+def get_significant_states_columnar_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> dict[str, ColumnarStates]:
+    """Return states changes during UTC period start_time - end_time in columns.
+
+    This is the same as get_significant_states_with_session with
+    compressed_state_format, except the states of each entity are
+    stored in arrays instead of one dict per row.
+    """
+    if not (
+        result := _execute_significant_states_stmt(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ):
+        return {}
+    rows, start_time_ts, entity_ids, entity_id_to_metadata_id = result
+    return _sorted_states_to_columnar(
+        rows,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        no_attributes,
+    )
+
+
+def _execute_significant_states_stmt(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> tuple[Iterable[Row], float | None, list[str], dict[str, int | None]] | None:
+    """Execute the significant states query.
+
+    Returns None if none of the entity_ids are in the database.
+    """
     if filters is not None:
         raise NotImplementedError("Filters are no longer supported")
     if not entity_ids:
@@ -237,7 +349,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return None
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -275,14 +387,11 @@ def get_significant_states_with_session(
             include_start_time_state,
         ],
     )
-    return _sorted_states_to_dict(
+    return (
         execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
         start_time_ts if include_start_time_state else None,
         entity_ids,
         entity_id_to_metadata_id,
-        minimal_response,
-        compressed_state_format,
-        no_attributes=no_attributes,
     )
 
 
@@ -816,3 +925,83 @@ def _sorted_states_to_dict(
 
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
+
+
+def _sorted_states_to_columnar(
+    states: Iterable[Row],
+    start_time_ts: float | None,
+    entity_ids: list[str],
+    entity_id_to_metadata_id: dict[str, int | None],
+    minimal_response: bool,
+    no_attributes: bool,
+) -> dict[str, ColumnarStates]:
+    """Convert SQL results into columnar states.
+
+    The rows are the same as _sorted_states_to_dict with
+    compressed_state_format, but are appended to typed arrays
+    instead of creating a dict per row.
+
+    States must be sorted by entity_id and last_updated
+    """
+    field_map = _FIELD_MAP
+    result: dict[str, ColumnarStates] = {
+        entity_id: ColumnarStates() for entity_id in entity_ids
+    }
+    metadata_id_to_entity_id = {
+        v: k for k, v in entity_id_to_metadata_id.items() if v is not None
+    }
+    if len(entity_ids) == 1:
+        metadata_id = entity_id_to_metadata_id[entity_ids[0]]
+        assert metadata_id is not None  # should not be possible if we got here
+        states_iter: Iterable[tuple[int, Iterator[Row]]] = (
+            (metadata_id, iter(states)),
+        )
+    else:
+        key_func = itemgetter(field_map["metadata_id"])
+        states_iter = groupby(states, key_func)
+
+    state_idx = field_map["state"]
+    last_updated_ts_idx = field_map["last_updated_ts"]
+
+    for metadata_id, group in states_iter:
+        entity_id = metadata_id_to_entity_id[metadata_id]
+        attr_cache: dict[str, dict[str, Any]] = {}
+        columnar = result[entity_id]
+        append = columnar.append
+        intern_attributes = columnar.intern_attributes
+        if (
+            not minimal_response
+            or split_entity_id(entity_id)[0] in NEED_ATTRIBUTE_DOMAINS
+        ):
+            for row in group:
+                append(
+                    row[state_idx],
+                    row[last_updated_ts_idx] or start_time_ts,  # type: ignore[arg-type]
+                    getattr(row, "last_changed_ts", None),
+                    intern_attributes(getattr(row, "attributes", None), attr_cache),
+                )
+            continue
+
+        # With minimal response we only provide attributes for
+        # the first row and filter out rows where only the
+        # attributes changed.
+        if (first_state := next(group, None)) is None:
+            continue
+        prev_state: str = first_state[state_idx]
+        append(
+            prev_state,
+            first_state[last_updated_ts_idx] or start_time_ts,  # type: ignore[arg-type]
+            getattr(first_state, "last_changed_ts", None),
+            -1
+            if no_attributes
+            else intern_attributes(
+                getattr(first_state, "attributes", None), attr_cache
+            ),
+        )
+        for row in group:
+            if (state := row[state_idx]) != prev_state:
+                append(state, row[last_updated_ts_idx], None)
+                prev_state = state
+
+    # Filter out the empty columns if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
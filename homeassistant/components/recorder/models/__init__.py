@@ -10,7 +10,12 @@ from .context import (
 )
 from .database import DatabaseEngine, DatabaseOptimizer, UnsupportedDialect
 from .event import extract_event_type_ids
-from .state import LazyState, extract_metadata_ids, row_to_compressed_state
+from .state import (
+    ColumnarStates,
+    LazyState,
+    extract_metadata_ids,
+    row_to_compressed_state,
+)
 from .statistics import (
     CalendarStatisticPeriod,
     FixedStatisticPeriod,
@@ -31,6 +36,7 @@ from .time import (
 
 __all__ = [
     "CalendarStatisticPeriod",
+    "ColumnarStates",
     "DatabaseEngine",
     "DatabaseOptimizer",
     "FixedStatisticPeriod",
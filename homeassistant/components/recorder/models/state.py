@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from array import array
+from collections.abc import Iterable
 from datetime import datetime
 from functools import cached_property
 import logging
@@ -16,6 +18,7 @@ from homeassistant.const import (
     COMPRESSED_STATE_STATE,
 )
 from homeassistant.core import Context, State
+from homeassistant.helpers.json import json_bytes
 import homeassistant.util.dt as dt_util
 
 from .state_attributes import decode_attributes_from_source
@@ -141,3 +144,178 @@ def row_to_compressed_state(
     ):
         comp_state[COMPRESSED_STATE_LAST_CHANGED] = row_last_changed_ts
     return comp_state
+
+
+class ColumnarStates:
+    """Array backed history of a single entity.
+
+    Each row only costs a few bytes in typed arrays instead of a
+    State or dict object. State strings are interned into
+    state_values and attributes are decoded once per distinct
+    attributes row into attribute_values.
+
+    A last_changed_ts of 0 means last_changed is the same as
+    last_updated and an attribute index of -1 means the row
+    does not include attributes.
+    """
+
+    __slots__ = (
+        "state_values",
+        "state_idx",
+        "last_updated_ts",
+        "last_changed_ts",
+        "attribute_values",
+        "attribute_idx",
+        "_state_lookup",
+        "_attribute_lookup",
+    )
+
+    def __init__(self) -> None:
+        """Init the columnar states."""
+        self.state_values: list[str] = []
+        self.state_idx = array("I")
+        self.last_updated_ts = array("d")
+        self.last_changed_ts = array("d")
+        self.attribute_values: list[dict[str, Any]] = []
+        self.attribute_idx = array("i")
+        self._state_lookup: dict[str, int] = {}
+        self._attribute_lookup: dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.last_updated_ts)
+
+    def append(
+        self,
+        state: str,
+        last_updated_ts: float,
+        last_changed_ts: float | None,
+        attribute_idx: int = -1,
+    ) -> None:
+        """Append a row."""
+        if (state_idx := self._state_lookup.get(state)) is None:
+            state_idx = self._state_lookup[state] = len(self.state_values)
+            self.state_values.append(state)
+        self.state_idx.append(state_idx)
+        self.last_updated_ts.append(last_updated_ts)
+        self.last_changed_ts.append(
+            0
+            if not last_changed_ts or last_changed_ts == last_updated_ts
+            else last_changed_ts
+        )
+        self.attribute_idx.append(attribute_idx)
+
+    def intern_attributes(
+        self, attributes_source: Any, attr_cache: dict[str, dict[str, Any]]
+    ) -> int:
+        """Return the index of the attributes for a row source.
+
+        attributes_source is the shared_attrs (or legacy attributes)
+        column of the row which is unique per attributes_id.
+        """
+        if (attribute_idx := self._attribute_lookup.get(attributes_source)) is None:
+            attribute_idx = len(self.attribute_values)
+            self._attribute_lookup[attributes_source] = attribute_idx
+            self.attribute_values.append(
+                decode_attributes_from_source(attributes_source, attr_cache)
+            )
+        return attribute_idx
+
+    @classmethod
+    def from_compressed_states(
+        cls, compressed_states: Iterable[dict[str, Any]]
+    ) -> ColumnarStates:
+        """Create columnar states from compressed states."""
+        columnar = cls()
+        attribute_lookup = columnar._attribute_lookup  # noqa: SLF001
+        attribute_values = columnar.attribute_values
+        for comp_state in compressed_states:
+            attribute_idx = -1
+            if (attributes := comp_state.get(COMPRESSED_STATE_ATTRIBUTES)) is not None:
+                # Decoded attributes are shared by identity
+                if (attribute_idx := attribute_lookup.get(id(attributes), -1)) == -1:
+                    attribute_idx = len(attribute_values)
+                    attribute_lookup[id(attributes)] = attribute_idx
+                    attribute_values.append(attributes)
+            columnar.append(
+                comp_state[COMPRESSED_STATE_STATE],
+                comp_state[COMPRESSED_STATE_LAST_UPDATED],
+                comp_state.get(COMPRESSED_STATE_LAST_CHANGED),
+                attribute_idx,
+            )
+        return columnar
+
+    def as_compressed_states(self) -> list[dict[str, Any]]:
+        """Return the rows as compressed states."""
+        state_values = self.state_values
+        attribute_values = self.attribute_values
+        compressed_states: list[dict[str, Any]] = []
+        for state_idx, last_updated_ts, last_changed_ts, attribute_idx in zip(
+            self.state_idx,
+            self.last_updated_ts,
+            self.last_changed_ts,
+            self.attribute_idx,
+            strict=True,
+        ):
+            comp_state: dict[str, Any] = {
+                COMPRESSED_STATE_STATE: state_values[state_idx]
+            }
+            if attribute_idx != -1:
+                comp_state[COMPRESSED_STATE_ATTRIBUTES] = attribute_values[
+                    attribute_idx
+                ]
+            comp_state[COMPRESSED_STATE_LAST_UPDATED] = last_updated_ts
+            if last_changed_ts:
+                comp_state[COMPRESSED_STATE_LAST_CHANGED] = last_changed_ts
+            compressed_states.append(comp_state)
+        return compressed_states
+
+    def as_compressed_state_json(self) -> bytes:
+        """Return the rows as a JSON list of compressed states.
+
+        The JSON is built straight from the arrays so each distinct
+        state and attributes value is only serialized once.
+        """
+        state_json = [
+            b'{"' + COMPRESSED_STATE_STATE.encode() + b'":' + json_bytes(state)
+            for state in self.state_values
+        ]
+        attributes_json = [
+            b',"' + COMPRESSED_STATE_ATTRIBUTES.encode() + b'":' + json_bytes(attrs)
+            for attrs in self.attribute_values
+        ]
+        last_updated_key = b',"' + COMPRESSED_STATE_LAST_UPDATED.encode() + b'":'
+        last_changed_key = b',"' + COMPRESSED_STATE_LAST_CHANGED.encode() + b'":'
+        return b"".join(
+            (
+                b"[",
+                b",".join(
+                    [
+                        b"".join(
+                            (
+                                state_json[state_idx],
+                                b""
+                                if attribute_idx == -1
+                                else attributes_json[attribute_idx],
+                                last_updated_key,
+                                repr(last_updated_ts).encode(),
+                                (
+                                    last_changed_key + repr(last_changed_ts).encode()
+                                    if last_changed_ts
+                                    else b""
+                                ),
+                                b"}",
+                            )
+                        )
+                        for state_idx, last_updated_ts, last_changed_ts, attribute_idx in zip(
+                            self.state_idx,
+                            self.last_updated_ts,
+                            self.last_changed_ts,
+                            self.attribute_idx,
+                            strict=True,
+                        )
+                    ]
+                ),
+                b"]",
+            )
+        )
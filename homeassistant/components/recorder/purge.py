@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from itertools import zip_longest
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.orm.session import Session
 
@@ -23,6 +24,7 @@ from .queries import (
     delete_event_data_rows,
     delete_event_rows,
     delete_event_types_rows,
+    delete_logbook_index_rows,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
     delete_states_meta_rows,
@@ -54,6 +56,61 @@ DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
 
+@dataclass(slots=True)
+class PurgeProgress:
+    """Progress of a purge that runs in time limited slices.
+
+    Each slice selects the oldest rows again and removes the unused
+    attributes and data of the rows it purged before it is committed,
+    so only the purge itself needs to be persisted to resume an
+    unfinished purge after a restart.
+    """
+
+    purge_before: datetime
+    repack: bool
+    apply_filter: bool
+    rows_purged: int = field(default=0, compare=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict of the progress that can be stored."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "repack": self.repack,
+            "apply_filter": self.apply_filter,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PurgeProgress:
+        """Create the progress from a stored dict."""
+        return cls(
+            purge_before=datetime.fromisoformat(data["purge_before"]),
+            repack=data["repack"],
+            apply_filter=data["apply_filter"],
+        )
+
+
+@dataclass(slots=True)
+class PurgeStatistics:
+    """Statistics about the purge slices that have run."""
+
+    rows_purged: int = 0
+    purge_time: float = 0.0
+    last_slice_latency: float | None = None
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return the number of rows purged per second of purge time."""
+        if not self.purge_time:
+            return 0.0
+        return self.rows_purged / self.purge_time
+
+    def add_slice(self, rows_purged: int, latency: float) -> None:
+        """Record a purge slice."""
+        self.rows_purged += rows_purged
+        self.purge_time += latency
+        self.last_slice_latency = latency
+
+
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder,
@@ -62,11 +119,55 @@ def purge_old_data(
     apply_filter: bool = False,
     events_batch_size: int = DEFAULT_EVENTS_BATCHES_PER_PURGE,
     states_batch_size: int = DEFAULT_STATES_BATCHES_PER_PURGE,
+    progress: PurgeProgress | None = None,
+    time_budget: float | None = None,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+
+    If progress and a time_budget are given, purging states and events
+    stops once the budget is used up and the remaining work is recorded
+    in progress.
     """
+    if progress is None or time_budget is None:
+        return _purge_old_data(
+            instance,
+            purge_before,
+            repack,
+            apply_filter,
+            events_batch_size,
+            states_batch_size,
+            None,
+            None,
+        )
+    slice_progress = replace(progress)
+    finished = _purge_old_data(
+        instance,
+        purge_before,
+        repack,
+        apply_filter,
+        events_batch_size,
+        states_batch_size,
+        slice_progress,
+        time.monotonic() + time_budget,
+    )
+    # The progress is only updated once the slice has been committed
+    progress.rows_purged = slice_progress.rows_purged
+    return finished
+
+
+def _purge_old_data(
+    instance: Recorder,
+    purge_before: datetime,
+    repack: bool,
+    apply_filter: bool,
+    events_batch_size: int,
+    states_batch_size: int,
+    progress: PurgeProgress | None,
+    deadline: float | None,
+) -> bool:
+    """Purge events and states older than purge_before."""
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
@@ -87,10 +188,10 @@ def purge_old_data(
             )
             # Once we are done purging legacy rows, we use the new method
             has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before
+                instance, session, states_batch_size, purge_before, progress, deadline
             )
             has_more_to_purge |= _purge_events_and_data_ids(
-                instance, session, events_batch_size, purge_before
+                instance, session, events_batch_size, purge_before, progress, deadline
             )
 
         statistics_runs = _select_statistics_runs_to_purge(
@@ -173,11 +274,18 @@ def _purge_legacy_format(
     )
 
 
+def _deadline_exceeded(deadline: float | None) -> bool:
+    """Return if the time budget of the purge slice is used up."""
+    return deadline is not None and time.monotonic() >= deadline
+
+
 def _purge_states_and_attributes_ids(
     instance: Recorder,
     session: Session,
     states_batch_size: int,
     purge_before: datetime,
+    progress: PurgeProgress | None = None,
+    deadline: float | None = None,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -193,6 +301,8 @@ def _purge_states_and_attributes_ids(
     attributes_ids_batch: set[int] = set()
     max_bind_vars = instance.max_bind_vars
     for _ in range(states_batch_size):
+        if _deadline_exceeded(deadline):
+            break
         state_ids, attributes_ids = _select_state_attributes_ids_to_purge(
             session, purge_before, max_bind_vars
         )
@@ -201,7 +311,12 @@ def _purge_states_and_attributes_ids(
             break
         _purge_state_ids(instance, session, state_ids)
         attributes_ids_batch = attributes_ids_batch | attributes_ids
+        if progress is not None:
+            progress.rows_purged += len(state_ids)
 
+    # The unused attributes are removed before the slice is committed
+    # even when it ran out of time, they would never be found again
+    # once the states linking them are gone
     _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
     _LOGGER.debug(
         "After purging states and attributes_ids remaining=%s",
@@ -215,6 +330,8 @@ def _purge_events_and_data_ids(
     session: Session,
     events_batch_size: int,
     purge_before: datetime,
+    progress: PurgeProgress | None = None,
+    deadline: float | None = None,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -228,6 +345,8 @@ def _purge_events_and_data_ids(
     data_ids_batch: set[int] = set()
     max_bind_vars = instance.max_bind_vars
     for _ in range(events_batch_size):
+        if _deadline_exceeded(deadline):
+            break
         event_ids, data_ids = _select_event_data_ids_to_purge(
             session, purge_before, max_bind_vars
         )
@@ -236,6 +355,8 @@ def _purge_events_and_data_ids(
             break
         _purge_event_ids(session, event_ids)
         data_ids_batch = data_ids_batch | data_ids
+        if progress is not None:
+            progress.rows_purged += len(event_ids)
 
     _purge_unused_data_ids(instance, session, data_ids_batch)
     _LOGGER.debug(
@@ -521,6 +642,9 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     disconnected_rows = session.execute(disconnect_states_rows(state_ids))
     _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
 
+    deleted_rows = session.execute(delete_logbook_index_rows(state_ids))
+    _LOGGER.debug("Deleted %s logbook index rows", deleted_rows)
+
     deleted_rows = session.execute(delete_states_rows(state_ids))
     _LOGGER.debug("Deleted %s states", deleted_rows)
 
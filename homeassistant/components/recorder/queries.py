@@ -13,6 +13,7 @@ from .db_schema import (
     EventData,
     Events,
     EventTypes,
+    LogbookIndex,
     MigrationChanges,
     RecorderRuns,
     StateAttributes,
@@ -549,6 +550,15 @@ def delete_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     )
 
 
+def delete_logbook_index_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete logbook_index rows."""
+    return lambda_stmt(
+        lambda: delete(LogbookIndex)
+        .where(LogbookIndex.state_id.in_(state_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_event_data_rows(data_ids: Iterable[int]) -> StatementLambdaElement:
     """Delete event_data rows."""
     return lambda_stmt(
@@ -55,6 +55,17 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_purge_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about the purge slices that have run."""
+    purge_info: dict[str, Any] = {}
+    purge_statistics = instance.purge_statistics
+    if (latency := purge_statistics.last_slice_latency) is not None:
+        purge_info["purge_rows_per_second"] = f"{purge_statistics.rows_per_second:.1f}"
+        purge_info["purge_slice_latency"] = f"{latency*1000:.0f}"
+    return purge_info
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -72,4 +83,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | _async_get_purge_info(instance)
@@ -2,16 +2,47 @@
 
 from __future__ import annotations
 
+from functools import cache
 from typing import TYPE_CHECKING, Any
 
 from lru import LRU
 
 from homeassistant.util.event_type import EventType
 
+from ..db_schema import Base
+
 if TYPE_CHECKING:
     from ..core import Recorder
 
 
+@cache
+def _bulk_insert_columns(row_type: type[Base]) -> tuple[str, ...]:
+    """Return the columns of a mapped class that a bulk insert writes."""
+    return tuple(
+        column.key for column in row_type.__table__.columns if not column.primary_key
+    )
+
+
+def row_to_bulk_insert_params(
+    row: Base, links: tuple[tuple[str, str, str], ...]
+) -> dict[str, Any]:
+    """Return the bulk insert parameters for a row that is not in the session.
+
+    Every column is included so all rows of a batch share the same keys
+    and can be written with a single executemany.
+
+    links are (relationship, foreign key, related primary key) tuples.
+    When the relationship is set the foreign key is taken from the
+    related row which must already have been flushed.
+    """
+    row_dict = row.__dict__
+    params = {key: row_dict.get(key) for key in _bulk_insert_columns(type(row))}
+    for relationship, foreign_key, primary_key in links:
+        if (related := row_dict.get(relationship)) is not None:
+            params[foreign_key] = getattr(related, primary_key)
+    return params
+
+
 class BaseTableManager[_DataT]:
     """Base class for table managers."""
 
@@ -0,0 +1,69 @@
+"""Support managing Events."""
+
+from __future__ import annotations
+
+from typing import cast
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm.session import Session
+
+from ..db_schema import Events
+from . import row_to_bulk_insert_params
+
+_EVENTS_LINKS = (
+    ("event_type_rel", "event_type_id", "event_type_id"),
+    ("event_data_rel", "data_id", "data_id"),
+)
+
+
+class EventsManager:
+    """Manage the events table."""
+
+    def __init__(self) -> None:
+        """Initialize the events manager."""
+        self._pending_rows: list[Events] = []
+
+    def add_pending_row(self, event: Events) -> None:
+        """Add an Events row to be written by the next bulk insert.
+
+        The row is not added to the session, it is written with
+        bulk_insert_pending when the session is committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_rows.append(event)
+
+    def bulk_insert_pending(self, session: Session) -> None:
+        """Write the pending Events rows with a single executemany insert.
+
+        The session must be flushed first so the pending EventTypes
+        and EventData rows the events link to have their ids.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if pending_rows := self._pending_rows:
+            session.execute(
+                insert(cast(Table, type(pending_rows[0]).__table__)),
+                [
+                    row_to_bulk_insert_params(dbevent, _EVENTS_LINKS)
+                    for dbevent in pending_rows
+                ],
+            )
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to clear the written rows.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_rows.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_rows.clear()
@@ -0,0 +1,134 @@
+"""Support managing the LogbookIndex."""
+
+from __future__ import annotations
+
+from typing import Any, cast
+
+from sqlalchemy import Table, delete, insert
+from sqlalchemy.orm.session import Session
+
+from homeassistant.const import ATTR_ICON, ATTR_UNIT_OF_MEASUREMENT, MATCH_ALL
+from homeassistant.core import Event, EventStateChangedData, State
+
+from ..const import ALWAYS_CONTINUOUS_DOMAINS, CONDITIONALLY_CONTINUOUS_DOMAINS
+from ..db_schema import MAX_LENGTH_LOGBOOK_ICON, LogbookIndex, States
+
+
+def _recorded_attribute(state: State, attribute: str) -> Any:
+    """Return an attribute of a state if the recorder stores it."""
+    if (value := state.attributes.get(attribute)) is None:
+        return None
+    if (state_info := state.state_info) and (
+        attribute in (unrecorded := state_info["unrecorded_attributes"])
+        or (MATCH_ALL in unrecorded and attribute != ATTR_UNIT_OF_MEASUREMENT)
+    ):
+        return None
+    return value
+
+
+def is_logbook_state_change(event: Event[EventStateChangedData]) -> bool:
+    """Check if a state change is shown in the logbook.
+
+    Entities that are added or removed, changes of only the attributes
+    and continuous entities, like sensors with a unit of measurement,
+    are not shown in the logbook.
+    """
+    data = event.data
+    if (old_state := data["old_state"]) is None or (
+        new_state := data["new_state"]
+    ) is None:
+        return False
+    if new_state.state == old_state.state:
+        return False
+    domain = new_state.domain
+    return domain not in ALWAYS_CONTINUOUS_DOMAINS and (
+        domain not in CONDITIONALLY_CONTINUOUS_DOMAINS
+        or _recorded_attribute(new_state, ATTR_UNIT_OF_MEASUREMENT) is None
+    )
+
+
+class LogbookIndexManager:
+    """Manage the logbook_index table."""
+
+    def __init__(self) -> None:
+        """Initialize the logbook index manager."""
+        self._pending_rows: list[tuple[States, str | None]] = []
+
+    def add_pending(self, dbstate: States, event: Event[EventStateChangedData]) -> None:
+        """Add the index row of a States row if the logbook shows it.
+
+        The row is written with bulk_insert_pending once the States
+        row has its state_id.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if (dbstate.old_state is None and dbstate.old_state_id is None) or not (
+            is_logbook_state_change(event)
+        ):
+            return
+        new_state = event.data["new_state"]
+        assert new_state is not None
+        icon = _recorded_attribute(new_state, ATTR_ICON)
+        if not isinstance(icon, str) or len(icon) > MAX_LENGTH_LOGBOOK_ICON:
+            icon = None
+        self._pending_rows.append((dbstate, icon))
+
+    def bulk_insert_pending(self, session: Session) -> None:
+        """Write the pending LogbookIndex rows with a single executemany insert.
+
+        The States rows must be written first so they have their
+        state_id and the StatesMeta rows they link to their metadata_id.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not (pending_rows := self._pending_rows):
+            return
+        session.execute(
+            insert(cast(Table, LogbookIndex.__table__)),
+            [
+                {
+                    "state_id": dbstate.state_id,
+                    "metadata_id": (
+                        dbstate.metadata_id
+                        if (states_meta := dbstate.states_meta_rel) is None
+                        else states_meta.metadata_id
+                    ),
+                    "time_ts": dbstate.last_updated_ts,
+                    "state": dbstate.state,
+                    "icon": icon,
+                    "context_id_bin": dbstate.context_id_bin,
+                    "context_user_id_bin": dbstate.context_user_id_bin,
+                    "context_parent_id_bin": dbstate.context_parent_id_bin,
+                }
+                for dbstate, icon in pending_rows
+            ],
+        )
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to clear the written rows.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_rows.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_rows.clear()
+
+    def clear(self, session: Session) -> None:
+        """Delete all rows of the index.
+
+        The index is cleared when the recorder runs without it so it
+        never has gaps when it is enabled again.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        session.execute(delete(LogbookIndex))
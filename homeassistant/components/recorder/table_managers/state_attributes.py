@@ -40,9 +40,35 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
 
     def serialize_from_event(self, event: Event[EventStateChangedData]) -> bytes | None:
         """Serialize event data."""
+        if shared_attrs := self.shared_attrs_from_event(event):
+            return shared_attrs[0]
+        return None
+
+    def shared_attrs_from_event(
+        self, event: Event[EventStateChangedData]
+    ) -> tuple[bytes, int] | None:
+        """Serialize event data and hash it.
+
+        The result is cached on the new state and reused for later
+        states that share the same attributes object.
+        """
+        dialect = self.recorder.dialect_name
+        if (new_state := event.data["new_state"]) is not None:
+            cached = new_state.recorder_shared_attrs
+            if (
+                cached is None
+                and (old_state := event.data["old_state"]) is not None
+                and old_state.attributes is new_state.attributes
+                and old_state.state_info is new_state.state_info
+            ):
+                cached = new_state.recorder_shared_attrs = (
+                    old_state.recorder_shared_attrs
+                )
+            if cached is not None and cached[0] == dialect:
+                return cached[1], cached[2]
         try:
-            return StateAttributes.shared_attrs_bytes_from_event(
-                event, self.recorder.dialect_name
+            shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
+                event, dialect
             )
         except JSON_ENCODE_EXCEPTIONS as ex:
             _LOGGER.warning(
@@ -51,6 +77,10 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
                 ex,
             )
             return None
+        hash_ = StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes)
+        if new_state is not None:
+            new_state.recorder_shared_attrs = (dialect, shared_attrs_bytes, hash_)
+        return shared_attrs_bytes, hash_
 
     def load(
         self, events: list[Event[EventStateChangedData]], session: Session
@@ -61,9 +91,9 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         recorder thread.
         """
         if hashes := {
-            StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes)
+            shared_attrs[1]
             for event in events
-            if (shared_attrs_bytes := self.serialize_from_event(event))
+            if (shared_attrs := self.shared_attrs_from_event(event))
         }:
             self._load_from_hashes(hashes, session)
 
@@ -2,7 +2,19 @@
 
 from __future__ import annotations
 
+from typing import cast
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm.session import Session
+
 from ..db_schema import States
+from . import row_to_bulk_insert_params
+
+_STATES_LINKS = (
+    ("old_state", "old_state_id", "state_id"),
+    ("states_meta_rel", "metadata_id", "metadata_id"),
+    ("state_attributes", "attributes_id", "attributes_id"),
+)
 
 
 class StatesManager:
@@ -13,6 +25,7 @@ class StatesManager:
         self._pending: dict[str, States] = {}
         self._last_committed_id: dict[str, int] = {}
         self._last_reported: dict[int, float] = {}
+        self._pending_rows: list[States] = []
 
     def pop_pending(self, entity_id: str) -> States | None:
         """Pop a pending state.
@@ -45,6 +58,66 @@ class StatesManager:
         """
         self._pending[entity_id] = state
 
+    def add_pending_row(self, state: States) -> None:
+        """Add a States row to be written by the next bulk insert.
+
+        The row is not added to the session, it is written with
+        bulk_insert_pending when the session is committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_rows.append(state)
+
+    def bulk_insert_pending(self, session: Session) -> None:
+        """Write the pending States rows with executemany inserts.
+
+        The session must be flushed first so the pending StatesMeta
+        and StateAttributes rows the states link to have their ids.
+
+        Rows that link to an old state in the same batch can only be
+        written once the old state has its state_id so the rows are
+        split into generations by the length of the chain that leads
+        to them. Each generation is written with a single executemany
+        insert which returns the state_ids in parameter order.
+
+        Databases that cannot return ids from an executemany insert
+        fall back to adding the rows to the session.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not (pending_rows := self._pending_rows):
+            return
+        dialect = session.get_bind().dialect
+        if not dialect.insert_executemany_returning_sort_by_parameter_order:
+            session.add_all(pending_rows)
+            session.flush()
+            return
+        row_generation: dict[int, int] = {}
+        generations: list[list[States]] = []
+        for dbstate in pending_rows:
+            generation = 0
+            if (old_state := dbstate.old_state) is not None and (
+                old_generation := row_generation.get(id(old_state))
+            ) is not None:
+                generation = old_generation + 1
+            row_generation[id(dbstate)] = generation
+            if generation == len(generations):
+                generations.append([])
+            generations[generation].append(dbstate)
+        # The recorder may be writing an older schema in tests
+        # so the statement is built from the table of the rows
+        table = cast(Table, type(pending_rows[0]).__table__)
+        stmt = insert(table).returning(table.c.state_id, sort_by_parameter_order=True)
+        for rows in generations:
+            state_ids = session.execute(
+                stmt,
+                [row_to_bulk_insert_params(dbstate, _STATES_LINKS) for dbstate in rows],
+            ).scalars()
+            for dbstate, state_id in zip(rows, state_ids, strict=True):
+                dbstate.state_id = state_id
+
     def update_pending_last_reported(
         self, state_id: int, last_reported_timestamp: float
     ) -> None:
@@ -65,6 +138,7 @@ class StatesManager:
             self._last_committed_id[entity_id] = db_states.state_id
         self._pending.clear()
         self._last_reported.clear()
+        self._pending_rows.clear()
 
     def reset(self) -> None:
         """Reset after the database has been reset or changed.
@@ -74,6 +148,7 @@ class StatesManager:
         """
         self._last_committed_id.clear()
         self._pending.clear()
+        self._pending_rows.clear()
 
     def evict_purged_state_ids(self, purged_state_ids: set[int]) -> None:
         """Evict purged states from the committed states.
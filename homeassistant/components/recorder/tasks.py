@@ -9,13 +9,21 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 import threading
+import time
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import Event
 from homeassistant.helpers.typing import UndefinedType
 from homeassistant.util.event_type import EventType
 
 from . import entity_registry, purge, statistics
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    INTEGRATION_PLATFORM_RECORD_STATE,
+    PURGE_PAUSE_BACKLOG,
+    PURGE_PAUSE_SECONDS,
+    PURGE_SLICE_TIME_BUDGET,
+)
 from .db_schema import Statistics, StatisticsShortTerm
 from .models import StatisticData, StatisticMetaData
 from .util import periodic_db_cleanups, session_scope
@@ -103,17 +111,53 @@ class UpdateStatesMetadataTask(RecorderTask):
 
 @dataclass(slots=True)
 class PurgeTask(RecorderTask):
-    """Object to store information about purge task."""
+    """Object to store information about purge task.
+
+    The purge runs in time limited slices. Each slice queues the next
+    one so events are processed in between, and the purge is paused
+    while the recorder queue is backed up.
+    """
 
     purge_before: datetime
     repack: bool
     apply_filter: bool
+    progress: purge.PurgeProgress | None = None
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
-        if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
-        ):
+        if (progress := self.progress) is None:
+            progress = purge.PurgeProgress(
+                self.purge_before, self.repack, self.apply_filter
+            )
+        if instance.backlog >= PURGE_PAUSE_BACKLOG:
+            _LOGGER.debug(
+                "Pausing purge for %s seconds, the recorder queue has %s items",
+                PURGE_PAUSE_SECONDS,
+                instance.backlog,
+            )
+            instance.queue_task_later(
+                PURGE_PAUSE_SECONDS,
+                PurgeTask(
+                    self.purge_before, self.repack, self.apply_filter, self.progress
+                ),
+            )
+            return
+        rows_purged_before_slice = progress.rows_purged
+        slice_start = time.monotonic()
+        finished = purge.purge_old_data(
+            instance,
+            self.purge_before,
+            self.repack,
+            self.apply_filter,
+            progress=progress,
+            time_budget=PURGE_SLICE_TIME_BUDGET,
+        )
+        instance.purge_statistics.add_slice(
+            progress.rows_purged - rows_purged_before_slice,
+            time.monotonic() - slice_start,
+        )
+        if finished:
+            instance.save_purge_progress(None)
             with instance.get_session() as session:
                 instance.recorder_runs_manager.load_from_db(session)
             # We always need to do the db cleanups after a purge
@@ -121,9 +165,12 @@ class PurgeTask(RecorderTask):
             # tasks happen after a vacuum.
             periodic_db_cleanups(instance)
             return
+        if self.progress is None:
+            # Save the purge so it can be resumed after a restart
+            instance.save_purge_progress(progress)
         # Schedule a new purge task if this one didn't finish
         instance.queue_task(
-            PurgeTask(self.purge_before, self.repack, self.apply_filter)
+            PurgeTask(self.purge_before, self.repack, self.apply_filter, progress)
         )
 
 
@@ -291,6 +338,20 @@ class CommitTask(RecorderTask):
         instance._commit_event_session_or_retry()  # noqa: SLF001
 
 
+@dataclass(slots=True)
+class EventBatchTask(RecorderTask):
+    """Process a batch of state changed events."""
+
+    events: list[Event[Any]]
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        for event in self.events:
+            instance._guarded_process_one_task_or_event_or_recover(event)  # noqa: SLF001
+        instance._processed_batch_events += len(self.events) - 1  # noqa: SLF001
+
+
 @dataclass(slots=True)
 class AddRecorderPlatformTask(RecorderTask):
     """Add a recorder platform."""
@@ -306,6 +367,8 @@ class AddRecorderPlatformTask(RecorderTask):
         platform = self.platform
         platforms: dict[str, Any] = hass.data[DOMAIN].recorder_platforms
         platforms[domain] = platform
+        if record_state := getattr(platform, INTEGRATION_PLATFORM_RECORD_STATE, None):
+            instance.record_state_platforms[domain] = record_state
 
 
 @dataclass(slots=True)
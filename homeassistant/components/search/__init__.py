@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Callable, Collection, Iterable
 from enum import StrEnum
 import logging
 from typing import Any
@@ -12,18 +12,27 @@ import voluptuous as vol
 
 from homeassistant.components import automation, group, person, script, websocket_api
 from homeassistant.components.homeassistant import scene
-from homeassistant.core import HomeAssistant, callback, split_entity_id
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+    split_entity_id,
+)
 from homeassistant.helpers import (
     area_registry as ar,
     config_validation as cv,
     device_registry as dr,
     entity_registry as er,
+    target_index,
 )
 from homeassistant.helpers.entity import (
     EntityInfo,
     entity_sources as get_entity_sources,
 )
+from homeassistant.helpers.event import TrackStates, async_track_state_change_filtered
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.hass_dict import HassKey
 
 DOMAIN = "search"
 _LOGGER = logging.getLogger(__name__)
@@ -51,12 +60,138 @@ class ItemType(StrEnum):
     SCRIPT_BLUEPRINT = "script_blueprint"
 
 
+DATA_REFERENCE_GRAPH: HassKey[ReferenceGraph] = HassKey(f"{DOMAIN}_reference_graph")
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Search component."""
+    hass.data[DATA_REFERENCE_GRAPH] = ReferenceGraph(hass)
     websocket_api.async_register_command(hass, websocket_search_related)
     return True
 
 
+def _blueprint_in_automation(hass: HomeAssistant, entity_id: str) -> list[str]:
+    """Return the blueprint used in an automation."""
+    if (blueprint := automation.blueprint_in_automation(hass, entity_id)) is None:
+        return []
+    return [blueprint]
+
+
+def _blueprint_in_script(hass: HomeAssistant, entity_id: str) -> list[str]:
+    """Return the blueprint used in a script."""
+    if (blueprint := script.blueprint_in_script(hass, entity_id)) is None:
+        return []
+    return [blueprint]
+
+
+# The items each type of source references
+_SOURCE_REFERENCES: dict[
+    ItemType, tuple[tuple[ItemType, Callable[[HomeAssistant, str], Iterable[str]]], ...]
+] = {
+    ItemType.AUTOMATION: (
+        (ItemType.ENTITY, automation.entities_in_automation),
+        (ItemType.DEVICE, automation.devices_in_automation),
+        (ItemType.AREA, automation.areas_in_automation),
+        (ItemType.FLOOR, automation.floors_in_automation),
+        (ItemType.LABEL, automation.labels_in_automation),
+        (ItemType.AUTOMATION_BLUEPRINT, _blueprint_in_automation),
+    ),
+    ItemType.SCRIPT: (
+        (ItemType.ENTITY, script.entities_in_script),
+        (ItemType.DEVICE, script.devices_in_script),
+        (ItemType.AREA, script.areas_in_script),
+        (ItemType.FLOOR, script.floors_in_script),
+        (ItemType.LABEL, script.labels_in_script),
+        (ItemType.SCRIPT_BLUEPRINT, _blueprint_in_script),
+    ),
+    ItemType.SCENE: ((ItemType.ENTITY, scene.entities_in_scene),),
+    ItemType.GROUP: ((ItemType.ENTITY, group.get_entity_ids),),
+    ItemType.PERSON: ((ItemType.ENTITY, person.entities_in_person),),
+}
+
+_EMPTY: frozenset[str] = frozenset()
+
+
+class ReferenceGraph:
+    """Maintain which automations, scripts, scenes, groups and persons reference items.
+
+    The references of a source are read from its entity once and
+    kept until the state of the source changes. Reloading the
+    configuration of a source replaces its entity and changing the
+    members of a group or person updates its state, so only the
+    sources which changed since the last lookup are read again.
+    Finding the sources referencing an item is then a single lookup
+    instead of checking every source.
+
+    The graph is built on the first lookup so it costs nothing
+    until it is used. All methods must be called from the event loop.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the reference graph."""
+        self.hass = hass
+        self._references: dict[str, set[tuple[ItemType, str]]] = {}
+        self._sources: dict[tuple[ItemType, ItemType, str], set[str]] = {}
+        self._dirty: set[str] = set()
+        self._listening = False
+
+    @callback
+    def async_sources(
+        self, source_type: ItemType, item_type: ItemType, item_id: str
+    ) -> Collection[str]:
+        """Return the sources of a type which reference an item.
+
+        The returned collection must not be modified.
+        """
+        if self._dirty or not self._listening:
+            self._async_update()
+        return self._sources.get((source_type, item_type, item_id), _EMPTY)
+
+    @callback
+    def _async_update(self) -> None:
+        """Update the references of the sources which changed."""
+        if not self._listening:
+            self._listening = True
+            async_track_state_change_filtered(
+                self.hass,
+                TrackStates(
+                    False, set(), {str(domain) for domain in _SOURCE_REFERENCES}
+                ),
+                self._async_source_changed,
+            )
+            self._dirty.update(self.hass.states.async_entity_ids(_SOURCE_REFERENCES))
+        for entity_id in self._dirty:
+            self._async_update_source(entity_id)
+        self._dirty.clear()
+
+    @callback
+    def _async_update_source(self, entity_id: str) -> None:
+        """Replace the references of a source."""
+        source_type = ItemType(split_entity_id(entity_id)[0])
+        sources = self._sources
+        for item_type, item_id in self._references.pop(entity_id, ()):
+            key = (source_type, item_type, item_id)
+            sources[key].discard(entity_id)
+            if not sources[key]:
+                del sources[key]
+
+        references = {
+            (item_type, item_id)
+            for item_type, get_items in _SOURCE_REFERENCES[source_type]
+            for item_id in get_items(self.hass, entity_id)
+        }
+        if not references:
+            return
+        self._references[entity_id] = references
+        for item_type, item_id in references:
+            sources.setdefault((source_type, item_type, item_id), set()).add(entity_id)
+
+    @callback
+    def _async_source_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Mark a source to update its references on the next lookup."""
+        self._dirty.add(event.data["entity_id"])
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "search/related",
@@ -92,6 +227,8 @@ class Searcher:
         self._area_registry = ar.async_get(hass)
         self._device_registry = dr.async_get(hass)
         self._entity_registry = er.async_get(hass)
+        self._target_index = target_index.async_get(hass)
+        self._reference_graph = hass.data[DATA_REFERENCE_GRAPH]
         self._entity_sources = entity_sources
         self.results: defaultdict[ItemType, set[str]] = defaultdict(set)
 
@@ -119,6 +256,16 @@ class Searcher:
         else:
             self.results[item_type].update(item_id)
 
+    @callback
+    def _add_sources(
+        self, source_type: ItemType, item_type: ItemType, item_id: str
+    ) -> None:
+        """Add the sources of a type which reference an item to the results."""
+        self._add(
+            source_type,
+            self._reference_graph.async_sources(source_type, item_type, item_id),
+        )
+
     @callback
     def _async_search_area(self, area_id: str, *, entry_point: bool = True) -> None:
         """Find results for an area."""
@@ -130,15 +277,10 @@ class Searcher:
             self._add(ItemType.LABEL, area_entry.labels)
 
         # Automations referencing this area
-        self._add(
-            ItemType.AUTOMATION, automation.automations_with_area(self.hass, area_id)
-        )
+        self._add_sources(ItemType.AUTOMATION, ItemType.AREA, area_id)
 
         # Scripts referencing this area
-        self._add(ItemType.SCRIPT, script.scripts_with_area(self.hass, area_id))
-
-        # Entity in this area, will extend this with the entities of the devices in this area
-        entity_entries = er.async_entries_for_area(self._entity_registry, area_id)
+        self._add_sources(ItemType.SCRIPT, ItemType.AREA, area_id)
 
         # Devices in this area
         for device in dr.async_entries_for_area(self._device_registry, area_id):
@@ -149,25 +291,16 @@ class Searcher:
                 self._add(ItemType.CONFIG_ENTRY, device_entry.config_entries)
 
             # Automations referencing this device
-            self._add(
-                ItemType.AUTOMATION,
-                automation.automations_with_device(self.hass, device.id),
-            )
+            self._add_sources(ItemType.AUTOMATION, ItemType.DEVICE, device.id)
 
             # Scripts referencing this device
-            self._add(ItemType.SCRIPT, script.scripts_with_device(self.hass, device.id))
+            self._add_sources(ItemType.SCRIPT, ItemType.DEVICE, device.id)
 
-            # Entities of this device
-            for entity_entry in er.async_entries_for_device(
-                self._entity_registry, device.id
-            ):
-                # Skip the entity if it's in a different area
-                if entity_entry.area_id is not None:
-                    continue
-                entity_entries.append(entity_entry)
-
-        # Process entities in this area
-        for entity_entry in entity_entries:
+        # Process entities in this area, including the entities of the
+        # devices in this area which are not in a different area
+        for entity_id in self._target_index.async_area_entities(area_id):
+            if not (entity_entry := self._entity_registry.async_get(entity_id)):
+                continue
             self._add(ItemType.ENTITY, entity_entry.entity_id)
 
             # If this entity also exists as a resource, we add it.
@@ -175,34 +308,21 @@ class Searcher:
                 self._add(ItemType(entity_entry.domain), entity_entry.entity_id)
 
             # Automations referencing this entity
-            self._add(
-                ItemType.AUTOMATION,
-                automation.automations_with_entity(self.hass, entity_entry.entity_id),
+            self._add_sources(
+                ItemType.AUTOMATION, ItemType.ENTITY, entity_entry.entity_id
             )
 
             # Scripts referencing this entity
-            self._add(
-                ItemType.SCRIPT,
-                script.scripts_with_entity(self.hass, entity_entry.entity_id),
-            )
+            self._add_sources(ItemType.SCRIPT, ItemType.ENTITY, entity_entry.entity_id)
 
             # Groups that have this entity as a member
-            self._add(
-                ItemType.GROUP,
-                group.groups_with_entity(self.hass, entity_entry.entity_id),
-            )
+            self._add_sources(ItemType.GROUP, ItemType.ENTITY, entity_entry.entity_id)
 
             # Persons that use this entity
-            self._add(
-                ItemType.PERSON,
-                person.persons_with_entity(self.hass, entity_entry.entity_id),
-            )
+            self._add_sources(ItemType.PERSON, ItemType.ENTITY, entity_entry.entity_id)
 
             # Scenes that reference this entity
-            self._add(
-                ItemType.SCENE,
-                scene.scenes_with_entity(self.hass, entity_entry.entity_id),
-            )
+            self._add_sources(ItemType.SCENE, ItemType.ENTITY, entity_entry.entity_id)
 
             # Config entries for entities in this area
             self._add(ItemType.CONFIG_ENTRY, entity_entry.config_entry_id)
@@ -271,9 +391,8 @@ class Searcher:
     @callback
     def _async_search_automation_blueprint(self, blueprint_path: str) -> None:
         """Find results for an automation blueprint."""
-        self._add(
-            ItemType.AUTOMATION,
-            automation.automations_with_blueprint(self.hass, blueprint_path),
+        self._add_sources(
+            ItemType.AUTOMATION, ItemType.AUTOMATION_BLUEPRINT, blueprint_path
         )
 
     @callback
@@ -302,13 +421,10 @@ class Searcher:
             self._add(ItemType.LABEL, device_entry.labels)
 
         # Automations referencing this device
-        self._add(
-            ItemType.AUTOMATION,
-            automation.automations_with_device(self.hass, device_id),
-        )
+        self._add_sources(ItemType.AUTOMATION, ItemType.DEVICE, device_id)
 
         # Scripts referencing this device
-        self._add(ItemType.SCRIPT, script.scripts_with_device(self.hass, device_id))
+        self._add_sources(ItemType.SCRIPT, ItemType.DEVICE, device_id)
 
         # Entities of this device
         for entity_entry in er.async_entries_for_device(
@@ -329,38 +445,32 @@ class Searcher:
             self._add(ItemType.LABEL, entity_entry.labels)
 
         # Automations referencing this entity
-        self._add(
-            ItemType.AUTOMATION,
-            automation.automations_with_entity(self.hass, entity_id),
-        )
+        self._add_sources(ItemType.AUTOMATION, ItemType.ENTITY, entity_id)
 
         # Scripts referencing this entity
-        self._add(ItemType.SCRIPT, script.scripts_with_entity(self.hass, entity_id))
+        self._add_sources(ItemType.SCRIPT, ItemType.ENTITY, entity_id)
 
         # Groups that have this entity as a member
-        self._add(ItemType.GROUP, group.groups_with_entity(self.hass, entity_id))
+        self._add_sources(ItemType.GROUP, ItemType.ENTITY, entity_id)
 
         # Persons referencing this entity
-        self._add(ItemType.PERSON, person.persons_with_entity(self.hass, entity_id))
+        self._add_sources(ItemType.PERSON, ItemType.ENTITY, entity_id)
 
         # Scenes referencing this entity
-        self._add(ItemType.SCENE, scene.scenes_with_entity(self.hass, entity_id))
+        self._add_sources(ItemType.SCENE, ItemType.ENTITY, entity_id)
 
     @callback
     def _async_search_floor(self, floor_id: str) -> None:
         """Find results for a floor."""
         # Automations referencing this floor
-        self._add(
-            ItemType.AUTOMATION,
-            automation.automations_with_floor(self.hass, floor_id),
-        )
+        self._add_sources(ItemType.AUTOMATION, ItemType.FLOOR, floor_id)
 
         # Scripts referencing this floor
-        self._add(ItemType.SCRIPT, script.scripts_with_floor(self.hass, floor_id))
+        self._add_sources(ItemType.SCRIPT, ItemType.FLOOR, floor_id)
 
-        for area_entry in ar.async_entries_for_floor(self._area_registry, floor_id):
-            self._add(ItemType.AREA, area_entry.id)
-            self._async_search_area(area_entry.id, entry_point=False)
+        for area_id in self._target_index.async_floor_areas(floor_id):
+            self._add(ItemType.AREA, area_id)
+            self._async_search_area(area_id, entry_point=False)
 
     @callback
     def _async_search_group(self, group_entity_id: str) -> None:
@@ -370,18 +480,13 @@ class Searcher:
         we don't look up the area/floor for a group entity.
         """
         # Automations referencing this group
-        self._add(
-            ItemType.AUTOMATION,
-            automation.automations_with_entity(self.hass, group_entity_id),
-        )
+        self._add_sources(ItemType.AUTOMATION, ItemType.ENTITY, group_entity_id)
 
         # Scripts referencing this group
-        self._add(
-            ItemType.SCRIPT, script.scripts_with_entity(self.hass, group_entity_id)
-        )
+        self._add_sources(ItemType.SCRIPT, ItemType.ENTITY, group_entity_id)
 
         # Scenes that reference this group
-        self._add(ItemType.SCENE, scene.scenes_with_entity(self.hass, group_entity_id))
+        self._add_sources(ItemType.SCENE, ItemType.ENTITY, group_entity_id)
 
         # Entities in this group
         for entity_id in group.get_entity_ids(self.hass, group_entity_id):
@@ -401,22 +506,19 @@ class Searcher:
             self._add(ItemType.DEVICE, device.id)
 
         # Entities with this label
-        for entity_entry in er.async_entries_for_label(self._entity_registry, label_id):
-            self._add(ItemType.ENTITY, entity_entry.entity_id)
+        for entity_id in self._target_index.async_label_entities(label_id):
+            self._add(ItemType.ENTITY, entity_id)
 
             # If this entity also exists as a resource, we add it.
-            domain = split_entity_id(entity_entry.entity_id)[0]
+            domain = split_entity_id(entity_id)[0]
             if domain in self.EXIST_AS_ENTITY:
-                self._add(ItemType(domain), entity_entry.entity_id)
+                self._add(ItemType(domain), entity_id)
 
         # Automations referencing this label
-        self._add(
-            ItemType.AUTOMATION,
-            automation.automations_with_label(self.hass, label_id),
-        )
+        self._add_sources(ItemType.AUTOMATION, ItemType.LABEL, label_id)
 
         # Scripts referencing this label
-        self._add(ItemType.SCRIPT, script.scripts_with_label(self.hass, label_id))
+        self._add_sources(ItemType.SCRIPT, ItemType.LABEL, label_id)
 
     @callback
     def _async_search_person(self, person_entity_id: str) -> None:
@@ -427,15 +529,10 @@ class Searcher:
             self._add(ItemType.LABEL, entity_entry.labels)
 
         # Automations referencing this person
-        self._add(
-            ItemType.AUTOMATION,
-            automation.automations_with_entity(self.hass, person_entity_id),
-        )
+        self._add_sources(ItemType.AUTOMATION, ItemType.ENTITY, person_entity_id)
 
         # Scripts referencing this person
-        self._add(
-            ItemType.SCRIPT, script.scripts_with_entity(self.hass, person_entity_id)
-        )
+        self._add_sources(ItemType.SCRIPT, ItemType.ENTITY, person_entity_id)
 
         # Add all member entities of this person
         self._add(
@@ -451,15 +548,10 @@ class Searcher:
             self._add(ItemType.LABEL, entity_entry.labels)
 
         # Automations referencing this scene
-        self._add(
-            ItemType.AUTOMATION,
-            automation.automations_with_entity(self.hass, scene_entity_id),
-        )
+        self._add_sources(ItemType.AUTOMATION, ItemType.ENTITY, scene_entity_id)
 
         # Scripts referencing this scene
-        self._add(
-            ItemType.SCRIPT, script.scripts_with_entity(self.hass, scene_entity_id)
-        )
+        self._add_sources(ItemType.SCRIPT, ItemType.ENTITY, scene_entity_id)
 
         # Add all entities in this scene
         for entity in scene.entities_in_scene(self.hass, scene_entity_id):
@@ -529,9 +621,7 @@ class Searcher:
     @callback
     def _async_search_script_blueprint(self, blueprint_path: str) -> None:
         """Find results for a script blueprint."""
-        self._add(
-            ItemType.SCRIPT, script.scripts_with_blueprint(self.hass, blueprint_path)
-        )
+        self._add_sources(ItemType.SCRIPT, ItemType.SCRIPT_BLUEPRINT, blueprint_path)
 
     @callback
     def _async_resolve_up_device(self, device_id: str) -> dr.DeviceEntry | None:
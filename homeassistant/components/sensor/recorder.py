@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import defaultdict
 from collections.abc import Callable, Iterable
 import datetime
@@ -36,6 +37,7 @@ from homeassistant.helpers.entity import entity_sources
 from homeassistant.loader import async_suggest_report_issue
 from homeassistant.util import dt as dt_util
 from homeassistant.util.enum import try_parse_enum
+from homeassistant.util.hass_dict import HassKey
 
 from .const import (
     ATTR_LAST_RESET,
@@ -73,6 +75,108 @@ WARN_UNSTABLE_UNIT = "sensor_warn_unstable_unit"
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
 
+DATA_RECORDED_STATES: HassKey[RecordedStates] = HassKey(
+    "sensor_statistics_recorded_states"
+)
+
+
+def _last_updated(state: State) -> datetime.datetime:
+    """Return when a state was last updated."""
+    return state.last_updated
+
+
+class RecordedStates:
+    """Keep the states of sensors as they are recorded.
+
+    The states recorded since the start of the period that will be
+    compiled next are kept per sensor, along with the state the sensor
+    had when that period started. compile_statistics uses them instead
+    of reading the history of the period from the database.
+
+    A sensor's states are only known once a state was recorded before
+    the start of a period or a compiled period seeded the state it had
+    at its end. Until then, for example after a restart, the history is
+    read from the database.
+
+    This class is only accessed from the recorder thread.
+    """
+
+    def __init__(self, first_recorded: datetime.datetime) -> None:
+        """Initialize the recorded states.
+
+        All states last updated at or after first_recorded are passed
+        to record.
+        """
+        self._first_recorded = first_recorded
+        self._states: dict[str, list[State]] = {}
+
+    def record(self, state: State) -> None:
+        """Record a state."""
+        if (states := self._states.get(state.entity_id)) is None:
+            self._states[state.entity_id] = [state]
+        else:
+            states.append(state)
+
+    def history(
+        self,
+        entity_id: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        significant_changes_only: bool,
+    ) -> list[State] | None:
+        """Return the history of a sensor during start-end.
+
+        The history starts with the state the sensor had at start like
+        the history read from the database. Returns None if the states
+        of the sensor during start-end are not known.
+        """
+        states = self._states.get(entity_id)
+        if not states or states[0].last_updated >= start:
+            return None
+        idx = bisect_left(states, start, key=_last_updated)
+        history = [states[idx - 1]]
+        for state in itertools.islice(states, idx, None):
+            if state.last_updated >= end:
+                break
+            if significant_changes_only and state.last_changed != state.last_updated:
+                continue
+            history.append(state)
+        return history
+
+    def seed(self, entity_id: str, state: State, end: datetime.datetime) -> None:
+        """Seed the state a sensor had at the end of a compiled period.
+
+        The state is only kept if all states recorded after it are known.
+        """
+        if self._first_recorded > end:
+            return
+        if (states := self._states.get(entity_id)) is None:
+            self._states[entity_id] = [state]
+        elif states[0].last_updated >= end:
+            states.insert(0, state)
+
+    def compiled(self, entity_ids: set[str], end: datetime.datetime) -> None:
+        """Drop the states that are no longer needed after compiling a period.
+
+        The state each sensor had at the end of the period is kept.
+        """
+        for entity_id in list(self._states):
+            if entity_id not in entity_ids:
+                del self._states[entity_id]
+                continue
+            states = self._states[entity_id]
+            if (idx := bisect_left(states, end, key=_last_updated)) > 1:
+                del states[: idx - 1]
+
+
+def record_state(hass: HomeAssistant, state: State) -> None:
+    """Record the state of a sensor as it is written to the database."""
+    if (recorded_states := hass.data.get(DATA_RECORDED_STATES)) is None:
+        recorded_states = hass.data[DATA_RECORDED_STATES] = RecordedStates(
+            state.last_updated
+        )
+    recorded_states.record(state)
+
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     """Get the current state of all sensors for which to compile statistics."""
@@ -399,13 +503,30 @@ def compile_statistics(  # noqa: C901
 
     sensor_states = _get_sensor_states(hass)
     wanted_statistics = _wanted_statistics(sensor_states)
-    # Get history between start and end
+    # Use the recorded states of sensors that are known during start-end
+    history_list: dict[str, list[State]] = {}
+    recorded_states = hass.data.get(DATA_RECORDED_STATES)
+    if recorded_states is not None:
+        for _state in sensor_states:
+            entity_id = _state.entity_id
+            if (
+                entity_history := recorded_states.history(
+                    entity_id,
+                    start,
+                    end,
+                    "sum" not in wanted_statistics[entity_id],
+                )
+            ) is not None:
+                history_list[entity_id] = entity_history
+    # Get history between start and end for the other sensors
     entities_full_history = [
-        i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
+        i.entity_id
+        for i in sensor_states
+        if "sum" in wanted_statistics[i.entity_id] and i.entity_id not in history_list
     ]
-    history_list: dict[str, list[State]] = {}
+    db_history_list: dict[str, list[State]] = {}
     if entities_full_history:
-        history_list = history.get_full_significant_states_with_session(
+        db_history_list = history.get_full_significant_states_with_session(
             hass,
             session,
             start - datetime.timedelta.resolution,
@@ -417,6 +538,7 @@ def compile_statistics(  # noqa: C901
         i.entity_id
         for i in sensor_states
         if "sum" not in wanted_statistics[i.entity_id]
+        and i.entity_id not in history_list
     ]
     if entities_significant_history:
         _history_list = history.get_full_significant_states_with_session(
@@ -426,14 +548,25 @@ def compile_statistics(  # noqa: C901
             end,
             entity_ids=entities_significant_history,
         )
-        history_list = {**history_list, **_history_list}
+        db_history_list = {**db_history_list, **_history_list}
 
     entities_with_float_states: dict[str, list[tuple[float, State]]] = {}
     for _state in sensor_states:
         entity_id = _state.entity_id
-        # If there are no recent state changes, the sensor's state may already be pruned
-        # from the recorder. Get the state from the state machine instead.
-        if not (entity_history := history_list.get(entity_id, [_state])):
+        if entity_id in history_list:
+            entity_history = history_list[entity_id]
+        else:
+            # If there are no recent state changes, the sensor's state may already
+            # be pruned from the recorder. Get the state from the state machine
+            # instead.
+            entity_history = db_history_list.get(entity_id, [_state])
+            if (
+                recorded_states is not None
+                and entity_history
+                and entity_history[-1].last_updated < end
+            ):
+                recorded_states.seed(entity_id, entity_history[-1], end)
+        if not entity_history:
             continue
         if not (float_states := _entity_history_to_float_and_state(entity_history)):
             continue
@@ -626,6 +759,9 @@ def compile_statistics(  # noqa: C901
 
         result.append({"meta": meta, "stat": stat})
 
+    if recorded_states is not None:
+        recorded_states.compiled({_state.entity_id for _state in sensor_states}, end)
+
     return statistics.PlatformCompiledStatistics(result, old_metadatas)
 
 
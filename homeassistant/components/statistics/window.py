@@ -0,0 +1,234 @@
+"""Sliding window of samples with incrementally maintained aggregates."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import datetime
+import math
+
+# Aggregates that are updated by subtracting evicted samples slowly
+# drift from the exact value. They are recomputed from the samples
+# after this many evictions or the window size if that is larger
+# which keeps the cost amortized O(1) per sample.
+MIN_EVICTIONS_BEFORE_REBUILD = 1000
+
+
+def _difference_nonnegative(previous: float, value: float) -> float:
+    """Return the difference between two samples of a counter that may reset."""
+    return value - previous if value >= previous else value
+
+
+class StatisticsWindow:
+    """A window of samples with incrementally maintained aggregates.
+
+    Samples are appended at the end and evicted from the front, either
+    because the window is full or because they are too old. All
+    aggregates are updated for each appended and evicted sample so the
+    characteristics can be read without scanning the samples:
+
+    - sums over the samples and over pairs of consecutive samples
+    - Welford's running mean and sum of squared deviations
+    - monotonic deques for the minimum and maximum
+    - a sorted copy of the samples for the median and percentiles
+
+    The sorted copy is only kept when order_statistics is set. It uses
+    a binary search to insert and evict a sample which only moves a
+    contiguous block of pointers instead of sorting all samples.
+    """
+
+    def __init__(self, maxlen: int | None, order_statistics: bool) -> None:
+        """Initialize the window."""
+        self.maxlen = maxlen
+        self.states: deque[float | bool] = deque()
+        self.ages: deque[datetime] = deque()
+        self.sorted_states: list[float | bool] | None = [] if order_statistics else None
+        # (sequence, value, age) of the samples that can still become
+        # the maximum or minimum, oldest first
+        self._max: deque[tuple[int, float | bool, datetime]] = deque()
+        self._min: deque[tuple[int, float | bool, datetime]] = deque()
+        self._first_seq = 0
+        self._next_seq = 0
+        self._evictions = 0
+        self.sum: float = 0
+        self.sin_sum: float = 0
+        self.cos_sum: float = 0
+        self.welford_mean: float = 0
+        self.welford_m2: float = 0
+        self.sum_differences: float = 0
+        self.sum_differences_nonnegative: float = 0
+        self.area_linear: float = 0
+        self.area_step: float = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self.states)
+
+    def append(self, value: float | bool, age: datetime) -> None:
+        """Append a sample, evicting the oldest sample if the window is full.
+
+        Non-finite samples raise ValueError before the window is changed
+        because they would poison the incremental aggregates.
+        """
+        if not math.isfinite(value):
+            raise ValueError(f"Sample {value} is not finite")
+        radians = math.radians(value)
+        sin = math.sin(radians)
+        cos = math.cos(radians)
+        if self.maxlen is not None and len(self.states) >= self.maxlen:
+            self.popleft()
+        states = self.states
+        if states:
+            self._add_pair(states[-1], self.ages[-1], value, age)
+        states.append(value)
+        self.ages.append(age)
+        self.sum += value
+        self.sin_sum += sin
+        self.cos_sum += cos
+        delta = value - self.welford_mean
+        self.welford_mean += delta / len(states)
+        self.welford_m2 += delta * (value - self.welford_mean)
+        if self.sorted_states is not None:
+            insort(self.sorted_states, value)
+        seq = self._next_seq
+        self._next_seq += 1
+        maximums = self._max
+        while maximums and maximums[-1][1] < value:
+            maximums.pop()
+        maximums.append((seq, value, age))
+        minimums = self._min
+        while minimums and minimums[-1][1] > value:
+            minimums.pop()
+        minimums.append((seq, value, age))
+
+    def popleft(self) -> None:
+        """Evict the oldest sample."""
+        states = self.states
+        value = states.popleft()
+        age = self.ages.popleft()
+        seq = self._first_seq
+        self._first_seq += 1
+        if not states:
+            self._reset_aggregates()
+            return
+        radians = math.radians(value)
+        sin = math.sin(radians)
+        cos = math.cos(radians)
+        self._remove_pair(value, age, states[0], self.ages[0])
+        self.sum -= value
+        self.sin_sum -= sin
+        self.cos_sum -= cos
+        delta = value - self.welford_mean
+        self.welford_mean -= delta / len(states)
+        self.welford_m2 -= delta * (value - self.welford_mean)
+        if self.sorted_states is not None:
+            del self.sorted_states[bisect_left(self.sorted_states, value)]
+        if self._max[0][0] == seq:
+            self._max.popleft()
+        if self._min[0][0] == seq:
+            self._min.popleft()
+        self._evictions += 1
+        if self._evictions >= max(len(states), MIN_EVICTIONS_BEFORE_REBUILD):
+            self._rebuild()
+
+    @property
+    def maximum(self) -> tuple[float | bool, datetime]:
+        """Return the maximum value and the age of its oldest sample."""
+        _, value, age = self._max[0]
+        return value, age
+
+    @property
+    def minimum(self) -> tuple[float | bool, datetime]:
+        """Return the minimum value and the age of its oldest sample."""
+        _, value, age = self._min[0]
+        return value, age
+
+    @property
+    def variance(self) -> float:
+        """Return the sample variance, at least two samples are required."""
+        return max(self.welford_m2, 0) / (len(self.states) - 1)
+
+    def median(self) -> float:
+        """Return the median like statistics.median."""
+        assert self.sorted_states is not None
+        data = self.sorted_states
+        count = len(data)
+        idx = count // 2
+        if count % 2 == 1:
+            return data[idx]
+        return (data[idx - 1] + data[idx]) / 2
+
+    def percentile(self, percentile: int) -> float:
+        """Return a percentile like statistics.quantiles with the exclusive method.
+
+        At least two samples are required.
+        """
+        assert self.sorted_states is not None
+        data = self.sorted_states
+        count = len(data)
+        m = count + 1
+        j = percentile * m // 100
+        j = max(1, min(j, count - 1))
+        delta = percentile * m - j * 100
+        return (data[j - 1] * (100 - delta) + data[j] * delta) / 100
+
+    def _add_pair(
+        self,
+        previous: float | bool,
+        previous_age: datetime,
+        value: float | bool,
+        age: datetime,
+    ) -> None:
+        """Add the aggregates of a pair of consecutive samples."""
+        seconds = (age - previous_age).total_seconds()
+        self.sum_differences += abs(value - previous)
+        self.sum_differences_nonnegative += _difference_nonnegative(previous, value)
+        self.area_linear += 0.5 * (value + previous) * seconds
+        self.area_step += previous * seconds
+
+    def _remove_pair(
+        self,
+        previous: float | bool,
+        previous_age: datetime,
+        value: float | bool,
+        age: datetime,
+    ) -> None:
+        """Remove the aggregates of a pair of consecutive samples."""
+        seconds = (age - previous_age).total_seconds()
+        self.sum_differences -= abs(value - previous)
+        self.sum_differences_nonnegative -= _difference_nonnegative(previous, value)
+        self.area_linear -= 0.5 * (value + previous) * seconds
+        self.area_step -= previous * seconds
+
+    def _reset_aggregates(self) -> None:
+        """Reset the aggregates of an empty window."""
+        self._evictions = 0
+        self.sum = 0
+        self.sin_sum = self.cos_sum = 0
+        self.welford_mean = self.welford_m2 = 0
+        self.sum_differences = self.sum_differences_nonnegative = 0
+        self.area_linear = self.area_step = 0
+        self._max.clear()
+        self._min.clear()
+        if self.sorted_states is not None:
+            self.sorted_states.clear()
+
+    def _rebuild(self) -> None:
+        """Recompute the aggregates that drift from the samples."""
+        states = self.states
+        ages = self.ages
+        self._evictions = 0
+        self.sum = sum(states)
+        self.sin_sum = sum(math.sin(math.radians(value)) for value in states)
+        self.cos_sum = sum(math.cos(math.radians(value)) for value in states)
+        self.welford_mean = mean = self.sum / len(states)
+        self.welford_m2 = sum((value - mean) ** 2 for value in states)
+        self.sum_differences = self.sum_differences_nonnegative = 0
+        self.area_linear = self.area_step = 0
+        previous: float | bool | None = None
+        previous_age = ages[0]
+        for value, age in zip(states, ages, strict=True):
+            if previous is not None:
+                self._add_pair(previous, previous_age, value, age)
+            previous = value
+            previous_age = age
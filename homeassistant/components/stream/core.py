@@ -77,8 +77,8 @@ class Part:
 
     duration: float
     has_keyframe: bool
-    # video data (moof+mdat)
-    data: bytes
+    # video data (moof+mdat), a view of the segment data once it is complete
+    data: bytes | memoryview
 
 
 @dataclass(slots=True)
@@ -102,6 +102,8 @@ class Segment:
     hls_num_parts_rendered: int = 0
     # Set to true when all the parts are rendered
     hls_playlist_complete: bool = False
+    # The data of all parts in one contiguous buffer once the segment is complete
+    _data: memoryview | None = None
 
     def __post_init__(self) -> None:
         """Run after init."""
@@ -121,6 +123,8 @@ class Segment:
     @property
     def data_size(self) -> int:
         """Return the size of all part data without init in bytes."""
+        if self._data is not None:
+            return len(self._data)
         return sum(len(part.data) for part in self.parts)
 
     @callback
@@ -128,19 +132,46 @@ class Segment:
         self,
         part: Part,
         duration: float,
+        data: memoryview | None = None,
     ) -> None:
         """Add a part to the Segment.
 
-        Duration is non zero only for the last part.
+        Duration is non zero only for the last part. The data of all parts
+        may be passed with the last part to avoid joining the parts.
         """
         self.parts.append(part)
         self.duration = duration
+        if data is not None:
+            self._set_data(data)
         for output in self._stream_outputs:
             output.part_put()
 
-    def get_data(self) -> bytes:
-        """Return reconstructed data for all parts as bytes, without init."""
-        return b"".join([part.data for part in self.parts])
+    def _set_data(self, data: memoryview) -> None:
+        """Keep the data of all parts in one contiguous buffer.
+
+        The parts are replaced by views of the buffer so the data is
+        only kept once.
+        """
+        position = 0
+        for part in self.parts:
+            size = len(part.data)
+            part.data = data[position : position + size]
+            position += size
+        self._data = data
+
+    def get_data(self) -> bytes | memoryview:
+        """Return reconstructed data for all parts, without init.
+
+        The data of a complete segment is joined once and returned as a
+        view of the contiguous buffer, so it is not copied per request.
+        """
+        if self._data is not None:
+            return self._data
+        if not self.complete:
+            return b"".join([part.data for part in self.parts])
+        data = memoryview(b"".join([part.data for part in self.parts]))
+        self._set_data(data)
+        return data
 
     def _render_hls_template(self, last_stream_id: int, render_parts: bool) -> str:
         """Render the HLS playlist section for the Segment.
@@ -420,13 +451,15 @@ class KeyFrameConverter:
     """Enables generating and getting an image from the last keyframe seen in the stream.
 
     An overview of the thread and state interaction:
-        the worker thread sets a packet
+        the worker thread sets a packet and increments the keyframe sequence
         get_image is called from the main asyncio loop
-        get_image schedules _generate_image in an executor thread
+        get_image returns the cached image if the keyframe was already converted
+        otherwise get_image schedules _generate_image in an executor thread
         _generate_image will try to create an image from the packet
-        _generate_image will clear the packet, so there will only be one attempt per packet
-    If successful, self._image will be updated and returned by get_image
-    If unsuccessful, get_image will return the previous image
+    The images of the last keyframe are cached by size and orientation, so all
+    image requests until the next keyframe share one decode and JPEG encode.
+    There is only one attempt to decode each packet. If unsuccessful, get_image
+    will return the previous image.
     """
 
     def __init__(
@@ -442,10 +475,16 @@ class KeyFrameConverter:
         # pylint: disable-next=import-outside-toplevel
         from homeassistant.components.camera.img_util import TurboJPEGSingleton
 
-        self._packet: Packet = None
+        # The sequence of the last keyframe and its packet
+        self._keyframe: tuple[int, Packet] | None = None
+        self._keyframe_sequence = 0
         self._event: asyncio.Event = asyncio.Event()
         self._hass = hass
         self._image: bytes | None = None
+        # The images of the keyframe with _images_sequence by size and orientation
+        self._images: dict[tuple[int | None, int | None, int], bytes] = {}
+        self._images_sequence = 0
+        self._decode_failed = False
         self._turbojpeg = TurboJPEGSingleton.instance()
         self._lock = asyncio.Lock()
         self._codec_context: CodecContext | None = None
@@ -457,7 +496,8 @@ class KeyFrameConverter:
 
         This is called from the worker thread.
         """
-        self._packet = packet
+        self._keyframe_sequence += 1
+        self._keyframe = (self._keyframe_sequence, packet)
         self._hass.loop.call_soon_threadsafe(self._event.set)
 
     def create_codec_context(self, codec_context: CodecContext) -> None:
@@ -484,6 +524,22 @@ class KeyFrameConverter:
         """Transform image to a given orientation."""
         return TRANSFORM_IMAGE_FUNCTION[orientation](image)
 
+    def _image_key(
+        self, width: int | None, height: int | None
+    ) -> tuple[int | None, int | None, int]:
+        """Return the key of an image in the cache."""
+        if width and height:
+            return (width, height, self._dynamic_stream_settings.orientation)
+        return (None, None, self._dynamic_stream_settings.orientation)
+
+    def _get_cached_image(self, width: int | None, height: int | None) -> bytes | None:
+        """Return the image of the last keyframe if it was already generated."""
+        if (keyframe := self._keyframe) is None or keyframe[0] != self._images_sequence:
+            return None
+        if self._decode_failed:
+            return self._image
+        return self._images.get(self._image_key(width, height))
+
     def _generate_image(self, width: int | None, height: int | None) -> None:
         """Generate the keyframe image.
 
@@ -492,10 +548,19 @@ class KeyFrameConverter:
         at a time per instance.
         """
 
-        if not (self._turbojpeg and self._packet and self._codec_context):
+        if not (self._turbojpeg and self._keyframe and self._codec_context):
+            return
+        sequence, packet = self._keyframe
+        if sequence != self._images_sequence:
+            self._images = {}
+            self._images_sequence = sequence
+            self._decode_failed = False
+        elif self._decode_failed:
+            return
+        key = self._image_key(width, height)
+        if (image := self._images.get(key)) is not None:
+            self._image = image
             return
-        packet = self._packet
-        self._packet = None
         for _ in range(2):  # Retry once if codec context needs to be flushed
             try:
                 # decode packet (flush afterwards)
@@ -511,19 +576,22 @@ class KeyFrameConverter:
                 self._codec_context.open()
         else:
             _LOGGER.debug("Unable to decode keyframe")
+            self._decode_failed = True
             return
-        if frames:
-            frame = frames[0]
-            if width and height:
-                if self._dynamic_stream_settings.orientation >= 5:
-                    frame = frame.reformat(width=height, height=width)
-                else:
-                    frame = frame.reformat(width=width, height=height)
-            bgr_array = self.transform_image(
-                frame.to_ndarray(format="bgr24"),
-                self._dynamic_stream_settings.orientation,
-            )
-            self._image = bytes(self._turbojpeg.encode(bgr_array))
+        if not frames:
+            self._decode_failed = True
+            return
+        frame = frames[0]
+        if width and height:
+            if self._dynamic_stream_settings.orientation >= 5:
+                frame = frame.reformat(width=height, height=width)
+            else:
+                frame = frame.reformat(width=width, height=height)
+        bgr_array = self.transform_image(
+            frame.to_ndarray(format="bgr24"),
+            self._dynamic_stream_settings.orientation,
+        )
+        self._image = self._images[key] = bytes(self._turbojpeg.encode(bgr_array))
 
     async def async_get_image(
         self,
@@ -538,5 +606,7 @@ class KeyFrameConverter:
             self._event.clear()
             await self._event.wait()
         async with self._lock:
+            if (image := self._get_cached_image(width, height)) is not None:
+                return image
             await self._hass.async_add_executor_job(self._generate_image, width, height)
         return self._image
@@ -144,7 +144,8 @@ class StreamMuxer:
         self._output_video_stream: av.video.VideoStream = None
         self._output_audio_stream: av.audio.stream.AudioStream | None = None
         self._segment: Segment | None = None
-        # the following 3 member variables are used for Part formation
+        # the following 4 member variables are used for Part formation
+        self._segment_data_pos: int = cast(int, None)
         self._memory_file_pos: int = cast(int, None)
         self._part_start_dts: int = cast(int, None)
         self._part_has_keyframe = False
@@ -293,7 +294,7 @@ class StreamMuxer:
             _stream_outputs=self._stream_state.outputs,
             start_time=self._start_time,
         )
-        self._memory_file_pos = self._memory_file.tell()
+        self._segment_data_pos = self._memory_file_pos = self._memory_file.tell()
         self._memory_file.seek(0, SEEK_END)
 
     def check_flush_part(self, packet: av.Packet) -> None:
@@ -356,7 +357,20 @@ class StreamMuxer:
         if not self._stream_settings.ll_hls:
             adjusted_dts = packet.dts
         assert self._segment
-        self._memory_file.seek(self._memory_file_pos)
+        segment_data: memoryview | None = None
+        if last_part:
+            # Hand over the data of all parts in one buffer. The memory_file
+            # is not written to anymore, so getvalue shares its buffer and
+            # the last part is a view of it instead of a copy.
+            segment_data = memoryview(self._memory_file.getvalue())[
+                self._segment_data_pos :
+            ]
+            part_data: bytes | memoryview = segment_data[
+                self._memory_file_pos - self._segment_data_pos :
+            ]
+        else:
+            self._memory_file.seek(self._memory_file_pos)
+            part_data = self._memory_file.read()
         self._hass.loop.call_soon_threadsafe(
             self._segment.async_add_part,
             Part(
@@ -364,7 +378,7 @@ class StreamMuxer:
                     (adjusted_dts - self._part_start_dts) * packet.time_base
                 ),
                 has_keyframe=self._part_has_keyframe,
-                data=self._memory_file.read(),
+                data=part_data,
             ),
             (
                 segment_duration := float(
@@ -373,6 +387,7 @@ class StreamMuxer:
             )
             if last_part
             else 0,
+            segment_data,
         )
         if last_part:
             # If we've written the last part, we can close the memory_file.
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections import OrderedDict
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
 import logging
 from typing import Any
 
@@ -14,16 +16,29 @@ from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.json import ExtendedJSONEncoder
 from homeassistant.helpers.storage import Store
+from homeassistant.helpers.trace import VariablesCapture, variables_capture_cv
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util.limited_size_dict import LimitedSizeDict
 
 from . import websocket_api
 from .const import (
+    CONF_LAZY,
+    CONF_SAMPLE_RATE,
     CONF_STORED_TRACES,
+    CONF_TRACE_MODE,
     DATA_TRACE,
+    DATA_TRACE_LRU,
+    DATA_TRACE_RUNS,
     DATA_TRACE_STORE,
     DATA_TRACES_RESTORED,
+    DEFAULT_SAMPLE_RATE,
     DEFAULT_STORED_TRACES,
+    MAX_STORED_TRACES,
+    TRACE_MODE_FULL,
+    TRACE_MODE_OFF,
+    TRACE_MODE_ON_ERROR,
+    TRACE_MODE_SAMPLED,
+    TRACE_MODES,
 )
 from .models import ActionTrace, BaseTrace, RestoredTrace
 
@@ -35,7 +50,12 @@ STORAGE_KEY = "trace.saved_traces"
 STORAGE_VERSION = 1
 
 TRACE_CONFIG_SCHEMA = {
-    vol.Optional(CONF_STORED_TRACES, default=DEFAULT_STORED_TRACES): cv.positive_int
+    vol.Optional(CONF_STORED_TRACES, default=DEFAULT_STORED_TRACES): cv.positive_int,
+    vol.Optional(CONF_TRACE_MODE, default=TRACE_MODE_FULL): vol.In(TRACE_MODES),
+    vol.Optional(CONF_SAMPLE_RATE, default=DEFAULT_SAMPLE_RATE): vol.All(
+        vol.Coerce(int), vol.Range(min=1)
+    ),
+    vol.Optional(CONF_LAZY, default=False): cv.boolean,
 }
 
 CONFIG_SCHEMA = cv.empty_config_schema(DOMAIN)
@@ -48,9 +68,17 @@ def _get_data(hass: HomeAssistant) -> TraceData:
     return hass.data[DATA_TRACE]  # type: ignore[no-any-return]
 
 
+@callback
+def _get_lru(hass: HomeAssistant) -> OrderedDict[tuple[str, str], None]:
+    """Return the (key, run_id) of all stored traces, least recently used first."""
+    return hass.data[DATA_TRACE_LRU]  # type: ignore[no-any-return]
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Initialize the trace integration."""
     hass.data[DATA_TRACE] = {}
+    hass.data[DATA_TRACE_LRU] = OrderedDict()
+    hass.data[DATA_TRACE_RUNS] = {}
     websocket_api.async_setup(hass)
     store = Store[dict[str, list]](
         hass, STORAGE_VERSION, STORAGE_KEY, encoder=ExtendedJSONEncoder
@@ -80,7 +108,10 @@ async def async_get_trace(
     # Restore saved traces if not done
     await async_restore_traces(hass)
 
-    return _get_data(hass)[key][run_id].as_extended_dict()
+    requested_trace = _get_data(hass)[key][run_id]
+    if (key, run_id) in (lru := _get_lru(hass)):
+        lru.move_to_end((key, run_id))
+    return requested_trace.as_extended_dict()
 
 
 async def async_list_contexts(
@@ -141,11 +172,69 @@ def async_store_trace(
     """Store a trace if its key is valid."""
     if key := trace.key:
         traces = _get_data(hass)
-        if key not in traces:
-            traces[key] = LimitedSizeDict(size_limit=stored_traces)
+        lru = _get_lru(hass)
+        if (traces_for_key := traces.get(key)) is None:
+            traces_for_key = traces[key] = LimitedSizeDict(size_limit=stored_traces)
         else:
-            traces[key].size_limit = stored_traces
-        traces[key][trace.run_id] = trace
+            traces_for_key.size_limit = stored_traces
+        # Evict the oldest traces of the key here to keep the LRU in sync
+        while traces_for_key and len(traces_for_key) >= stored_traces:
+            evicted_run_id, _ = traces_for_key.popitem(last=False)
+            lru.pop((key, evicted_run_id), None)
+        traces_for_key[trace.run_id] = trace
+        if trace.run_id in traces_for_key:
+            lru[(key, trace.run_id)] = None
+            _async_evict_traces(hass)
+
+
+@callback
+def _async_evict_traces(hass: HomeAssistant) -> None:
+    """Evict the least recently used traces above the limit of all stored traces."""
+    traces = _get_data(hass)
+    lru = _get_lru(hass)
+    while len(lru) > MAX_STORED_TRACES:
+        (key, run_id), _ = lru.popitem(last=False)
+        traces[key].pop(run_id, None)
+
+
+@contextmanager
+def trace_policy(
+    hass: HomeAssistant, trace: ActionTrace, trace_config: ConfigType
+) -> Generator[None]:
+    """Store the trace of a run according to the trace config.
+
+    Runs which are not traced do not record their path, trace elements or
+    variables. Runs traced only on error record the trace and store it
+    when the run has failed.
+    """
+    mode = trace_config[CONF_TRACE_MODE]
+    if mode == TRACE_MODE_OFF:
+        traced = False
+    elif mode == TRACE_MODE_SAMPLED:
+        runs: dict[str, int] = hass.data[DATA_TRACE_RUNS]
+        run = runs.get(trace.key, 0)
+        runs[trace.key] = run + 1
+        traced = run % trace_config[CONF_SAMPLE_RATE] == 0
+    else:
+        traced = True
+
+    if not traced:
+        capture = VariablesCapture.OFF
+    elif trace_config[CONF_LAZY]:
+        capture = VariablesCapture.LAZY
+    else:
+        capture = VariablesCapture.FULL
+    token = variables_capture_cv.set(capture)
+
+    stored_traces = trace_config[CONF_STORED_TRACES]
+    if traced and mode != TRACE_MODE_ON_ERROR:
+        async_store_trace(hass, trace, stored_traces)
+    try:
+        yield
+    finally:
+        variables_capture_cv.reset(token)
+        if mode == TRACE_MODE_ON_ERROR and trace.failed:
+            async_store_trace(hass, trace, stored_traces)
 
 
 def _async_store_restored_trace(hass: HomeAssistant, trace: RestoredTrace) -> None:
@@ -156,6 +245,10 @@ def _async_store_restored_trace(hass: HomeAssistant, trace: RestoredTrace) -> No
         traces[key] = LimitedSizeDict()
     traces[key][trace.run_id] = trace
     traces[key].move_to_end(trace.run_id, last=False)
+    lru = _get_lru(hass)
+    lru[(key, trace.run_id)] = None
+    lru.move_to_end((key, trace.run_id), last=False)
+    _async_evict_traces(hass)
 
 
 async def async_restore_traces(hass: HomeAssistant) -> None:
@@ -1,7 +1,20 @@
 """Shared constants for script and automation tracing and debugging."""
 
+CONF_LAZY = "lazy"
+CONF_SAMPLE_RATE = "sample_rate"
 CONF_STORED_TRACES = "stored_traces"
+CONF_TRACE_MODE = "mode"
 DATA_TRACE = "trace"
+DATA_TRACE_LRU = "trace_lru"
+DATA_TRACE_RUNS = "trace_runs"
 DATA_TRACE_STORE = "trace_store"
 DATA_TRACES_RESTORED = "trace_traces_restored"
+DEFAULT_SAMPLE_RATE = 10  # Trace one in this many runs when sampling
 DEFAULT_STORED_TRACES = 5  # Stored traces per script or automation
+MAX_STORED_TRACES = 1000  # Stored traces of all scripts and automations
+
+TRACE_MODE_FULL = "full"
+TRACE_MODE_OFF = "off"
+TRACE_MODE_ON_ERROR = "on_error"
+TRACE_MODE_SAMPLED = "sampled"
+TRACE_MODES = [TRACE_MODE_FULL, TRACE_MODE_OFF, TRACE_MODE_ON_ERROR, TRACE_MODE_SAMPLED]
@@ -11,6 +11,7 @@ from typing import Any, cast
 import voluptuous as vol
 
 from homeassistant.auth.models import User
+from homeassistant.auth.permissions import AbstractPermissions
 from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.auth.permissions.events import SUBSCRIBE_ALLOWLIST
 from homeassistant.const import (
@@ -19,6 +20,7 @@ from homeassistant.const import (
     SIGNAL_BOOTSTRAP_INTEGRATIONS,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Context,
     Event,
     EventStateChangedData,
@@ -56,6 +58,7 @@ from homeassistant.loader import (
     async_get_integrations,
 )
 from homeassistant.setup import async_get_loaded_integrations, async_get_setup_timings
+from homeassistant.util.hass_dict import HassKey
 from homeassistant.util.json import format_unserializable_data
 
 from . import const, decorators, messages
@@ -63,6 +66,9 @@ from .connection import ActiveConnection
 from .messages import construct_result_message
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
+DATA_ENTITY_SUBSCRIPTION_HUB: HassKey[_EntitySubscriptionHub] = HassKey(
+    "websocket_api_entity_subscription_hub"
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -363,28 +369,184 @@ def _send_handle_get_states_response(
     )
 
 
+class _EntitySubscription:
+    """A subscribe_entities subscription for a connection."""
+
+    __slots__ = ("send_message", "user", "message_id_as_bytes", "entity_ids")
+
+    def __init__(
+        self,
+        send_message: Callable[[str | bytes | dict[str, Any]], None],
+        user: User,
+        message_id_as_bytes: bytes,
+        entity_ids: set[str],
+    ) -> None:
+        """Initialize the subscription."""
+        self.send_message = send_message
+        self.user = user
+        self.message_id_as_bytes = message_id_as_bytes
+        self.entity_ids = entity_ids
+
+
+class _EntitySubscriptionHub:
+    """Fan out state changed events to subscribe_entities subscriptions.
+
+    A single state changed listener is shared by all connections and
+    subscriptions are indexed by entity_id so a state change only
+    reaches the subscriptions that are interested in it. The state
+    diff message is serialized once per event and the read permission
+    is cached per user until the user's permissions change. Batches
+    of state changes are merged into a single message per subscription.
+    """
+
+    __slots__ = (
+        "_hass",
+        "_unsub",
+        "_all_entities",
+        "_by_entity_id",
+        "_read_permission_cache",
+    )
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self._hass = hass
+        self._unsub: CALLBACK_TYPE | None = None
+        self._all_entities: set[_EntitySubscription] = set()
+        self._by_entity_id: dict[str, set[_EntitySubscription]] = {}
+        self._read_permission_cache: dict[
+            str, tuple[AbstractPermissions, bool, dict[str, bool]]
+        ] = {}
+
+    @callback
+    def async_subscribe(self, subscription: _EntitySubscription) -> CALLBACK_TYPE:
+        """Add a subscription and return a callback to remove it."""
+        if not subscription.entity_ids:
+            self._all_entities.add(subscription)
+        else:
+            by_entity_id = self._by_entity_id
+            for entity_id in subscription.entity_ids:
+                by_entity_id.setdefault(entity_id, set()).add(subscription)
+        if self._unsub is None:
+            self._unsub = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_forward_entity_changes,
+                batch_listener=self._async_forward_entity_changes_batch,
+            )
+        return partial(self._async_unsubscribe, subscription)
+
+    @callback
+    def _async_unsubscribe(self, subscription: _EntitySubscription) -> None:
+        """Remove a subscription."""
+        if not subscription.entity_ids:
+            self._all_entities.discard(subscription)
+        else:
+            by_entity_id = self._by_entity_id
+            for entity_id in subscription.entity_ids:
+                subscriptions = by_entity_id[entity_id]
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del by_entity_id[entity_id]
+        if not self._all_entities and not self._by_entity_id and self._unsub:
+            self._unsub()
+            self._unsub = None
+            self._read_permission_cache.clear()
+
+    @callback
+    def _async_user_can_read(self, user: User, entity_id: str) -> bool:
+        """Return if the user can read the entity.
+
+        We have to check the permissions object every time because
+        the user might have changed since the subscription was created.
+        """
+        permissions = user.permissions
+        cached = self._read_permission_cache.get(user.id)
+        if cached is None or cached[0] is not permissions:
+            read_all = user.is_admin or permissions.access_all_entities(POLICY_READ)
+            cached = (permissions, read_all, {})
+            self._read_permission_cache[user.id] = cached
+        _, read_all, entity_cache = cached
+        if read_all:
+            return True
+        if (allowed := entity_cache.get(entity_id)) is None:
+            allowed = permissions.check_entity(entity_id, POLICY_READ)
+            entity_cache[entity_id] = allowed
+        return allowed
+
+    @callback
+    def _async_forward_entity_changes(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Forward entity state changed events to interested subscriptions."""
+        entity_id = event.data["entity_id"]
+        entity_subscriptions = self._by_entity_id.get(entity_id)
+        if not self._all_entities and not entity_subscriptions:
+            return
+        prefix: bytes | None = None
+        can_read_by_user: dict[str, bool] = {}
+        for subscriptions in (self._all_entities, entity_subscriptions):
+            if not subscriptions:
+                continue
+            for subscription in subscriptions:
+                user = subscription.user
+                if (can_read := can_read_by_user.get(user.id)) is None:
+                    can_read = self._async_user_can_read(user, entity_id)
+                    can_read_by_user[user.id] = can_read
+                if not can_read:
+                    continue
+                if prefix is None:
+                    prefix = messages.cached_state_diff_message_prefix(event)
+                subscription.send_message(
+                    messages.state_diff_message_with_id(
+                        prefix, subscription.message_id_as_bytes
+                    )
+                )
+
+    @callback
+    def _async_forward_entity_changes_batch(
+        self, events: list[Event[EventStateChangedData]]
+    ) -> None:
+        """Forward a batch of state changed events to interested subscriptions.
+
+        Each subscription gets the changes it can see merged into as few
+        messages as possible. Subscriptions that see the same changes
+        share the serialized messages.
+        """
+        all_entities = self._all_entities
+        by_entity_id = self._by_entity_id
+        visible: dict[_EntitySubscription, list[int]] = {}
+        for index, event in enumerate(events):
+            entity_id = event.data["entity_id"]
+            entity_subscriptions = by_entity_id.get(entity_id)
+            for subscriptions in (all_entities, entity_subscriptions):
+                if not subscriptions:
+                    continue
+                for subscription in subscriptions:
+                    if self._async_user_can_read(subscription.user, entity_id):
+                        visible.setdefault(subscription, []).append(index)
+
+        prefixes_by_indexes: dict[tuple[int, ...], list[bytes]] = {}
+        for subscription, indexes in visible.items():
+            key = tuple(indexes)
+            if (prefixes := prefixes_by_indexes.get(key)) is None:
+                prefixes = prefixes_by_indexes[key] = (
+                    messages.state_diff_batch_message_prefixes(
+                        events[index] for index in indexes
+                    )
+                )
+            for prefix in prefixes:
+                subscription.send_message(
+                    messages.state_diff_message_with_id(
+                        prefix, subscription.message_id_as_bytes
+                    )
+                )
+
+
 @callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
-    entity_ids: set[str],
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event[EventStateChangedData],
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if entity_ids and entity_id not in entity_ids:
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
+def _async_get_entity_subscription_hub(hass: HomeAssistant) -> _EntitySubscriptionHub:
+    """Return the shared subscribe_entities hub."""
+    if (hub := hass.data.get(DATA_ENTITY_SUBSCRIPTION_HUB)) is None:
+        hub = hass.data[DATA_ENTITY_SUBSCRIPTION_HUB] = _EntitySubscriptionHub(hass)
+    return hub
 
 
 @callback
@@ -404,15 +566,15 @@ def handle_subscribe_entities(
     # where some states are missed
     states = _async_get_allowed_states(hass, connection)
     message_id_as_bytes = str(msg["id"]).encode()
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
+    connection.subscriptions[msg["id"]] = _async_get_entity_subscription_hub(
+        hass
+    ).async_subscribe(
+        _EntitySubscription(
             connection.send_message,
-            entity_ids,
             connection.user,
             message_id_as_bytes,
-        ),
+            entity_ids,
+        )
     )
     connection.send_result(msg["id"])
 
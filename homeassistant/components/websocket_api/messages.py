@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from functools import lru_cache
 import logging
 from typing import Any, Final
@@ -152,16 +153,61 @@ def cached_state_diff_message(
     all getting many of the same events (mostly state changed)
     we can avoid serializing the same data for each connection.
     """
-    return b"".join(
-        (
-            _partial_cached_state_diff_message(event)[:-1],
-            b',"id":',
-            message_id_as_bytes,
-            b"}",
-        )
+    return state_diff_message_with_id(
+        cached_state_diff_message_prefix(event), message_id_as_bytes
     )
 
 
+def cached_state_diff_message_prefix(event: Event[EventStateChangedData]) -> bytes:
+    """Return the serialized state diff message without the id.
+
+    The result is missing the closing brace so it can be
+    completed with state_diff_message_with_id.
+    """
+    return _partial_cached_state_diff_message(event)[:-1]
+
+
+def state_diff_message_with_id(prefix: bytes, message_id_as_bytes: bytes) -> bytes:
+    """Complete a state diff message prefix with the message id."""
+    return b"".join((prefix, b',"id":', message_id_as_bytes, b"}"))
+
+
+def state_diff_batch_message_prefixes(
+    events: Iterable[Event[EventStateChangedData]],
+) -> list[bytes]:
+    """Return the serialized state diff messages for a batch without the id.
+
+    The state diffs of the batch are merged into a single message. A new
+    message is started when an entity shows up again in the batch so the
+    changes are still applied in order.
+    """
+    prefixes: list[bytes] = []
+    merged: dict[str, Any] = {}
+    entity_ids: set[str] = set()
+    for event in events:
+        if (entity_id := event.data["entity_id"]) in entity_ids:
+            prefixes.append(_state_diff_batch_message_prefix(merged))
+            merged = {}
+            entity_ids.clear()
+        entity_ids.add(entity_id)
+        for key, value in _state_diff_event(event).items():
+            if key == ENTITY_EVENT_REMOVE:
+                merged.setdefault(key, []).extend(value)
+            else:
+                merged.setdefault(key, {}).update(value)
+    if merged:
+        prefixes.append(_state_diff_batch_message_prefix(merged))
+    return prefixes
+
+
+def _state_diff_batch_message_prefix(merged: dict[str, Any]) -> bytes:
+    """Serialize merged state diffs without the closing brace."""
+    return (
+        _message_to_json_bytes_or_none({"type": "event", "event": merged})
+        or INVALID_JSON_PARTIAL_MESSAGE
+    )[:-1]
+
+
 @lru_cache(maxsize=128)
 def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> bytes:
     """Cache and serialize the event to json.
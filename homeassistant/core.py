@@ -12,13 +12,14 @@ from collections.abc import (
     Callable,
     Collection,
     Coroutine,
+    Generator,
     Iterable,
     KeysView,
     Mapping,
     ValuesView,
 )
 import concurrent.futures
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
 import datetime
 import enum
@@ -108,6 +109,7 @@ from .util.event_type import EventType
 from .util.executor import InterruptibleThreadPoolExecutor
 from .util.hass_dict import HassDict
 from .util.json import JsonObjectType
+from .util.loop_accounting import LoopAccounting, domain_for_callable
 from .util.read_only_dict import ReadOnlyDict
 from .util.timeout import TimeoutManager
 from .util.ulid import ulid_at_time, ulid_now
@@ -453,6 +455,8 @@ class HomeAssistant:
         self.loop_thread_id = getattr(
             self.loop, "_thread_ident", getattr(self.loop, "_thread_id")
         )
+        # Set by the profiler to account the time spent in the event loop
+        self.loop_accounting: LoopAccounting | None = None
 
     def verify_event_loop_thread(self, what: str) -> None:
         """Report and raise if we are not running in the event loop thread."""
@@ -753,15 +757,31 @@ class HomeAssistant:
         if hassjob.job_type is HassJobType.Coroutinefunction:
             if TYPE_CHECKING:
                 hassjob = cast(HassJob[..., Coroutine[Any, Any, _R]], hassjob)
-            task = create_eager_task(
-                hassjob.target(*args), name=hassjob.name, loop=self.loop
-            )
+            if (loop_accounting := self.loop_accounting) is None:
+                task = create_eager_task(
+                    hassjob.target(*args), name=hassjob.name, loop=self.loop
+                )
+            else:
+                task = loop_accounting.async_run(
+                    domain_for_callable(hassjob.target),
+                    functools.partial(
+                        create_eager_task,
+                        hassjob.target(*args),
+                        name=hassjob.name,
+                        loop=self.loop,
+                    ),
+                )
             if task.done():
                 return task
         elif hassjob.job_type is HassJobType.Callback:
             if TYPE_CHECKING:
                 hassjob = cast(HassJob[..., _R], hassjob)
-            self.loop.call_soon(hassjob.target, *args)
+            if (loop_accounting := self.loop_accounting) is None:
+                self.loop.call_soon(hassjob.target, *args)
+            else:
+                self.loop.call_soon(
+                    loop_accounting.async_run_job, hassjob.target, *args
+                )
             return None
         else:
             if TYPE_CHECKING:
@@ -935,7 +955,10 @@ class HomeAssistant:
         if hassjob.job_type is HassJobType.Callback:
             if TYPE_CHECKING:
                 hassjob = cast(HassJob[..., _R], hassjob)
-            hassjob.target(*args)
+            if (loop_accounting := self.loop_accounting) is None:
+                hassjob.target(*args)
+            else:
+                loop_accounting.async_run_job(hassjob.target, *args)
             return None
 
         return self._async_add_hass_job(hassjob, *args, background=background)
@@ -1446,7 +1469,13 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_batch_jobs",
+        "_debug",
+        "_hass",
+        "_listeners",
+        "_match_all_listeners",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
@@ -1454,6 +1483,10 @@ class EventBus:
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
+        self._batch_jobs: dict[
+            HassJob[[Event[Any]], Coroutine[Any, Any, None] | None],
+            HassJob[[list[Event[Any]]], None],
+        ] = {}
         self._listeners[MATCH_ALL] = self._match_all_listeners
         self._hass = hass
         self._async_logging_changed()
@@ -1535,6 +1568,9 @@ class EventBus:
                 "Bus:Handling %s", _event_repr(event_type, origin, event_data)
             )
 
+        if (loop_accounting := self._hass.loop_accounting) is not None:
+            dispatch_start = time.perf_counter()
+
         listeners = self._listeners.get(event_type, EMPTY_LIST)
         if event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL:
             match_all_listeners = self._match_all_listeners
@@ -1565,6 +1601,83 @@ class EventBus:
             except Exception:
                 _LOGGER.exception("Error running job: %s", job)
 
+        if loop_accounting is not None:
+            loop_accounting.async_record_event(
+                event_type, time.perf_counter() - dispatch_start
+            )
+
+    @callback
+    def async_fire_batch_internal(
+        self,
+        event_type: EventType[_DataT] | str,
+        events: list[Event[_DataT]],
+    ) -> None:
+        """Fire a batch of events of the same type, for internal use only.
+
+        Listeners that were registered with a batch_listener get all
+        the events of the batch that pass their filter in a single call.
+        All other listeners get the events one at a time in order.
+
+        This method is intended to only be used by core internally
+        and should not be considered a stable API. We will make
+        breaking changes to this function in the future and it
+        should not be used in integrations.
+
+        This method must be run in the event loop.
+        """
+        if self._debug:
+            for event in events:
+                _LOGGER.debug(
+                    "Bus:Handling %s",
+                    _event_repr(event_type, event.origin, event.data),
+                )
+
+        listeners = self._listeners.get(event_type, EMPTY_LIST)
+        if event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL:
+            match_all_listeners = self._match_all_listeners
+        else:
+            match_all_listeners = EMPTY_LIST
+
+        batch_jobs = self._batch_jobs
+        event_listeners: list[_FilterableJobType[_DataT]] = []
+        for filterable_job in listeners + match_all_listeners:
+            job, event_filter = filterable_job
+            if (batch_job := batch_jobs.get(job)) is None:
+                event_listeners.append(filterable_job)
+                continue
+            matched_events = events
+            if event_filter is not None:
+                matched_events = []
+                for event in events:
+                    try:
+                        if event_filter(event.data):
+                            matched_events.append(event)
+                    except Exception:
+                        _LOGGER.exception("Error in event filter")
+                if not matched_events:
+                    continue
+            try:
+                self._hass.async_run_hass_job(batch_job, matched_events)
+            except Exception:
+                _LOGGER.exception("Error running job: %s", batch_job)
+
+        if not event_listeners:
+            return
+
+        for event in events:
+            for job, event_filter in event_listeners:
+                if event_filter is not None:
+                    try:
+                        if not event_filter(event.data):
+                            continue
+                    except Exception:
+                        _LOGGER.exception("Error in event filter")
+                        continue
+                try:
+                    self._hass.async_run_hass_job(job, event)
+                except Exception:
+                    _LOGGER.exception("Error running job: %s", job)
+
     def listen(
         self,
         event_type: EventType[_DataT] | str,
@@ -1592,6 +1705,7 @@ class EventBus:
         listener: Callable[[Event[_DataT]], Coroutine[Any, Any, None] | None],
         event_filter: Callable[[_DataT], bool] | None = None,
         run_immediately: bool | object = _SENTINEL,
+        batch_listener: Callable[[list[Event[_DataT]]], None] | None = None,
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -1602,6 +1716,11 @@ class EventBus:
         @callback that returns a boolean value, determines if the
         listener callable should run.
 
+        An optional batch_listener, which must be a callable decorated
+        with @callback, is called instead of the listener with all the
+        events of a batch that pass the event_filter when events are
+        fired as a batch with async_fire_batch_internal.
+
         If run_immediately is passed:
           - callbacks will be run right away instead of using call_soon.
           - coroutine functions will be scheduled eagerly.
@@ -1620,12 +1739,22 @@ class EventBus:
 
         if event_filter is not None and not is_callback_check_partial(event_filter):
             raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+        if batch_listener is not None and not is_callback_check_partial(batch_listener):
+            raise HomeAssistantError(
+                f"Batch listener {batch_listener} is not a callback"
+            )
         filterable_job = (HassJob(listener, f"listen {event_type}"), event_filter)
         if event_type == EVENT_STATE_REPORTED:
             if not event_filter:
                 raise HomeAssistantError(
                     f"Event filter is required for event {event_type}"
                 )
+        if batch_listener is not None:
+            self._batch_jobs[filterable_job[0]] = HassJob(
+                batch_listener,
+                f"listen batch {event_type}",
+                job_type=HassJobType.Callback,
+            )
         return self._async_listen_filterable_job(event_type, filterable_job)
 
     @callback
@@ -1715,6 +1844,7 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        self._batch_jobs.pop(filterable_job[0], None)
         try:
             self._listeners[event_type].remove(filterable_job)
 
@@ -1791,6 +1921,11 @@ class State:
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.state_info = state_info
+        # The serialized recorded attributes and their hash as
+        # (dialect, shared_attrs bytes, hash) set by the recorder.
+        # States that share the same attributes object share it
+        # as well so the attributes are only serialized once.
+        self.recorder_shared_attrs: tuple[str | None, bytes, int] | None = None
         self.domain, self.object_id = split_entity_id(self.entity_id)
         # The recorder or the websocket_api will always call the timestamps,
         # so we will set the timestamp values here to avoid the overhead of
@@ -1880,10 +2015,21 @@ class State:
             as_dict["context"] = ReadOnlyDict(context)
         return ReadOnlyDict(as_dict)
 
+    @cached_property
+    def attributes_json(self) -> bytes:
+        """Return a JSON string of the attributes.
+
+        States that share the same attributes object share
+        the serialized attributes as well.
+        """
+        return json_bytes(self.attributes)
+
     @cached_property
     def as_dict_json(self) -> bytes:
         """Return a JSON string of the State."""
-        return json_bytes(self._as_dict)
+        return json_bytes(
+            self._as_dict | {"attributes": json_fragment(self.attributes_json)}
+        )
 
     @cached_property
     def json_fragment(self) -> json_fragment:
@@ -1926,7 +2072,10 @@ class State:
 
         It is used for sending multiple states in a single message.
         """
-        return json_bytes({self.entity_id: self.as_compressed_state})[1:-1]
+        compressed_state = self.as_compressed_state | {
+            COMPRESSED_STATE_ATTRIBUTES: json_fragment(self.attributes_json)
+        }
+        return json_bytes({self.entity_id: compressed_state})[1:-1]
 
     @classmethod
     def from_dict(cls, json_dict: dict[str, Any]) -> Self | None:
@@ -1964,6 +2113,13 @@ class State:
             context=context,
         )
 
+    def _share_attributes_cache(self, old_state: State) -> None:
+        """Share the serialized attributes of a state with the same attributes."""
+        if (attributes_json := old_state.__dict__.get("attributes_json")) is not None:
+            self.__dict__["attributes_json"] = attributes_json
+        if old_state.state_info is self.state_info:
+            self.recorder_shared_attrs = old_state.recorder_shared_attrs
+
     def expire(self) -> None:
         """Mark the state as old.
 
@@ -2037,7 +2193,14 @@ class States(UserDict[str, State]):
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_states", "_states_data", "_reservations", "_bus", "_loop")
+    __slots__ = (
+        "_states",
+        "_states_data",
+        "_reservations",
+        "_bus",
+        "_loop",
+        "_batch",
+    )
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
@@ -2048,6 +2211,7 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        self._batch: list[Event[EventStateChangedData]] | None = None
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -2165,6 +2329,11 @@ class StateMachine:
             "old_state": old_state,
             "new_state": None,
         }
+        if self._batch is not None:
+            self._batch.append(
+                Event(EVENT_STATE_CHANGED, state_changed_data, context=context)
+            )
+            return True
         self._bus.async_fire_internal(
             EVENT_STATE_CHANGED,
             state_changed_data,
@@ -2287,7 +2456,11 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == attributes
+            # Callers that pass the attributes of the current state
+            # can skip comparing them by value.
+            same_attr = (
+                old_state.attributes is attributes or old_state.attributes == attributes
+            )
             last_changed = old_state.last_changed if same_state else None
 
         # It is much faster to convert a timestamp to a utc datetime object
@@ -2343,6 +2516,10 @@ class StateMachine:
             state_info,
             timestamp,
         )
+        if same_attr:
+            if TYPE_CHECKING:
+                assert old_state is not None
+            state._share_attributes_cache(old_state)  # noqa: SLF001
         if old_state is not None:
             old_state.expire()
         self._states[entity_id] = state
@@ -2351,6 +2528,17 @@ class StateMachine:
             "old_state": old_state,
             "new_state": state,
         }
+        if self._batch is not None:
+            self._batch.append(
+                Event(
+                    EVENT_STATE_CHANGED,
+                    state_changed_data,
+                    EventOrigin.local,
+                    timestamp,
+                    context,
+                )
+            )
+            return
         self._bus.async_fire_internal(
             EVENT_STATE_CHANGED,
             state_changed_data,
@@ -2358,6 +2546,60 @@ class StateMachine:
             time_fired=timestamp,
         )
 
+    @contextmanager
+    def async_batch(self) -> Generator[None]:
+        """Collect the state changes made in the block and fire them as a batch.
+
+        The state changed events are fired with async_fire_batch_internal
+        when the block exits so listeners that support batches get all of
+        them in a single call. Listeners run after all the states in the
+        block have been written. Nested blocks are part of the outer batch.
+
+        The block must not yield to the event loop.
+
+        This method must be run in the event loop.
+        """
+        if self._batch is not None:
+            yield
+            return
+        batch: list[Event[EventStateChangedData]] = []
+        self._batch = batch
+        try:
+            yield
+        finally:
+            self._batch = None
+            if batch:
+                self._bus.async_fire_batch_internal(EVENT_STATE_CHANGED, batch)
+
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+    ) -> None:
+        """Set the state of multiple entities, add entities that do not exist.
+
+        states is an iterable of (entity_id, new_state, attributes).
+
+        The state changed events are fired as a single batch
+        after all the states have been written.
+
+        This method must be run in the event loop.
+        """
+        timestamp = time.time()
+        with self.async_batch():
+            for entity_id, new_state, attributes in states:
+                self.async_set_internal(
+                    entity_id.lower(),
+                    str(new_state),
+                    attributes or {},
+                    force_update,
+                    context,
+                    None,
+                    timestamp,
+                )
+
 
 class SupportsResponse(enum.StrEnum):
     """Service call response configuration."""
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from datetime import datetime
 from enum import StrEnum
 from functools import cached_property, lru_cache, partial
@@ -457,7 +457,7 @@ def format_mac(mac: str) -> str:
     return mac
 
 
-class DeviceRegistryStore(storage.Store[dict[str, list[dict[str, Any]]]]):
+class DeviceRegistryStore(storage.JournaledStore[dict[str, list[dict[str, Any]]]]):
     """Store entity registry data."""
 
     async def _async_migrate_func(
@@ -638,6 +638,7 @@ class DeviceRegistry(BaseRegistry[dict[str, list[dict[str, Any]]]]):
     devices: ActiveDeviceRegistryItems
     deleted_devices: DeviceRegistryItems[DeletedDeviceEntry]
     _device_data: dict[str, DeviceEntry]
+    _store: DeviceRegistryStore
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the device registry."""
@@ -1222,6 +1223,7 @@ class DeviceRegistry(BaseRegistry[dict[str, list[dict[str, Any]]]]):
         self.devices = devices
         self.deleted_devices = deleted_devices
         self._device_data = devices.data
+        self._store.async_start_journal(self._journal_items)
 
     @callback
     def _data_to_save(self) -> dict[str, Any]:
@@ -1233,6 +1235,14 @@ class DeviceRegistry(BaseRegistry[dict[str, list[dict[str, Any]]]]):
             ],
         }
 
+    @callback
+    def _journal_items(self) -> dict[str, Iterable[storage.JournalItem]]:
+        """Return the items of the device registry to journal changes of."""
+        return {
+            "devices": self.devices.values(),
+            "deleted_devices": self.deleted_devices.values(),
+        }
+
     @callback
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
@@ -57,6 +57,7 @@ from homeassistant.exceptions import (
 from homeassistant.loader import async_suggest_report_issue, bind_hass
 from homeassistant.util import ensure_unique_string, slugify
 from homeassistant.util.frozen_dataclass_compat import FrozenOrThawed
+from homeassistant.util.loop_accounting import domain_for_module
 
 from . import device_registry as dr, entity_registry as er, singleton
 from .device_registry import DeviceInfo, EventDeviceRegistryUpdatedData
@@ -1104,6 +1105,18 @@ class Entity(
 
     @callback
     def _async_write_ha_state(self) -> None:
+        """Write the state to the state machine."""
+        if (loop_accounting := self.hass.loop_accounting) is None:
+            self.__async_write_ha_state()
+        else:
+            loop_accounting.async_run(
+                self.platform.platform_name
+                if self.platform
+                else domain_for_module(type(self).__module__),
+                self.__async_write_ha_state,
+            )
+
+    def __async_write_ha_state(self) -> None:
         """Write the state to the state machine."""
         if self._platform_state is EntityPlatformState.REMOVED:
             # Polling returned after the entity has already been removed
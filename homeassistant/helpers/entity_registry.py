@@ -11,7 +11,7 @@ timer.
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Callable, Container, Hashable, KeysView, Mapping
+from collections.abc import Callable, Container, Hashable, Iterable, KeysView, Mapping
 from datetime import datetime, timedelta
 from enum import StrEnum
 from functools import cached_property
@@ -429,7 +429,7 @@ class DeletedRegistryEntry:
         )
 
 
-class EntityRegistryStore(storage.Store[dict[str, list[dict[str, Any]]]]):
+class EntityRegistryStore(storage.JournaledStore[dict[str, list[dict[str, Any]]]]):
     """Store entity registry data."""
 
     async def _async_migrate_func(  # noqa: C901
@@ -694,6 +694,7 @@ class EntityRegistry(BaseRegistry):
     deleted_entities: dict[tuple[str, str, str], DeletedRegistryEntry]
     entities: EntityRegistryItems
     _entities_data: dict[str, RegistryEntry]
+    _store: EntityRegistryStore
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the registry."""
@@ -1347,6 +1348,7 @@ class EntityRegistry(BaseRegistry):
         self.deleted_entities = deleted_entities
         self.entities = entities
         self._entities_data = entities.data
+        self._store.async_start_journal(self._journal_items)
 
     @callback
     def _data_to_save(self) -> dict[str, Any]:
@@ -1358,6 +1360,14 @@ class EntityRegistry(BaseRegistry):
             ],
         }
 
+    @callback
+    def _journal_items(self) -> dict[str, Iterable[storage.JournalItem]]:
+        """Return the items of the entity registry to journal changes of."""
+        return {
+            "entities": self.entities.values(),
+            "deleted_entities": self.deleted_entities.values(),
+        }
+
     @callback
     def async_clear_category_id(self, scope: str, category_id: str) -> None:
         """Clear category id from registry entries."""
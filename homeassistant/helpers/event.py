@@ -69,6 +69,9 @@ _TRACK_STATE_ADDED_DOMAIN_DATA: HassKey[_KeyedEventData[EventStateChangedData]]
 _TRACK_STATE_REMOVED_DOMAIN_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = (
     HassKey("track_state_removed_domain_data")
 )
+_TRACK_STATE_CHANGE_DOMAIN_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = (
+    HassKey("track_state_change_domain_data")
+)
 _TRACK_ENTITY_REGISTRY_UPDATED_DATA: HassKey[
     _KeyedEventData[EventEntityRegistryUpdatedData]
 ] = HassKey("track_entity_registry_updated_data")
@@ -689,6 +692,43 @@ def async_track_state_removed_domain(
     )
 
 
+@callback
+def _async_domain_filter(
+    hass: HomeAssistant,
+    callbacks: dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]],
+    event_data: EventStateChangedData,
+) -> bool:
+    """Filter state changes by domain."""
+    return split_entity_id(event_data["entity_id"])[0] in callbacks
+
+
+_KEYED_TRACK_STATE_CHANGE_DOMAIN = _KeyedEventTracker(
+    key=_TRACK_STATE_CHANGE_DOMAIN_DATA,
+    event_type=EVENT_STATE_CHANGED,
+    dispatcher_callable=_async_dispatch_domain_event,
+    filter_callable=_async_domain_filter,
+)
+
+
+@bind_hass
+def _async_track_state_change_domain(
+    hass: HomeAssistant,
+    domains: str | Iterable[str],
+    action: Callable[[Event[EventStateChangedData]], Any],
+    job_type: HassJobType | None,
+) -> CALLBACK_TYPE:
+    """Track all state change events of entities in domains.
+
+    All trackers of a domain share a single bus listener and the
+    event is only dispatched when the domain is tracked so the cost
+    of a tracker does not grow with the number of entities in the
+    domain.
+    """
+    return _async_track_event(
+        _KEYED_TRACK_STATE_CHANGE_DOMAIN, hass, domains, action, job_type
+    )
+
+
 @callback
 def _async_string_to_lower_list(instr: str | Iterable[str]) -> list[str]:
     if isinstance(instr, str):
@@ -796,8 +836,12 @@ class _TrackStateChangeFiltered:
     @callback
     def _setup_entities_listener(self, domains: set[str], entities: set[str]) -> None:
         if domains:
-            entities = entities.copy()
-            entities.update(self.hass.states.async_entity_ids(domains))
+            # Entities in a tracked domain are dispatched by the domains listener
+            entities = {
+                entity_id
+                for entity_id in entities
+                if split_entity_id(entity_id)[0] not in domains
+            }
 
         # Entities has changed to none
         if not entities:
@@ -807,21 +851,13 @@ class _TrackStateChangeFiltered:
             self.hass, entities, self._action, self._action_as_hassjob.job_type
         )
 
-    @callback
-    def _state_added(self, event: Event[EventStateChangedData]) -> None:
-        self._cancel_listener(_ENTITIES_LISTENER)
-        self._setup_entities_listener(
-            self._last_track_states.domains, self._last_track_states.entities
-        )
-        self.hass.async_run_hass_job(self._action_as_hassjob, event)
-
     @callback
     def _setup_domains_listener(self, domains: set[str]) -> None:
         if not domains:
             return
 
-        self._listeners[_DOMAINS_LISTENER] = _async_track_state_added_domain(
-            self.hass, domains, self._state_added, HassJobType.Callback
+        self._listeners[_DOMAINS_LISTENER] = _async_track_state_change_domain(
+            self.hass, domains, self._action, self._action_as_hassjob.job_type
         )
 
     @callback
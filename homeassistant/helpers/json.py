@@ -197,6 +197,19 @@ def save_json(
     atomic_writes: bool = False,
 ) -> None:
     """Save JSON data to a file."""
+    json_data = serialize_json_for_save(filename, data, encoder=encoder)
+    mode = "wb" if isinstance(json_data, bytes) else "w"
+    method = write_utf8_file_atomic if atomic_writes else write_utf8_file
+    method(filename, json_data, private, mode=mode)
+
+
+def serialize_json_for_save(
+    filename: str,
+    data: list | dict,
+    *,
+    encoder: type[json.JSONEncoder] | None = None,
+) -> str | bytes:
+    """Serialize JSON data the way save_json writes it to a file."""
     dump: Callable[[Any], Any]
     try:
         # For backwards compatibility, if they pass in the
@@ -205,13 +218,10 @@ def save_json(
         if encoder and encoder is not JSONEncoder:
             # If they pass a custom encoder that is not the
             # default JSONEncoder, we use the slow path of json.dumps
-            mode = "w"
             dump = json.dumps
-            json_data: str | bytes = json.dumps(data, indent=2, cls=encoder)
-        else:
-            mode = "wb"
-            dump = _orjson_default_encoder
-            json_data = _orjson_bytes_default_encoder(data)
+            return json.dumps(data, indent=2, cls=encoder)
+        dump = _orjson_default_encoder
+        return _orjson_bytes_default_encoder(data)
     except TypeError as error:
         formatted_data = format_unserializable_data(
             find_paths_unserializable_data(data, dump=dump)
@@ -220,9 +230,6 @@ def save_json(
         _LOGGER.error(msg)
         raise SerializationError(msg) from error
 
-    method = write_utf8_file_atomic if atomic_writes else write_utf8_file
-    method(filename, json_data, private, mode=mode)
-
 
 def find_paths_unserializable_data(
     bad_data: Any, *, dump: Callable[[Any], str] = json.dumps
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
 from datetime import datetime, timedelta
+from functools import cached_property
 import logging
 from typing import Any, Self, cast
 
@@ -18,17 +20,30 @@ from . import start
 from .entity import Entity
 from .event import async_track_time_interval
 from .frame import report
-from .json import JSONEncoder
+from .json import JSONEncoder, json_bytes, json_fragment
 from .singleton import singleton
-from .storage import Store
+from .storage import JournaledStore, JournalItem, Store
 
 DATA_RESTORE_STATE: HassKey[RestoreStateData] = HassKey("restore_state")
 
 _LOGGER = logging.getLogger(__name__)
 
-STORAGE_KEY = "core.restore_state"
+STORAGE_KEY = "core.restore_state_journal"
 STORAGE_VERSION = 1
 
+# Versions before the journaled store saved the states as a list under
+# this key. It is migrated when present and removed once the states are
+# saved under the new key, so a downgrade starts without stored states
+# instead of restoring stale ones.
+LEGACY_STORAGE_KEY = "core.restore_state"
+LEGACY_STORAGE_VERSION = 1
+
+# The stored states and the time of the last dump, each a collection
+# of the journaled store
+STORAGE_STATES = "states"
+STORAGE_DUMPS = "dumps"
+LAST_DUMP_ID = "last"
+
 # How long between periodically saving the current states to disk
 STATE_DUMP_INTERVAL = timedelta(minutes=15)
 
@@ -96,6 +111,51 @@ class StoredState:
         )
 
 
+class _JournaledState:
+    """A stored state as an item of the journaled store.
+
+    The states of entities in the current run are stored without
+    last_seen, they are seen at the time of the last dump.
+    """
+
+    def __init__(self, stored_state: StoredState, current: bool) -> None:
+        """Initialize the item."""
+        self.id = stored_state.state.entity_id
+        self.stored_state = stored_state
+        self.current = current
+        extra_data = stored_state.extra_data
+        self.extra_data = extra_data.as_dict() if extra_data else None
+
+    @cached_property
+    def as_storage_fragment(self) -> json_fragment:
+        """Return a json fragment of the stored state for storage."""
+        data = self.stored_state.as_dict()
+        data["extra_data"] = self.extra_data
+        data["id"] = self.id
+        if self.current:
+            data["last_seen"] = None
+        return json_fragment(json_bytes(data))
+
+
+class _JournaledDump:
+    """The time of a dump as an item of the journaled store."""
+
+    id = LAST_DUMP_ID
+
+    def __init__(self, time: datetime) -> None:
+        """Initialize the item."""
+        self.time = time
+
+    @cached_property
+    def as_storage_fragment(self) -> json_fragment:
+        """Return a json fragment of the dump for storage."""
+        return json_fragment(json_bytes({"id": self.id, "time": self.time}))
+
+
+class RestoreStateStore(JournaledStore[dict[str, list[Any]]]):
+    """Store the restore state data."""
+
+
 async def async_load(hass: HomeAssistant) -> None:
     """Load the restore state task."""
     await async_get(hass).async_setup()
@@ -134,11 +194,16 @@ class RestoreStateData:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the restore state data class."""
         self.hass: HomeAssistant = hass
-        self.store = Store[list[dict[str, Any]]](
+        self.store = RestoreStateStore(
             hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
         )
+        self._legacy_store: Store[list[dict[str, Any]]] | None = None
         self.last_states: dict[str, StoredState] = {}
         self.entities: dict[str, RestoreEntity] = {}
+        # The items of the last dump, states are only rebuilt when they change
+        self._journal_states: dict[str, _JournaledState] = {}
+        self._journal_dump: _JournaledDump | None = None
+        self._journal_started = False
 
     async def async_setup(self) -> None:
         """Set up up the instance of this data helper."""
@@ -154,7 +219,9 @@ class RestoreStateData:
     async def async_load(self) -> None:
         """Load the instance of this data helper."""
         try:
-            stored_states = await self.store.async_load()
+            stored_states = await self._async_load_legacy()
+            if stored_states is None:
+                stored_states = await self.store.async_load()
         except HomeAssistantError as exc:
             _LOGGER.error("Error loading last states", exc_info=exc)
             stored_states = None
@@ -163,13 +230,47 @@ class RestoreStateData:
             _LOGGER.debug("Not creating cache - no saved states found")
             self.last_states = {}
         else:
+            # States of entities that were in the run of the last dump
+            # were last seen at the time of the dump
+            last_dump = next(
+                (
+                    dump["time"]
+                    for dump in stored_states.get(STORAGE_DUMPS, ())
+                    if dump["id"] == LAST_DUMP_ID
+                ),
+                None,
+            )
+            last_dump = dt_util.parse_datetime(last_dump) if last_dump else None
+            last_seen = last_dump or dt_util.utcnow()
             self.last_states = {
-                item["state"]["entity_id"]: StoredState.from_dict(item)
-                for item in stored_states
+                item["state"]["entity_id"]: StoredState.from_dict(
+                    item if item["last_seen"] else {**item, "last_seen": last_seen}
+                )
+                for item in stored_states[STORAGE_STATES]
                 if valid_entity_id(item["state"]["entity_id"])
             }
             _LOGGER.debug("Created cache with %s", list(self.last_states))
 
+    async def _async_load_legacy(self) -> dict[str, list[Any]] | None:
+        """Load the states saved under the legacy key, if any.
+
+        The legacy file is only present when it was not migrated yet or
+        an older version wrote it after a downgrade, so it is always
+        newer than the journaled store.
+        """
+        store = Store[list[dict[str, Any]]](
+            self.hass, LEGACY_STORAGE_VERSION, LEGACY_STORAGE_KEY, encoder=JSONEncoder
+        )
+        if (legacy_states := await store.async_load()) is None:
+            return None
+        self._legacy_store = store
+        return {
+            STORAGE_STATES: [
+                {**item, "id": item["state"]["entity_id"]} for item in legacy_states
+            ],
+            STORAGE_DUMPS: [],
+        }
+
     @callback
     def async_get_stored_states(self) -> list[StoredState]:
         """Get the set of states which should be stored.
@@ -214,25 +315,118 @@ class RestoreStateData:
 
         return stored_states
 
+    @callback
+    def _async_update_journal_states(self, check_extra_data: bool) -> None:
+        """Update the items of the states which should be stored.
+
+        The same states as async_get_stored_states are stored but the
+        item of a state is kept as long as the entity has not written
+        a new state object, so only the changed states are appended to
+        the journal. The extra data is only rebuilt for the entities
+        which wrote a new state unless check_extra_data is set, then
+        the item is also replaced when the extra data changed.
+        """
+        now = dt_util.utcnow()
+        previous = self._journal_states
+        current: dict[str, _JournaledState] = {}
+        get_state = self.hass.states.get
+        for entity_id, entity in self.entities.items():
+            if (state := get_state(entity_id)) is None or state.attributes.get(
+                ATTR_RESTORED
+            ):
+                continue
+            if (
+                (item := previous.get(entity_id)) is not None
+                and item.current
+                and item.stored_state.state is state
+            ):
+                if not check_extra_data:
+                    current[entity_id] = item
+                    continue
+                extra_data = entity.extra_restore_state_data
+                if item.extra_data == (extra_data.as_dict() if extra_data else None):
+                    current[entity_id] = item
+                    continue
+            else:
+                extra_data = entity.extra_restore_state_data
+            current[entity_id] = _JournaledState(
+                StoredState(state, extra_data, now), True
+            )
+
+        expiration_time = now - STATE_EXPIRATION
+        for entity_id, stored_state in self.last_states.items():
+            # Don't save old states that have entities in the current run
+            # They are either registered and already part of the items,
+            # or no longer care about restoring.
+            if entity_id in current or (
+                (state := get_state(entity_id)) is not None
+                and not state.attributes.get(ATTR_RESTORED)
+            ):
+                continue
+
+            # Don't save old states that have expired
+            if stored_state.last_seen < expiration_time:
+                continue
+
+            if (
+                (item := previous.get(entity_id)) is not None
+                and not item.current
+                and item.stored_state is stored_state
+            ):
+                current[entity_id] = item
+            else:
+                current[entity_id] = _JournaledState(stored_state, False)
+
+        self._journal_states = current
+        self._journal_dump = _JournaledDump(now)
+
+    @callback
+    def _async_journal_items(self) -> Mapping[str, Iterable[JournalItem]]:
+        """Return the items of the last dump by collection."""
+        return {
+            STORAGE_STATES: self._journal_states.values(),
+            STORAGE_DUMPS: [self._journal_dump] if self._journal_dump else [],
+        }
+
     async def async_dump_states(self) -> None:
+        """Save the current state machine to storage.
+
+        Only the states that changed since the last dump are written
+        unless the store compacts its journal.
+        """
+        await self._async_dump_states(check_extra_data=True)
+
+    async def _async_dump_states(self, check_extra_data: bool) -> None:
         """Save the current state machine to storage."""
         _LOGGER.debug("Dumping states")
+        self._async_update_journal_states(check_extra_data)
         try:
             await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+                {
+                    collection: [item.as_storage_fragment for item in items]
+                    for collection, items in self._async_journal_items().items()
+                }
             )
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
+            return
+        if self._legacy_store is not None:
+            await self._legacy_store.async_remove()
+            self._legacy_store = None
+        if not self._journal_started:
+            # The first dump writes the whole file, the following
+            # dumps append the changed states to its journal
+            self._journal_started = True
+            self.store.async_start_journal(self._async_journal_items)
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
         """Set up the restore state listeners."""
 
         async def _async_dump_states(*_: Any) -> None:
-            await self.async_dump_states()
+            # The extra data of entities that did not write a new state
+            # is only checked when stopping
+            await self._async_dump_states(check_extra_data=False)
 
         # Dump the initial states now. This helps minimize the risk of having
         # old states loaded by overwriting the last states once Home Assistant
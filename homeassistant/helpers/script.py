@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncGenerator, Callable, Mapping, Sequence
+from collections.abc import AsyncGenerator, Callable, Coroutine, Mapping, Sequence
 from contextlib import asynccontextmanager
 from contextvars import ContextVar
 from copy import copy
@@ -41,6 +41,7 @@ from homeassistant.const import (
     CONF_DOMAIN,
     CONF_ELSE,
     CONF_ENABLED,
+    CONF_ENTITY_ID,
     CONF_ERROR,
     CONF_EVENT,
     CONF_EVENT_DATA,
@@ -56,6 +57,7 @@ from homeassistant.const import (
     CONF_SERVICE,
     CONF_SERVICE_DATA,
     CONF_SERVICE_DATA_TEMPLATE,
+    CONF_SERVICE_TEMPLATE,
     CONF_SET_CONVERSATION_RESPONSE,
     CONF_STOP,
     CONF_TARGET,
@@ -66,6 +68,8 @@ from homeassistant.const import (
     CONF_WAIT_FOR_TRIGGER,
     CONF_WAIT_TEMPLATE,
     CONF_WHILE,
+    ENTITY_MATCH_ALL,
+    ENTITY_MATCH_NONE,
     EVENT_HOMEASSISTANT_STOP,
     SERVICE_TURN_ON,
 )
@@ -78,6 +82,7 @@ from homeassistant.core import (
     State,
     SupportsResponse,
     callback,
+    valid_entity_id,
 )
 from homeassistant.util import slugify
 from homeassistant.util.async_ import create_eager_task
@@ -106,6 +111,7 @@ from .trace import (
     trace_stack_push,
     trace_stack_top,
     trace_update_result,
+    trace_variables_change,
 )
 from .trigger import async_initialize_triggers, async_validate_trigger_config
 from .typing import UNDEFINED, ConfigType, TemplateVarsType, UndefinedType
@@ -405,6 +411,7 @@ class _ScriptRun:
     """Manage Script sequence run."""
 
     _action: dict[str, Any]
+    _plan_step: _PlanStep
 
     def __init__(
         self,
@@ -456,7 +463,8 @@ class _ScriptRun:
 
         try:
             self._log("Running %s", self._script.running_description)
-            for self._step, self._action in enumerate(self._script.sequence):
+            for self._step, self._plan_step in enumerate(self._script._get_plan()):  # noqa: SLF001
+                self._action = self._plan_step.config
                 if self._stop.done():
                     script_execution_set("cancelled")
                     break
@@ -490,19 +498,17 @@ class _ScriptRun:
         return ScriptRunResult(self._conversation_response, response, self._variables)
 
     async def _async_step(self, log_exceptions: bool) -> None:
-        continue_on_error = self._action.get(CONF_CONTINUE_ON_ERROR, False)
+        plan_step = self._plan_step
+        continue_on_error = plan_step.continue_on_error
 
-        with trace_path(str(self._step)):
+        with trace_path(plan_step.path):
             async with trace_action(
                 self._hass, self, self._stop, self._variables
             ) as trace_element:
                 if self._stop.done():
                     return
 
-                action = cv.determine_script_action(self._action)
-
-                if CONF_ENABLED in self._action:
-                    enabled = self._action[CONF_ENABLED]
+                if (enabled := plan_step.enabled) is not True:
                     if isinstance(enabled, Template):
                         try:
                             enabled = enabled.async_render(limited=True)
@@ -515,14 +521,13 @@ class _ScriptRun:
                     if not enabled:
                         self._log(
                             "Skipped disabled step %s",
-                            self._action.get(CONF_ALIAS, action),
+                            self._action.get(CONF_ALIAS, plan_step.action),
                         )
                         trace_set_result(enabled=False)
                         return
 
-                handler = f"_async_{action}_step"
                 try:
-                    await getattr(self, handler)()
+                    await plan_step.handler(self)
                 except Exception as ex:  # noqa: BLE001
                     self._handle_exception(
                         ex, continue_on_error, self._log_exceptions or log_exceptions
@@ -580,7 +585,7 @@ class _ScriptRun:
             raise exception
 
     def _log_exception(self, exception: Exception) -> None:
-        action_type = cv.determine_script_action(self._action)
+        action_type = self._plan_step.action
 
         error = str(exception)
         level = logging.ERROR
@@ -665,6 +670,7 @@ class _ScriptRun:
         timeout = self._get_timeout_seconds_from_action()
         self._step_log("wait template", timeout)
 
+        trace_variables_change(self._variables)
         self._variables["wait"] = {"remaining": timeout, "completed": False}
         trace_set_result(wait=self._variables["wait"])
 
@@ -732,9 +738,19 @@ class _ScriptRun:
         """Call the service specified in the action."""
         self._step_log("call service")
 
-        params = service.async_prepare_call_from_config(
-            self._hass, self._action, self._variables
-        )
+        if (static_params := self._plan_step.static_params) is not None:
+            # The service call is the same for each run but
+            # async_call adds the target to the service data.
+            params: service.ServiceParams = {
+                "domain": static_params["domain"],
+                "service": static_params["service"],
+                "service_data": copy(static_params["service_data"]),
+                "target": copy(static_params["target"]),
+            }
+        else:
+            params = service.async_prepare_call_from_config(
+                self._hass, self._action, self._variables
+            )
 
         # Validate response data parameters. This check ignores services that do
         # not exist which will raise an appropriate error in the service call below.
@@ -773,6 +789,7 @@ class _ScriptRun:
             )
         )
         if response_variable:
+            trace_variables_change(self._variables)
             self._variables[response_variable] = response_data
 
     async def _async_device_step(self) -> None:
@@ -821,7 +838,10 @@ class _ScriptRun:
         self._script.last_action = self._action.get(
             CONF_ALIAS, self._action[CONF_CONDITION]
         )
-        cond = await self._async_get_condition(self._action)
+        if (cond := self._plan_step.condition) is None:
+            cond = self._plan_step.condition = await self._async_get_condition(
+                self._action
+            )
         try:
             trace_element = trace_stack_top(trace_stack_cv)
             if trace_element:
@@ -879,6 +899,7 @@ class _ScriptRun:
                 repeat_vars["last"] = iteration == count
             if item is not None:
                 repeat_vars["item"] = item
+            trace_variables_change(self._variables)
             self._variables["repeat"] = repeat_vars
 
         script = self._script._get_repeat_script(self._step)  # noqa: SLF001
@@ -1030,6 +1051,7 @@ class _ScriptRun:
                 # while all the cpu time is consumed.
                 await asyncio.sleep(0)
 
+        trace_variables_change(self._variables)
         if saved_repeat_vars:
             self._variables["repeat"] = saved_repeat_vars
         else:
@@ -1133,6 +1155,7 @@ class _ScriptRun:
         self._step_log("wait for trigger", timeout)
 
         variables = {**self._variables}
+        trace_variables_change(self._variables)
         self._variables["wait"] = {"remaining": timeout, "trigger": None}
         trace_set_result(wait=self._variables["wait"])
 
@@ -1382,6 +1405,89 @@ class _IfData(TypedDict):
     if_else: Script | None
 
 
+@dataclass(slots=True)
+class _PlanStep:
+    """An action of a script sequence compiled for running it."""
+
+    config: dict[str, Any]
+    path: str
+    action: str
+    handler: Callable[[_ScriptRun], Coroutine[Any, Any, None]]
+    continue_on_error: bool
+    enabled: bool | Template
+    # The service call of a call_service action without templates
+    static_params: service.ServiceParams | None = None
+    condition: ConditionCheckerType | None = None
+
+
+def _is_static(value: Any) -> bool:
+    """Return if a config value renders the same for all variables."""
+    if isinstance(value, Template):
+        return value.is_static
+    if isinstance(value, list):
+        return all(_is_static(val) for val in value)
+    if isinstance(value, Mapping):
+        return all(_is_static(val) for val in value) and all(
+            _is_static(val) for val in value.values()
+        )
+    return True
+
+
+@callback
+def _async_prepare_static_service_call(
+    hass: HomeAssistant, config: ConfigType
+) -> service.ServiceParams | None:
+    """Prepare the service call of an action once if it does not use templates.
+
+    Returns None if the service call has to be prepared for each run because
+    it renders templates or targets entities by their registry id which can
+    be renamed while the script is loaded.
+    """
+    if not all(
+        _is_static(config[key])
+        for key in (
+            CONF_SERVICE,
+            CONF_SERVICE_TEMPLATE,
+            CONF_TARGET,
+            CONF_SERVICE_DATA,
+            CONF_SERVICE_DATA_TEMPLATE,
+        )
+        if key in config
+    ):
+        return None
+    try:
+        target = template.render_complex(config.get(CONF_TARGET, {}))
+        if (entity_ids := target.get(CONF_ENTITY_ID)) is not None:
+            entity_ids = cv.comp_entity_ids_or_uuids(entity_ids)
+            if entity_ids not in (ENTITY_MATCH_ALL, ENTITY_MATCH_NONE) and not all(
+                valid_entity_id(entity_id) for entity_id in entity_ids
+            ):
+                return None
+        return service.async_prepare_call_from_config(hass, config)
+    except (exceptions.HomeAssistantError, vol.Invalid):
+        # Raise the error when the action runs
+        return None
+
+
+@callback
+def _async_compile_step(
+    hass: HomeAssistant, step: int, config: dict[str, Any]
+) -> _PlanStep:
+    """Compile an action of a script sequence."""
+    action = cv.determine_script_action(config)
+    return _PlanStep(
+        config,
+        str(step),
+        action,
+        getattr(_ScriptRun, f"_async_{action}_step"),
+        config.get(CONF_CONTINUE_ON_ERROR, False),
+        config.get(CONF_ENABLED, True),
+        _async_prepare_static_service_call(hass, config)
+        if action == cv.SCRIPT_ACTION_CALL_SERVICE
+        else None,
+    )
+
+
 @dataclass
 class ScriptRunResult:
     """Container with the result of a script run."""
@@ -1457,6 +1563,7 @@ class Script:
         self._if_data: dict[int, _IfData] = {}
         self._parallel_scripts: dict[int, list[Script]] = {}
         self._sequence_scripts: dict[int, Script] = {}
+        self._plan: list[_PlanStep] | None = None
         self.variables = variables
         self._variables_dynamic = template.is_complex(variables)
         if self._variables_dynamic:
@@ -1823,6 +1930,20 @@ class Script:
             return
         await asyncio.shield(create_eager_task(self._async_stop(aws, update_state)))
 
+    def _get_plan(self) -> list[_PlanStep]:
+        """Return the sequence compiled into the steps to run.
+
+        The sequence is compiled once when the script runs for the
+        first time so each run does not have to look up the handler
+        and prepare the static parts of the actions again.
+        """
+        if (plan := self._plan) is None:
+            plan = self._plan = [
+                _async_compile_step(self._hass, step, config)
+                for step, config in enumerate(self.sequence)
+            ]
+        return plan
+
     async def _async_get_condition(self, config: ConfigType) -> ConditionCheckerType:
         config_cache_key = frozenset((k, str(v)) for k, v in config.items())
         if not (cond := self._config_cache.get(config_cache_key)):
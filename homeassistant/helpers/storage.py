@@ -6,13 +6,16 @@ import asyncio
 from collections.abc import Callable, Iterable, Mapping, Sequence
 from contextlib import suppress
 from copy import deepcopy
+from dataclasses import dataclass
 from functools import cached_property
 import inspect
 from json import JSONDecodeError, JSONEncoder
 import logging
 import os
 from pathlib import Path
-from typing import Any
+import tempfile
+from typing import Any, Protocol
+from zlib import crc32
 
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
@@ -33,6 +36,7 @@ from homeassistant.util import json as json_util
 import homeassistant.util.dt as dt_util
 from homeassistant.util.file import WriteError
 from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.uuid import random_uuid_hex
 
 from . import json as json_helper
 
@@ -48,6 +52,15 @@ STORAGE_MANAGER: HassKey[_StoreManager] = HassKey("storage_manager")
 
 MANAGER_CLEANUP_DELAY = 60
 
+# Block size used to estimate how many bytes of a file changed
+WRITE_BLOCK_SIZE = 4096
+
+JOURNAL_SUFFIX = ".journal"
+# The journal is compacted into the file once it is larger than
+# this ratio of the file, so loading does not get much slower
+JOURNAL_COMPACT_RATIO = 0.25
+JOURNAL_MIN_COMPACT_SIZE = 256 * 1024
+
 
 @bind_hass
 async def async_migrator[_T: Mapping[str, Any] | Sequence[Any]](
@@ -102,10 +115,95 @@ def get_internal_store_manager(hass: HomeAssistant) -> _StoreManager:
     return hass.data[STORAGE_MANAGER]
 
 
+@dataclass(slots=True)
+class StoreWriteStats:
+    """Write statistics of a store since startup.
+
+    bytes_changed is estimated by comparing the blocks at the start
+    and the end of the file with the previous write, so a small edit
+    in the middle of a large file only counts the blocks around it.
+    """
+
+    writes: int = 0
+    skipped_writes: int = 0
+    bytes_written: int = 0
+    bytes_changed: int = 0
+
+    @property
+    def write_amplification(self) -> float | None:
+        """Return the number of bytes written per byte changed."""
+        if not self.bytes_changed:
+            return None
+        return self.bytes_written / self.bytes_changed
+
+
+@dataclass(slots=True)
+class _BlockChecksums:
+    """Checksums of the blocks of a file aligned to its start and its end."""
+
+    head: list[int]
+    tail: list[int]
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> _BlockChecksums:
+        """Create the checksums of data."""
+        view = memoryview(data)
+        size = len(data)
+        return cls(
+            [
+                crc32(view[i : i + WRITE_BLOCK_SIZE])
+                for i in range(0, size, WRITE_BLOCK_SIZE)
+            ],
+            [
+                crc32(view[max(i - WRITE_BLOCK_SIZE, 0) : i])
+                for i in range(size, 0, -WRITE_BLOCK_SIZE)
+            ],
+        )
+
+    def changed_bytes(self, previous: _BlockChecksums | None, size: int) -> int:
+        """Estimate the number of bytes that changed since previous."""
+        if previous is None:
+            return size
+        unchanged_blocks = _count_equal_prefix(
+            self.head, previous.head
+        ) + _count_equal_prefix(self.tail, previous.tail)
+        return max(size - unchanged_blocks * WRITE_BLOCK_SIZE, 0)
+
+
+def _count_equal_prefix(first: list[int], second: list[int]) -> int:
+    """Return the number of leading items that are equal."""
+    count = 0
+    for first_item, second_item in zip(first, second, strict=False):
+        if first_item != second_item:
+            break
+        count += 1
+    return count
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    """A store write waiting for the next flush."""
+
+    store: Store[Any]
+    path: str
+    data: dict[str, Any]
+    future: asyncio.Future[None]
+    tmp_path: str | None = None
+    checksums: _BlockChecksums | None = None
+    bytes_written: int = 0
+    bytes_changed: int = 0
+    error: Exception | None = None
+
+
 class _StoreManager:
     """Class to help storing data.
 
     The store manager is used to cache and manage storage files.
+
+    It also writes the stores. Writes that are due in the same event
+    loop iteration, or while a previous flush is still running, are
+    coalesced into a single executor job which renames all files into
+    place after writing them and syncs each storage directory once.
     """
 
     def __init__(self, hass: HomeAssistant) -> None:
@@ -116,6 +214,10 @@ class _StoreManager:
         self._data_preload: dict[str, json_util.JsonValueType] = {}
         self._storage_path: Path = Path(hass.config.config_dir).joinpath(STORAGE_DIR)
         self._cancel_cleanup: asyncio.TimerHandle | None = None
+        self._pending_writes: list[_PendingWrite] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._checksums: dict[str, _BlockChecksums] = {}
+        self._write_stats: dict[str, StoreWriteStats] = {}
 
     async def async_initialize(self) -> None:
         """Initialize the storage manager."""
@@ -225,6 +327,163 @@ class _StoreManager:
         if self._storage_path.exists():
             self._files = set(os.listdir(self._storage_path))
 
+    @callback
+    def async_get_write_stats(self) -> dict[str, StoreWriteStats]:
+        """Return the write statistics of the stores by key."""
+        return self._write_stats
+
+    @callback
+    def async_forget_written(self, path: str) -> None:
+        """Forget what was written to a file that was removed."""
+        self._checksums.pop(path, None)
+
+    async def async_write(
+        self, store: Store[Any], path: str, data: dict[str, Any]
+    ) -> None:
+        """Write the data of a store with the next flush."""
+        write = _PendingWrite(store, path, data, self._hass.loop.create_future())
+        self._pending_writes.append(write)
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_task_internal(
+                self._async_flush(), "storage flush", eager_start=False
+            )
+        await write.future
+
+    async def _async_flush(self) -> None:
+        """Flush pending writes until there are none left."""
+        writes: list[_PendingWrite] = []
+        try:
+            while self._pending_writes:
+                writes = self._pending_writes
+                self._pending_writes = []
+                try:
+                    await self._hass.async_add_executor_job(self._write_batch, writes)
+                except Exception as err:  # noqa: BLE001
+                    # Fail the stores of this batch and carry on with
+                    # the writes that were queued in the meantime
+                    for write in writes:
+                        if not write.future.done():
+                            write.future.set_exception(err)
+                    continue
+                for write in writes:
+                    self._async_finish_write(write)
+        finally:
+            self._flush_task = None
+            # Only cancels anything when the flush itself was cancelled
+            for write in (*writes, *self._pending_writes):
+                write.future.cancel()
+            self._pending_writes.clear()
+
+    @callback
+    def _async_finish_write(self, write: _PendingWrite) -> None:
+        """Record the statistics of a write and wake up the store."""
+        if write.future.done():
+            return
+        if write.error is not None:
+            write.future.set_exception(write.error)
+            return
+        if write.tmp_path is None:
+            self._async_get_stats(write.store.key).skipped_writes += 1
+        else:
+            self.async_record_write(
+                write.store.key, write.bytes_written, write.bytes_changed
+            )
+        write.future.set_result(None)
+
+    @callback
+    def _async_get_stats(self, key: str) -> StoreWriteStats:
+        """Return the write statistics of a store."""
+        if (stats := self._write_stats.get(key)) is None:
+            stats = self._write_stats[key] = StoreWriteStats()
+        return stats
+
+    @callback
+    def async_record_write(
+        self, key: str, bytes_written: int, bytes_changed: int
+    ) -> None:
+        """Record a write of a store."""
+        stats = self._async_get_stats(key)
+        stats.writes += 1
+        stats.bytes_written += bytes_written
+        stats.bytes_changed += bytes_changed
+
+    def _write_batch(self, writes: list[_PendingWrite]) -> None:
+        """Write a batch of stores.
+
+        All files are written to temporary files first and then
+        renamed into place. Files of stores with atomic writes are
+        synced before the rename and their directories once after.
+        """
+        for write in writes:
+            try:
+                self._stage_write(write)
+            except Exception as err:  # noqa: BLE001
+                write.error = err
+
+        sync_dirs: set[str] = set()
+        for write in writes:
+            if write.error is not None or (tmp_path := write.tmp_path) is None:
+                continue
+            try:
+                os.replace(tmp_path, write.path)
+            except OSError as err:
+                _LOGGER.exception("Saving file failed: %s", write.path)
+                write.error = WriteError(err)
+                with suppress(OSError):
+                    os.remove(tmp_path)
+                continue
+            if write.checksums is not None:
+                self._checksums[write.path] = write.checksums
+            if write.store._atomic_writes:  # noqa: SLF001
+                sync_dirs.add(os.path.dirname(write.path))
+
+        for directory in sync_dirs:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as err:
+                _LOGGER.warning("Syncing directory %s failed: %s", directory, err)
+
+    def _stage_write(self, write: _PendingWrite) -> None:
+        """Serialize a store and write it to a temporary file."""
+        store = write.store
+        path = write.path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        json_data = store._serialize_data(path, write.data)  # noqa: SLF001
+        if isinstance(json_data, str):
+            json_data = json_data.encode()
+
+        checksums = _BlockChecksums.from_bytes(json_data)
+        previous = self._checksums.get(path)
+        if previous == checksums and os.path.exists(path):
+            _LOGGER.debug("Data for %s did not change, skipping write", store.key)
+            return
+
+        write.checksums = checksums
+        write.bytes_written = len(json_data)
+        write.bytes_changed = checksums.changed_bytes(previous, len(json_data))
+        try:
+            # Modern versions of Python tempfile create this file with mode 0o600
+            with tempfile.NamedTemporaryFile(
+                mode="wb", dir=os.path.dirname(path), delete=False
+            ) as fdesc:
+                write.tmp_path = fdesc.name
+                fdesc.write(json_data)
+                if not store._private:  # noqa: SLF001
+                    os.fchmod(fdesc.fileno(), 0o644)
+                if store._atomic_writes:  # noqa: SLF001
+                    fdesc.flush()
+                    os.fsync(fdesc.fileno())
+        except OSError as err:
+            _LOGGER.exception("Saving file failed: %s", path)
+            if write.tmp_path is not None:
+                with suppress(OSError):
+                    os.remove(write.tmp_path)
+            raise WriteError(err) from err
+
 
 @bind_hass
 class Store[_T: Mapping[str, Any] | Sequence[Any]]:
@@ -325,6 +584,7 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
             exists, data = cache
             if not exists:
                 return None
+            await self._async_process_read_data(data)
         else:
             try:
                 data = await self.hass.async_add_executor_job(
@@ -387,6 +647,8 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
             if data == {}:
                 return None
 
+            await self._async_process_read_data(data)
+
         # Add minor_version if not set
         if "minor_version" not in data:
             data["minor_version"] = 1
@@ -420,6 +682,9 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
 
         return stored
 
+    async def _async_process_read_data(self, data: dict[str, Any]) -> None:
+        """Process data read from disk before it is migrated."""
+
     async def async_save(self, data: _T) -> None:
         """Save data."""
         self._data = {
@@ -542,23 +807,15 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
     async def _async_write_data(self, path: str, data: dict) -> None:
-        await self.hass.async_add_executor_job(self._write_data, self.path, data)
-
-    def _write_data(self, path: str, data: dict) -> None:
-        """Write the data."""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        await self._manager.async_write(self, path, data)
 
+    def _serialize_data(self, path: str, data: dict) -> str | bytes:
+        """Serialize the data to write."""
         if "data_func" in data:
             data["data"] = data.pop("data_func")()
 
         _LOGGER.debug("Writing data for %s to %s", self.key, path)
-        json_helper.save_json(
-            path,
-            data,
-            self._private,
-            encoder=self._encoder,
-            atomic_writes=self._atomic_writes,
-        )
+        return json_helper.serialize_json_for_save(path, data, encoder=self._encoder)
 
     async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
         """Migrate to the new version."""
@@ -570,5 +827,226 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
         self._async_cleanup_delay_listener()
         self._async_cleanup_final_write_listener()
 
+        self._manager.async_forget_written(self.path)
+
         with suppress(FileNotFoundError):
             await self.hass.async_add_executor_job(os.unlink, self.path)
+
+
+class JournalItem(Protocol):
+    """An item of a collection in a journaled store."""
+
+    @property
+    def id(self) -> str:
+        """Return the unique id of the item."""
+
+    @property
+    def as_storage_fragment(self) -> json_helper.json_fragment:
+        """Return a json fragment of the item for storage."""
+
+
+class JournaledStore[_T: Mapping[str, Any]](Store[_T]):
+    """Store which appends changed items to a journal.
+
+    The data must be a dict of collections, each a list of items with a
+    unique id. Once the data is loaded, the owner calls
+    async_start_journal with a function returning the current items of
+    each collection. From then on, writes append the items which changed
+    since the last write (compared by identity) to a journal next to the
+    file instead of rewriting the whole file.
+
+    The journal is replayed when the data is loaded. It is compacted
+    into the file when it grows too large compared to the file and
+    during the final write when Home Assistant stops. The file and the
+    first line of its journal share a random token so a journal left
+    behind by an interrupted compaction is never replayed on top of a
+    newer file.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize journaled storage class."""
+        super().__init__(*args, **kwargs)
+        self._journal_func: Callable[[], Mapping[str, Iterable[JournalItem]]] | None = (
+            None
+        )
+        # The items that are on disk by collection and id
+        self._journaled: dict[str, dict[str, JournalItem]] | None = None
+        self._token: str | None = None
+        self._file_size = 0
+        self._journal_size = 0
+
+    @cached_property
+    def journal_path(self) -> str:
+        """Return the path of the journal."""
+        return f"{self.path}{JOURNAL_SUFFIX}"
+
+    @callback
+    def async_start_journal(
+        self, journal_func: Callable[[], Mapping[str, Iterable[JournalItem]]]
+    ) -> None:
+        """Start journaling changes once the loaded data is in use."""
+        self._journal_func = journal_func
+        if self._token is not None:
+            self._journaled = self._async_get_journal_items()
+
+    @callback
+    def _async_get_journal_items(self) -> dict[str, dict[str, JournalItem]]:
+        """Return the current items by collection and id."""
+        assert self._journal_func is not None
+        return {
+            collection: {item.id: item for item in items}
+            for collection, items in self._journal_func().items()
+        }
+
+    async def _async_process_read_data(self, data: dict[str, Any]) -> None:
+        """Replay the journal on the data read from disk."""
+        self._token = data.get("journal")
+        self._file_size, self._journal_size = await self.hass.async_add_executor_job(
+            self._replay_journal, data
+        )
+
+    def _replay_journal(self, data: dict[str, Any]) -> tuple[int, int]:
+        """Replay the journal and return the size of the file and the journal."""
+        try:
+            file_size = os.path.getsize(self.path)
+        except OSError:
+            file_size = 0
+        try:
+            with open(self.journal_path, "rb") as fdesc:
+                lines = fdesc.read().splitlines()
+        except FileNotFoundError:
+            return file_size, 0
+
+        try:
+            token = json_util.json_loads(lines[0]) if lines else None
+        except ValueError:
+            token = None
+        if token is None or token != self._token:
+            _LOGGER.debug("Ignoring journal of %s from another file", self.key)
+            return file_size, 0
+
+        collections: dict[str, list[dict[str, Any] | None]] = data["data"]
+        indexes: dict[str, dict[str, int]] = {}
+        replayed = 1
+        for line in lines[1:]:
+            try:
+                change: Any = json_util.json_loads(line)
+            except ValueError:
+                # The last change was not completely written
+                _LOGGER.warning("Ignoring incomplete journal entry of %s", self.key)
+                break
+            collection, item_id, item = change
+            items = collections.setdefault(collection, [])
+            if (index := indexes.get(collection)) is None:
+                index = indexes[collection] = {
+                    existing["id"]: idx
+                    for idx, existing in enumerate(items)
+                    if existing is not None
+                }
+            if (idx := index.get(item_id)) is not None:
+                items[idx] = item
+            elif item is not None:
+                index[item_id] = len(items)
+                items.append(item)
+            replayed += 1
+
+        for collection in indexes:
+            collections[collection] = [
+                item for item in collections[collection] if item is not None
+            ]
+        _LOGGER.debug("Replayed %s journal entries of %s", replayed - 1, self.key)
+        return file_size, sum(len(line) + 1 for line in lines[:replayed])
+
+    async def _async_write_data(self, path: str, data: dict) -> None:
+        """Append the changed items to the journal or write the whole file."""
+        if (
+            (journaled := self._journaled) is None
+            or self.hass.state is CoreState.final_write
+            or self._journal_size
+            >= max(JOURNAL_MIN_COMPACT_SIZE, self._file_size * JOURNAL_COMPACT_RATIO)
+        ):
+            await self._async_write_file(path, data)
+            return
+
+        current = self._async_get_journal_items()
+        changes: list[tuple[str, str, JournalItem | None]] = []
+        for collection, items in current.items():
+            previous = journaled.get(collection, {})
+            changes.extend(
+                (collection, item_id, item)
+                for item_id, item in items.items()
+                if previous.get(item_id) is not item
+            )
+            changes.extend(
+                (collection, item_id, None)
+                for item_id in previous
+                if item_id not in items
+            )
+        self._journaled = current
+        if not changes:
+            return
+
+        try:
+            size = await self.hass.async_add_executor_job(
+                self._append_journal, changes, self._journal_size == 0
+            )
+        except OSError as err:
+            # The file is written on the next save
+            self._journaled = None
+            raise WriteError(err) from err
+        self._journal_size += size
+        self._manager.async_record_write(self.key, size, size)
+
+    def _append_journal(
+        self, changes: list[tuple[str, str, JournalItem | None]], new: bool
+    ) -> int:
+        """Append changes to the journal and return the number of bytes written."""
+        lines = [json_helper.json_bytes(self._token)] if new else []
+        lines.extend(
+            json_helper.json_bytes(
+                [
+                    collection,
+                    item_id,
+                    None if item is None else item.as_storage_fragment,
+                ]
+            )
+            for collection, item_id, item in changes
+        )
+        journal_data = b"\n".join(lines) + b"\n"
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if new else os.O_APPEND)
+        fd = os.open(self.journal_path, flags, 0o600 if self._private else 0o644)
+        with os.fdopen(fd, "wb") as fdesc:
+            fdesc.write(journal_data)
+            if self._atomic_writes:
+                fdesc.flush()
+                os.fsync(fdesc.fileno())
+        return len(journal_data)
+
+    async def _async_write_file(self, path: str, data: dict) -> None:
+        """Write the whole file and remove the journal."""
+        current = (
+            self._async_get_journal_items() if self._journal_func is not None else None
+        )
+        token = data["journal"] = random_uuid_hex()
+        await super()._async_write_data(path, data)
+        self._token = token
+        self._journaled = current
+        self._journal_size = 0
+        self._file_size = await self.hass.async_add_executor_job(self._remove_journal)
+
+    def _remove_journal(self) -> int:
+        """Remove the journal and return the size of the file."""
+        with suppress(FileNotFoundError):
+            os.unlink(self.journal_path)
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    async def async_remove(self) -> None:
+        """Remove all data."""
+        self._token = None
+        self._journaled = None
+        self._journal_size = 0
+        await super().async_remove()
+        await self.hass.async_add_executor_job(self._remove_journal)
@@ -0,0 +1,445 @@
+"""Index of the areas, devices and entities targeted by areas, devices, floors and labels."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, cast
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from . import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    label_registry as lr,
+)
+from .singleton import singleton
+
+DATA_TARGET_INDEX: HassKey[TargetIndex] = HassKey("target_index")
+
+# Registry items a cached result is computed from
+_AREA = "area"
+_DEVICE = "device"
+_ENTITY = "entity"
+_FLOOR = "floor"
+_LABEL = "label"
+
+# Kinds of cached results
+_AREA_ENTITIES = "area_entities"
+_FLOOR_AREAS = "floor_areas"
+_LABEL_ENTITIES = "label_entities"
+_TARGET_AREA = "target_area"
+_TARGET_DEVICE = "target_device"
+_TARGET_FLOOR = "target_floor"
+_TARGET_LABEL = "target_label"
+
+# Fields of registry entries which change what a target resolves to,
+# updates of other fields keep the cached results
+_ENTITY_TARGET_FIELDS = {
+    "area_id",
+    "device_id",
+    "disabled_by",
+    "entity_category",
+    "entity_id",
+    "hidden_by",
+    "labels",
+}
+_DEVICE_TARGET_FIELDS = {"area_id", "labels"}
+
+type _Token = tuple[str, str]
+type _Key = tuple[str, str]
+
+
+@dataclass(slots=True, frozen=True)
+class TargetResolution:
+    """The areas, devices and entities a target resolves to.
+
+    Entities which are hidden, or which are config or diagnostic
+    entities, are not included.
+    """
+
+    areas: frozenset[str]
+    devices: frozenset[str]
+    entities: frozenset[str]
+
+
+def _is_targetable(entry: er.RegistryEntry) -> bool:
+    """Return if an entity is targeted through its area, device or labels."""
+    return entry.entity_category is None and entry.hidden_by is None
+
+
+class TargetIndex:
+    """Resolve areas, devices, floors and labels to the items they contain.
+
+    Results are computed when they are first requested and cached. Each
+    result records the registry items it was computed from, so a registry
+    update only drops the results which depend on the updated items.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the target index."""
+        self.hass = hass
+        self._cache: dict[_Key, Any] = {}
+        self._dependencies: dict[_Key, set[_Token]] = {}
+        self._dependents: defaultdict[_Token, set[_Key]] = defaultdict(set)
+        self._entity_registry: er.EntityRegistry | None = None
+        self._device_registry: dr.DeviceRegistry | None = None
+        self._area_registry: ar.AreaRegistry | None = None
+        self._compute: dict[str, Callable[[str, set[_Token]], Any]] = {
+            _AREA_ENTITIES: self._compute_area_entities,
+            _FLOOR_AREAS: self._compute_floor_areas,
+            _LABEL_ENTITIES: self._compute_label_entities,
+            _TARGET_AREA: self._compute_target_area,
+            _TARGET_DEVICE: self._compute_target_device,
+            _TARGET_FLOOR: self._compute_target_floor,
+            _TARGET_LABEL: self._compute_target_label,
+        }
+
+    @callback
+    def async_setup(self) -> None:
+        """Listen for registry updates."""
+        bus = self.hass.bus
+        bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_registry_updated
+        )
+        bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_registry_updated
+        )
+        bus.async_listen(
+            ar.EVENT_AREA_REGISTRY_UPDATED, self._async_area_registry_updated
+        )
+        bus.async_listen(
+            fr.EVENT_FLOOR_REGISTRY_UPDATED, self._async_floor_registry_updated
+        )
+        bus.async_listen(
+            lr.EVENT_LABEL_REGISTRY_UPDATED, self._async_label_registry_updated
+        )
+
+    @callback
+    def async_resolve_area(self, area_id: str) -> TargetResolution:
+        """Resolve an area target."""
+        return cast(TargetResolution, self._async_get(_TARGET_AREA, area_id))
+
+    @callback
+    def async_resolve_device(self, device_id: str) -> TargetResolution:
+        """Resolve a device target.
+
+        Unlike the devices of a targeted area, a targeted device also
+        resolves to its entities which are in another area.
+        """
+        return cast(TargetResolution, self._async_get(_TARGET_DEVICE, device_id))
+
+    @callback
+    def async_resolve_floor(self, floor_id: str) -> TargetResolution:
+        """Resolve a floor target."""
+        return cast(TargetResolution, self._async_get(_TARGET_FLOOR, floor_id))
+
+    @callback
+    def async_resolve_label(self, label_id: str) -> TargetResolution:
+        """Resolve a label target."""
+        return cast(TargetResolution, self._async_get(_TARGET_LABEL, label_id))
+
+    @callback
+    def async_area_entities(self, area_id: str) -> tuple[str, ...]:
+        """Return the entities in an area.
+
+        These are the entities assigned to the area and the entities of
+        the devices in the area which are not assigned to an area
+        themselves, including hidden, config and diagnostic entities.
+        """
+        return cast(tuple[str, ...], self._async_get(_AREA_ENTITIES, area_id))
+
+    @callback
+    def async_floor_areas(self, floor_id: str) -> tuple[str, ...]:
+        """Return the areas on a floor."""
+        return cast(tuple[str, ...], self._async_get(_FLOOR_AREAS, floor_id))
+
+    @callback
+    def async_label_entities(self, label_id: str) -> tuple[str, ...]:
+        """Return the entities which have a label."""
+        return cast(tuple[str, ...], self._async_get(_LABEL_ENTITIES, label_id))
+
+    @callback
+    def _async_get(self, kind: str, target_id: str) -> Any:
+        """Return a cached result, computing it if needed."""
+        hass = self.hass
+        entity_registry = er.async_get(hass)
+        device_registry = dr.async_get(hass)
+        area_registry = ar.async_get(hass)
+        if (
+            entity_registry is not self._entity_registry
+            or device_registry is not self._device_registry
+            or area_registry is not self._area_registry
+        ):
+            # A registry was replaced without firing update events
+            self._entity_registry = entity_registry
+            self._device_registry = device_registry
+            self._area_registry = area_registry
+            self._async_clear()
+        return self._async_get_cached(kind, target_id, None)
+
+    @callback
+    def _async_get_cached(
+        self, kind: str, target_id: str, tokens: set[_Token] | None
+    ) -> Any:
+        """Return a cached result and add its dependencies to tokens."""
+        key = (kind, target_id)
+        if (result := self._cache.get(key)) is None:
+            dependencies: set[_Token] = set()
+            result = self._cache[key] = self._compute[kind](target_id, dependencies)
+            self._dependencies[key] = dependencies
+            for token in dependencies:
+                self._dependents[token].add(key)
+        if tokens is not None:
+            tokens.update(self._dependencies[key])
+        return result
+
+    @callback
+    def _async_clear(self) -> None:
+        """Drop all cached results."""
+        self._cache.clear()
+        self._dependencies.clear()
+        self._dependents.clear()
+
+    @callback
+    def _async_invalidate(self, tokens: Iterable[_Token]) -> None:
+        """Drop the cached results which depend on registry items."""
+        if not self._cache:
+            return
+        dependents = self._dependents
+        for token in tokens:
+            for key in dependents.pop(token, ()):
+                self._cache.pop(key, None)
+                self._dependencies.pop(key, None)
+
+    def _add_entities(
+        self,
+        entries: Iterable[er.RegistryEntry],
+        entity_ids: set[str],
+        tokens: set[_Token],
+        *,
+        with_area: bool = True,
+    ) -> None:
+        """Add the targetable entities of entries to entity_ids."""
+        for entry in entries:
+            tokens.add((_ENTITY, entry.entity_id))
+            if _is_targetable(entry) and (with_area or not entry.area_id):
+                entity_ids.add(entry.entity_id)
+
+    def _compute_area_entities(
+        self, area_id: str, tokens: set[_Token]
+    ) -> tuple[str, ...]:
+        """Compute the entities in an area."""
+        assert self._entity_registry and self._device_registry
+        entities = self._entity_registry.entities
+        tokens.add((_AREA, area_id))
+        entity_ids: list[str] = []
+        for entry in entities.get_entries_for_area_id(area_id):
+            tokens.add((_ENTITY, entry.entity_id))
+            entity_ids.append(entry.entity_id)
+        # Entities of a device in the area without an area themselves
+        # inherit the area of the device
+        for device in self._device_registry.devices.get_devices_for_area_id(area_id):
+            tokens.add((_DEVICE, device.id))
+            for entry in entities.get_entries_for_device_id(device.id):
+                tokens.add((_ENTITY, entry.entity_id))
+                if entry.area_id is None:
+                    entity_ids.append(entry.entity_id)
+        return tuple(entity_ids)
+
+    def _compute_floor_areas(
+        self, floor_id: str, tokens: set[_Token]
+    ) -> tuple[str, ...]:
+        """Compute the areas on a floor."""
+        assert self._area_registry
+        tokens.add((_FLOOR, floor_id))
+        area_ids: list[str] = []
+        for area in self._area_registry.areas.get_areas_for_floor(floor_id):
+            tokens.add((_AREA, area.id))
+            area_ids.append(area.id)
+        return tuple(area_ids)
+
+    def _compute_label_entities(
+        self, label_id: str, tokens: set[_Token]
+    ) -> tuple[str, ...]:
+        """Compute the entities which have a label."""
+        assert self._entity_registry
+        tokens.add((_LABEL, label_id))
+        entity_ids: list[str] = []
+        for entry in self._entity_registry.entities.get_entries_for_label(label_id):
+            tokens.add((_ENTITY, entry.entity_id))
+            entity_ids.append(entry.entity_id)
+        return tuple(entity_ids)
+
+    def _compute_target_area(
+        self, area_id: str, tokens: set[_Token]
+    ) -> TargetResolution:
+        """Resolve an area target."""
+        assert self._entity_registry and self._device_registry
+        entities = self._entity_registry.entities
+        tokens.add((_AREA, area_id))
+        device_ids: set[str] = set()
+        entity_ids: set[str] = set()
+        self._add_entities(
+            entities.get_entries_for_area_id(area_id), entity_ids, tokens
+        )
+        for device in self._device_registry.devices.get_devices_for_area_id(area_id):
+            tokens.add((_DEVICE, device.id))
+            device_ids.add(device.id)
+            # Entities with an area of their own are only targeted
+            # through their area
+            self._add_entities(
+                entities.get_entries_for_device_id(device.id),
+                entity_ids,
+                tokens,
+                with_area=False,
+            )
+        return TargetResolution(
+            frozenset((area_id,)), frozenset(device_ids), frozenset(entity_ids)
+        )
+
+    def _compute_target_device(
+        self, device_id: str, tokens: set[_Token]
+    ) -> TargetResolution:
+        """Resolve a device target."""
+        assert self._entity_registry
+        tokens.add((_DEVICE, device_id))
+        entity_ids: set[str] = set()
+        self._add_entities(
+            self._entity_registry.entities.get_entries_for_device_id(device_id),
+            entity_ids,
+            tokens,
+        )
+        return TargetResolution(
+            frozenset(), frozenset((device_id,)), frozenset(entity_ids)
+        )
+
+    def _compute_target_floor(
+        self, floor_id: str, tokens: set[_Token]
+    ) -> TargetResolution:
+        """Resolve a floor target."""
+        area_ids: set[str] = set()
+        device_ids: set[str] = set()
+        entity_ids: set[str] = set()
+        for area_id in self._async_get_cached(_FLOOR_AREAS, floor_id, tokens):
+            area = self._async_get_cached(_TARGET_AREA, area_id, tokens)
+            area_ids.update(area.areas)
+            device_ids.update(area.devices)
+            entity_ids.update(area.entities)
+        return TargetResolution(
+            frozenset(area_ids), frozenset(device_ids), frozenset(entity_ids)
+        )
+
+    def _compute_target_label(
+        self, label_id: str, tokens: set[_Token]
+    ) -> TargetResolution:
+        """Resolve a label target."""
+        assert self._entity_registry and self._device_registry and self._area_registry
+        entities = self._entity_registry.entities
+        tokens.add((_LABEL, label_id))
+        area_ids: set[str] = set()
+        device_ids: set[str] = set()
+        entity_ids: set[str] = set()
+        self._add_entities(entities.get_entries_for_label(label_id), entity_ids, tokens)
+        for device in self._device_registry.devices.get_devices_for_label(label_id):
+            tokens.add((_DEVICE, device.id))
+            device_ids.add(device.id)
+            self._add_entities(
+                entities.get_entries_for_device_id(device.id),
+                entity_ids,
+                tokens,
+                with_area=False,
+            )
+        for area_entry in self._area_registry.areas.get_areas_for_label(label_id):
+            area = self._async_get_cached(_TARGET_AREA, area_entry.id, tokens)
+            area_ids.update(area.areas)
+            device_ids.update(area.devices)
+            entity_ids.update(area.entities)
+        return TargetResolution(
+            frozenset(area_ids), frozenset(device_ids), frozenset(entity_ids)
+        )
+
+    @callback
+    def _async_entity_registry_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Drop the results which depend on an updated entity."""
+        data = event.data
+        entity_id = data["entity_id"]
+        tokens: list[_Token] = [(_ENTITY, entity_id)]
+        if data["action"] == "update":
+            if _ENTITY_TARGET_FIELDS.isdisjoint(data["changes"]):
+                return
+            if "old_entity_id" in data:
+                tokens.append((_ENTITY, data["old_entity_id"]))
+        # Results which did not contain the entity before depend on
+        # the area, device or labels it has now
+        if data["action"] != "remove" and (
+            entry := er.async_get(self.hass).async_get(entity_id)
+        ):
+            if entry.area_id:
+                tokens.append((_AREA, entry.area_id))
+            if entry.device_id:
+                tokens.append((_DEVICE, entry.device_id))
+            tokens.extend((_LABEL, label_id) for label_id in entry.labels)
+        self._async_invalidate(tokens)
+
+    @callback
+    def _async_device_registry_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Drop the results which depend on an updated device."""
+        data = event.data
+        device_id = data["device_id"]
+        if data["action"] == "update" and _DEVICE_TARGET_FIELDS.isdisjoint(
+            data["changes"]
+        ):
+            return
+        tokens: list[_Token] = [(_DEVICE, device_id)]
+        if data["action"] != "remove" and (
+            device := dr.async_get(self.hass).async_get(device_id)
+        ):
+            if device.area_id:
+                tokens.append((_AREA, device.area_id))
+            tokens.extend((_LABEL, label_id) for label_id in device.labels)
+        self._async_invalidate(tokens)
+
+    @callback
+    def _async_area_registry_updated(
+        self, event: Event[ar.EventAreaRegistryUpdatedData]
+    ) -> None:
+        """Drop the results which depend on an updated area."""
+        area_id = event.data["area_id"]
+        tokens: list[_Token] = [(_AREA, area_id)]
+        if area := ar.async_get(self.hass).async_get_area(area_id):
+            if area.floor_id:
+                tokens.append((_FLOOR, area.floor_id))
+            tokens.extend((_LABEL, label_id) for label_id in area.labels)
+        self._async_invalidate(tokens)
+
+    @callback
+    def _async_floor_registry_updated(
+        self, event: Event[fr.EventFloorRegistryUpdatedData]
+    ) -> None:
+        """Drop the results which depend on an updated floor."""
+        self._async_invalidate(((_FLOOR, event.data["floor_id"]),))
+
+    @callback
+    def _async_label_registry_updated(
+        self, event: Event[lr.EventLabelRegistryUpdatedData]
+    ) -> None:
+        """Drop the results which depend on an updated label."""
+        self._async_invalidate(((_LABEL, event.data["label_id"]),))
+
+
+@callback
+@singleton(DATA_TARGET_INDEX)
+def async_get(hass: HomeAssistant) -> TargetIndex:
+    """Get the target index."""
+    index = TargetIndex(hass)
+    index.async_setup()
+    return index
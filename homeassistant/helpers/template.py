@@ -11,8 +11,10 @@ from contextlib import AbstractContextManager
 from contextvars import ContextVar
 from datetime import date, datetime, time, timedelta
 from functools import cache, cached_property, lru_cache, partial, wraps
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
 from operator import contains
 import pathlib
@@ -47,6 +49,7 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__,
 )
 from homeassistant.core import (
     Context,
@@ -79,8 +82,10 @@ from . import (
     issue_registry,
     label_registry,
     location as loc_helper,
+    target_index,
 )
 from .singleton import singleton
+from .storage import Store
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -98,6 +103,7 @@ _ENVIRONMENT_STRICT: HassKey[TemplateEnvironment] = HassKey(
     "template.environment_strict"
 )
 _HASS_LOADER = "template.hass_loader"
+_BYTECODE_CACHE: HassKey[TemplateBytecodeCache] = HassKey("template.bytecode_cache")
 
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -150,6 +156,11 @@ EVAL_CACHE_SIZE = 512
 
 MAX_CUSTOM_TEMPLATE_SIZE = 5 * 1024 * 1024
 
+BYTECODE_CACHE_STORAGE_KEY = "core.template_bytecode"
+BYTECODE_CACHE_STORAGE_VERSION = 1
+BYTECODE_CACHE_SAVE_DELAY = 60
+MAX_BYTECODE_CACHE_ENTRIES = 10000
+
 CACHED_TEMPLATE_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
 CACHED_TEMPLATE_NO_COLLECT_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
 ENTITY_COUNT_GROWTH_FACTOR = 1.2
@@ -178,7 +189,8 @@ def _template_state(hass: HomeAssistant, state: State) -> TemplateState:
 
 
 def async_setup(hass: HomeAssistant) -> bool:
-    """Set up tracking the template LRUs."""
+    """Set up tracking the template LRUs and the bytecode cache."""
+    hass.data[_BYTECODE_CACHE] = TemplateBytecodeCache(hass)
 
     @callback
     def _async_adjust_lru_sizes(_: Any) -> None:
@@ -1470,9 +1482,7 @@ def floor_areas(hass: HomeAssistant, floor_id_or_name: str) -> Iterable[str]:
     if _floor_id is None:
         return []
 
-    area_reg = area_registry.async_get(hass)
-    entries = area_registry.async_entries_for_floor(area_reg, _floor_id)
-    return [entry.id for entry in entries if entry.id]
+    return list(target_index.async_get(hass).async_floor_areas(_floor_id))
 
 
 def areas(hass: HomeAssistant) -> Iterable[str | None]:
@@ -1564,23 +1574,9 @@ def area_entities(hass: HomeAssistant, area_id_or_name: str) -> Iterable[str]:
         _area_id = area_id_or_name
     if _area_id is None:
         return []
-    ent_reg = entity_registry.async_get(hass)
-    entity_ids = [
-        entry.entity_id
-        for entry in entity_registry.async_entries_for_area(ent_reg, _area_id)
-    ]
-    dev_reg = device_registry.async_get(hass)
-    # We also need to add entities tied to a device in the area that don't themselves
-    # have an area specified since they inherit the area from the device.
-    entity_ids.extend(
-        [
-            entity.entity_id
-            for device in device_registry.async_entries_for_area(dev_reg, _area_id)
-            for entity in entity_registry.async_entries_for_device(ent_reg, device.id)
-            if entity.area_id is None
-        ]
-    )
-    return entity_ids
+    # The index also includes the entities tied to a device in the area that don't
+    # themselves have an area specified since they inherit the area from the device.
+    return list(target_index.async_get(hass).async_area_entities(_area_id))
 
 
 def area_devices(hass: HomeAssistant, area_id_or_name: str) -> Iterable[str]:
@@ -1680,9 +1676,7 @@ def label_entities(hass: HomeAssistant, label_id_or_name: str) -> Iterable[str]:
     """Return entities for a given label ID or name."""
     if (_label_id := _label_id_or_name(hass, label_id_or_name)) is None:
         return []
-    ent_reg = entity_registry.async_get(hass)
-    entries = entity_registry.async_entries_for_label(ent_reg, _label_id)
-    return [entry.entity_id for entry in entries]
+    return list(target_index.async_get(hass).async_label_entities(_label_id))
 
 
 def closest(hass, *args):
@@ -2711,6 +2705,117 @@ def _load_custom_templates(hass: HomeAssistant) -> dict[str, str]:
     return result
 
 
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the compiled templates saved by the last run."""
+    if (bytecode_cache := hass.data.get(_BYTECODE_CACHE)) is not None:
+        await bytecode_cache.async_load()
+
+
+def _bytecode_environment_version() -> str:
+    """Return the version of the code compiled by the template environment."""
+    return f"{__version__}-{jinja2.__version__}-{MAGIC_NUMBER.hex()}"
+
+
+class TemplateBytecodeCache(jinja2.BytecodeCache):
+    """Cache of compiled template code that is persisted in .storage.
+
+    Template strings are keyed by the environment variant and the hash
+    of their source. Templates loaded with the HassLoader go through the
+    jinja bytecode cache and are checked against the checksum of their
+    source, so custom templates that changed are compiled again. The
+    cache is discarded when Home Assistant, jinja or Python is updated,
+    and saved code that can not be loaded is compiled again.
+
+    The least recently used code is dropped when the cache is full and
+    only code used since the start is saved, so templates that are gone
+    do not stay in the cache forever.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the bytecode cache."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            BYTECODE_CACHE_STORAGE_VERSION,
+            BYTECODE_CACHE_STORAGE_KEY,
+            private=True,
+        )
+        self._entries: LRU[str, tuple[str, bytes]] = LRU(MAX_BYTECODE_CACHE_ENTRIES)
+        self._used: set[str] = set()
+
+    async def async_load(self) -> None:
+        """Load the saved code."""
+        if (
+            not (data := await self._store.async_load())
+            or data["environment"] != _bytecode_environment_version()
+        ):
+            return
+        entries = self._entries
+        for key, (checksum, code) in data["entries"].items():
+            # Code compiled before the cache was loaded is newer
+            if key not in entries:
+                entries[key] = (checksum, base64.b64decode(code))
+
+    def get_code(self, key: str, checksum: str) -> CodeType | None:
+        """Return the code for a key if the checksum matches."""
+        if (entry := self._entries.get(key)) is None or entry[0] != checksum:
+            return None
+        try:
+            code = marshal.loads(entry[1])
+        except (EOFError, ValueError, TypeError):
+            code = None
+        if not isinstance(code, CodeType):
+            del self._entries[key]
+            return None
+        self._used.add(key)
+        return code
+
+    def set_code(self, key: str, checksum: str, code: CodeType) -> None:
+        """Store the code for a key.
+
+        This method is thread-safe.
+        """
+        self._entries[key] = (checksum, marshal.dumps(code))
+        self._used.add(key)
+        self._hass.loop.call_soon_threadsafe(self._async_schedule_save)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule saving the cache."""
+        self._store.async_delay_save(self._data_to_save, BYTECODE_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to save."""
+        used = self._used
+        return {
+            "environment": _bytecode_environment_version(),
+            "entries": {
+                key: (checksum, base64.b64encode(code).decode())
+                for key, (checksum, code) in self._entries.items()
+                if key in used
+            },
+        }
+
+    @staticmethod
+    def _bucket_key(bucket: jinja2.bccache.Bucket) -> str:
+        """Return the key for a template loaded with the HassLoader."""
+        environment = cast(TemplateEnvironment, bucket.environment)
+        return f"loader:{environment.bytecode_variant}:{bucket.key}"
+
+    def load_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        """Load the code of a template loaded with the HassLoader."""
+        if (
+            code := self.get_code(self._bucket_key(bucket), bucket.checksum)
+        ) is not None:
+            bucket.code = code
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        """Store the code of a template loaded with the HassLoader."""
+        if bucket.code is not None:
+            self.set_code(self._bucket_key(bucket), bucket.checksum, bucket.code)
+
+
 @singleton(_HASS_LOADER)
 def _get_hass_loader(hass: HomeAssistant) -> HassLoader:
     return HassLoader({})
@@ -2757,6 +2862,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__(undefined=make_logging_undefined(strict, log_fn))
         self.hass = hass
+        self.bytecode_variant = f"{int(bool(limited))}{int(bool(strict))}"
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | None
         ] = weakref.WeakValueDictionary()
@@ -2859,6 +2965,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
         # This environment has access to hass, attach its loader to enable imports.
         self.loader = _get_hass_loader(hass)
+        self.bytecode_cache = hass.data.get(_BYTECODE_CACHE)
 
         # We mark these as a context functions to ensure they get
         # evaluated fresh with every execution, rather than executed
@@ -3110,7 +3217,17 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
-        compiled = super().compile(source)
+        if isinstance(source, str) and isinstance(
+            bytecode_cache := self.bytecode_cache, TemplateBytecodeCache
+        ):
+            key = (
+                f"{self.bytecode_variant}:{bytecode_cache.get_source_checksum(source)}"
+            )
+            if (compiled := bytecode_cache.get_code(key, "")) is None:
+                compiled = super().compile(source)
+                bytecode_cache.set_code(key, "", compiled)
+        else:
+            compiled = super().compile(source)
         self.template_cache[source] = compiled
         return compiled
 
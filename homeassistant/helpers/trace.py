@@ -6,6 +6,7 @@ from collections import deque
 from collections.abc import Callable, Coroutine, Generator
 from contextlib import contextmanager
 from contextvars import ContextVar
+from enum import Enum
 from functools import wraps
 from typing import Any
 
@@ -15,6 +16,20 @@ import homeassistant.util.dt as dt_util
 from .typing import TemplateVarsType
 
 
+class VariablesCapture(Enum):
+    """How trace elements capture the variables."""
+
+    # Copy the variables and compute the changed variables
+    FULL = "full"
+    # Keep a reference to the variables, compute the changed variables when
+    # requested. Variables changed in place are copied first with
+    # trace_variables_change.
+    LAZY = "lazy"
+    # Do not record the path, the elements or the variables of traces which
+    # are not kept
+    OFF = "off"
+
+
 class TraceElement:
     """Container for trace data."""
 
@@ -28,6 +43,7 @@ class TraceElement:
         "reuse_by_child",
         "_timestamp",
         "_variables",
+        "_variables_snapshot",
     )
 
     def __init__(self, variables: TemplateVarsType, path: str) -> None:
@@ -41,6 +57,8 @@ class TraceElement:
         self._timestamp = dt_util.utcnow()
 
         self._last_variables = variables_cv.get() or {}
+        self._variables: dict[str, Any] | None = {}
+        self._variables_snapshot: dict[str, Any] | None = None
         self.update_variables(variables)
 
     def __repr__(self) -> str:
@@ -67,10 +85,20 @@ class TraceElement:
 
     def update_variables(self, variables: TemplateVarsType) -> None:
         """Update variables."""
+        if (capture := variables_capture_cv.get()) is VariablesCapture.OFF:
+            return
         if variables is None:
             variables = {}
-        last_variables = self._last_variables
+        if capture is VariablesCapture.LAZY:
+            variables_cv.set(variables)
+            self._variables = None
+            self._variables_snapshot = variables
+            _lazy_variables_hold(variables, self)
+            if self._last_variables is not variables:
+                _lazy_variables_hold(self._last_variables, self)
+            return
         variables_cv.set(dict(variables))
+        last_variables = self._last_variables
         changed_variables = {
             key: value
             for key, value in variables.items()
@@ -78,6 +106,29 @@ class TraceElement:
         }
         self._variables = changed_variables
 
+    def replace_variables(
+        self, variables: TemplateVarsType, replacement: dict[str, Any]
+    ) -> None:
+        """Replace the variables kept by reference with a copy of them."""
+        if self._variables_snapshot is variables:
+            self._variables_snapshot = replacement
+        if self._last_variables is variables:
+            self._last_variables = replacement
+
+    @property
+    def changed_variables(self) -> dict[str, Any]:
+        """Return the variables changed by the traced element."""
+        if (changed_variables := self._variables) is None:
+            assert self._variables_snapshot is not None
+            last_variables = self._last_variables
+            changed_variables = self._variables = {
+                key: value
+                for key, value in self._variables_snapshot.items()
+                if key not in last_variables or last_variables[key] != value
+            }
+            self._variables_snapshot = None
+        return changed_variables
+
     def as_dict(self) -> dict[str, Any]:
         """Return dictionary version of this TraceElement."""
         result: dict[str, Any] = {"path": self.path, "timestamp": self._timestamp}
@@ -88,8 +139,8 @@ class TraceElement:
                 "item_id": item_id,
                 "run_id": str(self._child_run_id),
             }
-        if self._variables:
-            result["changed_variables"] = self._variables
+        if changed_variables := self.changed_variables:
+            result["changed_variables"] = changed_variables
         if self._error is not None:
             result["error"] = str(self._error) or self._error.__class__.__name__
         if self._result is not None:
@@ -112,6 +163,15 @@ trace_path_stack_cv: ContextVar[list[str] | None] = ContextVar(
 )
 # Copy of last variables
 variables_cv: ContextVar[Any | None] = ContextVar("variables_cv", default=None)
+# Variables kept by reference in lazy traces by id, with the trace
+# elements which keep them
+lazy_variables_cv: ContextVar[
+    dict[int, tuple[TemplateVarsType, list[TraceElement]]] | None
+] = ContextVar("lazy_variables_cv", default=None)
+# How the variables are captured in the current trace
+variables_capture_cv: ContextVar[VariablesCapture] = ContextVar(
+    "variables_capture_cv", default=VariablesCapture.FULL
+)
 # (domain.item_id, Run ID)
 trace_id_cv: ContextVar[tuple[str, str] | None] = ContextVar(
     "trace_id_cv", default=None
@@ -122,6 +182,33 @@ script_execution_cv: ContextVar[StopReason | None] = ContextVar(
 )
 
 
+def _lazy_variables_hold(variables: TemplateVarsType, element: TraceElement) -> None:
+    """Register a trace element keeping a reference to variables.
+
+    The registered variables are kept alive so their id is not reused.
+    """
+    if (lazy_variables := lazy_variables_cv.get()) is None:
+        lazy_variables = {}
+        lazy_variables_cv.set(lazy_variables)
+    if (entry := lazy_variables.get(id(variables))) is None:
+        lazy_variables[id(variables)] = (variables, [element])
+    else:
+        entry[1].append(element)
+
+
+def trace_variables_change(variables: dict[str, Any]) -> None:
+    """Copy variables kept by lazy traces before they are changed in place."""
+    if (lazy_variables := lazy_variables_cv.get()) is None or (
+        entry := lazy_variables.pop(id(variables), None)
+    ) is None:
+        return
+    replacement = dict(variables)
+    for element in entry[1]:
+        element.replace_variables(variables, replacement)
+    if variables_cv.get() is variables:
+        variables_cv.set(replacement)
+
+
 def trace_id_set(trace_id: tuple[str, str]) -> None:
     """Set id of the current trace."""
     trace_id_cv.set(trace_id)
@@ -158,6 +245,8 @@ def trace_stack_top[_T](trace_stack_var: ContextVar[list[_T] | None]) -> _T | No
 
 def trace_path_push(suffix: str | list[str]) -> int:
     """Go deeper in the config tree."""
+    if variables_capture_cv.get() is VariablesCapture.OFF:
+        return 0
     if isinstance(suffix, str):
         suffix = [suffix]
     for node in suffix:
@@ -183,6 +272,8 @@ def trace_append_element(
     maxlen: int | None = None,
 ) -> None:
     """Append a TraceElement to trace[path]."""
+    if variables_capture_cv.get() is VariablesCapture.OFF:
+        return
     if (trace := trace_cv.get()) is None:
         trace = {}
         trace_cv.set(trace)
@@ -204,6 +295,7 @@ def trace_clear() -> None:
     trace_stack_cv.set(None)
     trace_path_stack_cv.set(None)
     variables_cv.set(None)
+    lazy_variables_cv.set({})
     script_execution_cv.set(StopReason())
 
 
@@ -61,6 +61,9 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_DataT]):
     Setting :attr:`always_update` to ``False`` will cause coordinator to only
     callback listeners when data has changed. This requires that the data
     implements ``__eq__`` or uses a python object that already does.
+
+    Setting :attr:`batch_state_writes` to ``True`` will cause the state changes
+    written by the listeners on an update to be fired as a single batch.
     """
 
     def __init__(
@@ -74,6 +77,7 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_DataT]):
         setup_method: Callable[[], Awaitable[None]] | None = None,
         request_refresh_debouncer: Debouncer[Coroutine[Any, Any, None]] | None = None,
         always_update: bool = True,
+        batch_state_writes: bool = False,
     ) -> None:
         """Initialize global data updater."""
         self.hass = hass
@@ -86,6 +90,7 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_DataT]):
         self._shutdown_requested = False
         self.config_entry = config_entries.current_entry.get()
         self.always_update = always_update
+        self.batch_state_writes = batch_state_writes
 
         # It's None before the first successful update.
         # Components should call async_config_entry_first_refresh
@@ -164,6 +169,11 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_DataT]):
     @callback
     def async_update_listeners(self) -> None:
         """Update all registered listeners."""
+        if self.batch_state_writes:
+            with self.hass.states.async_batch():
+                for update_callback, _ in list(self._listeners.values()):
+                    update_callback()
+            return
         for update_callback, _ in list(self._listeners.values()):
             update_callback()
 
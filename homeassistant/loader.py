@@ -132,6 +132,7 @@ DATA_CUSTOM_COMPONENTS: HassKey[
     dict[str, Integration] | asyncio.Future[dict[str, Integration]]
 ] = HassKey("custom_components")
 DATA_PRELOAD_PLATFORMS: HassKey[list[str]] = HassKey("preload_platforms")
+DATA_IMPORT_TIMES: HassKey[dict[str, float]] = HassKey("integration_import_times")
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -269,6 +270,7 @@ def async_setup(hass: HomeAssistant) -> None:
     hass.data[DATA_INTEGRATIONS] = {}
     hass.data[DATA_MISSING_PLATFORMS] = {}
     hass.data[DATA_PRELOAD_PLATFORMS] = BASE_PRELOAD_PLATFORMS.copy()
+    hass.data[DATA_IMPORT_TIMES] = {}
 
 
 def manifest_from_legacy_module(domain: str, module: ModuleType) -> Manifest:
@@ -775,6 +777,7 @@ class Integration:
         self._import_futures: dict[str, asyncio.Future[ModuleType]] = {}
         self._cache = hass.data[DATA_COMPONENTS]
         self._missing_platforms_cache = hass.data[DATA_MISSING_PLATFORMS]
+        self._import_times = hass.data[DATA_IMPORT_TIMES]
         self._top_level_files = top_level_files or set()
         _LOGGER.info("Loaded %s from %s", self.domain, pkg_path)
 
@@ -982,8 +985,7 @@ class Integration:
         if self._component_future:
             return await self._component_future
 
-        if debug := _LOGGER.isEnabledFor(logging.DEBUG):
-            start = time.perf_counter()
+        start = time.perf_counter()
 
         # Some integrations fail on import because they call functions incorrectly.
         # So we do it before validating config to catch these errors.
@@ -993,12 +995,11 @@ class Integration:
         )
         if not load_executor:
             comp = self._get_component()
-            if debug:
-                _LOGGER.debug(
-                    "Component %s import took %.3f seconds (loaded_executor=False)",
-                    self.domain,
-                    time.perf_counter() - start,
-                )
+            _LOGGER.debug(
+                "Component %s import took %.3f seconds (loaded_executor=False)",
+                self.domain,
+                time.perf_counter() - start,
+            )
             return comp
 
         self._component_future = self.hass.loop.create_future()
@@ -1029,13 +1030,17 @@ class Integration:
         finally:
             self._component_future = None
 
-        if debug:
-            _LOGGER.debug(
-                "Component %s import took %.3f seconds (loaded_executor=%s)",
-                self.domain,
-                time.perf_counter() - start,
-                load_executor,
-            )
+        import_time = time.perf_counter() - start
+        if load_executor:
+            # Only imports done in the executor are recorded since they
+            # are the only ones that can be scheduled ahead of setup
+            self._import_times[domain] = import_time
+        _LOGGER.debug(
+            "Component %s import took %.3f seconds (loaded_executor=%s)",
+            self.domain,
+            import_time,
+            load_executor,
+        )
 
         return comp
 
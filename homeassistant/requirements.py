@@ -72,6 +72,12 @@ async def async_load_installed_versions(
     await _async_get_manager(hass).async_load_installed_versions(requirements)
 
 
+@callback
+def async_requirements_installed(hass: HomeAssistant, requirements: list[str]) -> bool:
+    """Return if the requirements are known to be installed."""
+    return _async_get_manager(hass).async_requirements_installed(requirements)
+
+
 @callback
 @singleton.singleton(DATA_REQUIREMENTS_MANAGER)
 def _async_get_manager(hass: HomeAssistant) -> RequirementsManager:
@@ -268,6 +274,11 @@ class RequirementsManager:
             if missing := self._find_missing_requirements(requirements):
                 await self._async_process_requirements(name, missing)
 
+    @callback
+    def async_requirements_installed(self, requirements: list[str]) -> bool:
+        """Return if the requirements are known to be installed."""
+        return not self._find_missing_requirements(requirements)
+
     def _find_missing_requirements(self, requirements: list[str]) -> list[str]:
         """Find requirements that are missing in the cache."""
         return [req for req in requirements if req not in self.is_installed_cache]
@@ -9,11 +9,24 @@ from collections.abc import Callable
 from contextlib import suppress
 import json
 import logging
+from random import Random
+import time
 from timeit import default_timer as timer
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
 from homeassistant import core
-from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.helpers.entityfilter import convert_include_exclude_filter
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_STATE_CHANGED,
+    UnitOfTemperature,
+)
+from homeassistant.helpers.entity_values import EntityValues
+from homeassistant.helpers.entityfilter import (
+    FILTER_SCHEMA,
+    convert_include_exclude_filter,
+)
 from homeassistant.helpers.event import (
     async_track_state_change,
     async_track_state_change_event,
@@ -312,6 +325,228 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def recorder_bulk_insert_states(hass):
+    """Write 100k states to SQLite with the ORM and with the bulk insert path."""
+    return await hass.async_add_executor_job(_recorder_bulk_insert_states)
+
+
+def _recorder_bulk_insert_states():
+    """Compare the rows per second of the ORM and bulk insert States writes."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.db_schema import (
+        Base,
+        StateAttributes,
+        States,
+        StatesMeta,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.table_managers.states import StatesManager
+
+    entities = 500
+    changes_per_commit = 5
+    commits = 40
+    rows = entities * changes_per_commit * commits
+
+    def _write(bulk: bool) -> float:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        states_manager = StatesManager()
+        with Session(engine) as session:
+            session.expire_on_commit = False
+            attributes = StateAttributes(shared_attrs="{}", hash=0)
+            states_metas = [
+                StatesMeta(entity_id=f"sensor.benchmark_{idx}")
+                for idx in range(entities)
+            ]
+            session.add(attributes)
+            session.add_all(states_metas)
+            session.commit()
+            start = timer()
+            for commit in range(commits):
+                for change in range(changes_per_commit):
+                    for states_meta in states_metas:
+                        entity_id = states_meta.entity_id
+                        dbstate = States(
+                            state=str(commit * changes_per_commit + change),
+                            last_updated_ts=time.time(),
+                            origin_idx=0,
+                            metadata_id=states_meta.metadata_id,
+                            attributes_id=attributes.attributes_id,
+                        )
+                        if pending_state := states_manager.pop_pending(entity_id):
+                            dbstate.old_state = pending_state
+                        elif old_state_id := states_manager.pop_committed(entity_id):
+                            dbstate.old_state_id = old_state_id
+                        states_manager.add_pending(entity_id, dbstate)
+                        if bulk:
+                            states_manager.add_pending_row(dbstate)
+                        else:
+                            session.add(dbstate)
+                session.flush()
+                states_manager.bulk_insert_pending(session)
+                session.commit()
+                states_manager.post_commit_pending()
+            runtime = timer() - start
+        engine.dispose()
+        return runtime
+
+    orm_runtime = _write(False)
+    bulk_runtime = _write(True)
+    print(f"ORM unit of work: {rows / orm_runtime:.0f} rows/s")
+    print(f"Bulk insert: {rows / bulk_runtime:.0f} rows/s")
+    return bulk_runtime
+
+
+@benchmark
+async def mqtt_topic_matching(hass):
+    """Match a million MQTT messages against a large install's subscriptions."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.mqtt.topic_matcher import TopicMatcher
+
+    devices = 3000
+    messages = 10**6
+    subscriptions = [
+        *(f"zigbee2mqtt/device_{idx}" for idx in range(devices // 2)),
+        *(f"zigbee2mqtt/device_{idx}/availability" for idx in range(devices // 2)),
+        *(f"tele/tasmota_{idx}/+" for idx in range(devices // 2)),
+        *(f"stat/tasmota_{idx}/+" for idx in range(devices // 2)),
+        *(f"homeassistant/{domain}/+/config" for domain in ("light", "sensor")),
+        *(f"homeassistant/{domain}/+/+/config" for domain in ("light", "sensor")),
+        "zigbee2mqtt/bridge/#",
+        "tasmota/discovery/#",
+    ]
+    # Replay a topic mix where a small set of chatty devices send most
+    # of the messages and discovery topics keep churning
+    random = Random(0)
+    topics = [
+        random.choice(
+            (
+                f"zigbee2mqtt/device_{int(random.paretovariate(1.2)) % devices}",
+                f"tele/tasmota_{int(random.paretovariate(1.2)) % devices}/SENSOR",
+                f"stat/tasmota_{random.randrange(devices)}/POWER",
+                f"zigbee2mqtt/bridge/event/{random.randrange(10**5)}",
+                f"homeassistant/sensor/node_{random.randrange(10**4)}/config",
+            )
+        )
+        for _ in range(messages)
+    ]
+
+    matcher = TopicMatcher()
+    for topic_filter in subscriptions:
+        matcher.add(topic_filter, topic_filter)
+
+    start = timer()
+    for topic in topics:
+        matcher.match(topic)
+    return timer() - start
+
+
+@benchmark
+async def script_run(hass):
+    """Run a typical automation action sequence 10k times."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import config_validation as cv
+    from homeassistant.helpers.script import Script
+
+    runs = 10**4
+
+    async def _service(call):
+        """Handle a service call."""
+
+    hass.services.async_register("light", "turn_on", _service)
+    hass.states.async_set("sun.sun", "below_horizon")
+    sequence = cv.SCRIPT_SCHEMA(
+        [
+            {"condition": "state", "entity_id": "sun.sun", "state": "below_horizon"},
+            {
+                "service": "light.turn_on",
+                "target": {"entity_id": "light.kitchen"},
+                "data": {"brightness": 255, "transition": 2},
+            },
+            {"delay": 0},
+            {
+                "service": "light.turn_on",
+                "target": {"entity_id": ["light.hallway", "light.porch"]},
+                "data": {"color_temp_kelvin": 2700},
+            },
+            {"event": "benchmark_done", "event_data": {"source": "script"}},
+        ]
+    )
+    script = Script(hass, sequence, "benchmark", "automation")
+
+    start = timer()
+    for _ in range(runs):
+        await script.async_run(context=core.Context())
+    runtime = timer() - start
+    print(f"Per run: {runtime / runs * 10**6:.1f} µs")
+    return runtime
+
+
+@benchmark
+async def prometheus_state_changes(hass):
+    """Compare the loop time per state change of the prometheus exporter modes."""
+    # pylint: disable-next=import-outside-toplevel
+    import prometheus_client
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components import prometheus
+
+    entities = 1000
+    changes = 10**5
+    random = Random(0)
+    states = {}
+    events = []
+    for _ in range(changes):
+        entity_id = f"sensor.power_{random.randrange(entities)}"
+        new_state = core.State(
+            entity_id, str(random.randrange(1000)), {ATTR_UNIT_OF_MEASUREMENT: "W"}
+        )
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": entity_id,
+                    "old_state": states.get(entity_id),
+                    "new_state": new_state,
+                },
+            )
+        )
+        states[entity_id] = new_state
+
+    def _metrics():
+        prometheus_client.REGISTRY = prometheus_client.CollectorRegistry()
+        return prometheus.PrometheusMetrics(
+            FILTER_SCHEMA({}),
+            "homeassistant",
+            UnitOfTemperature.CELSIUS,
+            EntityValues({}, {}, {}),
+            None,
+            None,
+        )
+
+    metrics = _metrics()
+    start = timer()
+    for event in events:
+        metrics.handle_state_changed_event(event)
+    on_change = timer() - start
+
+    metrics = _metrics()
+    start = timer()
+    for event in events:
+        metrics.async_handle_state_changed_event(event)
+    on_scrape = timer() - start
+    start = timer()
+    await metrics.async_generate_latest(hass)
+    scrape = timer() - start
+
+    print(f"Update on change: {on_change / changes * 10**6:.2f} µs per state change")
+    print(f"Update on scrape: {on_scrape / changes * 10**6:.2f} µs per state change")
+    print(f"Scrape of {len(states)} changed entities: {scrape * 1000:.1f} ms")
+    return on_scrape
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
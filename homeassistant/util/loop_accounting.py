@@ -0,0 +1,156 @@
+"""Account the time spent in the event loop per integration and event type."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import cache, partial
+import time
+from typing import Any
+
+from .event_type import EventType
+
+CORE_DOMAIN = "homeassistant"
+
+_COMPONENTS_PREFIX = "homeassistant.components."
+_CUSTOM_COMPONENTS_PREFIX = "custom_components."
+
+# Upper bounds of the latency histogram buckets in seconds,
+# doubling from 10µs to about 21s. Latencies above the last
+# bound are counted in an extra bucket.
+LATENCY_BUCKETS: tuple[float, ...] = tuple(
+    0.00001 * 2**exponent for exponent in range(22)
+)
+
+
+@cache
+def domain_for_module(module: str) -> str:
+    """Return the integration domain a module belongs to.
+
+    Modules of Home Assistant outside of the integrations are
+    accounted to the homeassistant domain and modules of libraries
+    to their top level package.
+    """
+    if module.startswith(_COMPONENTS_PREFIX):
+        return module[len(_COMPONENTS_PREFIX) :].partition(".")[0]
+    if module.startswith(_CUSTOM_COMPONENTS_PREFIX):
+        return module[len(_CUSTOM_COMPONENTS_PREFIX) :].partition(".")[0]
+    return module.partition(".")[0] or CORE_DOMAIN
+
+
+def domain_for_callable(target: Callable[..., Any]) -> str:
+    """Return the integration domain a callable belongs to."""
+    while isinstance(target, partial):
+        target = target.func
+    if (module := getattr(target, "__module__", None)) is None:
+        module = type(target).__module__
+    return domain_for_module(module)
+
+
+@dataclass(slots=True)
+class LoopStats:
+    """Cumulative time, calls and latency histogram of a key."""
+
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def record(self, elapsed: float) -> None:
+        """Record a call that took elapsed seconds."""
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.maximum:
+            self.maximum = elapsed
+        self.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def percentile(self, percentile: float) -> float:
+        """Return the upper bound of the latency of a percentile of the calls."""
+        target = self.count * percentile / 100
+        seen = 0
+        for idx, count in enumerate(self.buckets[:-1]):
+            seen += count
+            if seen >= target:
+                return min(LATENCY_BUCKETS[idx], self.maximum)
+        return self.maximum
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats as a dict."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.maximum,
+            "p99": self.percentile(99),
+        }
+
+
+class LoopAccounting:
+    """Account the time spent in the event loop.
+
+    The time of a job is accounted to the integration domain of its
+    target. Jobs that run other accounted jobs, for example an event
+    listener that writes a state, are only accounted the time they
+    spend themselves so the time of all domains adds up to the time
+    the loop spent running accounted jobs.
+
+    The time to dispatch an event to all its listeners is accounted
+    to the event type as well, including the time of the listeners
+    that run immediately.
+
+    For coroutine functions only the first step, which runs eagerly
+    when the job is added, is accounted.
+
+    All methods must be called from the event loop.
+    """
+
+    __slots__ = ("_nested", "domains", "event_types", "started")
+
+    def __init__(self) -> None:
+        """Initialize the loop accounting."""
+        self.domains: dict[str, LoopStats] = {}
+        self.event_types: dict[str, LoopStats] = {}
+        self.started = time.monotonic()
+        self._nested = 0.0
+
+    def async_run[*_Ts, _R](
+        self, domain: str, target: Callable[[*_Ts], _R], *args: *_Ts
+    ) -> _R:
+        """Run a target and account its time to a domain."""
+        outer_nested = self._nested
+        self._nested = 0.0
+        start = time.perf_counter()
+        try:
+            return target(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            if (stats := self.domains.get(domain)) is None:
+                stats = self.domains[domain] = LoopStats()
+            stats.record(elapsed - self._nested)
+            self._nested = outer_nested + elapsed
+
+    def async_run_job[*_Ts, _R](self, target: Callable[[*_Ts], _R], *args: *_Ts) -> _R:
+        """Run a target and account its time to the domain it belongs to."""
+        return self.async_run(domain_for_callable(target), target, *args)
+
+    def async_record_event(
+        self, event_type: EventType[Any] | str, elapsed: float
+    ) -> None:
+        """Record the time it took to dispatch an event."""
+        key = str(event_type)
+        if (stats := self.event_types.get(key)) is None:
+            stats = self.event_types[key] = LoopStats()
+        stats.record(elapsed)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the accounted stats as a dict."""
+        return {
+            "duration": time.monotonic() - self.started,
+            "domains": {
+                domain: stats.as_dict() for domain, stats in self.domains.items()
+            },
+            "event_types": {
+                event_type: stats.as_dict()
+                for event_type, stats in self.event_types.items()
+            },
+        }
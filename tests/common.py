@@ -231,6 +231,13 @@ class StoreWithoutWriteLoad[_T: (Mapping[str, Any] | Sequence[Any])](storage.Sto
         This function is mocked out in tests.
         """
 
+    @callback
+    def async_start_journal(self, *args: Any, **kwargs: Any) -> None:
+        """Start journaling changes.
+
+        This function is mocked out in tests.
+        """
+
 
 @asynccontextmanager
 async def async_test_home_assistant(
@@ -1421,6 +1428,11 @@ def mock_storage(data: dict[str, Any] | None = None) -> Generator[dict[str, Any]
             side_effect=mock_write_data,
             autospec=True,
         ),
+        patch(
+            "homeassistant.helpers.storage.JournaledStore._async_write_data",
+            side_effect=mock_write_data,
+            autospec=True,
+        ),
         patch(
             "homeassistant.helpers.storage.Store.async_remove",
             side_effect=mock_remove,
@@ -1626,6 +1626,63 @@ async def test_overflow_queue(
     ) == listeners_without_writes(init_listeners)
 
 
+async def test_overflow_queue_while_sending_historical_states(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the stream ends quietly when it overflows while sending history."""
+    now = dt_util.utcnow()
+    send_historical_states = websocket_api._async_send_historical_states
+
+    async def _send_and_overflow(*args, **kwargs):
+        result = await send_historical_states(*args, **kwargs)
+        for val in range(10):
+            hass.states.async_set("sensor.one", str(val))
+        return result
+
+    await async_setup_component(hass, "history", {history.DOMAIN: {}})
+    hass.states.async_set("sensor.one", "on")
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    init_listeners = hass.bus.async_listeners()
+
+    with (
+        patch.object(websocket_api, "MAX_PENDING_HISTORY_STATES", 5),
+        patch.object(
+            websocket_api,
+            "_async_send_historical_states",
+            side_effect=_send_and_overflow,
+        ),
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": ["sensor.one"],
+                "start_time": now.isoformat(),
+                "include_start_time_state": True,
+                "significant_changes_only": False,
+                "no_attributes": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+        assert response["type"] == "event"
+        assert response["event"]["states"]["sensor.one"][0]["s"] == "on"
+        await async_wait_recording_done(hass)
+
+    assert hass.data[websocket_api.HISTORY_STREAM_HUBS] == {}
+    assert listeners_without_writes(
+        hass.bus.async_listeners()
+    ) == listeners_without_writes(init_listeners)
+
+    # The connection is still usable
+    await client.send_json({"id": 2, "type": "ping"})
+    response = await client.receive_json()
+    assert response == {"id": 2, "type": "pong"}
+
+
 async def test_history_during_period_for_invalid_entity_ids(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -2072,3 +2129,134 @@ async def test_history_stream_historical_only_with_start_time_state_past(
         "id": 1,
         "type": "event",
     }
+
+
+async def test_history_stream_live_shared(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test live streams of the same entities share the conversion of the events."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "on", attributes={"any": "attr"})
+    hass.states.async_set("sensor.two", "off", attributes={"any": "attr"})
+    await async_wait_recording_done(hass)
+
+    clients = [await hass_ws_client(), await hass_ws_client()]
+    for msg_id, (client, entity_ids) in enumerate(
+        zip(
+            clients,
+            (["sensor.one", "sensor.two"], ["sensor.two", "sensor.one"]),
+            strict=True,
+        ),
+        start=1,
+    ):
+        await client.send_json(
+            {
+                "id": msg_id,
+                "type": "history/stream",
+                "entity_ids": entity_ids,
+                "start_time": now.isoformat(),
+                "include_start_time_state": True,
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "minimal_response": False,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+        assert response["event"]["states"].keys() == {"sensor.one", "sensor.two"}
+
+    assert len(hass.data[websocket_api.HISTORY_STREAM_HUBS]) == 1
+
+    await async_recorder_block_till_done(hass)
+    with patch.object(
+        websocket_api,
+        "_events_to_compressed_states",
+        wraps=websocket_api._events_to_compressed_states,
+    ) as events_to_compressed_states:
+        hass.states.async_set("sensor.one", "off", attributes={"any": "attr"})
+        await async_recorder_block_till_done(hass)
+        sensor_one_last_updated_timestamp = hass.states.get(
+            "sensor.one"
+        ).last_updated_timestamp
+
+        for msg_id, client in enumerate(clients, start=1):
+            response = await client.receive_json()
+            assert response == {
+                "event": {
+                    "states": {
+                        "sensor.one": [
+                            {
+                                "lu": pytest.approx(sensor_one_last_updated_timestamp),
+                                "s": "off",
+                            }
+                        ],
+                    },
+                },
+                "id": msg_id,
+                "type": "event",
+            }
+    assert events_to_compressed_states.call_count == 1
+
+    await clients[0].send_json(
+        {"id": 3, "type": "unsubscribe_events", "subscription": 1}
+    )
+    response = await clients[0].receive_json()
+    assert response["success"]
+    assert len(hass.data[websocket_api.HISTORY_STREAM_HUBS]) == 1
+
+    await clients[1].send_json(
+        {"id": 3, "type": "unsubscribe_events", "subscription": 2}
+    )
+    response = await clients[1].receive_json()
+    assert response["success"]
+    assert hass.data[websocket_api.HISTORY_STREAM_HUBS] == {}
+
+
+async def test_history_stream_shares_historical_query(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test live streams started together share the historical query."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "on", attributes={"any": "attr"})
+    await async_wait_recording_done(hass)
+
+    clients = [await hass_ws_client(), await hass_ws_client()]
+    with patch.object(
+        websocket_api,
+        "_generate_historical_response",
+        wraps=websocket_api._generate_historical_response,
+    ) as generate_historical_response:
+        for client in clients:
+            await client.send_json(
+                {
+                    "id": 1,
+                    "type": "history/stream",
+                    "entity_ids": ["sensor.one"],
+                    "start_time": now.isoformat(),
+                    "include_start_time_state": True,
+                    "significant_changes_only": False,
+                    "no_attributes": True,
+                    "minimal_response": False,
+                }
+            )
+        responses = []
+        for client in clients:
+            response = await client.receive_json()
+            assert response["success"]
+            responses.append(await client.receive_json())
+        await async_recorder_block_till_done(hass)
+        await hass.async_block_till_done()
+
+    assert responses[0] == responses[1]
+    assert responses[0]["event"]["states"]["sensor.one"][0]["s"] == "on"
+    start_time_state_queries = [
+        call for call in generate_historical_response.mock_calls if call.args[4] is True
+    ]
+    assert len(start_time_state_queries) == 1
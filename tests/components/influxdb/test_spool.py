@@ -0,0 +1,245 @@
+"""The tests for the InfluxDB spool."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import timedelta
+from http import HTTPStatus
+from pathlib import Path
+import time
+from typing import Any
+from unittest.mock import Mock, patch
+
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from homeassistant.components import influxdb
+from homeassistant.components.influxdb.const import RETRY_DELAY, SPOOL_DIRECTORY
+from homeassistant.components.influxdb.spool import InfluxSpool
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_component import async_update_entity
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+INFLUX_PATH = "homeassistant.components.influxdb"
+
+
+class InfluxStandIn:
+    """Stand-in for the write endpoints of the InfluxDB HTTP API."""
+
+    def __init__(self) -> None:
+        """Initialize the stand-in."""
+        self.status = HTTPStatus.NO_CONTENT
+        self.requests: list[web.Request] = []
+        self.lines: list[str] = []
+
+    async def write(self, request: web.Request) -> web.Response:
+        """Handle a write request."""
+        self.requests.append(request)
+        if self.status != HTTPStatus.NO_CONTENT:
+            return web.Response(status=self.status, text="unavailable")
+        # The request body is decompressed by aiohttp
+        self.lines.extend((await request.text()).splitlines())
+        return web.Response(status=self.status)
+
+
+@pytest.fixture(autouse=True)
+def mock_batch_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Mock the batch timeout for tests."""
+    monkeypatch.setattr(
+        f"{INFLUX_PATH}.InfluxThread.batch_timeout",
+        Mock(return_value=0),
+    )
+
+
+@pytest.fixture
+async def influx_server(
+    aiohttp_server: Callable[..., Any], socket_enabled: None
+) -> tuple[InfluxStandIn, TestServer]:
+    """Start a stand-in InfluxDB server."""
+    stand_in = InfluxStandIn()
+    app = web.Application()
+    app.router.add_post("/write", stand_in.write)
+    app.router.add_post("/api/v2/write", stand_in.write)
+    return stand_in, await aiohttp_server(app)
+
+
+def _points(count: int) -> list[dict[str, Any]]:
+    """Return points in the json format of the client."""
+    return [
+        {
+            "measurement": "°C",
+            "tags": {"domain": "sensor", "entity_id": "temperature"},
+            "time": 1700000000000000000 + idx,
+            "fields": {"value": float(idx)},
+        }
+        for idx in range(count)
+    ]
+
+
+async def test_spool_segments(tmp_path: Path) -> None:
+    """Test the spool rotates, caps and reloads its segments."""
+    spool = InfluxSpool(tmp_path, max_size=300, segment_size=100, segment_max_age=0)
+    spool.load()
+    for _ in range(6):
+        spool.append_points(_points(2))
+
+    # Each batch starts a new segment and the oldest segments
+    # are dropped once the spool is full
+    assert spool.size <= 300
+    assert spool.points == 4
+    assert spool.dropped == 8
+    assert len(list(tmp_path.iterdir())) == 2
+
+    segments = spool.take(2)
+    assert len(segments) == 2
+    assert spool.take(2) == []
+    spool.complete(segments[0], True)
+    spool.release(segments[1])
+    assert spool.written == 2
+    assert spool.points == 2
+    spool.close()
+
+    # A new spool continues with the segments left on disk
+    reloaded = InfluxSpool(tmp_path, max_size=300, segment_size=100, segment_max_age=0)
+    reloaded.load()
+    assert reloaded.points == spool.points
+    assert reloaded.size == spool.size
+    reloaded.append_points(_points(1))
+    assert [segment.path.name for segment in reloaded.take(10)] == sorted(
+        path.name for path in tmp_path.iterdir()
+    )
+
+
+async def test_spool_seals_full_or_old_segments(tmp_path: Path) -> None:
+    """Test the newest segment is only drained once it is full or old."""
+    spool = InfluxSpool(tmp_path, max_size=10000, segment_size=1000, segment_max_age=10)
+    spool.load()
+    with patch(f"{INFLUX_PATH}.spool.time.monotonic", return_value=100):
+        spool.append_points(_points(1))
+        spool.append_points(_points(1))
+        assert spool.take(10) == []
+
+    # Batches keep going to the same segment until it is old enough
+    with patch(f"{INFLUX_PATH}.spool.time.monotonic", return_value=110):
+        segments = spool.take(10)
+    assert len(segments) == 1
+    assert segments[0].points == 2
+
+    with patch(f"{INFLUX_PATH}.spool.time.monotonic", return_value=200):
+        spool.append_points(_points(20))
+        # A full segment is drained right away
+        segments = spool.take(10)
+    assert len(segments) == 1
+    assert segments[0].points == 20
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+async def test_spool_keeps_old_events(hass: HomeAssistant) -> None:
+    """Test events waiting long in the queue are not dropped with the spool."""
+    instance = await hass.async_add_executor_job(
+        influxdb.InfluxThread, hass, None, lambda event: {"event": event}, 0, Mock()
+    )
+    instance.queue.put((time.monotonic() - 3600, "old"))
+    instance.queue.put(None)
+
+    assert instance.get_events_json() == (2, [{"event": "old"}])
+
+
+@pytest.mark.parametrize(
+    ("config_ext", "path", "params", "headers"),
+    [
+        (
+            {},
+            "/write",
+            {"db": "home_assistant"},
+            {},
+        ),
+        (
+            {
+                "api_version": influxdb.API_VERSION_2,
+                "ssl": False,
+                "organization": "org",
+                "token": "token",
+                "precision": "s",
+            },
+            "/api/v2/write",
+            {"org": "org", "bucket": "Home Assistant", "precision": "s"},
+            {hdrs.AUTHORIZATION: "Token token"},
+        ),
+    ],
+    ids=["v1", "v2"],
+)
+async def test_spool_drain(
+    hass: HomeAssistant,
+    tmp_path: Path,
+    influx_server: tuple[InfluxStandIn, TestServer],
+    config_ext: dict[str, Any],
+    path: str,
+    params: dict[str, str],
+    headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test events are spooled while InfluxDB is down and drained once it is up."""
+    stand_in, server = influx_server
+    monkeypatch.setattr(f"{INFLUX_PATH}.SPOOL_SEGMENT_MAX_AGE", 0)
+    stand_in.status = HTTPStatus.SERVICE_UNAVAILABLE
+    hass.config.config_dir = str(tmp_path)
+    assert await async_setup_component(
+        hass,
+        influxdb.DOMAIN,
+        {
+            influxdb.DOMAIN: {
+                "host": "127.0.0.1",
+                "port": server.port,
+                "spool": {"concurrency": 2},
+                "include": {"entities": ["sensor.temperature"]},
+                **config_ext,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.temperature", "21.5", {"unit_of_measurement": "°C"})
+    await hass.async_add_executor_job(hass.data[influxdb.DOMAIN].block_till_done)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert len(stand_in.requests) == 1
+    assert stand_in.lines == []
+    await async_update_entity(hass, "sensor.influxdb_spool_backlog")
+    state = hass.states.get("sensor.influxdb_spool_backlog")
+    assert state.state == "1"
+    assert state.attributes["dropped"] == 0
+
+    # The drain waits for the retry delay once InfluxDB is up again
+    stand_in.status = HTTPStatus.NO_CONTENT
+    hass.states.async_set("sensor.temperature", "22.0", {"unit_of_measurement": "°C"})
+    await hass.async_add_executor_job(hass.data[influxdb.DOMAIN].block_till_done)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert len(stand_in.requests) == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=RETRY_DELAY + 1))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert len(stand_in.requests) == 3
+    for request in stand_in.requests[1:]:
+        assert request.path == path
+        assert dict(request.query) == params
+        assert request.headers[hdrs.CONTENT_ENCODING] == "gzip"
+        for header, value in headers.items():
+            assert request.headers[header] == value
+    assert [line.split(" ")[:2] for line in stand_in.lines] == [
+        ["°C,domain=sensor,entity_id=temperature", "value=21.5"],
+        ["°C,domain=sensor,entity_id=temperature", "value=22.0"],
+    ]
+    assert list((tmp_path / SPOOL_DIRECTORY).iterdir()) == []
+
+    await async_update_entity(hass, "sensor.influxdb_spool_backlog")
+    assert hass.states.get("sensor.influxdb_spool_backlog").state == "0"
+    await async_update_entity(hass, "sensor.influxdb_spool_throughput")
+    assert float(hass.states.get("sensor.influxdb_spool_throughput").state) > 0
@@ -6,7 +6,7 @@ from collections.abc import Callable
 from datetime import datetime, timedelta
 from http import HTTPStatus
 import json
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from freezegun import freeze_time
 import pytest
@@ -17,6 +17,7 @@ from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.logbook.models import LazyEventPartialState
 from homeassistant.components.logbook.processor import EventProcessor
+from homeassistant.components.logbook.queries import statement_for_request
 from homeassistant.components.logbook.queries.common import PSEUDO_EVENT_STATE_CHANGED
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
@@ -840,6 +841,53 @@ async def test_filter_continuous_sensor_values(
     assert response_json[1]["entity_id"] == entity_id_third
 
 
+@pytest.mark.parametrize(
+    ("recorder_config", "use_logbook_index"),
+    [({"logbook_index": True}, True), ({}, False)],
+)
+@pytest.mark.parametrize("entity_ids", [None, ["switch.test", "light.bla"]])
+async def test_get_events_logbook_index(
+    hass_: HomeAssistant, use_logbook_index: bool, entity_ids: list[str] | None
+) -> None:
+    """Test the same events are returned with the logbook index."""
+    hass_.states.async_set("switch.test", STATE_OFF)
+    hass_.states.async_set("switch.test", STATE_ON)
+    await async_wait_recording_done(hass_)
+    start = dt_util.utcnow()
+
+    hass_.states.async_set("switch.test", STATE_OFF, {"icon": "mdi:power"})
+    hass_.states.async_set("switch.test", STATE_OFF, {"icon": "mdi:power-off"})
+    hass_.states.async_set("sensor.bla", STATE_OFF, {"unit_of_measurement": "foo"})
+    hass_.states.async_set("sensor.bla", STATE_ON, {"unit_of_measurement": "foo"})
+    hass_.states.async_set("counter.bla", STATE_OFF)
+    hass_.states.async_set("counter.bla", STATE_ON)
+    hass_.states.async_set("light.bla", STATE_OFF)
+    hass_.states.async_set("light.bla", STATE_ON)
+    logbook.async_log_entry(hass_, "Alarm", "is triggered", "switch", "switch.test")
+    await async_wait_recording_done(hass_)
+
+    event_processor = EventProcessor(hass_, (EVENT_LOGBOOK_ENTRY,), entity_ids)
+    with patch(
+        "homeassistant.components.logbook.processor.statement_for_request",
+        wraps=statement_for_request,
+    ) as mock_statement_for_request:
+        events = event_processor.get_events(start, dt_util.utcnow())
+
+    assert (
+        mock_statement_for_request.call_args.kwargs["use_logbook_index"]
+        is use_logbook_index
+    )
+    assert [
+        (event.get("entity_id"), event.get("state"), event.get("icon"))
+        for event in events
+    ] == [
+        ("switch.test", STATE_OFF, "mdi:power"),
+        ("light.bla", STATE_ON, None),
+        ("switch.test", None, None),
+    ]
+    assert events[2]["name"] == "Alarm"
+
+
 async def test_exclude_new_entities(
     recorder_mock: Recorder,
     hass: HomeAssistant,
@@ -0,0 +1,115 @@
+"""Test the MQTT topic matcher."""
+
+import pytest
+
+from homeassistant.components.mqtt.topic_matcher import TopicMatcher
+
+
+@pytest.mark.parametrize(
+    ("topic_filter", "topic", "matches"),
+    [
+        ("sport/tennis/player1", "sport/tennis/player1", True),
+        ("sport/tennis/player1", "sport/tennis/player2", False),
+        ("sport/tennis/+", "sport/tennis/player1", True),
+        ("sport/tennis/+", "sport/tennis/player1/ranking", False),
+        ("sport/tennis/+", "sport/tennis", False),
+        ("sport/+/player1", "sport/tennis/player1", True),
+        ("sport/#", "sport", True),
+        ("sport/#", "sport/tennis/player1/ranking", True),
+        ("sport/tennis/#", "sport/tennisplayer1", False),
+        ("+/+", "/finance", True),
+        ("/+", "/finance", True),
+        ("+", "/finance", False),
+        ("#", "sport/tennis", True),
+        ("#", "$SYS/broker/uptime", False),
+        ("+/broker/uptime", "$SYS/broker/uptime", False),
+        ("$SYS/#", "$SYS/broker/uptime", True),
+        ("$SYS/+/uptime", "$SYS/broker/uptime", True),
+    ],
+)
+def test_match(topic_filter: str, topic: str, matches: bool) -> None:
+    """Test matching a topic against a topic filter."""
+    matcher: TopicMatcher[str] = TopicMatcher()
+    matcher.add(topic_filter, "item")
+    assert matcher.match(topic) == (["item"] if matches else [])
+
+
+def test_match_many_filters() -> None:
+    """Test a topic is matched against all topic filters in one walk."""
+    matcher: TopicMatcher[str] = TopicMatcher()
+    for topic_filter in (
+        "zigbee2mqtt/device",
+        "zigbee2mqtt/+",
+        "zigbee2mqtt/#",
+        "+/device",
+        "#",
+        "zigbee2mqtt/other",
+        "zigbee2mqtt/+/availability",
+    ):
+        matcher.add(topic_filter, topic_filter)
+
+    assert sorted(matcher.match("zigbee2mqtt/device")) == [
+        "#",
+        "+/device",
+        "zigbee2mqtt/#",
+        "zigbee2mqtt/+",
+        "zigbee2mqtt/device",
+    ]
+    assert sorted(matcher.match("zigbee2mqtt/device/availability")) == [
+        "#",
+        "zigbee2mqtt/#",
+        "zigbee2mqtt/+/availability",
+    ]
+    # Topic filters match themselves once
+    assert sorted(matcher.match("zigbee2mqtt/+")) == [
+        "#",
+        "zigbee2mqtt/#",
+        "zigbee2mqtt/+",
+    ]
+
+
+def test_add_remove_invalidates_cache() -> None:
+    """Test changing topic filters invalidates the cached matches."""
+    matcher: TopicMatcher[str] = TopicMatcher()
+    assert matcher.match("tele/plug/SENSOR") == []
+    assert matcher.match("stat/plug/POWER") == []
+
+    matcher.add("tele/+/SENSOR", "sensor")
+    assert matcher.match("tele/plug/SENSOR") == ["sensor"]
+    # The other subtree keeps its cached match
+    assert "stat/plug/POWER" in matcher._cache
+
+    matcher.add("tele/plug/SENSOR", "plug")
+    assert sorted(matcher.match("tele/plug/SENSOR")) == ["plug", "sensor"]
+
+    matcher.remove("tele/+/SENSOR", "sensor")
+    assert matcher.match("tele/plug/SENSOR") == ["plug"]
+    matcher.remove("tele/plug/SENSOR", "plug")
+    assert matcher.match("tele/plug/SENSOR") == []
+
+    matcher.add("#", "all")
+    assert "stat/plug/POWER" not in matcher._cache
+    assert matcher.match("stat/plug/POWER") == ["all"]
+
+    assert "tele/+/SENSOR" not in matcher
+    assert "#" in matcher
+    assert list(matcher) == ["all"]
+    matcher.remove("#", "all")
+    assert not matcher._root.children
+
+    with pytest.raises(KeyError):
+        matcher.remove("#", "all")
+    with pytest.raises(KeyError):
+        matcher.remove("tele/plug/SENSOR", "plug")
+
+
+def test_match_cache_is_bounded() -> None:
+    """Test the match cache evicts the least recently used topics."""
+    matcher: TopicMatcher[str] = TopicMatcher(cache_size=2)
+    matcher.add("tele/+/SENSOR", "sensor")
+    for idx in range(10):
+        assert matcher.match(f"tele/plug_{idx}/SENSOR") == ["sensor"]
+    assert len(matcher._cache) == 2
+    assert matcher._cached_topics == {
+        "tele": {"tele/plug_8/SENSOR", "tele/plug_9/SENSOR"}
+    }
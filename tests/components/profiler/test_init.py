@@ -27,16 +27,20 @@ from homeassistant.components.profiler import (
     SERVICE_START,
     SERVICE_START_LOG_OBJECT_SOURCES,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_START_LOOP_ACCOUNTING,
     SERVICE_STOP_LOG_OBJECT_SOURCES,
     SERVICE_STOP_LOG_OBJECTS,
+    SERVICE_STOP_LOOP_ACCOUNTING,
 )
 from homeassistant.components.profiler.const import DOMAIN
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE, STATE_UNAVAILABLE
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.typing import WebSocketGenerator
 
 
 async def test_basic_usage(hass: HomeAssistant, tmp_path: Path) -> None:
@@ -446,3 +450,80 @@ async def test_set_asyncio_debug(
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_loop_accounting(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test accounting the time spent in the event loop."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    busy_entity_id, integration_entity_id, event_type_entity_id = (
+        entity_registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_{key}")
+        for key in ("loop_busy", "busiest_integration", "busiest_event_type")
+    )
+    assert hass.states.get(busy_entity_id).state == STATE_UNAVAILABLE
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/loop_accounting"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_running"
+
+    calls: list[Event] = []
+
+    @callback
+    def _listener(event: Event) -> None:
+        calls.append(event)
+
+    hass.bus.async_listen("test_event", _listener)
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_LOOP_ACCOUNTING, {}, blocking=True
+    )
+    assert hass.loop_accounting is not None
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START_LOOP_ACCOUNTING, {}, blocking=True
+        )
+
+    for _ in range(3):
+        hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+    await client.send_json_auto_id({"type": "profiler/loop_accounting"})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result["event_types"]["test_event"]["count"] == 3
+    # The listener is defined in the tests package
+    assert result["domains"]["tests"]["count"] == 3
+    assert result["domains"]["tests"]["p99"] <= result["domains"]["tests"]["max"]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get(busy_entity_id).state) >= 0
+    assert hass.states.get(integration_entity_id).state != STATE_UNAVAILABLE
+    event_type_state = hass.states.get(event_type_entity_id)
+    assert "test_event" in event_type_state.attributes["loop_time_ms"]
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_LOOP_ACCOUNTING, {}, blocking=True
+    )
+    assert hass.loop_accounting is None
+    assert hass.states.get(busy_entity_id).state == STATE_UNAVAILABLE
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_STOP_LOOP_ACCOUNTING, {}, blocking=True
+        )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
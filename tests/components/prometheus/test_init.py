@@ -60,6 +60,7 @@ from homeassistant.const import (
     CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
     CONTENT_TYPE_TEXT_PLAIN,
     DEGREE,
+    EVENT_STATE_CHANGED,
     PERCENTAGE,
     STATE_CLOSED,
     STATE_CLOSING,
@@ -75,8 +76,9 @@ from homeassistant.const import (
     UnitOfEnergy,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity_registry as er
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er, entityfilter
+from homeassistant.helpers.entity_values import EntityValues
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 
@@ -93,11 +95,18 @@ class FilterTest:
     should_pass: bool
 
 
+@pytest.fixture(name="update_on_scrape")
+def update_on_scrape_fixture() -> bool:
+    """Return if the metrics are updated when they are scraped."""
+    return False
+
+
 @pytest.fixture(name="client")
 async def setup_prometheus_client(
     hass: HomeAssistant,
     hass_client: ClientSessionGenerator,
     namespace: str,
+    update_on_scrape: bool,
 ):
     """Initialize an hass_client with Prometheus component."""
     # Reset registry
@@ -106,7 +115,7 @@ async def setup_prometheus_client(
     prometheus_client.PlatformCollector(registry=prometheus_client.REGISTRY)
     prometheus_client.GCCollector(registry=prometheus_client.REGISTRY)
 
-    config = {}
+    config: dict[str, Any] = {prometheus.CONF_UPDATE_ON_SCRAPE: update_on_scrape}
     if namespace is not None:
         config[prometheus.CONF_PROM_NAMESPACE] = namespace
     assert await async_setup_component(
@@ -746,6 +755,7 @@ async def test_update(
 
 
 @pytest.mark.parametrize("namespace", [""])
+@pytest.mark.parametrize("update_on_scrape", [False, True])
 async def test_renaming_entity_name(
     hass: HomeAssistant,
     entity_registry: er.EntityRegistry,
@@ -872,6 +882,7 @@ async def test_renaming_entity_name(
 
 
 @pytest.mark.parametrize("namespace", [""])
+@pytest.mark.parametrize("update_on_scrape", [False, True])
 async def test_renaming_entity_id(
     hass: HomeAssistant,
     entity_registry: er.EntityRegistry,
@@ -952,6 +963,7 @@ async def test_renaming_entity_id(
 
 
 @pytest.mark.parametrize("namespace", [""])
+@pytest.mark.parametrize("update_on_scrape", [False, True])
 async def test_deleting_entity(
     hass: HomeAssistant,
     entity_registry: er.EntityRegistry,
@@ -1031,6 +1043,7 @@ async def test_deleting_entity(
 
 
 @pytest.mark.parametrize("namespace", [""])
+@pytest.mark.parametrize("update_on_scrape", [False, True])
 async def test_disabling_entity(
     hass: HomeAssistant,
     entity_registry: er.EntityRegistry,
@@ -1125,6 +1138,7 @@ async def test_disabling_entity(
 
 
 @pytest.mark.parametrize("namespace", [""])
+@pytest.mark.parametrize("update_on_scrape", [False, True])
 async def test_entity_becomes_unavailable_with_export(
     hass: HomeAssistant,
     entity_registry: er.EntityRegistry,
@@ -1244,6 +1258,82 @@ async def test_entity_becomes_unavailable_with_export(
     )
 
 
+async def test_update_on_scrape_matches_update_on_change(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry
+) -> None:
+    """Test updating the metrics on scrape renders the same metrics."""
+    prometheus_client.REGISTRY = prometheus_client.CollectorRegistry(auto_describe=True)
+    on_change, on_scrape = (
+        prometheus.PrometheusMetrics(
+            entityfilter.FILTER_SCHEMA({}),
+            namespace,
+            UnitOfTemperature.CELSIUS,
+            EntityValues({}, {}, {}),
+            None,
+            None,
+        )
+        for namespace in ("on_change", "on_scrape")
+    )
+
+    # Update the metrics on each change without the executor to compare
+    # them at the same time
+    @callback
+    def handle_state_changed_event(event: Event[EventStateChangedData]) -> None:
+        on_change.handle_state_changed_event(event)
+
+    @callback
+    def handle_entity_registry_updated(
+        event: Event[er.EventEntityRegistryUpdatedData],
+    ) -> None:
+        on_change.handle_entity_registry_updated(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, handle_state_changed_event)
+    hass.bus.async_listen(
+        er.EVENT_ENTITY_REGISTRY_UPDATED, handle_entity_registry_updated
+    )
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED, on_scrape.async_handle_state_changed_event
+    )
+    hass.bus.async_listen(
+        er.EVENT_ENTITY_REGISTRY_UPDATED,
+        on_scrape.async_handle_entity_registry_updated,
+    )
+
+    def metrics(namespace: str) -> list[str]:
+        body = prometheus_client.generate_latest(prometheus_client.REGISTRY)
+        return sorted(
+            line.replace(f"{namespace}_", "")
+            for line in body.decode().splitlines()
+            if f"{namespace}_" in line and "_created" not in line
+        )
+
+    removed = entity_registry.async_get_or_create("sensor", "test", "removed")
+    for idx in range(3):
+        hass.states.async_set(
+            "automation.alarm", STATE_ON, {"last_triggered": idx, "id": "alarm"}
+        )
+        hass.states.async_set(
+            "sensor.power",
+            idx,
+            {ATTR_UNIT_OF_MEASUREMENT: "W", ATTR_FRIENDLY_NAME: f"Power {idx % 2}"},
+        )
+        hass.states.async_set(removed.entity_id, idx, {ATTR_UNIT_OF_MEASUREMENT: "W"})
+    await on_scrape.async_generate_latest(hass)
+    assert metrics("on_scrape") == metrics("on_change")
+    assert (
+        'automation_triggered_count_total{domain="automation",'
+        'entity="automation.alarm",friendly_name="None"} 3.0'
+    ) in metrics("on_scrape")
+
+    hass.states.async_set("sensor.power", 5, {ATTR_UNIT_OF_MEASUREMENT: "W"})
+    hass.states.async_set("automation.alarm", STATE_UNAVAILABLE)
+    entity_registry.async_remove(removed.entity_id)
+    await hass.async_block_till_done()
+    await on_scrape.async_generate_latest(hass)
+    assert metrics("on_scrape") == metrics("on_change")
+    assert removed.entity_id not in "".join(metrics("on_scrape"))
+
+
 @pytest.fixture(name="sensor_entities")
 async def sensor_fixture(
     hass: HomeAssistant, entity_registry: er.EntityRegistry
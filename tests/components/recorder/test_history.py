@@ -592,6 +592,43 @@ async def test_get_significant_states_minimal_response(
     )
 
 
+@pytest.mark.parametrize("minimal_response", [True, False])
+@pytest.mark.parametrize("no_attributes", [True, False])
+@pytest.mark.parametrize("significant_changes_only", [True, False])
+async def test_get_significant_states_columnar(
+    hass: HomeAssistant,
+    minimal_response: bool,
+    no_attributes: bool,
+    significant_changes_only: bool,
+) -> None:
+    """Test columnar states match the compressed state format."""
+    zero, four, states = record_states(hass)
+    await async_wait_recording_done(hass)
+    kwargs = {
+        "entity_ids": list(states),
+        "significant_changes_only": significant_changes_only,
+        "minimal_response": minimal_response,
+        "no_attributes": no_attributes,
+    }
+
+    hist = history.get_significant_states(
+        hass, zero, four, compressed_state_format=True, **kwargs
+    )
+    columnar = history.get_significant_states_columnar(hass, zero, four, **kwargs)
+
+    assert list(columnar) == list(hist)
+    for entity_id, columnar_states in columnar.items():
+        assert columnar_states.as_compressed_states() == hist[entity_id]
+        assert json.loads(columnar_states.as_compressed_state_json()) == json.loads(
+            json.dumps(hist[entity_id])
+        )
+
+    # Attributes are only decoded once per distinct attributes row
+    therm_columnar = columnar["thermostat.test"]
+    assert len(therm_columnar.state_values) == len(set(therm_columnar.state_values))
+    assert len(therm_columnar.attribute_values) <= len(therm_columnar)
+
+
 @pytest.mark.parametrize("time_zone", ["Europe/Berlin", "US/Hawaii", "UTC"])
 async def test_get_significant_states_with_initial(
     time_zone, hass: HomeAssistant
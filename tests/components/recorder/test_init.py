@@ -13,6 +13,7 @@ from unittest.mock import MagicMock, Mock, patch
 
 from freezegun.api import FrozenDateTimeFactory
 import pytest
+from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 from sqlalchemy.pool import QueuePool
 
@@ -43,6 +44,7 @@ from homeassistant.components.recorder.db_schema import (
     EventData,
     Events,
     EventTypes,
+    LogbookIndex,
     RecorderRuns,
     StateAttributes,
     States,
@@ -85,6 +87,7 @@ from homeassistant.util.json import json_loads
 from .common import (
     async_block_recorder,
     async_recorder_block_till_done,
+    async_wait_purge_done,
     async_wait_recording_done,
     convert_pending_states_to_meta,
     corrupt_db_file,
@@ -288,6 +291,117 @@ async def test_saving_state(hass: HomeAssistant, setup_recorder: None) -> None:
     assert state.as_dict() == _state_with_context(hass, entity_id).as_dict()
 
 
+async def test_saving_state_batch(hass: HomeAssistant, setup_recorder: None) -> None:
+    """Test saving a batch of states."""
+    hass.states.async_set_many(
+        [
+            ("test.one", "on", {"test_attr": 1}),
+            ("test.two", "off", None),
+            ("test.three", "on", None),
+        ]
+    )
+
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        recorded = {
+            (states_meta.entity_id, db_state.state)
+            for db_state, states_meta in session.query(States, StatesMeta).join(
+                StatesMeta, States.metadata_id == StatesMeta.metadata_id
+            )
+        }
+    assert recorded == {("test.one", "on"), ("test.two", "off"), ("test.three", "on")}
+
+
+async def test_backlog_counts_batched_events(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test every event of a batch is counted in the backlog."""
+    instance = recorder.get_instance(hass)
+    await async_wait_recording_done(hass)
+    await async_block_recorder(hass, 0.2)
+    backlog = instance.backlog
+
+    hass.states.async_set_many([(f"test.batch_{idx}", "on", None) for idx in range(10)])
+    assert instance.backlog == backlog + 10
+
+    await async_wait_recording_done(hass)
+    assert instance.backlog == 0
+
+
+async def test_saving_states_sharing_attributes(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test the attributes shared by consecutive states are serialized once."""
+    entity_id = "test.recorder"
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    with patch.object(
+        StateAttributes,
+        "shared_attrs_bytes_from_event",
+        wraps=StateAttributes.shared_attrs_bytes_from_event,
+    ) as shared_attrs_bytes_from_event:
+        for state in ("on", "off", "on"):
+            hass.states.async_set(entity_id, state, attributes)
+            await async_wait_recording_done(hass)
+
+    assert shared_attrs_bytes_from_event.call_count == 1
+    new_state = hass.states.get(entity_id)
+    assert (
+        new_state.recorder_shared_attrs[1] == b'{"test_attr":5,"test_attr_10":"nice"}'
+    )
+
+    with session_scope(hass=hass, read_only=True) as session:
+        db_states = list(session.query(States))
+        assert len(db_states) == 3
+        assert len({db_state.attributes_id for db_state in db_states}) == 1
+        assert session.query(StateAttributes).count() == 1
+
+
+@pytest.mark.parametrize("recorder_config", [{"logbook_index": True}])
+async def test_saving_states_logbook_index(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test the state changes shown in the logbook are added to the index."""
+    hass.states.async_set("light.kitchen", "off", {"icon": "mdi:lamp"})
+    hass.states.async_set("sensor.power", "5", {"unit_of_measurement": "W"})
+    hass.states.async_set("counter.clicks", "1")
+    await async_wait_recording_done(hass)
+    hass.states.async_set("light.kitchen", "on", {"icon": "mdi:lamp"})
+    hass.states.async_set("light.kitchen", "on", {"icon": "mdi:lamp", "brightness": 10})
+    hass.states.async_set("sensor.power", "6", {"unit_of_measurement": "W"})
+    hass.states.async_set("counter.clicks", "2")
+    hass.states.async_set("light.kitchen", "off")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        rows = [
+            tuple(row)
+            for row in session.query(
+                StatesMeta.entity_id, LogbookIndex.state, LogbookIndex.icon
+            )
+            .join(States, LogbookIndex.state_id == States.state_id)
+            .join(StatesMeta, LogbookIndex.metadata_id == StatesMeta.metadata_id)
+            .order_by(LogbookIndex.time_ts)
+        ]
+    assert rows == [
+        ("light.kitchen", "on", "mdi:lamp"),
+        ("light.kitchen", "off", None),
+    ]
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PURGE_ENTITIES,
+        {"entity_id": "light.kitchen", "domains": [], "entity_globs": []},
+        blocking=True,
+    )
+    await async_recorder_block_till_done(hass)
+    await async_wait_purge_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.query(LogbookIndex).count() == 0
+
+
 @pytest.mark.parametrize(
     ("db_engine", "expected_attributes"),
     [
@@ -396,11 +510,8 @@ async def test_saving_state_with_exception(
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+        if get_instance(hass).states_manager._pending_rows:
+            raise OperationalError("insert the state", "fake params", "forced to fail")
 
     with (
         patch("time.sleep"),
@@ -439,11 +550,8 @@ async def test_saving_state_with_sqlalchemy_exception(
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise SQLAlchemyError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+        if get_instance(hass).states_manager._pending_rows:
+            raise SQLAlchemyError("insert the state", "fake params", "forced to fail")
 
     with (
         patch("time.sleep"),
@@ -1469,6 +1577,62 @@ async def test_saving_sets_old_state(hass: HomeAssistant, setup_recorder: None)
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+@pytest.mark.parametrize("persistent_database", [True])
+@pytest.mark.parametrize("recorder_config", [{CONF_COMMIT_INTERVAL: 1}])
+async def test_saving_old_state_chain_in_one_commit(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test states that change many times in one commit link to each other."""
+    for state in ("s1", "s2", "s3", "s4"):
+        hass.states.async_set("test.one", state, {"attr": state})
+    hass.states.async_set("test.two", "t1", {})
+    hass.bus.async_fire("test_event", {"data": 1})
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+
+    hass.states.async_set("test.one", "s5", {"attr": "s5"})
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+
+    def _get_states_and_events() -> tuple[list[Row], list[Row]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            states = list(
+                session.query(
+                    StatesMeta.entity_id,
+                    States.state_id,
+                    States.old_state_id,
+                    States.state,
+                    StateAttributes.shared_attrs,
+                )
+                .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .outerjoin(
+                    StateAttributes,
+                    States.attributes_id == StateAttributes.attributes_id,
+                )
+            )
+            events = list(
+                session.query(Events.event_id, EventData.shared_data)
+                .filter(
+                    Events.event_type_id.in_(select_event_type_ids(("test_event",)))
+                )
+                .outerjoin(EventData, Events.data_id == EventData.data_id)
+            )
+            return states, events
+
+    states, events = await recorder_mock.async_add_executor_job(_get_states_and_events)
+    assert len(states) == 6
+    states_by_state = {state.state: state for state in states}
+    assert states_by_state["s1"].old_state_id is None
+    assert states_by_state["t1"].old_state_id is None
+    for old, new in (("s1", "s2"), ("s2", "s3"), ("s3", "s4"), ("s4", "s5")):
+        assert states_by_state[new].old_state_id == states_by_state[old].state_id
+        assert states_by_state[new].entity_id == "test.one"
+        assert json_loads(states_by_state[new].shared_attrs) == {"attr": new}
+
+    assert len(events) == 1
+    assert json_loads(events[0].shared_data) == {"data": 1}
+
+
 async def test_saving_state_with_serializable_data(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture, setup_recorder: None
 ) -> None:
@@ -4,7 +4,8 @@ from collections.abc import Generator
 from datetime import datetime, timedelta
 import json
 import sqlite3
-from unittest.mock import patch
+from typing import Any
+from unittest.mock import call, patch
 
 from freezegun import freeze_time
 import pytest
@@ -13,7 +14,11 @@ from sqlalchemy.orm.session import Session
 from voluptuous.error import MultipleInvalid
 
 from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder
-from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.const import (
+    PURGE_PAUSE_SECONDS,
+    PURGE_PROGRESS_STORAGE_KEY,
+    SupportedDialect,
+)
 from homeassistant.components.recorder.db_schema import (
     Events,
     EventTypes,
@@ -25,7 +30,7 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import PurgeProgress, purge_old_data
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
@@ -34,7 +39,8 @@ from homeassistant.components.recorder.services import (
 from homeassistant.components.recorder.tasks import PurgeTask
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_THEMES_UPDATED, STATE_ON
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HassJobType, HomeAssistant
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util import dt as dt_util
 
 from .common import (
@@ -45,6 +51,7 @@ from .common import (
     convert_pending_states_to_meta,
 )
 
+from tests.common import async_fire_time_changed
 from tests.typing import RecorderInstanceGenerator
 
 TEST_EVENT_TYPES = (
@@ -110,6 +117,137 @@ async def test_purge_big_database(hass: HomeAssistant, recorder_mock: Recorder)
             assert state_attributes.count() == 1
 
 
+async def test_purge_slice_out_of_time_removes_unused_attributes(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test a purge slice that runs out of time removes the unused attributes."""
+    for _ in range(12):
+        await _add_test_states(hass, wait_recording_done=False)
+    await async_wait_recording_done(hass)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    progress = PurgeProgress(purge_before, repack=False, apply_filter=False)
+
+    with (
+        patch.object(recorder_mock, "max_bind_vars", 72),
+        patch.object(recorder_mock.database_engine, "max_bind_vars", 72),
+        patch(
+            "homeassistant.components.recorder.purge._deadline_exceeded",
+            side_effect=[False, True, True, True, True],
+        ),
+    ):
+        finished = purge_old_data(
+            recorder_mock,
+            purge_before,
+            repack=False,
+            progress=progress,
+            time_budget=1,
+        )
+    assert not finished
+    assert progress.rows_purged == 48
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 24
+        # The attributes of the purged states are not left behind
+        assert session.query(StateAttributes).count() == 1
+
+    assert PurgeProgress.from_dict(progress.as_dict()) == progress
+
+    finished = purge_old_data(
+        recorder_mock, purge_before, repack=False, progress=progress, time_budget=60
+    )
+    assert finished
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 24
+        assert session.query(StateAttributes).count() == 1
+
+
+async def test_purge_task_pauses_and_resumes(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test the purge task pauses while the queue is backed up and resumes."""
+    await _add_test_states(hass)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+
+    with (
+        patch("homeassistant.components.recorder.tasks.PURGE_PAUSE_BACKLOG", 0),
+        patch(
+            "homeassistant.components.recorder.core.async_call_later",
+            wraps=async_call_later,
+        ) as call_later,
+    ):
+        recorder_mock.queue_task(
+            PurgeTask(purge_before, repack=False, apply_filter=False)
+        )
+        await async_wait_recording_done(hass)
+
+    # The paused purge is queued again from the event loop
+    assert call_later.call_args[0][2].job_type is HassJobType.Callback
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 6
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=PURGE_PAUSE_SECONDS)
+    )
+    await async_wait_purge_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+    assert recorder_mock.purge_statistics.last_slice_latency is not None
+    assert recorder_mock.purge_statistics.rows_purged == 4
+    assert PURGE_PROGRESS_STORAGE_KEY not in hass_storage
+
+
+async def test_purge_task_saves_progress(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the purge task saves an unfinished purge until it finishes."""
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    progress = PurgeProgress(purge_before, repack=False, apply_filter=False)
+
+    with (
+        patch(
+            "homeassistant.components.recorder.purge.purge_old_data",
+            side_effect=[False, False, False, True],
+        ),
+        patch.object(recorder_mock, "save_purge_progress") as save_purge_progress,
+    ):
+        recorder_mock.queue_task(
+            PurgeTask(purge_before, repack=False, apply_filter=False)
+        )
+        await async_wait_purge_done(hass)
+
+    # The purge is saved once when it did not finish in the first slice
+    assert save_purge_progress.mock_calls == [call(progress), call(None)]
+
+
+async def test_purge_resumes_after_restart(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test a purge that did not finish is resumed from the saved progress."""
+    await _add_test_states(hass)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    hass_storage[PURGE_PROGRESS_STORAGE_KEY] = {
+        "version": 1,
+        "key": PURGE_PROGRESS_STORAGE_KEY,
+        "data": PurgeProgress(purge_before, repack=False, apply_filter=False).as_dict(),
+    }
+
+    await recorder_mock._async_resume_purge()
+    await async_wait_purge_done(hass)
+    await hass.async_block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+    assert PURGE_PROGRESS_STORAGE_KEY not in hass_storage
+
+
 async def test_purge_old_states(hass: HomeAssistant, recorder_mock: Recorder) -> None:
     """Test deleting old states."""
     await _add_test_states(hass)
@@ -128,3 +128,20 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
     }
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_recorder_system_health_purge_statistics(
+    recorder_mock: Recorder, hass: HomeAssistant, recorder_db_url: str
+) -> None:
+    """Test recorder system health reports the purge statistics."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+    instance.purge_statistics.add_slice(500, 0.25)
+    instance.purge_statistics.add_slice(300, 0.15)
+
+    info = await get_system_health_info(hass, "recorder")
+    assert info["purge_rows_per_second"] == "2000.0"
+    assert info["purge_slice_latency"] == "150"
@@ -1,5 +1,8 @@
 """Tests for Search integration."""
 
+from typing import Any
+from unittest.mock import patch
+
 import pytest
 from pytest_unordered import unordered
 
@@ -1013,3 +1016,57 @@ async def test_search(
         ),
         ItemType.SCRIPT: unordered(["script.device", "script.hue"]),
     }
+
+
+async def test_search_follows_changed_references(hass: HomeAssistant) -> None:
+    """Test search follows reloaded automations and changed group members."""
+    assert await async_setup_component(hass, "search", {})
+    assert await async_setup_component(
+        hass, "group", {"group": {"lights": {"entities": ["light.kitchen"]}}}
+    )
+
+    def automation_config(entity_id: str) -> dict[str, Any]:
+        """Return an automation config turning on an entity."""
+        return {
+            "id": "lights",
+            "alias": "lights",
+            "trigger": {"platform": "event", "event_type": "test_event"},
+            "action": {
+                "service": "test.automation",
+                "target": {"entity_id": entity_id},
+            },
+        }
+
+    assert await async_setup_component(
+        hass, "automation", {"automation": automation_config("light.kitchen")}
+    )
+
+    def search(item_type: ItemType, item_id: str) -> dict[str, set[str]]:
+        """Search."""
+        searcher = Searcher(hass, {})
+        return searcher.async_search(item_type, item_id)
+
+    assert search(ItemType.ENTITY, "light.kitchen") == {
+        ItemType.AUTOMATION: {"automation.lights"},
+        ItemType.GROUP: {"group.lights"},
+    }
+    assert search(ItemType.ENTITY, "light.hallway") == {}
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={"automation": automation_config("light.hallway")},
+    ):
+        await hass.services.async_call("automation", "reload", blocking=True)
+    await hass.services.async_call(
+        "group",
+        "set",
+        {"object_id": "lights", "entities": ["light.hallway"]},
+        blocking=True,
+    )
+
+    assert search(ItemType.ENTITY, "light.kitchen") == {}
+    assert search(ItemType.ENTITY, "light.hallway") == {
+        ItemType.AUTOMATION: {"automation.lights"},
+        ItemType.GROUP: {"group.lights"},
+    }
@@ -247,6 +247,77 @@ async def test_compile_hourly_statistics(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+async def test_compile_statistics_from_recorded_states(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test compiling statistics from the states kept as they are recorded."""
+    zero = get_start_time(dt_util.utcnow())
+    period2 = zero + timedelta(minutes=5)
+    await async_setup_component(hass, "sensor", {})
+    # Wait for the sensor recorder platform to be added
+    await async_recorder_block_till_done(hass)
+    with freeze_time(zero) as freezer:
+        await async_record_states(
+            hass, freezer, zero, "sensor.test1", POWER_SENSOR_ATTRIBUTES
+        )
+        await async_record_states(
+            hass,
+            freezer,
+            period2,
+            "sensor.test1",
+            POWER_SENSOR_ATTRIBUTES,
+            seq=[50, 5, 20],
+        )
+    await async_wait_recording_done(hass)
+
+    # The states before the first period are not known, read them from the database
+    with patch.object(
+        history,
+        "get_full_significant_states_with_session",
+        wraps=history.get_full_significant_states_with_session,
+    ) as get_full_significant_states_mock:
+        do_adhoc_statistics(hass, start=zero)
+        await async_wait_recording_done(hass)
+    assert get_full_significant_states_mock.call_count == 1
+
+    with patch.object(
+        history,
+        "get_full_significant_states_with_session",
+        wraps=history.get_full_significant_states_with_session,
+    ) as get_full_significant_states_mock:
+        do_adhoc_statistics(hass, start=period2)
+        await async_wait_recording_done(hass)
+    assert get_full_significant_states_mock.call_count == 0
+
+    stats = statistics_during_period(hass, zero, period="5minute")
+    assert stats == {
+        "sensor.test1": [
+            {
+                "start": process_timestamp(zero).timestamp(),
+                "end": process_timestamp(period2).timestamp(),
+                "mean": pytest.approx(13.050847),
+                "min": pytest.approx(-10.0),
+                "max": pytest.approx(30.0),
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            },
+            {
+                "start": process_timestamp(period2).timestamp(),
+                "end": process_timestamp(period2 + timedelta(minutes=5)).timestamp(),
+                "mean": pytest.approx((30 * 5 + 50 * 50 + 5 * 200 + 20 * 45) / 300),
+                "min": pytest.approx(5.0),
+                "max": pytest.approx(50.0),
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            },
+        ]
+    }
+    assert "Error while processing event StatisticsTask" not in caplog.text
+
+
 @pytest.mark.parametrize(
     (
         "device_class",
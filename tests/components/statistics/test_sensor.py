@@ -449,6 +449,41 @@ async def test_sampling_size_reduced(hass: HomeAssistant) -> None:
     assert state.attributes.get("buffer_usage_ratio") == round(5 / 5, 2)
 
 
+@pytest.mark.parametrize("value", ["inf", "-inf", "nan"])
+async def test_non_finite_source_value(hass: HomeAssistant, value: str) -> None:
+    """Test non-finite source values are rejected and do not corrupt the buffer."""
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": [
+                {
+                    "platform": "statistics",
+                    "name": "test",
+                    "entity_id": "sensor.test_monitored",
+                    "state_characteristic": "mean",
+                    "sampling_size": 5,
+                },
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+
+    for sample in (*VALUES_NUMERIC[:3], value, *VALUES_NUMERIC[3:]):
+        hass.states.async_set(
+            "sensor.test_monitored",
+            str(sample),
+            {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+        )
+        await hass.async_block_till_done()
+        state = hass.states.get("sensor.test")
+        assert state is not None
+        assert state.attributes.get("source_value_valid") is (sample != value)
+
+    new_mean = round(sum(VALUES_NUMERIC[-5:]) / len(VALUES_NUMERIC[-5:]), 2)
+    assert state.state == str(new_mean)
+
+
 async def test_sampling_size_1(hass: HomeAssistant) -> None:
     """Test validity of stats requiring only one sample."""
     assert await async_setup_component(
@@ -0,0 +1,127 @@
+"""Test the sliding window of the statistics sensor."""
+
+from datetime import datetime, timedelta
+import math
+from random import Random
+import statistics
+
+import pytest
+
+from homeassistant.components.statistics.window import StatisticsWindow
+
+
+@pytest.mark.parametrize("maxlen", [1, 2, 5, 50, None])
+def test_window_matches_statistics(maxlen: int | None) -> None:
+    """Test the incremental aggregates match computing them from the samples."""
+    random = Random(42)
+    window = StatisticsWindow(maxlen, order_statistics=True)
+    start = datetime(2024, 1, 1)
+    for idx in range(3000):
+        window.append(
+            round(random.uniform(-50, 50), random.randint(0, 2)),
+            start + timedelta(seconds=idx * 10 + random.randint(0, 9)),
+        )
+        if maxlen is None and random.random() < 0.5:
+            window.popleft()
+        states = list(window.states)
+        ages = list(window.ages)
+        assert len(window) == len(states)
+        assert len(states) == len(window.sorted_states)
+        if not states:
+            continue
+        assert window.sum == pytest.approx(sum(states))
+        assert window.median() == statistics.median(states)
+        value_max = max(states)
+        assert window.maximum == (value_max, ages[states.index(value_max)])
+        value_min = min(states)
+        assert window.minimum == (value_min, ages[states.index(value_min)])
+        assert window.sin_sum == pytest.approx(
+            sum(math.sin(math.radians(value)) for value in states), abs=1e-9
+        )
+        assert window.cos_sum == pytest.approx(
+            sum(math.cos(math.radians(value)) for value in states), abs=1e-9
+        )
+        if len(states) < 2:
+            continue
+        assert window.variance == pytest.approx(statistics.variance(states))
+        percentile = random.randint(1, 99)
+        assert window.percentile(percentile) == pytest.approx(
+            statistics.quantiles(states, n=100, method="exclusive")[percentile - 1]
+        )
+        pairs = list(zip(states, states[1:], strict=False))
+        assert window.sum_differences == pytest.approx(
+            sum(abs(j - i) for i, j in pairs), abs=1e-6
+        )
+        assert window.sum_differences_nonnegative == pytest.approx(
+            sum(j - i if j >= i else j for i, j in pairs), abs=1e-6
+        )
+        seconds = [
+            (ages[idx] - ages[idx - 1]).total_seconds() for idx in range(1, len(ages))
+        ]
+        assert window.area_linear == pytest.approx(
+            sum(0.5 * (j + i) * s for (i, j), s in zip(pairs, seconds, strict=True)),
+            abs=1e-6,
+        )
+        assert window.area_step == pytest.approx(
+            sum(i * s for (i, _), s in zip(pairs, seconds, strict=True)), abs=1e-6
+        )
+
+
+@pytest.mark.parametrize("percentile", [1, 5, 50, 95, 99])
+def test_window_percentile(percentile: int) -> None:
+    """Test percentiles match statistics.quantiles."""
+    window = StatisticsWindow(20, order_statistics=True)
+    start = datetime(2024, 1, 1)
+    for idx, value in enumerate([3.0, 1.5, 8.25, -2.0, 4.0, 4.0, 7.5, 0.0] * 5):
+        window.append(value, start + timedelta(seconds=idx))
+        if len(window) >= 2:
+            assert window.percentile(percentile) == pytest.approx(
+                statistics.quantiles(window.states, n=100, method="exclusive")[
+                    percentile - 1
+                ]
+            )
+
+
+def test_window_binary() -> None:
+    """Test the aggregates of binary samples."""
+    window = StatisticsWindow(3, order_statistics=False)
+    start = datetime(2024, 1, 1)
+    for idx, value in enumerate([True, False, True, True, False]):
+        window.append(value, start + timedelta(seconds=idx * 10))
+    assert list(window.states) == [True, True, False]
+    assert window.sum == 2
+    assert window.area_step == 20
+    assert window.sorted_states is None
+
+    for _ in range(3):
+        window.popleft()
+    assert len(window) == 0
+    assert window.sum == 0
+    assert window.area_step == 0
+
+
+@pytest.mark.parametrize("value", [math.inf, -math.inf, math.nan])
+def test_window_rejects_non_finite(value: float) -> None:
+    """Test non-finite samples are rejected without changing the window."""
+    window = StatisticsWindow(3, order_statistics=True)
+    start = datetime(2024, 1, 1)
+    for idx, sample in enumerate([1.0, 5.0, 3.0]):
+        window.append(sample, start + timedelta(seconds=idx))
+
+    with pytest.raises(ValueError):
+        window.append(value, start + timedelta(seconds=3))
+
+    assert list(window.states) == [1.0, 5.0, 3.0]
+    assert len(window.ages) == 3
+    assert window.sum == 9.0
+    assert window.minimum == (1.0, start)
+    assert window.maximum == (5.0, start + timedelta(seconds=1))
+    assert window.sorted_states == [1.0, 3.0, 5.0]
+    assert window.sin_sum == pytest.approx(
+        sum(math.sin(math.radians(v)) for v in (1.0, 5.0, 3.0))
+    )
+
+    window.append(7.0, start + timedelta(seconds=4))
+    assert list(window.states) == [5.0, 3.0, 7.0]
+    assert window.sum == 15.0
+    assert window.minimum == (3.0, start + timedelta(seconds=2))
@@ -716,3 +716,26 @@ async def test_get_part_segments(
     )
 
     stream_worker_sync.resume()
+
+
+def test_complete_segment_data_is_shared_by_parts() -> None:
+    """Test the data of a complete segment is kept once for the segment and parts."""
+    segment = create_segment(sequence=0)
+    parts = create_parts(SEQUENCE_BYTES)
+    for part in parts[:-1]:
+        segment.async_add_part(part, 0)
+    assert segment.get_data() == SEQUENCE_BYTES[:-BYTERANGE_LENGTH]
+
+    segment.async_add_part(parts[-1], SEGMENT_DURATION)
+    data = segment.get_data()
+    assert isinstance(data, memoryview)
+    assert data == SEQUENCE_BYTES
+    assert segment.get_data() is data
+    assert segment.data_size == len(SEQUENCE_BYTES)
+    for i, part in enumerate(segment.parts):
+        assert isinstance(part.data, memoryview)
+        assert part.data.obj is data.obj
+        assert (
+            part.data
+            == SEQUENCE_BYTES[i * BYTERANGE_LENGTH : (i + 1) * BYTERANGE_LENGTH]
+        )
@@ -20,7 +20,7 @@ import logging
 import math
 from pathlib import Path
 import threading
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import av
 import numpy as np
@@ -40,7 +40,11 @@ from homeassistant.components.stream.const import (
     SEGMENT_DURATION_ADJUSTER,
     TARGET_SEGMENT_DURATION_NON_LL_HLS,
 )
-from homeassistant.components.stream.core import Orientation, StreamSettings
+from homeassistant.components.stream.core import (
+    STREAM_SETTINGS_NON_LL_HLS,
+    Orientation,
+    StreamSettings,
+)
 from homeassistant.components.stream.worker import (
     StreamEndedError,
     StreamState,
@@ -1069,3 +1073,50 @@ async def test_get_image_rotated(hass: HomeAssistant, h264_video, filename) -> N
                 0
             ][0]
         ).all()
+
+
+async def test_keyframe_images_are_cached(hass: HomeAssistant) -> None:
+    """Test images of a keyframe are decoded and encoded once per size."""
+    with patch(
+        "homeassistant.components.camera.img_util.TurboJPEGSingleton"
+    ) as mock_turbo_jpeg_singleton:
+        mock_turbo_jpeg_singleton.instance.return_value = mock_turbo_jpeg()
+        converter = KeyFrameConverter(
+            hass, STREAM_SETTINGS_NON_LL_HLS, dynamic_stream_settings()
+        )
+    encode = mock_turbo_jpeg_singleton.instance.return_value.encode
+    frame = Mock()
+    frame.to_ndarray.return_value = np.zeros((6, 8, 3), dtype=np.uint8)
+    frame.reformat.return_value = frame
+    converter._codec_context = Mock()
+    converter._codec_context.decode.return_value = [frame]
+
+    # No keyframe yet
+    assert await converter.async_get_image() is None
+
+    converter.stash_keyframe_packet(Mock())
+    for _ in range(3):
+        assert await converter.async_get_image() == EMPTY_8_6_JPEG
+    assert converter._codec_context.decode.call_count == 1
+    assert encode.call_count == 1
+
+    # Another size of the same keyframe is encoded once
+    for _ in range(3):
+        assert await converter.async_get_image(width=4, height=3) == EMPTY_8_6_JPEG
+    assert converter._codec_context.decode.call_count == 2
+    assert encode.call_count == 2
+    frame.reformat.assert_called_once_with(width=4, height=3)
+
+    # The next keyframe replaces the cached images
+    converter.stash_keyframe_packet(Mock())
+    assert await converter.async_get_image() == EMPTY_8_6_JPEG
+    assert converter._codec_context.decode.call_count == 3
+    assert encode.call_count == 3
+
+    # Decoding is only attempted once per keyframe
+    converter.stash_keyframe_packet(Mock())
+    converter._codec_context.decode.return_value = []
+    assert await converter.async_get_image() == EMPTY_8_6_JPEG
+    assert await converter.async_get_image() == EMPTY_8_6_JPEG
+    assert converter._codec_context.decode.call_count == 6
+    assert encode.call_count == 3
@@ -2,9 +2,10 @@
 
 import asyncio
 from collections import defaultdict
+import contextlib
 import json
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 from pytest_unordered import unordered
@@ -12,6 +13,8 @@ from pytest_unordered import unordered
 from homeassistant.components.trace.const import DEFAULT_STORED_TRACES
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import Context, CoreState, HomeAssistant, callback
+from homeassistant.exceptions import ServiceNotFound
+from homeassistant.helpers import trace as trace_helper
 from homeassistant.helpers.typing import UNDEFINED
 from homeassistant.setup import async_setup_component
 from homeassistant.util.uuid import random_uuid_hex
@@ -592,6 +595,269 @@ async def test_trace_overflow(
     assert len(_find_traces(response["result"], domain, "sun")) == 1
 
 
+@pytest.mark.parametrize("domain", ["automation", "script"])
+@pytest.mark.parametrize(
+    ("trace_config", "expected_sun_traces", "expected_moon_traces"),
+    [
+        ({"mode": "full"}, 5, 5),
+        ({"mode": "off"}, 0, 0),
+        ({"mode": "sampled", "sample_rate": 3}, 2, 2),
+        ({"mode": "on_error"}, 0, 5),
+    ],
+)
+async def test_trace_mode(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    domain: str,
+    trace_config: dict[str, Any],
+    expected_sun_traces: int,
+    expected_moon_traces: int,
+) -> None:
+    """Test the trace mode decides which runs are traced."""
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"event": "some_event"},
+    }
+    moon_config = {
+        "id": "moon",
+        "trigger": {"platform": "event", "event_type": "test_event2"},
+        "action": {"service": "test.not_registered"},
+    }
+    if domain == "script":
+        configs = {
+            config["id"]: {"sequence": config["action"], "trace": trace_config}
+            for config in (sun_config, moon_config)
+        }
+    else:
+        configs = [
+            {**config, "trace": trace_config} for config in (sun_config, moon_config)
+        ]
+    assert await async_setup_component(hass, domain, {domain: configs})
+    client = await hass_ws_client()
+
+    for _ in range(5):
+        await _run_automation_or_script(hass, domain, sun_config, "test_event")
+        with contextlib.suppress(ServiceNotFound):
+            await _run_automation_or_script(hass, domain, moon_config, "test_event2")
+        await hass.async_block_till_done()
+
+    await client.send_json({"id": 1, "type": "trace/list", "domain": domain})
+    response = await client.receive_json()
+    assert response["success"]
+    assert len(_find_traces(response["result"], domain, "sun")) == expected_sun_traces
+    moon_traces = _find_traces(response["result"], domain, "moon")
+    assert len(moon_traces) == expected_moon_traces
+    assert all("error" in trace for trace in moon_traces)
+
+
+@pytest.mark.parametrize("domain", ["automation", "script"])
+@pytest.mark.parametrize(("mode", "recorded"), [("full", True), ("off", False)])
+async def test_trace_mode_off_skips_recording(
+    hass: HomeAssistant, domain: str, mode: str, recorded: bool
+) -> None:
+    """Test runs which are not traced do not record the path or trace elements."""
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": [{"variables": {"brightness": 10}}, {"event": "some_event"}],
+    }
+    if domain == "script":
+        configs = {"sun": {"sequence": sun_config["action"], "trace": {"mode": mode}}}
+    else:
+        configs = [{**sun_config, "trace": {"mode": mode}}]
+    assert await async_setup_component(hass, domain, {domain: configs})
+
+    with (
+        patch(
+            "homeassistant.helpers.trace.trace_stack_push",
+            wraps=trace_helper.trace_stack_push,
+        ) as path_push,
+        patch(
+            "homeassistant.helpers.trace.deque", wraps=trace_helper.deque
+        ) as new_trace_node,
+    ):
+        await _run_automation_or_script(hass, domain, sun_config, "test_event")
+        await hass.async_block_till_done()
+
+    assert path_push.called is recorded
+    assert new_trace_node.called is recorded
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+async def test_trace_lazy(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator, lazy: bool
+) -> None:
+    """Test lazy traces compute the changed variables when requested."""
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": [
+            {"variables": {"brightness": 10}},
+            {"variables": {"brightness": "{{ brightness * 2 }}", "color": "red"}},
+            {"event": "some_event"},
+        ],
+        "trace": {"lazy": lazy},
+    }
+    assert await async_setup_component(hass, "automation", {"automation": sun_config})
+    client = await hass_ws_client()
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    await client.send_json({"id": 1, "type": "trace/list", "domain": "automation"})
+    response = await client.receive_json()
+    run_id = _find_run_id(response["result"], "automation", "sun")
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "trace/get",
+            "domain": "automation",
+            "item_id": "sun",
+            "run_id": run_id,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    trace = response["result"]["trace"]
+    assert trace["action/0"][0]["changed_variables"] == {
+        "brightness": 10,
+        "context": ANY,
+    }
+    assert trace["action/1"][0]["changed_variables"] == {
+        "brightness": 20,
+        "color": "red",
+    }
+    assert "changed_variables" not in trace["action/2"][0]
+
+
+async def test_trace_lazy_variables_changed_in_place(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test lazy traces report variables changed in place like full traces."""
+    action = [
+        {"variables": {"brightness": 10}},
+        {
+            "repeat": {
+                "count": 2,
+                "sequence": [{"event": "repeat_event"}],
+            }
+        },
+        {"wait_template": "{{ true }}"},
+        {"event": "some_event"},
+    ]
+    configs = [
+        {
+            "id": item_id,
+            "trigger": {"platform": "event", "event_type": "test_event"},
+            "action": action,
+            "trace": {"lazy": item_id == "lazy"},
+        }
+        for item_id in ("full", "lazy")
+    ]
+    assert await async_setup_component(hass, "automation", {"automation": configs})
+    client = await hass_ws_client()
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    await client.send_json({"id": 1, "type": "trace/list", "domain": "automation"})
+    response = await client.receive_json()
+    traces = {}
+    for msg_id, item_id in enumerate(("full", "lazy"), start=2):
+        await client.send_json(
+            {
+                "id": msg_id,
+                "type": "trace/get",
+                "domain": "automation",
+                "item_id": item_id,
+                "run_id": _find_run_id(response["result"], "automation", item_id),
+            }
+        )
+        trace_response = await client.receive_json()
+        assert trace_response["success"]
+        # The runs have their own context
+        traces[item_id] = {
+            path: [
+                {
+                    key: value
+                    for key, value in element.get("changed_variables", {}).items()
+                    if key != "context"
+                }
+                for element in elements
+            ]
+            for path, elements in trace_response["result"]["trace"].items()
+            if path.startswith("action")
+        }
+
+    assert traces["full"]["action/1/repeat/sequence/0"] == [
+        {"repeat": {"first": True, "index": 1, "last": False}},
+        {"repeat": {"first": False, "index": 2, "last": True}},
+    ]
+    assert traces["full"]["action/2"] == [
+        {"wait": {"completed": True, "remaining": None}}
+    ]
+    assert traces["lazy"] == traces["full"]
+
+
+async def test_trace_global_limit(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the least recently used traces are evicted above the global limit."""
+    configs = [
+        {
+            "id": item_id,
+            "trigger": {"platform": "event", "event_type": f"{item_id}_event"},
+            "action": {"event": "some_event"},
+        }
+        for item_id in ("sun", "moon", "star")
+    ]
+    await _setup_automation_or_script(hass, "automation", configs)
+    client = await hass_ws_client()
+
+    async def _list_traces() -> list[dict[str, Any]]:
+        await client.send_json(
+            {"id": next_id(), "type": "trace/list", "domain": "automation"}
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        return response["result"]
+
+    msg_id = 0
+
+    def next_id() -> int:
+        nonlocal msg_id
+        msg_id += 1
+        return msg_id
+
+    with patch("homeassistant.components.trace.MAX_STORED_TRACES", 3):
+        for item_id in ("sun", "moon", "star"):
+            hass.bus.async_fire(f"{item_id}_event")
+            await hass.async_block_till_done()
+        sun_run_id = _find_run_id(await _list_traces(), "automation", "sun")
+
+        # Reading the sun trace keeps it over the older moon trace
+        await client.send_json(
+            {
+                "id": next_id(),
+                "type": "trace/get",
+                "domain": "automation",
+                "item_id": "sun",
+                "run_id": sun_run_id,
+            }
+        )
+        assert (await client.receive_json())["success"]
+
+        hass.bus.async_fire("star_event")
+        await hass.async_block_till_done()
+
+    traces = await _list_traces()
+    assert len(traces) == 3
+    assert len(_find_traces(traces, "automation", "sun")) == 1
+    assert len(_find_traces(traces, "automation", "moon")) == 0
+    assert len(_find_traces(traces, "automation", "star")) == 2
+
+
 @pytest.mark.parametrize(
     ("domain", "num_restored_moon_traces"), [("automation", 3), ("script", 1)]
 )
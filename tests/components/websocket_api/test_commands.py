@@ -1261,6 +1261,94 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_shares_state_changed_listener(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test subscribe_entities subscriptions share one state changed listener."""
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.other", "off")
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.other": True}}}
+    )
+    init_count = sum(hass.bus.async_listeners().values())
+
+    for msg_id, entity_ids in ((7, ["light.permitted"]), (8, ["light.other"])):
+        await websocket_client.send_json(
+            {"id": msg_id, "type": "subscribe_entities", "entity_ids": entity_ids}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == msg_id
+        assert msg["success"]
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == msg_id
+        assert msg["type"] == "event"
+
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+
+    hass.states.async_set("light.other", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["event"] == {
+        "c": {"light.other": {"+": {"c": ANY, "lc": ANY, "s": "on"}}}
+    }
+
+    # Permissions are checked again after they change
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.other": True}}})
+    hass.states.async_set("light.permitted", "on")
+    hass.states.async_set("light.other", "off")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["event"] == {
+        "c": {"light.other": {"+": {"c": ANY, "lc": ANY, "s": "off"}}}
+    }
+
+    for msg_id, subscription in ((9, 7), (10, 8)):
+        await websocket_client.send_json(
+            {"id": msg_id, "type": "unsubscribe_events", "subscription": subscription}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == msg_id
+        assert msg["success"]
+
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
+async def test_subscribe_entities_batch(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test a batch of state changes is sent as merged messages."""
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.removed", "off")
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "event"
+
+    with hass.states.async_batch():
+        hass.states.async_set("light.permitted", "on")
+        hass.states.async_set("light.new", "on")
+        hass.states.async_remove("light.removed")
+        # Seen again, so a second message is needed to keep the order
+        hass.states.async_set("light.permitted", "off")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {
+        "a": {"light.new": {"a": {}, "c": ANY, "lc": ANY, "s": "on"}},
+        "c": {"light.permitted": {"+": {"c": ANY, "lc": ANY, "s": "on"}}},
+        "r": ["light.removed"],
+    }
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {
+        "c": {"light.permitted": {"+": {"c": ANY, "lc": ANY, "s": "off"}}}
+    }
+
+
 async def test_render_template_renders_template(
     hass: HomeAssistant, websocket_client
 ) -> None:
@@ -13,7 +13,7 @@ from freezegun.api import FrozenDateTimeFactory
 import jinja2
 import pytest
 
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import (
     Event,
@@ -26,6 +26,8 @@ from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    _TRACK_STATE_CHANGE_DATA,
+    _TRACK_STATE_CHANGE_DOMAIN_DATA,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
@@ -444,6 +446,63 @@ async def test_async_track_state_change_filtered(hass: HomeAssistant) -> None:
     track_throws.async_remove()
 
 
+async def test_async_track_state_change_filtered_shares_domain_listener(
+    hass: HomeAssistant,
+) -> None:
+    """Test domain trackers share one listener instead of one per entity."""
+    for idx in range(10):
+        hass.states.async_set(f"sensor.test_{idx}", "on")
+    calls: list[Event[EventStateChangedData]] = []
+
+    @ha.callback
+    def run_callback(event: Event[EventStateChangedData]) -> None:
+        calls.append(event)
+
+    listeners_before = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    trackers = [
+        async_track_state_change_filtered(
+            hass,
+            TrackStates(False, {"sensor.test_0", "light.bowl"}, {"sensor"}),
+            run_callback,
+        )
+        for _ in range(3)
+    ]
+    # One listener for the domains and one for the entities
+    assert (
+        hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before + 2
+    )
+    # Entities in a tracked domain are only dispatched by domain
+    assert "sensor.test_0" not in hass.data[_TRACK_STATE_CHANGE_DATA].callbacks
+    assert len(hass.data[_TRACK_STATE_CHANGE_DOMAIN_DATA].callbacks["sensor"]) == 3
+
+    hass.states.async_set("sensor.test_0", "off")
+    hass.states.async_set("sensor.new", "on")
+    hass.states.async_remove("sensor.test_1")
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.kitchen", "on")
+    await hass.async_block_till_done()
+    assert [event.data["entity_id"] for event in calls] == [
+        *(["sensor.test_0"] * 3),
+        *(["sensor.new"] * 3),
+        *(["sensor.test_1"] * 3),
+        *(["light.bowl"] * 3),
+    ]
+
+    # Leaving the domain releases the shared listener
+    for tracker in trackers:
+        tracker.async_update_listeners(TrackStates(False, {"sensor.test_0"}, set()))
+    assert _TRACK_STATE_CHANGE_DOMAIN_DATA not in hass.data
+    calls.clear()
+    hass.states.async_set("sensor.test_0", "on")
+    hass.states.async_set("sensor.test_2", "off")
+    await hass.async_block_till_done()
+    assert [event.data["entity_id"] for event in calls] == ["sensor.test_0"] * 3
+
+    for tracker in trackers:
+        tracker.async_remove()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before
+
+
 async def test_async_track_state_change_event(hass: HomeAssistant) -> None:
     """Test async_track_state_change_event."""
     single_entity_id_tracker = []
@@ -552,6 +611,36 @@ async def test_async_track_state_change_event_with_empty_list(
     unsub_single()
 
 
+async def test_async_track_state_change_event_batch(hass: HomeAssistant) -> None:
+    """Test async_track_state_change_event with a batch of state changes."""
+    tracked: list[tuple[str, str]] = []
+
+    @ha.callback
+    def _callback(event: Event[EventStateChangedData]) -> None:
+        tracked.append((event.data["entity_id"], event.data["new_state"].state))
+
+    unsub = async_track_state_change_event(
+        hass, ["light.bowl", "light.kitchen"], _callback
+    )
+
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "on", None),
+            ("light.other", "on", None),
+            ("light.kitchen", "on", None),
+            ("light.bowl", "off", None),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    assert tracked == [
+        ("light.bowl", "on"),
+        ("light.kitchen", "on"),
+        ("light.bowl", "off"),
+    ]
+    unsub()
+
+
 async def test_async_track_state_added_domain(hass: HomeAssistant) -> None:
     """Test async_track_state_added_domain."""
     single_entity_id_tracker = []
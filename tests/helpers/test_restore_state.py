@@ -1,11 +1,15 @@
 """The tests for the Restore component."""
 
+import asyncio
 from collections.abc import Coroutine
 from datetime import datetime, timedelta
 import logging
+import os
+from pathlib import Path
 from typing import Any
 from unittest.mock import Mock, patch
 
+import py
 import pytest
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP
@@ -17,7 +21,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.reload import async_get_platform_without_config_entry
 from homeassistant.helpers.restore_state import (
     DATA_RESTORE_STATE,
+    LEGACY_STORAGE_KEY,
     STORAGE_KEY,
+    RestoredExtraData,
     RestoreEntity,
     RestoreStateData,
     StoredState,
@@ -32,6 +38,7 @@ from tests.common import (
     MockModule,
     MockPlatform,
     async_fire_time_changed,
+    async_test_home_assistant,
     json_round_trip,
     mock_integration,
     mock_platform,
@@ -53,17 +60,25 @@ async def test_caching_data(hass: HomeAssistant) -> None:
 
     data = async_get(hass)
     await hass.async_block_till_done()
-    await data.store.async_save([state.as_dict() for state in stored_states])
+    await data.store.async_save(
+        {
+            "states": [
+                {**state.as_dict(), "id": state.state.entity_id}
+                for state in stored_states
+            ],
+            "dumps": [],
+        }
+    )
 
     # Emulate a fresh load
     hass.data.pop(DATA_RESTORE_STATE)
 
     with (
         patch(
-            "homeassistant.helpers.restore_state.Store.async_load",
+            "homeassistant.helpers.restore_state.RestoreStateStore.async_load",
             side_effect=HomeAssistantError,
         ),
-        patch("homeassistant.helpers.restore_state.Store.async_save"),
+        patch("homeassistant.helpers.restore_state.RestoreStateStore.async_save"),
     ):
         # Failure to load should not be treated as fatal
         await async_load(hass)
@@ -73,7 +88,7 @@ async def test_caching_data(hass: HomeAssistant) -> None:
 
     # Mock that only b1 is present this run
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         await async_load(hass)
         await hass.async_block_till_done()
@@ -112,11 +127,11 @@ async def test_periodic_write(hass: HomeAssistant) -> None:
     """Test that we write periodiclly but not after stop."""
     data = async_get(hass)
     await hass.async_block_till_done()
-    await data.store.async_save([])
+    await data.store.async_save({"states": [], "dumps": []})
 
     # Emulate a fresh load
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         hass.data.pop(DATA_RESTORE_STATE)
         await async_load(hass)
@@ -132,7 +147,7 @@ async def test_periodic_write(hass: HomeAssistant) -> None:
     assert mock_write_data.called
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=15))
         await hass.async_block_till_done()
@@ -140,7 +155,7 @@ async def test_periodic_write(hass: HomeAssistant) -> None:
     assert mock_write_data.called
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
         await hass.async_block_till_done()
@@ -148,7 +163,7 @@ async def test_periodic_write(hass: HomeAssistant) -> None:
     assert mock_write_data.called
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=30))
         await hass.async_block_till_done()
@@ -160,11 +175,11 @@ async def test_save_persistent_states(hass: HomeAssistant) -> None:
     """Test that we cancel the currently running job, save the data, and verify the perdiodic job continues."""
     data = async_get(hass)
     await hass.async_block_till_done()
-    await data.store.async_save([])
+    await data.store.async_save({"states": [], "dumps": []})
 
     # Emulate a fresh load
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         hass.data.pop(DATA_RESTORE_STATE)
         await async_load(hass)
@@ -181,7 +196,7 @@ async def test_save_persistent_states(hass: HomeAssistant) -> None:
     assert mock_write_data.called
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
         await hass.async_block_till_done()
@@ -190,7 +205,7 @@ async def test_save_persistent_states(hass: HomeAssistant) -> None:
     assert not mock_write_data.called
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         await RestoreStateData.async_save_persistent_states(hass)
         await hass.async_block_till_done()
@@ -198,7 +213,7 @@ async def test_save_persistent_states(hass: HomeAssistant) -> None:
     assert mock_write_data.called
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=20))
         await hass.async_block_till_done()
@@ -206,7 +221,7 @@ async def test_save_persistent_states(hass: HomeAssistant) -> None:
     assert mock_write_data.called
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
         await hass.async_block_till_done()
@@ -227,7 +242,15 @@ async def test_hass_starting(hass: HomeAssistant) -> None:
 
     data = async_get(hass)
     await hass.async_block_till_done()
-    await data.store.async_save([state.as_dict() for state in stored_states])
+    await data.store.async_save(
+        {
+            "states": [
+                {**state.as_dict(), "id": state.state.entity_id}
+                for state in stored_states
+            ],
+            "dumps": [],
+        }
+    )
 
     # Emulate a fresh load
     hass.set_state(CoreState.not_running)
@@ -245,7 +268,7 @@ async def test_hass_starting(hass: HomeAssistant) -> None:
 
     # Mock that only b1 is present this run
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         state = await entity.async_get_last_state()
         await hass.async_block_till_done()
@@ -260,7 +283,7 @@ async def test_hass_starting(hass: HomeAssistant) -> None:
 
     # Finish hass startup
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
         await hass.async_block_till_done()
@@ -308,13 +331,13 @@ async def test_dump_data(hass: HomeAssistant) -> None:
         hass.states.async_set(state.entity_id, state.state, state.attributes)
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         await data.async_dump_states()
 
     assert mock_write_data.called
     args = mock_write_data.mock_calls[0][1]
-    written_states = args[0]
+    written_states = args[0]["states"]
 
     for state in states:
         hass.states.async_remove(state.entity_id)
@@ -342,13 +365,13 @@ async def test_dump_data(hass: HomeAssistant) -> None:
         hass.states.async_set(state.entity_id, state.state, state.attributes)
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
     ) as mock_write_data:
         await data.async_dump_states()
 
     assert mock_write_data.called
     args = mock_write_data.mock_calls[0][1]
-    written_states = args[0]
+    written_states = args[0]["states"]
     assert len(written_states) == 2
     state0 = json_round_trip(written_states[0])
     state1 = json_round_trip(written_states[1])
@@ -383,7 +406,7 @@ async def test_dump_error(hass: HomeAssistant) -> None:
         hass.states.async_set(state.entity_id, state.state, state.attributes)
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save",
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save",
         side_effect=HomeAssistantError,
     ) as mock_write_data:
         await data.async_dump_states()
@@ -441,9 +464,9 @@ async def test_restoring_invalid_entity_id(
     entity.hass = hass
     entity.entity_id = "test.invalid__entity_id"
     now = dt_util.utcnow().isoformat()
-    hass_storage[STORAGE_KEY] = {
+    hass_storage[LEGACY_STORAGE_KEY] = {
         "version": 1,
-        "key": STORAGE_KEY,
+        "key": LEGACY_STORAGE_KEY,
         "data": [
             {
                 "state": {
@@ -531,7 +554,7 @@ async def test_restore_entity_end_to_end(
     await data.async_dump_states()
     await hass.async_block_till_done()
 
-    storage_data = hass_storage[STORAGE_KEY]["data"]
+    storage_data = hass_storage[STORAGE_KEY]["data"]["states"]
     assert len(storage_data) == 1
     assert storage_data[0]["state"]["entity_id"] == entity_id
     assert storage_data[0]["state"]["state"] == "stored"
@@ -546,7 +569,201 @@ async def test_restore_entity_end_to_end(
     await data.async_dump_states()
     await hass.async_block_till_done()
 
-    storage_data = hass_storage[STORAGE_KEY]["data"]
+    storage_data = hass_storage[STORAGE_KEY]["data"]["states"]
     assert len(storage_data) == 1
     assert storage_data[0]["state"]["entity_id"] == entity_id
     assert storage_data[0]["state"]["state"] == "stored"
+
+
+async def test_dump_states_journal(tmpdir: py.path.local) -> None:
+    """Test only the changed states are appended to the journal."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        platform = MockEntityPlatform(hass, domain="input_boolean")
+        entities = []
+        for idx in range(3):
+            entity = RestoreEntity()
+            entity.hass = hass
+            entity.entity_id = f"input_boolean.b{idx}"
+            entities.append(entity)
+        await platform.async_add_entities(entities)
+        for entity in entities:
+            hass.states.async_set(entity.entity_id, "on")
+
+        data = async_get(hass)
+        store = data.store
+
+        # The first dump writes the whole file
+        await data.async_dump_states()
+        assert await hass.async_add_executor_job(os.path.exists, store.path)
+        assert not await hass.async_add_executor_job(os.path.exists, store.journal_path)
+
+        # Only the changed state and the time of the dump are journaled
+        hass.states.async_set("input_boolean.b1", "off")
+        await data.async_dump_states()
+        journal = await hass.async_add_executor_job(Path(store.journal_path).read_bytes)
+        assert b"input_boolean.b1" in journal
+        assert b"input_boolean.b0" not in journal
+        assert b"input_boolean.b2" not in journal
+        dump_time = data._journal_dump.time
+        await hass.async_stop(force=True)
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        last_states = async_get(hass).last_states
+        assert {
+            entity_id: stored_state.state.state
+            for entity_id, stored_state in last_states.items()
+        } == {
+            "input_boolean.b0": "on",
+            "input_boolean.b1": "off",
+            "input_boolean.b2": "on",
+        }
+        assert all(
+            stored_state.last_seen == dump_time for stored_state in last_states.values()
+        )
+        await hass.async_stop(force=True)
+
+
+def _legacy_storage_data(entity_id: str, state: str) -> dict[str, Any]:
+    """Return restore state data as saved under the legacy key."""
+    now = dt_util.utcnow().isoformat()
+    return {
+        "version": 1,
+        "key": LEGACY_STORAGE_KEY,
+        "data": [
+            {
+                "state": {
+                    "entity_id": entity_id,
+                    "state": state,
+                    "attributes": {},
+                    "last_changed": now,
+                    "last_updated": now,
+                    "context": {
+                        "id": "3c2243ff5f30447eb12e7348cfd5b8ff",
+                        "user_id": None,
+                    },
+                },
+                "extra_data": None,
+                "last_seen": now,
+            }
+        ],
+    }
+
+
+async def test_migrate_legacy_storage(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the states saved under the legacy key are migrated."""
+    hass_storage[LEGACY_STORAGE_KEY] = _legacy_storage_data("input_boolean.b0", "on")
+
+    await async_load(hass)
+    data = async_get(hass)
+    assert data.last_states["input_boolean.b0"].state.state == "on"
+
+    await data.async_dump_states()
+    assert LEGACY_STORAGE_KEY not in hass_storage
+    states = hass_storage[STORAGE_KEY]["data"]["states"]
+    assert [item["id"] for item in states] == ["input_boolean.b0"]
+
+
+async def test_legacy_storage_after_downgrade(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the legacy file is preferred as it is written after a downgrade."""
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "states": [
+                {
+                    **_legacy_storage_data("input_boolean.b0", "off")["data"][0],
+                    "id": "input_boolean.b0",
+                }
+            ],
+            "dumps": [],
+        },
+    }
+    hass_storage[LEGACY_STORAGE_KEY] = _legacy_storage_data("input_boolean.b0", "on")
+
+    await async_load(hass)
+    assert async_get(hass).last_states["input_boolean.b0"].state.state == "on"
+
+
+async def test_dump_states_extra_data_changed(hass: HomeAssistant) -> None:
+    """Test a change of extra data without a new state is dumped."""
+    extra_data = {"value": 1}
+
+    class MockRestoreEntity(RestoreEntity):
+        """Mock restore entity with extra data."""
+
+        @property
+        def extra_restore_state_data(self) -> RestoredExtraData:
+            """Return the extra data."""
+            return RestoredExtraData(dict(extra_data))
+
+    platform = MockEntityPlatform(hass, domain="input_boolean")
+    entity = MockRestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+    await platform.async_add_entities([entity])
+    hass.states.async_set(entity.entity_id, "on")
+
+    data = async_get(hass)
+    await data.async_dump_states()
+    item = data._journal_states["input_boolean.b0"]
+
+    # Unchanged extra data keeps the item
+    await data.async_dump_states()
+    assert data._journal_states["input_boolean.b0"] is item
+
+    extra_data["value"] = 2
+    with patch(
+        "homeassistant.helpers.restore_state.RestoreStateStore.async_save"
+    ) as mock_write_data:
+        await data.async_dump_states()
+
+    assert data._journal_states["input_boolean.b0"] is not item
+    written_states = mock_write_data.mock_calls[0][1][0]["states"]
+    assert json_round_trip(written_states[0])["extra_data"] == {"value": 2}
+
+
+async def test_periodic_dump_skips_extra_data_of_unchanged_states(
+    hass: HomeAssistant,
+) -> None:
+    """Test periodic dumps only rebuild the extra data of new states."""
+    extra_data_calls = 0
+
+    class MockRestoreEntity(RestoreEntity):
+        """Mock restore entity counting the extra data requests."""
+
+        @property
+        def extra_restore_state_data(self) -> RestoredExtraData:
+            """Return the extra data."""
+            nonlocal extra_data_calls
+            extra_data_calls += 1
+            return RestoredExtraData({"value": 1})
+
+    platform = MockEntityPlatform(hass, domain="input_boolean")
+    entity = MockRestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+    await platform.async_add_entities([entity])
+    hass.states.async_set(entity.entity_id, "on")
+
+    data = async_get(hass)
+    await data._async_dump_states(check_extra_data=False)
+    assert extra_data_calls == 1
+
+    # The entity did not write a new state
+    await data._async_dump_states(check_extra_data=False)
+    assert extra_data_calls == 1
+
+    hass.states.async_set(entity.entity_id, "off")
+    await data._async_dump_states(check_extra_data=False)
+    assert extra_data_calls == 2
+
+    # A dump when stopping checks the extra data of all entities
+    await data.async_dump_states()
+    assert extra_data_calls == 3
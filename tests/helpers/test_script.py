@@ -280,6 +280,65 @@ async def test_calling_service_basic(
     )
 
 
+async def test_calling_service_compiled_once(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry
+) -> None:
+    """Test the sequence is compiled once and static service calls are reused."""
+    entry = entity_registry.async_get_or_create(
+        "light", "hue", "1234", suggested_object_id="bed"
+    )
+    calls = async_mock_service(hass, "test", "script")
+    sequence = cv.SCRIPT_SCHEMA(
+        [
+            {
+                "service": "test.script",
+                "target": {"entity_id": "light.kitchen"},
+                "data": {"hello": "world"},
+            },
+            {"service": "test.script", "data": {"hello": "{{ greeting }}"}},
+            {"service": "test.script", "target": {"entity_id": entry.id}},
+        ]
+    )
+    script_obj = script.Script(hass, sequence, "Test Name", "test_domain")
+
+    with patch(
+        "homeassistant.helpers.script.cv.determine_script_action",
+        wraps=cv.determine_script_action,
+    ) as determine_script_action:
+        await script_obj.async_run(
+            MappingProxyType({"greeting": "hi"}), context=Context()
+        )
+        await script_obj.async_run(
+            MappingProxyType({"greeting": "bye"}), context=Context()
+        )
+    await hass.async_block_till_done()
+
+    assert determine_script_action.call_count == 3
+    plan = script_obj._get_plan()
+    assert plan[0].static_params == {
+        "domain": "test",
+        "service": "script",
+        "service_data": {"hello": "world"},
+        "target": {"entity_id": ["light.kitchen"]},
+    }
+    # Templates are rendered and registry ids resolved for each run
+    assert plan[1].static_params is None
+    assert plan[2].static_params is None
+
+    assert [call.data.get("hello") for call in calls] == [
+        "world",
+        "hi",
+        None,
+        "world",
+        "bye",
+        None,
+    ]
+    assert calls[2].data["entity_id"] == ["light.bed"]
+    # The service call adds the target to a copy of the static service data
+    assert calls[0].data["entity_id"] == ["light.kitchen"]
+    assert plan[0].static_params["service_data"] == {"hello": "world"}
+
+
 async def test_calling_service_template(hass: HomeAssistant) -> None:
     """Test the calling of a service."""
     context = Context()
@@ -4,6 +4,8 @@ import asyncio
 from datetime import timedelta
 import json
 import os
+from pathlib import Path
+import threading
 from typing import Any, NamedTuple
 from unittest.mock import Mock, patch
 
@@ -20,7 +22,7 @@ from homeassistant.const import (
 from homeassistant.core import DOMAIN as HOMEASSISTANT_DOMAIN, CoreState, HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import issue_registry as ir, storage
-from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.json import json_bytes, json_fragment
 from homeassistant.util import dt as dt_util
 from homeassistant.util.color import RGBColor
 
@@ -1180,3 +1182,257 @@ async def test_storage_concurrent_load(hass: HomeAssistant) -> None:
         )
         for load in loads:
             assert load == "data"
+
+
+async def test_writes_are_coalesced(tmpdir: py.path.local) -> None:
+    """Test writes of stores due at the same time are written in one batch."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        stores = [
+            storage.Store(hass, MOCK_VERSION, f"integration{idx}", atomic_writes=True)
+            for idx in range(3)
+        ]
+        orig_write_batch = storage._StoreManager._write_batch
+        batches: list[list[str]] = []
+
+        def _write_batch(
+            manager: storage._StoreManager, writes: list[storage._PendingWrite]
+        ) -> None:
+            batches.append(sorted(write.store.key for write in writes))
+            orig_write_batch(manager, writes)
+
+        with patch.object(storage._StoreManager, "_write_batch", _write_batch):
+            for idx, store in enumerate(stores):
+                store.async_delay_save(lambda idx=idx: {"idx": idx}, 1)
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+            await hass.async_block_till_done()
+
+        assert batches == [["integration0", "integration1", "integration2"]]
+        for idx, store in enumerate(stores):
+            assert await hass.async_add_executor_job(os.path.exists, store.path)
+            assert await store.async_load() == {"idx": idx}
+
+        await hass.async_stop(force=True)
+
+
+async def test_write_stats(tmpdir: py.path.local) -> None:
+    """Test write statistics and skipping writes of unchanged data."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+        data = {f"key{idx}": "x" * 100 for idx in range(1000)}
+        await store.async_save(data)
+
+        stats = storage.get_internal_store_manager(hass).async_get_write_stats()
+        key_stats = stats[MOCK_KEY]
+        size = key_stats.bytes_written
+        assert key_stats == storage.StoreWriteStats(
+            writes=1, skipped_writes=0, bytes_written=size, bytes_changed=size
+        )
+        assert key_stats.write_amplification == 1
+
+        # Unchanged data is not written again
+        await store.async_save(data)
+        assert key_stats.writes == 1
+        assert key_stats.skipped_writes == 1
+
+        # A small change only counts the blocks around it as changed
+        data["key500"] = "y" * 100
+        await store.async_save(data)
+        assert key_stats.writes == 2
+        assert key_stats.bytes_written == 2 * size
+        assert key_stats.bytes_changed < size + 2 * storage.WRITE_BLOCK_SIZE
+        assert key_stats.write_amplification > 1
+        assert (await store.async_load())["key500"] == "y" * 100
+
+        # A removed store is written again
+        await store.async_remove()
+        await store.async_save(data)
+        assert key_stats.writes == 3
+        assert await hass.async_add_executor_job(os.path.exists, store.path)
+
+        await hass.async_stop(force=True)
+
+
+async def test_write_batch_errors(
+    tmpdir: py.path.local, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a failing store does not prevent writing the other stores."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        good_store = storage.Store(hass, MOCK_VERSION, "good")
+        bad_store = storage.Store(hass, MOCK_VERSION, "bad")
+        good_store.async_delay_save(lambda: MOCK_DATA, 1)
+        bad_store.async_delay_save(lambda: {"bad": object()}, 1)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+        assert "Error writing config for bad" in caplog.text
+        assert await good_store.async_load() == MOCK_DATA
+        assert not await hass.async_add_executor_job(os.path.exists, bad_store.path)
+
+        await hass.async_stop(force=True)
+
+
+async def test_write_batch_raises(tmpdir: py.path.local) -> None:
+    """Test a failing batch fails its stores and writes the queued ones."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        first_store = storage.Store(hass, MOCK_VERSION, "first")
+        second_store = storage.Store(hass, MOCK_VERSION, "second")
+        orig_write_batch = storage._StoreManager._write_batch
+        started = threading.Event()
+        release = threading.Event()
+
+        def _write_batch(
+            manager: storage._StoreManager, writes: list[storage._PendingWrite]
+        ) -> None:
+            if not started.is_set():
+                started.set()
+                release.wait()
+                raise RuntimeError("Batch failed")
+            orig_write_batch(manager, writes)
+
+        with patch.object(storage._StoreManager, "_write_batch", _write_batch):
+            first_save = hass.async_create_task(first_store.async_save(MOCK_DATA))
+            await hass.async_add_executor_job(started.wait)
+            # Queued while the failing batch is written
+            second_save = hass.async_create_task(second_store.async_save(MOCK_DATA))
+            await asyncio.sleep(0)
+            release.set()
+
+            with pytest.raises(RuntimeError, match="Batch failed"):
+                await first_save
+            await second_save
+
+        assert not await hass.async_add_executor_job(os.path.exists, first_store.path)
+        assert await second_store.async_load() == MOCK_DATA
+
+        await hass.async_stop(force=True)
+
+
+class _MockJournalItem:
+    """A mock item of a journaled store."""
+
+    def __init__(self, item_id: str, value: str) -> None:
+        """Initialize the item."""
+        self.id = item_id
+        self.value = value
+
+    @property
+    def as_storage_fragment(self) -> json_fragment:
+        """Return a json fragment for storage."""
+        return json_fragment(json_bytes({"id": self.id, "value": self.value}))
+
+
+async def test_journaled_store(tmpdir: py.path.local) -> None:
+    """Test a journaled store appends changes and replays them on load."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    items = {
+        item_id: _MockJournalItem(item_id, "initial") for item_id in ("a", "b", "c")
+    }
+
+    def _data_to_save() -> dict[str, Any]:
+        return {"items": [item.as_storage_fragment for item in items.values()]}
+
+    def _journal_items() -> dict[str, Any]:
+        return {"items": items.values()}
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.JournaledStore(hass, MOCK_VERSION, MOCK_KEY)
+        assert await store.async_load() is None
+        store.async_start_journal(_journal_items)
+
+        # Without a file the whole data is written
+        await store.async_save(_data_to_save())
+        assert not await hass.async_add_executor_job(os.path.exists, store.journal_path)
+
+        # Changes are appended to the journal
+        items["b"] = _MockJournalItem("b", "changed")
+        del items["c"]
+        items["d"] = _MockJournalItem("d", "added")
+        await store.async_save(_data_to_save())
+        journal = await hass.async_add_executor_job(Path(store.journal_path).read_bytes)
+        assert len(journal.splitlines()) == 4
+        file_data = json.loads(
+            await hass.async_add_executor_job(Path(store.path).read_text)
+        )
+        assert file_data["data"]["items"][1] == {"id": "b", "value": "initial"}
+
+        # Nothing is written without changes
+        await store.async_save(_data_to_save())
+        assert (
+            await hass.async_add_executor_job(Path(store.journal_path).read_bytes)
+            == journal
+        )
+        stats = storage.get_internal_store_manager(hass).async_get_write_stats()
+        assert stats[MOCK_KEY].writes == 2
+        await hass.async_stop(force=True)
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.JournaledStore(hass, MOCK_VERSION, MOCK_KEY)
+        assert await store.async_load() == {
+            "items": [
+                {"id": "a", "value": "initial"},
+                {"id": "b", "value": "changed"},
+                {"id": "d", "value": "added"},
+            ]
+        }
+        store.async_start_journal(_journal_items)
+
+        # The journal is compacted into the file in the final write
+        items["a"] = _MockJournalItem("a", "final")
+        store.async_delay_save(_data_to_save, 10)
+        await hass.async_stop()
+        assert not await hass.async_add_executor_job(os.path.exists, store.journal_path)
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.JournaledStore(hass, MOCK_VERSION, MOCK_KEY)
+        assert await store.async_load() == {
+            "items": [
+                {"id": "a", "value": "final"},
+                {"id": "b", "value": "changed"},
+                {"id": "d", "value": "added"},
+            ]
+        }
+        await hass.async_stop(force=True)
+
+
+async def test_journaled_store_ignores_stale_journal(tmpdir: py.path.local) -> None:
+    """Test a journal of another file or with an incomplete entry."""
+    loop = asyncio.get_running_loop()
+    config_dir = await loop.run_in_executor(None, tmpdir.mkdir, "temp_storage")
+    items = {"a": _MockJournalItem("a", "initial")}
+
+    def _data_to_save() -> dict[str, Any]:
+        return {"items": [item.as_storage_fragment for item in items.values()]}
+
+    async with async_test_home_assistant(config_dir=config_dir.strpath) as hass:
+        store = storage.JournaledStore(hass, MOCK_VERSION, MOCK_KEY)
+        await store.async_load()
+        store.async_start_journal(lambda: {"items": items.values()})
+        await store.async_save(_data_to_save())
+        items["a"] = _MockJournalItem("a", "changed")
+        await store.async_save(_data_to_save())
+        journal_path = Path(store.journal_path)
+        journal = await hass.async_add_executor_job(journal_path.read_bytes)
+
+        # An incomplete entry at the end is ignored
+        await hass.async_add_executor_job(
+            journal_path.write_bytes, journal + b'["items","b",{"id"'
+        )
+        store = storage.JournaledStore(hass, MOCK_VERSION, MOCK_KEY)
+        assert await store.async_load() == {"items": [{"id": "a", "value": "changed"}]}
+
+        # A journal of another file is ignored
+        await hass.async_add_executor_job(
+            journal_path.write_bytes, b'"other"\n' + journal.split(b"\n", 1)[1]
+        )
+        store = storage.JournaledStore(hass, MOCK_VERSION, MOCK_KEY)
+        assert await store.async_load() == {"items": [{"id": "a", "value": "initial"}]}
+        await hass.async_stop(force=True)
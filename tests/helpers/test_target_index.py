@@ -0,0 +1,115 @@
+"""Tests for the target index."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    label_registry as lr,
+    target_index,
+)
+from homeassistant.helpers.target_index import TargetResolution
+
+from tests.common import MockConfigEntry
+
+
+async def test_target_index(
+    hass: HomeAssistant,
+    area_registry: ar.AreaRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    floor_registry: fr.FloorRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test resolving targets and updating them from registry updates."""
+    config_entry = MockConfigEntry(domain="light")
+    config_entry.add_to_hass(hass)
+    floor = floor_registry.async_create("Ground floor")
+    kitchen = area_registry.async_create("Kitchen", floor_id=floor.floor_id)
+    hallway = area_registry.async_create("Hallway")
+    label = label_registry.async_create("Lights")
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        connections={(dr.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+    )
+    device_registry.async_update_device(device.id, area_id=kitchen.id)
+    ceiling = entity_registry.async_get_or_create(
+        "light", "hue", "ceiling", device_id=device.id
+    )
+    spot = entity_registry.async_get_or_create(
+        "light", "hue", "spot", device_id=device.id
+    )
+    entity_registry.async_update_entity(spot.entity_id, area_id=hallway.id)
+    config = entity_registry.async_get_or_create(
+        "light",
+        "hue",
+        "config",
+        device_id=device.id,
+        entity_category=er.EntityCategory.CONFIG,
+    )
+
+    index = target_index.async_get(hass)
+    assert index.async_resolve_floor(floor.floor_id) == TargetResolution(
+        frozenset({kitchen.id}), frozenset({device.id}), frozenset({ceiling.entity_id})
+    )
+    assert index.async_resolve_device(device.id) == TargetResolution(
+        frozenset(),
+        frozenset({device.id}),
+        frozenset({ceiling.entity_id, spot.entity_id}),
+    )
+    assert index.async_area_entities(kitchen.id) == (
+        ceiling.entity_id,
+        config.entity_id,
+    )
+    assert index.async_floor_areas(floor.floor_id) == (kitchen.id,)
+    assert index.async_label_entities(label.label_id) == ()
+
+    # Updates of fields which do not change targets keep the results
+    resolution = index.async_resolve_floor(floor.floor_id)
+    entity_registry.async_update_entity(ceiling.entity_id, name="Ceiling")
+    device_registry.async_update_device(device.id, name_by_user="Lamp")
+    assert index.async_resolve_floor(floor.floor_id) is resolution
+
+    # An entity moving into the area of its device
+    entity_registry.async_update_entity(spot.entity_id, area_id=kitchen.id)
+    assert index.async_resolve_floor(floor.floor_id).entities == {
+        ceiling.entity_id,
+        spot.entity_id,
+    }
+
+    # A hidden entity is no longer targeted
+    entity_registry.async_update_entity(
+        ceiling.entity_id, hidden_by=er.RegistryEntryHider.USER
+    )
+    assert index.async_resolve_floor(floor.floor_id).entities == {spot.entity_id}
+    assert set(index.async_area_entities(kitchen.id)) == {
+        spot.entity_id,
+        ceiling.entity_id,
+        config.entity_id,
+    }
+
+    # An area moving to the floor
+    area_registry.async_update(hallway.id, floor_id=floor.floor_id)
+    assert index.async_floor_areas(floor.floor_id) == (kitchen.id, hallway.id)
+    assert index.async_resolve_floor(floor.floor_id).areas == {kitchen.id, hallway.id}
+
+    # Labels of entities, devices and areas
+    entity_registry.async_update_entity(spot.entity_id, labels={label.label_id})
+    assert index.async_label_entities(label.label_id) == (spot.entity_id,)
+    assert index.async_resolve_label(label.label_id).entities == {spot.entity_id}
+    area_registry.async_update(kitchen.id, labels={label.label_id})
+    assert index.async_resolve_label(label.label_id) == TargetResolution(
+        frozenset({kitchen.id}), frozenset({device.id}), frozenset({spot.entity_id})
+    )
+
+    # Removed entities and devices
+    entity_registry.async_remove(spot.entity_id)
+    assert index.async_resolve_label(label.label_id).entities == set()
+    assert set(index.async_area_entities(kitchen.id)) == {
+        ceiling.entity_id,
+        config.entity_id,
+    }
+    device_registry.async_remove_device(device.id)
+    assert index.async_resolve_floor(floor.floor_id).devices == set()
+    assert index.async_area_entities(kitchen.id) == ()
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import base64
 from collections.abc import Iterable
 from datetime import datetime, timedelta
 import json
 import logging
+import marshal
 import math
 import random
 from types import MappingProxyType
@@ -13,6 +15,7 @@ from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
 import orjson
 import pytest
 import voluptuous as vol
@@ -341,6 +344,107 @@ async def test_import_change(hass: HomeAssistant) -> None:
     assert to_test.async_render() == "macro2 variable2"
 
 
+async def test_bytecode_cache(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test compiled templates are saved and reused."""
+    template.async_setup(hass)
+    await template.async_load_bytecode_cache(hass)
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    await hass.async_block_till_done()
+
+    freezer.tick(template.BYTECODE_CACHE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    data = hass_storage[template.BYTECODE_CACHE_STORAGE_KEY]["data"]
+    assert len(data["entries"]) == 1
+
+    # Compiled code is loaded from storage on the next start
+    hass.data.pop(template._ENVIRONMENT)
+    template.async_setup(hass)
+    await template.async_load_bytecode_cache(hass)
+    with patch(
+        "jinja2.Environment.compile", side_effect=AssertionError("compiled")
+    ) as compile_mock:
+        assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    compile_mock.assert_not_called()
+
+
+async def test_bytecode_cache_environment_changed(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test compiled templates are discarded when the environment changed."""
+    template.async_setup(hass)
+    await template.async_load_bytecode_cache(hass)
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    data = hass.data[template._BYTECODE_CACHE]._data_to_save()
+    data["environment"] = "old"
+    hass_storage[template.BYTECODE_CACHE_STORAGE_KEY] = {
+        "version": template.BYTECODE_CACHE_STORAGE_VERSION,
+        "key": template.BYTECODE_CACHE_STORAGE_KEY,
+        "data": data,
+    }
+
+    hass.data.pop(template._ENVIRONMENT)
+    template.async_setup(hass)
+    await template.async_load_bytecode_cache(hass)
+    assert len(hass.data[template._BYTECODE_CACHE]._entries) == 0
+
+
+async def test_bytecode_cache_invalid_code(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test saved code that can not be loaded is compiled again."""
+    template.async_setup(hass)
+    await template.async_load_bytecode_cache(hass)
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    data = hass.data[template._BYTECODE_CACHE]._data_to_save()
+    not_code = base64.b64encode(marshal.dumps("not code")).decode()
+    data["entries"] = {
+        key: (checksum, not_code) for key, (checksum, _) in data["entries"].items()
+    }
+    hass_storage[template.BYTECODE_CACHE_STORAGE_KEY] = {
+        "version": template.BYTECODE_CACHE_STORAGE_VERSION,
+        "key": template.BYTECODE_CACHE_STORAGE_KEY,
+        "data": data,
+    }
+
+    hass.data.pop(template._ENVIRONMENT)
+    template.async_setup(hass)
+    await template.async_load_bytecode_cache(hass)
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+
+
+async def test_bytecode_cache_import_change(hass: HomeAssistant) -> None:
+    """Test changed custom templates are compiled again."""
+    template.async_setup(hass)
+    await template.async_load_bytecode_cache(hass)
+    await template.async_load_custom_templates(hass)
+    to_test = template.Template(
+        """
+        {% import 'test.jinja' as t %}
+        {{ t.test_macro() }} {{ t.test_variable }}
+        """,
+        hass,
+    )
+    assert to_test.async_render() == "macro variable"
+    entries = hass.data[template._BYTECODE_CACHE]._entries
+    assert any(key.startswith("loader:") for key, _ in entries.items())
+
+    template._get_hass_loader(hass).sources = {
+        "test.jinja": """
+            {% macro test_macro() -%}
+            macro2
+            {%- endmacro %}
+
+            {% set test_variable = "variable2" %}
+            """
+    }
+    assert to_test.async_render() == "macro2 variable2"
+
+
 def test_loop_controls(hass: HomeAssistant) -> None:
     """Test that loop controls are enabled."""
     assert (
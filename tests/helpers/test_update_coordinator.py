@@ -11,8 +11,8 @@ import pytest
 import requests
 
 from homeassistant import config_entries
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
 from homeassistant.exceptions import (
     ConfigEntryAuthFailed,
     ConfigEntryError,
@@ -765,6 +765,32 @@ async def test_always_callback_when_always_update_is_true(
     remove_callbacks()
 
 
+@pytest.mark.parametrize("batch_state_writes", [False, True])
+async def test_batch_state_writes(
+    hass: HomeAssistant,
+    crd_without_update_interval: update_coordinator.DataUpdateCoordinator[int],
+    batch_state_writes: bool,
+) -> None:
+    """Test state writes of listeners are only batched when enabled."""
+    crd = crd_without_update_interval
+    crd.batch_state_writes = batch_state_writes
+    seen_by_first_event: list[bool] = []
+
+    @callback
+    def _state_changed(event: Event) -> None:
+        if not seen_by_first_event:
+            seen_by_first_event.append(hass.states.get("test.two") is not None)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _state_changed)
+
+    crd.async_add_listener(lambda: hass.states.async_set("test.one", "on"))
+    crd.async_add_listener(lambda: hass.states.async_set("test.two", "on"))
+    await crd.async_refresh()
+    await hass.async_block_till_done()
+
+    assert seen_by_first_event == [batch_state_writes]
+
+
 async def test_timestamp_date_update_coordinator(hass: HomeAssistant) -> None:
     """Test last_update_success_time is set before calling listeners."""
     last_update_success_times: list[datetime | None] = []
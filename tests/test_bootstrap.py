@@ -1524,3 +1524,167 @@ def test_should_rollover_is_always_false() -> None:
         ).shouldRollover(Mock())
         is False
     )
+
+
+def test_critical_path_import_order() -> None:
+    """Test imports are ordered by the cost of their critical path."""
+    import_graph: dict[str, bootstrap.ImportGraphEntry] = {
+        "cheap_base": {"import_time": 0.1, "dependencies": []},
+        "slow_leaf": {"import_time": 1.0, "dependencies": []},
+        "medium": {"import_time": 0.5, "dependencies": ["cheap_base"]},
+        "slow_dependent": {"import_time": 0.8, "dependencies": ["medium"]},
+        "not_measured": {"import_time": 0, "dependencies": ["cheap_base"]},
+        "not_set_up": {"import_time": 5.0, "dependencies": []},
+    }
+    domains = {
+        "cheap_base",
+        "slow_leaf",
+        "medium",
+        "slow_dependent",
+        "not_measured",
+        "new_integration",
+    }
+
+    # cheap_base (0.1 + 0.5 + 0.8) is on the longest path even
+    # though it is the cheapest to import on its own
+    assert bootstrap._critical_path_import_order(import_graph, domains) == [
+        "cheap_base",
+        "medium",
+        "slow_leaf",
+        "slow_dependent",
+    ]
+
+
+def test_critical_path_import_order_with_cycle() -> None:
+    """Test a stale import graph with a cycle does not recurse forever."""
+    import_graph: dict[str, bootstrap.ImportGraphEntry] = {
+        "one": {"import_time": 0.2, "dependencies": ["two"]},
+        "two": {"import_time": 0.1, "dependencies": ["one"]},
+    }
+    assert set(bootstrap._critical_path_import_order(import_graph, {"one", "two"})) == {
+        "one",
+        "two",
+    }
+
+
+@pytest.mark.parametrize("load_registries", [False])
+async def test_import_graph_saved_after_start(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the import graph is saved after a successful start."""
+    hass_storage[bootstrap.IMPORT_GRAPH_STORAGE_KEY] = {
+        "version": bootstrap.IMPORT_GRAPH_STORAGE_VERSION,
+        "key": bootstrap.IMPORT_GRAPH_STORAGE_KEY,
+        "data": {"child": {"import_time": 0.25, "dependencies": []}},
+    }
+    mock_integration(hass, MockModule(domain="root"))
+    mock_integration(hass, MockModule(domain="child", dependencies=["root"]))
+    hass.data[loader.DATA_IMPORT_TIMES]["root"] = 0.5
+
+    await bootstrap._async_set_up_integrations(hass, {"child": {}})
+    await hass.async_block_till_done()
+
+    import_graph = hass_storage[bootstrap.IMPORT_GRAPH_STORAGE_KEY]["data"]
+    assert import_graph["root"] == {"import_time": 0.5, "dependencies": []}
+    # child was not imported in the executor so the last cost is kept
+    assert import_graph["child"] == {"import_time": 0.25, "dependencies": ["root"]}
+
+
+@pytest.mark.parametrize("load_registries", [False])
+async def test_import_graph_not_saved_after_timeout(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the import graph is not saved when startup timed out."""
+    task: asyncio.Task | None = None
+
+    async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+        nonlocal task
+        task = hass.async_create_task(asyncio.sleep(2))
+        return True
+
+    mock_integration(
+        hass, MockModule(domain="normal_integration", async_setup=async_setup)
+    )
+
+    with patch.object(bootstrap, "WRAP_UP_TIMEOUT", 0):
+        await bootstrap._async_set_up_integrations(hass, {"normal_integration": {}})
+
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    await hass.async_block_till_done()
+
+    assert bootstrap.IMPORT_GRAPH_STORAGE_KEY not in hass_storage
+
+
+@pytest.mark.parametrize("load_registries", [False])
+async def test_preimport_uses_saved_import_graph(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test integrations are pre-imported in critical path order."""
+    hass_storage[bootstrap.IMPORT_GRAPH_STORAGE_KEY] = {
+        "version": bootstrap.IMPORT_GRAPH_STORAGE_VERSION,
+        "key": bootstrap.IMPORT_GRAPH_STORAGE_KEY,
+        "data": {
+            "root": {"import_time": 0.1, "dependencies": []},
+            "child": {"import_time": 0.3, "dependencies": ["root"]},
+            "other": {"import_time": 0.35, "dependencies": []},
+        },
+    }
+    mock_integration(hass, MockModule(domain="root"))
+    mock_integration(hass, MockModule(domain="child", dependencies=["root"]))
+    mock_integration(hass, MockModule(domain="other"))
+
+    with patch.object(
+        bootstrap, "_async_preimport_integrations", AsyncMock()
+    ) as mock_preimport:
+        await bootstrap._async_set_up_integrations(hass, {"child": {}, "other": {}})
+
+    assert mock_preimport.call_args[0][2] == ["root", "other", "child"]
+
+
+async def test_preimport_integrations(hass: HomeAssistant) -> None:
+    """Test pre-importing skips integrations that can not be imported yet."""
+    imported: list[str] = []
+
+    def _mock_integration(
+        domain: str, import_executor: bool = True, fail: bool = False
+    ) -> Mock:
+        async def _async_get_component() -> None:
+            if fail:
+                raise ImportError
+            imported.append(domain)
+
+        return Mock(
+            domain=domain,
+            import_executor=import_executor,
+            requirements=[f"{domain}==1.0"],
+            async_get_component=_async_get_component,
+        )
+
+    integration_cache = {
+        "first": _mock_integration("first"),
+        "in_loop": _mock_integration("in_loop", import_executor=False),
+        "broken": _mock_integration("broken", fail=True),
+        "missing_requirements": _mock_integration("missing_requirements"),
+        "last": _mock_integration("last"),
+    }
+
+    with patch(
+        "homeassistant.requirements.pkg_util.get_installed_versions",
+        side_effect=lambda reqs: reqs - {"missing_requirements==1.0"},
+    ):
+        await bootstrap._async_preimport_integrations(
+            hass,
+            integration_cache,
+            [
+                "first",
+                "in_loop",
+                "broken",
+                "missing_requirements",
+                "not_loaded",
+                "last",
+            ],
+        )
+
+    assert imported == ["first", "last"]
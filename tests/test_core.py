@@ -64,6 +64,7 @@ from homeassistant.helpers.json import json_dumps
 from homeassistant.setup import async_setup_component
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -265,7 +266,9 @@ async def test_async_add_hass_job_schedule_partial_callback() -> None:
 
 async def test_async_add_hass_job_schedule_corofunction_eager_start() -> None:
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=asyncio.get_running_loop()))
+    hass = MagicMock(
+        loop=MagicMock(wraps=asyncio.get_running_loop()), loop_accounting=None
+    )
 
     async def job():
         pass
@@ -283,7 +286,9 @@ async def test_async_add_hass_job_schedule_corofunction_eager_start() -> None:
 
 async def test_async_add_hass_job_schedule_partial_corofunction_eager_start() -> None:
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=asyncio.get_running_loop()))
+    hass = MagicMock(
+        loop=MagicMock(wraps=asyncio.get_running_loop()), loop_accounting=None
+    )
 
     async def job():
         pass
@@ -358,7 +363,7 @@ async def test_async_create_task_schedule_coroutine_with_name() -> None:
 
 async def test_async_run_eager_hass_job_calls_callback() -> None:
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(loop_accounting=None)
     calls = []
 
     def job():
@@ -382,7 +387,7 @@ async def test_async_run_eager_hass_job_calls_coro_function() -> None:
 
 async def test_async_run_hass_job_calls_callback() -> None:
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(loop_accounting=None)
     calls = []
 
     def job():
@@ -1564,6 +1569,150 @@ async def test_statemachine_avoids_updating_attributes(hass: HomeAssistant) -> N
     assert isinstance(new_state.attributes, ReadOnlyDict)
 
 
+async def test_statemachine_shares_serialized_attributes(
+    hass: HomeAssistant,
+) -> None:
+    """Test states with the same attributes share the serialized attributes."""
+    hass.states.async_set("light.bowl", "off", {"some_attr": "attr_value"})
+    state = hass.states.get("light.bowl")
+    assert state.attributes_json == b'{"some_attr":"attr_value"}'
+    state.recorder_shared_attrs = ("sqlite", b'{"some_attr":"attr_value"}', 1234)
+
+    hass.states.async_set("light.bowl", "on", state.attributes)
+    new_state = hass.states.get("light.bowl")
+    assert new_state.attributes is state.attributes
+    assert new_state.attributes_json is state.attributes_json
+    assert new_state.recorder_shared_attrs is state.recorder_shared_attrs
+    assert json_loads(new_state.as_dict_json)["attributes"] == {
+        "some_attr": "attr_value"
+    }
+
+    hass.states.async_set("light.bowl", "off", {"some_attr": "other_value"})
+    changed_state = hass.states.get("light.bowl")
+    assert changed_state.attributes_json == b'{"some_attr":"other_value"}'
+    assert changed_state.recorder_shared_attrs is None
+
+
+async def test_statemachine_async_set_many(hass: HomeAssistant) -> None:
+    """Test async_set_many fires the state changes as a batch."""
+    hass.states.async_set("light.bowl", "off")
+    hass.states.async_set("light.kitchen", "off")
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    batches: list[list[ha.Event[ha.EventStateChangedData]]] = []
+    batch_listener_events: list[ha.Event[ha.EventStateChangedData]] = []
+    states_seen: list[str] = []
+
+    @ha.callback
+    def _listener(event: ha.Event[ha.EventStateChangedData]) -> None:
+        batch_listener_events.append(event)
+
+    @ha.callback
+    def _batch_listener(batch: list[ha.Event[ha.EventStateChangedData]]) -> None:
+        batches.append(batch)
+        # All states are written before any listener runs
+        states_seen.extend(
+            hass.states.get(event.data["entity_id"]).state for event in batch
+        )
+
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED, _listener, batch_listener=_batch_listener
+    )
+
+    hass.states.async_set_many(
+        [
+            ("light.Bowl", "on", {"brightness": 100}),
+            ("light.kitchen", "off", None),
+            ("light.new", "on", None),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("light.bowl").state == "on"
+    assert hass.states.get("light.bowl").attributes == {"brightness": 100}
+    assert hass.states.get("light.new").state == "on"
+    # light.kitchen did not change
+    assert [event.data["entity_id"] for event in events] == ["light.bowl", "light.new"]
+    assert len(batches) == 1
+    assert batches[0] == events
+    assert states_seen == ["on", "on"]
+    assert batch_listener_events == []
+
+    # Single writes still go to the regular listener
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    assert len(batch_listener_events) == 1
+    assert len(batches) == 1
+
+
+async def test_statemachine_async_batch(hass: HomeAssistant) -> None:
+    """Test nested batches and removals are fired with the outer batch."""
+    hass.states.async_set("light.bowl", "off")
+    batches: list[list[ha.Event[ha.EventStateChangedData]]] = []
+
+    @ha.callback
+    def _batch_listener(batch: list[ha.Event[ha.EventStateChangedData]]) -> None:
+        batches.append(batch)
+
+    @ha.callback
+    def _filter(event_data: ha.EventStateChangedData) -> bool:
+        return event_data["entity_id"] != "light.filtered"
+
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED,
+        lambda event: None,
+        event_filter=_filter,
+        batch_listener=_batch_listener,
+    )
+
+    with hass.states.async_batch():
+        hass.states.async_set("light.filtered", "on")
+        with hass.states.async_batch():
+            hass.states.async_set("light.kitchen", "on")
+        assert batches == []
+        hass.states.async_remove("light.bowl")
+
+    assert len(batches) == 1
+    assert [event.data["entity_id"] for event in batches[0]] == [
+        "light.kitchen",
+        "light.bowl",
+    ]
+    assert batches[0][1].data["new_state"] is None
+
+    # Nothing is fired when nothing changed
+    with hass.states.async_batch():
+        hass.states.async_set("light.kitchen", "on")
+    assert len(batches) == 1
+
+
+async def test_eventbus_batch_listener_must_be_callback(hass: HomeAssistant) -> None:
+    """Test the batch listener must be a callback."""
+
+    def _not_a_callback(events: list[ha.Event]) -> None:
+        pass
+
+    with pytest.raises(HomeAssistantError, match="is not a callback"):
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED, lambda event: None, batch_listener=_not_a_callback
+        )
+
+
+async def test_eventbus_batch_listener_removed(hass: HomeAssistant) -> None:
+    """Test the batch listener is removed with the listener."""
+    batches: list[list[ha.Event[ha.EventStateChangedData]]] = []
+
+    @ha.callback
+    def _batch_listener(batch: list[ha.Event[ha.EventStateChangedData]]) -> None:
+        batches.append(batch)
+
+    unsub = hass.bus.async_listen(
+        EVENT_STATE_CHANGED, lambda event: None, batch_listener=_batch_listener
+    )
+    unsub()
+
+    hass.states.async_set_many([("light.bowl", "on", None)])
+    assert batches == []
+
+
 def test_service_call_repr() -> None:
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1379,6 +1379,8 @@ async def test_async_get_component_loads_loop_if_already_in_sys_modules(
     assert "loaded_executor=True" in caplog.text
     assert "loaded_executor=False" not in caplog.text
     assert module is module_mock
+    # Imports done in the executor are timed for the import graph
+    assert "test_package_loaded_executor" in hass.data[loader.DATA_IMPORT_TIMES]
     caplog.clear()
 
     with (
@@ -16,7 +16,9 @@ from homeassistant.requirements import (
     _async_get_manager,
     async_clear_install_history,
     async_get_integration_with_requirements,
+    async_load_installed_versions,
     async_process_requirements,
+    async_requirements_installed,
 )
 
 from .common import MockModule, mock_integration
@@ -92,6 +94,20 @@ async def test_install_existing_package(hass: HomeAssistant) -> None:
     assert len(mock_inst.mock_calls) == 0
 
 
+async def test_requirements_installed(hass: HomeAssistant) -> None:
+    """Test checking if requirements are known to be installed."""
+    assert async_requirements_installed(hass, [])
+    assert not async_requirements_installed(hass, ["hello==1.0.0"])
+
+    with patch(
+        "homeassistant.util.package.is_installed", side_effect=lambda req: "1" in req
+    ):
+        await async_load_installed_versions(hass, {"hello==1.0.0", "world==2.0.0"})
+
+    assert async_requirements_installed(hass, ["hello==1.0.0"])
+    assert not async_requirements_installed(hass, ["hello==1.0.0", "world==2.0.0"])
+
+
 async def test_install_missing_package(hass: HomeAssistant) -> None:
     """Test an install attempt on an existing package."""
     with (
@@ -0,0 +1,107 @@
+"""Test the event loop accounting."""
+
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.loop_accounting import (
+    LoopAccounting,
+    LoopStats,
+    domain_for_callable,
+    domain_for_module,
+)
+
+
+@pytest.mark.parametrize(
+    ("module", "domain"),
+    [
+        ("homeassistant.components.light", "light"),
+        ("homeassistant.components.hue.v2.light", "hue"),
+        ("custom_components.my_integration.sensor", "my_integration"),
+        ("homeassistant.helpers.event", "homeassistant"),
+        ("homeassistant.core", "homeassistant"),
+        ("aiohttp.web", "aiohttp"),
+    ],
+)
+def test_domain_for_module(module: str, domain: str) -> None:
+    """Test the domain a module is accounted to."""
+    assert domain_for_module(module) == domain
+
+
+def test_domain_for_callable() -> None:
+    """Test the domain a callable is accounted to."""
+
+    def _target() -> None:
+        """Target defined in the tests package."""
+
+    assert domain_for_callable(_target) == "tests"
+    assert domain_for_callable(partial(partial(_target))) == "tests"
+    assert domain_for_callable(HomeAssistant.async_run_hass_job) == "homeassistant"
+
+
+def test_loop_stats() -> None:
+    """Test the cumulative stats and the p99 latency."""
+    stats = LoopStats()
+    assert stats.as_dict() == {"count": 0, "total": 0.0, "max": 0.0, "p99": 0.0}
+
+    for _ in range(99):
+        stats.record(0.000005)
+    stats.record(0.5)
+    assert stats.count == 100
+    assert stats.total == pytest.approx(0.500495)
+    assert stats.maximum == 0.5
+    # The p99 is the upper bound of the histogram bucket
+    assert stats.percentile(99) == 0.00001
+    assert stats.percentile(100) == 0.5
+
+    stats.record(100)
+    assert stats.percentile(100) == 100
+
+
+def test_loop_accounting_nested() -> None:
+    """Test nested accounted time is not accounted to the outer domain."""
+    accounting = LoopAccounting()
+    times = iter([1.0, 1.5, 1.75, 3.0])
+
+    def _inner() -> str:
+        return "inner"
+
+    def _outer() -> str:
+        return accounting.async_run("inner_domain", _inner)
+
+    with patch("homeassistant.util.loop_accounting.time.perf_counter", times.__next__):
+        assert accounting.async_run("outer_domain", _outer) == "inner"
+
+    assert accounting.domains["inner_domain"].total == 0.25
+    assert accounting.domains["outer_domain"].total == 1.75
+
+
+async def test_hass_loop_accounting(hass: HomeAssistant) -> None:
+    """Test the time of jobs and events is accounted when enabled."""
+    calls: list[str] = []
+
+    @callback
+    def _callback_listener(event) -> None:
+        calls.append("callback")
+
+    async def _coroutine_listener(event) -> None:
+        calls.append("coroutine")
+
+    hass.bus.async_listen("test_event", _callback_listener)
+    hass.bus.async_listen("test_event", _coroutine_listener)
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert calls == ["callback", "coroutine"]
+
+    accounting = hass.loop_accounting = LoopAccounting()
+    hass.bus.async_fire("test_event")
+    hass.async_add_job(_callback_listener, None)
+    await hass.async_block_till_done()
+    hass.loop_accounting = None
+
+    assert calls == ["callback", "coroutine"] * 2 + ["callback"]
+    assert accounting.event_types["test_event"].count == 1
+    assert accounting.domains["tests"].count == 3